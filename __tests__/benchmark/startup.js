@@ -0,0 +1,64 @@
+/**
+ * 组件启动耗时基准：统计加载组件入口以及各子命令模块的耗时（毫秒，取多次运行的中位数）
+ *
+ * 用法：node __tests__/benchmark/startup.js [次数，默认 5] [子命令...]
+ * 每次测量都在新的 node 进程中执行，避免模块缓存影响结果
+ */
+const { execFileSync, execSync } = require('child_process');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const root = path.join(__dirname, '..', '..');
+const [runsArg, ...commandArgs] = process.argv.slice(2);
+const runs = parseInt(runsArg, 10) || 5;
+const commands = commandArgs.length
+  ? commandArgs
+  : fs
+      .readdirSync(path.join(root, 'src', 'subCommands'))
+      .filter((name) => fs.existsSync(path.join(root, 'src', 'subCommands', name, 'index.ts')));
+
+const outDir = fs.mkdtempSync(path.join(os.tmpdir(), 'fc3-startup-'));
+console.log(`compile to ${outDir}`);
+execSync(
+  `npx tsc -p tsconfig.json --outDir ${outDir} --declaration false --inlineSourceMap false`,
+  { cwd: root, stdio: 'inherit' },
+);
+fs.copyFileSync(path.join(root, 'src', 'schema.json'), path.join(outDir, 'schema.json'));
+
+const measure = (modules) => {
+  const script = `
+    const start = process.hrtime.bigint();
+    const times = [];
+    for (const mod of ${JSON.stringify(modules)}) {
+      require(mod);
+      times.push(Number(process.hrtime.bigint() - start) / 1e6);
+    }
+    process.stdout.write(JSON.stringify(times));
+  `;
+  return JSON.parse(execFileSync(process.execPath, ['-e', script], { cwd: root }).toString());
+};
+
+const median = (values) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+};
+
+const entry = path.join(outDir, 'index.js');
+const rows = commands.map((command) => {
+  const samples = [];
+  for (let i = 0; i < runs; i++) {
+    samples.push(measure([entry, path.join(outDir, 'subCommands', command)]));
+  }
+  const index = median(samples.map(([time]) => time));
+  const total = median(samples.map(([, time]) => time));
+  return {
+    command,
+    'index (ms)': index.toFixed(1),
+    'subcommand (ms)': (total - index).toFixed(1),
+    'total (ms)': total.toFixed(1),
+  };
+});
+
+console.table(rows);
+fs.rmSync(outDir, { recursive: true, force: true });
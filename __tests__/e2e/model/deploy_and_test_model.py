@@ -1,18 +1,26 @@
 #!/usr/bin/env python3
 """
 模型部署和测试脚本
+
+单个模型: python deploy_and_test_model.py --model-id Qwen/Qwen2.5-0.5B-Instruct --auto-cleanup
+批量模式: python deploy_and_test_model.py --model-list models.txt --concurrency 4 --auto-cleanup
 """
 
 import hashlib
 import json
 import os
+import re
 import subprocess
+import threading
+import time
 import urllib.parse
 import secrets
 import string
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
 
 # 生成随机token
 def generate_random_token(length=30):
@@ -23,6 +31,48 @@ def generate_random_token(length=30):
 
 token = generate_random_token()
 
+# 清理资源的超时时间（秒），避免 s 命令卡住时阻塞整个批量任务
+CLEANUP_TIMEOUT = int(os.getenv("CLEANUP_TIMEOUT", "1800"))
+
+# 批量模式下每个工作线程的日志前缀，避免多个模型的输出交错后无法区分
+_log_context = threading.local()
+_log_lock = threading.Lock()
+
+
+def log(*args):
+    """输出日志，批量模式下每一行都加上当前模型的前缀"""
+    prefix = getattr(_log_context, "prefix", "")
+    text = " ".join(str(arg) for arg in args)
+    with _log_lock:
+        for line in text.splitlines() or [""]:
+            print(f"{prefix}{line}", flush=True)
+
+
+# 复用连接的 HTTP 会话，批量模式下多个线程共享
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+session.mount("http://", adapter)
+session.mount("https://", adapter)
+
+
+def run_s_command(command: str, cwd: str = None, log_file=None, capture: bool = False):
+    """
+    执行 s 命令，失败时抛出 CalledProcessError
+
+    Args:
+        command: 命令
+        cwd: 执行目录，批量模式下为每个模型独立的工作目录
+        log_file: 输出重定向的文件，默认输出到终端
+        capture: 是否返回标准输出
+
+    Returns:
+        capture 为 True 时返回标准输出
+    """
+    if capture:
+        return subprocess.check_output(command, shell=True, cwd=cwd, stderr=log_file)
+    stderr = subprocess.STDOUT if log_file else None
+    subprocess.check_call(command, shell=True, cwd=cwd, stdout=log_file, stderr=stderr)
+
 
 def simple_hash(input_string: str) -> str:
     """
@@ -41,18 +91,52 @@ def simple_hash(input_string: str) -> str:
     return sha256_hash[:8] + sha256_hash[-8:]
 
 
-def deploy_model(model_id: str, region: str = "cn-hangzhou", storage: str = "nas"):
+def resolve_template_paths(s_yaml: dict, template: str):
+    """
+    将 component 中的 path('相对路径') 转换为绝对路径
+
+    path() 相对于 s.yaml 所在目录解析，生成的 s.yaml 在其它目录时需要按模板位置解析
+    """
+    template_dir = os.path.dirname(os.path.abspath(template))
+    for resource in s_yaml.get("resources", {}).values():
+        component = resource.get("component")
+        if isinstance(component, str):
+            resource["component"] = re.sub(
+                r"path\('([^']*)'\)",
+                lambda m: "path('{}')".format(
+                    os.path.normpath(os.path.join(template_dir, m.group(1)))
+                ),
+                component,
+            )
+
+
+def deploy_model(
+    model_id: str,
+    region: str = "cn-hangzhou",
+    storage: str = "nas",
+    work_dir: str = None,
+    template: str = "s.yaml",
+    timings: dict = None,
+    log_file=None,
+):
     """
     部署模型到函数计算
 
     Args:
         model_id: 模型ID
         region: 部署区域
+        storage: 模型存储，nas 或 oss
+        work_dir: 工作目录，生成的 s.yaml 保存在该目录，默认当前目录
+        template: 基础 s.yaml 配置
+        timings: 记录各阶段耗时（秒）
+        log_file: s 命令输出重定向的文件
 
     Returns:
         tuple: (部署的URL, 配置文件路径)
     """
-    s_yaml_file = f"s.yaml"
+    s_yaml_file = os.path.join(work_dir, "s.yaml") if work_dir else "s.yaml"
+    if timings is None:
+        timings = {}
     
     try:
         # 生成函数名称
@@ -68,7 +152,7 @@ def deploy_model(model_id: str, region: str = "cn-hangzhou", storage: str = "nas
         }
 
         # 打印生成的token
-        print(f"生成的随机token: {token}")
+        log(f"生成的随机token: {token}")
 
         # URL编码模型ID
         encoded_model_id = urllib.parse.quote(model_id, safe="")
@@ -78,12 +162,12 @@ def deploy_model(model_id: str, region: str = "cn-hangzhou", storage: str = "nas
         deploy_url = (
             f"http://{model_registry_url}/api/v1/models/{encoded_model_id}/deploy-info"
         )
-        print(f"deploy url: {deploy_url}")
-        print(f"正在部署模型: {model_id}")
-        print(f"请求URL: {deploy_url}")
-        print(f"请求数据: {json.dumps(deploy_data, indent=2)}")
+        log(f"deploy url: {deploy_url}")
+        log(f"正在部署模型: {model_id}")
+        log(f"请求URL: {deploy_url}")
+        log(f"请求数据: {json.dumps(deploy_data, indent=2)}")
 
-        response = requests.post(
+        response = session.post(
             deploy_url,
             headers={"accept": "application/json", "Content-Type": "application/json"},
             data=json.dumps(deploy_data),
@@ -93,7 +177,7 @@ def deploy_model(model_id: str, region: str = "cn-hangzhou", storage: str = "nas
             raise Exception(f"部署请求失败: {response.status_code} - {response.text}")
 
         result = response.json()
-        print(f"部署响应: {json.dumps(result, indent=2)}")
+        log(f"部署响应: {json.dumps(result, indent=2)}")
 
         # 检查响应是否成功
         if not result.get("success", False):
@@ -103,8 +187,10 @@ def deploy_model(model_id: str, region: str = "cn-hangzhou", storage: str = "nas
         deploy_info = result.get("data", {})
 
         # 使用当前文件夹下的s.yaml内容作为基础配置
-        with open("s.yaml", "r", encoding="utf-8") as f:
+        with open(template, "r", encoding="utf-8") as f:
             s_yaml = yaml.safe_load(f)
+        if work_dir:
+            resolve_template_paths(s_yaml, template)
 
         # 更新resources中的props
         s_yaml["resources"]["test_func"]["props"] = deploy_info
@@ -125,44 +211,47 @@ def deploy_model(model_id: str, region: str = "cn-hangzhou", storage: str = "nas
         with open(s_yaml_file, "w", encoding="utf-8") as f:
             yaml.dump(s_yaml, f, default_flow_style=False, allow_unicode=True)
 
-        print(f"使用配置文件部署: {s_yaml_file}")
+        log(f"使用配置文件部署: {s_yaml_file}")
 
         # 执行部署命令
         # 下载模型
-        print("正在下载模型...")
-        subprocess.check_call(f"s model download -y -t {s_yaml_file}", shell=True)
+        log("正在下载模型...")
+        start = time.monotonic()
+        run_s_command("s model download -y -t s.yaml", work_dir, log_file)
+        timings["download"] = round(time.monotonic() - start, 2)
 
         # 部署函数
-        print("正在部署函数...")
-        subprocess.check_call(f"s deploy -y -t {s_yaml_file} --skip-push", shell=True)
+        log("正在部署函数...")
+        start = time.monotonic()
+        run_s_command("s deploy -y -t s.yaml --skip-push", work_dir, log_file)
+        timings["deploy"] = round(time.monotonic() - start, 2)
 
         # 获取部署信息
-        print("正在获取部署信息...")
-        result = subprocess.check_output(
-            f"s info -t {s_yaml_file} --silent -o json",
-            shell=True,
+        log("正在获取部署信息...")
+        result = run_s_command(
+            "s info -t s.yaml --silent -o json", work_dir, log_file, capture=True
         ).strip()
 
         result_dict = json.loads(result)
         deploy_url = result_dict["url"]["system_url"]
-        print(f"部署成功，访问URL: {deploy_url}")
+        log(f"部署成功，访问URL: {deploy_url}")
 
         return deploy_url, s_yaml_file
 
     except subprocess.CalledProcessError as e:
-        print(f"部署过程失败: {e}")
-        print("即使部署失败，仍将尝试执行清理操作...")
+        log(f"部署过程失败: {e}")
+        log("即使部署失败，仍将尝试执行清理操作...")
         # 即使部署失败，也要尝试清理资源
         try:
-            cleanup_deployment(s_yaml_file)
+            cleanup_deployment(s_yaml_file, log_file)
         except Exception as cleanup_error:
-            print(f"清理操作也失败了: {cleanup_error}")
+            log(f"清理操作也失败了: {cleanup_error}")
         raise Exception(f"部署过程失败: {e}")
     except Exception as e:
         raise Exception(f"获取部署信息失败: {e}")
 
 
-def test_model(model_id: str, deploy_url: str, s_yaml_file: str = None):
+def test_model(model_id: str, deploy_url: str, s_yaml_file: str = None, timings: dict = None):
     """
     测试已部署的模型
 
@@ -170,10 +259,13 @@ def test_model(model_id: str, deploy_url: str, s_yaml_file: str = None):
         model_id: 模型ID
         deploy_url: 部署的URL
         s_yaml_file: Serverless Devs 配置文件路径，用于检查启动命令
+        timings: 记录首个请求（冷启动）耗时（秒）
     """
+    if timings is None:
+        timings = {}
     # 先调用模型详情接口
     model_detail_url = f"{deploy_url}/model/info"
-    print(f"正在获取部署后的模型服务详情: {model_detail_url}")
+    log(f"正在获取部署后的模型服务详情: {model_detail_url}")
 
     # 检查是否是vLLM模型（通过配置文件中的启动命令）
     is_vllm_model = False
@@ -196,31 +288,33 @@ def test_model(model_id: str, deploy_url: str, s_yaml_file: str = None):
                 command = custom_container_config.get("command", "")
                 if "vllm" in entrypoint_str or "vllm" in command:
                     is_vllm_model = True
-                    print("检测到vLLM模型，将使用专用测试方法")
+                    log("检测到vLLM模型，将使用专用测试方法")
         except Exception as e:
-            print(f"检查模型类型时出错: {e}")
+            log(f"检查模型类型时出错: {e}")
     
     # 先调用模型详情接口
     model_detail_url = f"{deploy_url}/model/info"
     if is_vllm_model:
         model_detail_url = f"{deploy_url}/v1/models"
-    print(f"正在获取部署后的模型服务详情: {model_detail_url}")
+    log(f"正在获取部署后的模型服务详情: {model_detail_url}")
     try:
-        detail_response = requests.get(
+        # 部署后的首个请求，耗时包含实例冷启动
+        start = time.monotonic()
+        detail_response = session.get(
             model_detail_url, headers={"Authorization": f"Bearer {token}"}
         )
+        timings["first_request"] = round(time.monotonic() - start, 2)
         if detail_response.status_code == 200:
-            print(f"部署后的模型服务详情: {detail_response.text}")
+            log(f"部署后的模型服务详情: {detail_response.text}")
         else:
-            print(f"获取部署后的模型服务详情失败: {detail_response.status_code}")
+            log(f"获取部署后的模型服务详情失败: {detail_response.status_code}")
     except Exception as e:
-        print(f"获取部署后的模型服务详情时出错: {e}")
+        log(f"获取部署后的模型服务详情时出错: {e}")
 
     if is_vllm_model:
         # 对于vLLM模型，使用专门的测试方法
-        print(f"正在测试vLLM模型: {deploy_url}")
-        test_vllm_model(deploy_url)
-        return True
+        log(f"正在测试vLLM模型: {deploy_url}")
+        return test_vllm_model(deploy_url)
     else:
         # 获取模型信息
         encoded_model_id = urllib.parse.quote(model_id, safe="")
@@ -229,9 +323,9 @@ def test_model(model_id: str, deploy_url: str, s_yaml_file: str = None):
         )
         model_info_url = f"http://{model_registry_url}/api/v1/models/{encoded_model_id}"
 
-        print(f"正在获取模型信息: {model_info_url}")
+        log(f"正在获取模型信息: {model_info_url}")
 
-        response = requests.get(
+        response = session.get(
             model_info_url,
             headers={"accept": "application/json"},
         )
@@ -255,13 +349,13 @@ def test_model(model_id: str, deploy_url: str, s_yaml_file: str = None):
             raise Exception("模型没有定义任务类型")
 
         task_name = tasks[0].get("name", "")
-        print(f"模型任务类型: {task_name}")
+        log(f"模型任务类型: {task_name}")
 
         # 获取测试payload
         payload_url = "https://images.devsapp.cn/modelscope/pipeline_inputs.json"
-        print(f"正在获取测试payload: {payload_url}")
+        log(f"正在获取测试payload: {payload_url}")
 
-        payload_response = requests.get(payload_url)
+        payload_response = session.get(payload_url)
         if payload_response.status_code != 200:
             raise Exception(f"获取测试payload失败: {payload_response.status_code}")
 
@@ -273,12 +367,12 @@ def test_model(model_id: str, deploy_url: str, s_yaml_file: str = None):
             # 如果不是JSON格式，尝试使用文本
             payload = {"input": payload_response.text}
 
-        print(f"测试payload: {json.dumps(payload, indent=2)}")
+        log(f"测试payload: {json.dumps(payload, indent=2)}")
 
         # 发送测试请求
-        print(f"正在测试部署的模型: {deploy_url}")
+        log(f"正在测试部署的模型: {deploy_url}")
 
-        test_response = requests.post(
+        test_response = session.post(
             deploy_url,
             headers={
                 "Content-Type": "application/json",
@@ -287,14 +381,14 @@ def test_model(model_id: str, deploy_url: str, s_yaml_file: str = None):
             data=json.dumps(payload),
         )
 
-        print(f"测试响应状态码: {test_response.status_code}")
-        print(f"测试响应内容: {test_response.text}")
+        log(f"测试响应状态码: {test_response.status_code}")
+        log(f"测试响应内容: {test_response.text}")
 
         if test_response.status_code == 200:
-            print("模型测试成功!")
+            log("模型测试成功!")
             return True
         else:
-            print("模型测试失败!")
+            log("模型测试失败!")
             return False
 
 
@@ -307,7 +401,7 @@ def test_vllm_model(deploy_url: str):
     """
     # 对于vLLM模型，使用专门的测试方法
     chat_url = f"{deploy_url}/v1/chat/completions"
-    print(f"正在测试vLLM模型: {chat_url}")
+    log(f"正在测试vLLM模型: {chat_url}")
 
     test_data = {
         "messages": [{"role": "user", "content": "Hello! 你是谁？"}],
@@ -315,7 +409,7 @@ def test_vllm_model(deploy_url: str):
     }
 
     try:
-        response = requests.post(
+        response = session.post(
             chat_url,
             headers={
                 "Content-Type": "application/json",
@@ -325,42 +419,157 @@ def test_vllm_model(deploy_url: str):
             timeout=300,  # 5分钟超时
         )
 
-        print(f"vLLM测试响应状态码: {response.status_code}")
-        print(f"vLLM测试响应内容: {response.text}")
+        log(f"vLLM测试响应状态码: {response.status_code}")
+        log(f"vLLM测试响应内容: {response.text}")
 
         if response.status_code == 200:
-            print("vLLM模型测试成功!")
+            log("vLLM模型测试成功!")
             return True
         else:
-            print("vLLM模型测试失败!")
+            log("vLLM模型测试失败!")
             return False
     except Exception as e:
-        print(f"测试vLLM模型时出错: {e}")
+        log(f"测试vLLM模型时出错: {e}")
         return False
 
 
-def cleanup_deployment(s_yaml_file: str):
+def cleanup_deployment(s_yaml_file: str, log_file=None):
     """
     清除部署的资源
 
     Args:
         s_yaml_file: Serverless Devs 配置文件路径
+        log_file: s 命令输出重定向的文件
     """
     if not s_yaml_file or not os.path.exists(s_yaml_file):
-        print(f"配置文件不存在: {s_yaml_file}")
+        log(f"配置文件不存在: {s_yaml_file}")
         return
         
     try:
-        print(f"正在清除部署资源: {s_yaml_file}")
+        log(f"正在清除部署资源: {s_yaml_file}")
         # 清除模型
-        print("正在清除模型...")
-        subprocess.run(f"s model remove -y -t {s_yaml_file}", shell=True, check=False)
+        log("正在清除模型...")
+        output = {"stdout": log_file, "stderr": subprocess.STDOUT} if log_file else {}
+        subprocess.run(
+            f"s model remove -y -t {s_yaml_file}",
+            shell=True,
+            check=False,
+            timeout=CLEANUP_TIMEOUT,
+            **output,
+        )
         # 清除函数
-        print("正在清除函数...")
-        subprocess.run(f"s remove -y -t {s_yaml_file} --skip-push", shell=True, check=False)
-        print("部署资源清除完成!")
+        log("正在清除函数...")
+        subprocess.run(
+            f"s remove -y -t {s_yaml_file} --skip-push",
+            shell=True,
+            check=False,
+            timeout=CLEANUP_TIMEOUT,
+            **output,
+        )
+        log("部署资源清除完成!")
+    except subprocess.TimeoutExpired as e:
+        log(f"清除部署资源超时（{CLEANUP_TIMEOUT}s）: {e.cmd}")
     except Exception as e:
-        print(f"清除部署资源时发生错误: {e}")
+        log(f"清除部署资源时发生错误: {e}")
+
+
+def read_model_list(model_list_file: str, default_storage: str):
+    """
+    读取模型列表文件，每行一个模型，格式为 "模型ID [存储]"，忽略空行和 # 开头的注释
+
+    Returns:
+        list: [(模型ID, 存储)]
+    """
+    models = []
+    with open(model_list_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split()
+            models.append((fields[0], fields[1] if len(fields) > 1 else default_storage))
+    return models
+
+
+def run_model(index: int, model_id: str, storage: str, args) -> dict:
+    """
+    在独立的工作目录中部署、测试并清理一个模型，结果写入工作目录下的 report.json
+
+    Returns:
+        dict: 单个模型的报告
+    """
+    name = f"{index:03d}-{simple_hash(model_id + storage)}"
+    work_dir = os.path.join(args.work_dir, name)
+    os.makedirs(work_dir, exist_ok=True)
+    report = {
+        "model_id": model_id,
+        "storage": storage,
+        "work_dir": work_dir,
+        "success": False,
+        "timings": {},
+    }
+    start = time.monotonic()
+    s_yaml_file = None
+    _log_context.prefix = f"[{model_id}] "
+    log(f"开始部署和测试模型 {name} ({storage})，日志: {work_dir}/s.log")
+
+    with open(os.path.join(work_dir, "s.log"), "w", encoding="utf-8") as log_file:
+        try:
+            deploy_url, s_yaml_file = deploy_model(
+                model_id,
+                args.region,
+                storage,
+                work_dir=work_dir,
+                template=args.template,
+                timings=report["timings"],
+                log_file=log_file,
+            )
+            report["url"] = deploy_url
+            report["success"] = bool(
+                test_model(model_id, deploy_url, s_yaml_file, timings=report["timings"])
+            )
+        except Exception as e:
+            report["error"] = str(e)
+        finally:
+            if args.auto_cleanup and s_yaml_file:
+                cleanup_start = time.monotonic()
+                cleanup_deployment(s_yaml_file, log_file)
+                report["timings"]["cleanup"] = round(time.monotonic() - cleanup_start, 2)
+
+    report["timings"]["total"] = round(time.monotonic() - start, 2)
+    with open(os.path.join(work_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    log(f"{'成功' if report['success'] else '失败'}: {report['timings']}")
+    _log_context.prefix = ""
+    return report
+
+
+def run_batch(args) -> int:
+    """
+    批量模式：有限并发地部署和测试模型列表中的模型，汇总报告写入 <work-dir>/report.json
+    """
+    models = read_model_list(args.model_list, args.storage)
+    args.work_dir = os.path.abspath(args.work_dir)
+    args.template = os.path.abspath(args.template)
+    os.makedirs(args.work_dir, exist_ok=True)
+    log(f"共 {len(models)} 个模型，并发数 {args.concurrency}，工作目录 {args.work_dir}")
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        reports = list(
+            executor.map(
+                lambda item: run_model(item[0], item[1][0], item[1][1], args),
+                enumerate(models),
+            )
+        )
+
+    with open(os.path.join(args.work_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(reports, f, indent=2, ensure_ascii=False)
+
+    failed = [report for report in reports if not report["success"]]
+    log(f"批量测试完成: 成功 {len(reports) - len(failed)}，失败 {len(failed)}")
+    for report in failed:
+        log(f"  失败: {report['model_id']} ({report['storage']}) {report.get('error', '')}")
+    return 1 if failed else 0
 
 
 def main():
@@ -377,6 +586,14 @@ def main():
         "--auto-cleanup", action="store_true", help="部署和测试完成后自动执行清理操作"
     )
     parser.add_argument("--storage", help="存储区域", default="nas")
+    parser.add_argument(
+        "--model-list", help="批量模式：模型列表文件，每行一个模型，格式为 \"模型ID [存储]\""
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="批量模式的并发数")
+    parser.add_argument(
+        "--work-dir", default="model-runs", help="批量模式的工作目录，每个模型一个子目录"
+    )
+    parser.add_argument("--template", default="s.yaml", help="基础 s.yaml 配置")
 
     args = parser.parse_args()
 
@@ -387,10 +604,12 @@ def main():
             # 只执行清除操作
             cleanup_deployment(args.cleanup)
             return 0
+        elif args.model_list:
+            return run_batch(args)
         elif args.model_id:
             # 部署和测试模型
             deploy_url, s_yaml_file = deploy_model(
-                args.model_id, args.region, args.storage
+                args.model_id, args.region, args.storage, template=args.template
             )
 
             # 测试模型
@@ -398,30 +617,30 @@ def main():
 
             if args.auto_cleanup:
                 # 自动执行清理操作
-                print("自动执行清理操作...")
+                log("自动执行清理操作...")
                 cleanup_deployment(s_yaml_file)
-                print("模型部署、测试和清理完成!")
+                log("模型部署、测试和清理完成!")
             else:
-                print(f"模型部署和测试完成! 配置文件路径: {s_yaml_file}")
-                print(
+                log(f"模型部署和测试完成! 配置文件路径: {s_yaml_file}")
+                log(
                     "如需清除资源，请运行: python deploy_and_test_model.py --cleanup {}".format(
                         s_yaml_file
                     )
                 )
         else:
-            print("请提供模型ID或使用 --cleanup 参数指定配置文件路径")
+            log("请提供模型ID、模型列表文件或使用 --cleanup 参数指定配置文件路径")
             return 1
 
     except Exception as e:
-        print(f"错误: {e}")
+        log(f"错误: {e}")
         # 如果启用了自动清理且有配置文件，即使出错也要尝试清理
         if args.auto_cleanup and s_yaml_file:
-            print("尝试执行清理操作...")
+            log("尝试执行清理操作...")
             try:
                 cleanup_deployment(s_yaml_file)
-                print("清理操作完成!")
+                log("清理操作完成!")
             except Exception as cleanup_error:
-                print(f"清理操作失败: {cleanup_error}")
+                log(f"清理操作失败: {cleanup_error}")
         return 1
 
     return 0
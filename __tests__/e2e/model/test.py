@@ -48,59 +48,31 @@ def main():
     print("4. 等待实例启动...")
     time.sleep(10)
     
-    # 5. 获取实例列表并提取instanceId
-    print("5. 获取实例列表: s instance list -t s_file.yaml")
-    ret_code, instance_output, stderr = run_command_with_retry("s instance list -t s_file.yaml")
-    
-    if ret_code == 0:
-        print("实例列表:")
-        print(instance_output)
-        
-        # 提取第一个instanceId
-        instance_id = None
-        for line in instance_output.split('\n'):
-            if 'instanceId:' in line:
-                instance_id = line.split('instanceId:')[1].strip()
-                break
-        
-        if instance_id:
-            print(f"提取到的instanceId: {instance_id}")
-            
-            # 6. 执行详细检查
-            cmd = f"s instance exec --instance-id {instance_id} --cmd 'ls /mnt/{function_name}/models/checkpoints/v1-5-pruned-emaonly-fp16.safetensors'"
-            print(f"6. 执行详细检查: {cmd}")
-            ret_code, find_output, stderr = run_command_with_retry(cmd)
-            print(f"文件查找结果: {find_output}, 错误信息: {stderr}, 状态码: {ret_code}")
-            
-            if ret_code == 0:
-                print("文件查找结果:")
-                print(find_output)
-                
-                if "v1-5-pruned-emaonly-fp16.safetensors" in find_output:
-                    print("✓ 文件存在路径确认")
-                else:
-                    print("✗ 文件未在/mnt/auto目录下找到")
-                    # 文件不存在，终止流程
-                    sys.exit(1)
-            else:
-                print("文件查找命令执行失败:")
-                print(find_output)
-                print(f"错误信息: {stderr}")
-                # 命令执行失败，终止流程
-                sys.exit(1)
-        else:
-            print("✗ 未找到instanceId")
-    else:
-        print("✗ 获取实例列表失败:")
-        print(instance_output)
+    # 5. 在所有存活实例中检查模型文件，输出每行带有 [instanceId] 前缀，任一实例失败时退出码非 0
+    model_file = f"/mnt/{function_name}/models/checkpoints/v1-5-pruned-emaonly-fp16.safetensors"
+    cmd = f"s instance exec --all --cmd 'ls {model_file}' -t s_file.yaml"
+    print(f"5. 在所有实例中执行检查: {cmd}")
+    ret_code, find_output, stderr = run_command_with_retry(cmd)
+    print(f"文件查找结果: {find_output}, 错误信息: {stderr}, 状态码: {ret_code}")
+
+    if ret_code != 0:
+        print("文件查找命令执行失败:")
+        print(find_output)
         print(f"错误信息: {stderr}")
-    
-    # 7. 执行模型移除
-    print("7. 执行模型移除: s model remove -t s_file.yaml")
+        # 命令执行失败，终止流程
+        sys.exit(1)
+    if "v1-5-pruned-emaonly-fp16.safetensors" in find_output:
+        print("✓ 文件存在路径确认")
+    else:
+        print("✗ 未找到存活实例或文件不存在")
+        sys.exit(1)
+
+    # 6. 执行模型移除
+    print("6. 执行模型移除: s model remove -t s_file.yaml")
     subprocess.check_output(f"s model remove -t s_file.yaml", shell=True)
     
-    # 8. 移除部署
-    print("8. 移除部署: s remove -y -t s_file.yaml")
+    # 7. 移除部署
+    print("7. 移除部署: s remove -y -t s_file.yaml")
     subprocess.check_output(f"s remove -y -t s_file.yaml", shell=True)
     
     print("测试流程完成")
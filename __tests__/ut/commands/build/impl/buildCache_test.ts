@@ -0,0 +1,93 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import {
+  evictBuildCache,
+  getBuildCacheBaseDir,
+  getBuildCacheKey,
+  getMavenRepositoryCacheDir,
+  restoreBuildCache,
+  saveBuildCache,
+  useMavenRepositoryCache,
+} from '../../../../../src/subCommands/build/impl/buildCache';
+
+const mockRootHome = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-build-cache-home-'));
+
+jest.mock('@serverless-devs/utils', () => ({
+  getRootHome: jest.fn(() => mockRootHome),
+}));
+jest.mock('../../../../../src/logger', () => ({
+  debug: jest.fn(),
+  info: jest.fn(),
+}));
+
+describe('buildCache', () => {
+  let buildDir: string;
+
+  beforeEach(() => {
+    buildDir = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-build-code-'));
+    fs.writeFileSync(path.join(buildDir, 'requirements.txt'), 'flask==2.0.0\n');
+  });
+
+  afterEach(() => {
+    fs.rmSync(buildDir, { recursive: true, force: true });
+    fs.rmSync(getBuildCacheBaseDir(), { recursive: true, force: true });
+  });
+
+  it('should change key when the lockfile or image changes', () => {
+    const key = getBuildCacheKey(buildDir, ['python3.10', 'image:1']);
+
+    expect(getBuildCacheKey(buildDir, ['python3.10', 'image:1'])).toBe(key);
+    expect(getBuildCacheKey(buildDir, ['python3.10', 'image:2'])).not.toBe(key);
+    fs.writeFileSync(path.join(buildDir, 'requirements.txt'), 'flask==3.0.0\n');
+    expect(getBuildCacheKey(buildDir, ['python3.10', 'image:1'])).not.toBe(key);
+  });
+
+  it('should restore saved dependency directories', () => {
+    const key = getBuildCacheKey(buildDir, ['python3.10', 'image:1']);
+    expect(restoreBuildCache(key, buildDir)).toBeUndefined();
+
+    fs.mkdirSync(path.join(buildDir, 'python', 'flask'), { recursive: true });
+    fs.writeFileSync(path.join(buildDir, 'python', 'flask', '__init__.py'), 'x');
+    saveBuildCache(
+      key,
+      buildDir,
+      ['python', 'apt-archives'],
+      { runtime: 'python3.10', image: 'image:1' },
+      1024,
+    );
+    fs.rmSync(path.join(buildDir, 'python'), { recursive: true });
+
+    expect(restoreBuildCache(key, buildDir)).toEqual(['python']);
+    expect(fs.readFileSync(path.join(buildDir, 'python', 'flask', '__init__.py'), 'utf8')).toBe(
+      'x',
+    );
+  });
+
+  it('should evict least recently used entries over the size limit', () => {
+    fs.mkdirSync(path.join(buildDir, 'node_modules'));
+    fs.writeFileSync(path.join(buildDir, 'node_modules', 'a.js'), Buffer.alloc(1024 * 1024));
+    const meta = { runtime: 'nodejs18', image: 'image:1' };
+    saveBuildCache('old', buildDir, ['node_modules'], meta, 1024);
+    saveBuildCache('new', buildDir, ['node_modules'], meta, 1024);
+
+    evictBuildCache(1, path.join(getBuildCacheBaseDir(), 'new'));
+
+    expect(restoreBuildCache('old', buildDir)).toBeUndefined();
+    expect(restoreBuildCache('new', buildDir)).toEqual(['node_modules']);
+  });
+
+  it('should count the maven repository in the size limit', () => {
+    const m2Dir = useMavenRepositoryCache();
+    fs.writeFileSync(path.join(m2Dir, 'a.jar'), Buffer.alloc(1024 * 1024));
+    fs.writeFileSync(`${m2Dir}.json`, JSON.stringify({ lastUsed: Date.now() - 60000 }));
+    fs.mkdirSync(path.join(buildDir, 'node_modules'));
+    fs.writeFileSync(path.join(buildDir, 'node_modules', 'a.js'), Buffer.alloc(1024 * 1024));
+    saveBuildCache('new', buildDir, ['node_modules'], { runtime: 'nodejs18', image: 'i' }, 1024);
+
+    evictBuildCache(1, path.join(getBuildCacheBaseDir(), 'new'));
+
+    expect(fs.existsSync(getMavenRepositoryCacheDir())).toBe(false);
+    expect(restoreBuildCache('new', buildDir)).toEqual(['node_modules']);
+  });
+});
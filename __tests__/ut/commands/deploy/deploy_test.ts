@@ -371,6 +371,34 @@ describe('Deploy', () => {
       expect(mockConcurrencyConfig.run).toHaveBeenCalled();
     });
 
+    it('should run other resources after function is deployed', async () => {
+      const order: string[] = [];
+      mockService.run.mockImplementation(async () => {
+        order.push('function');
+        return true;
+      });
+      mockTrigger.run.mockImplementation(async () => {
+        order.push('trigger');
+        return true;
+      });
+      mockProvisionConfig.run.mockImplementation(async () => {
+        order.push('provisionConfig');
+        return true;
+      });
+      mockConcurrencyConfig.run.mockImplementation(async () => {
+        order.push('concurrencyConfig');
+        return true;
+      });
+
+      await deploy.run();
+
+      expect(order[0]).toBe('function');
+      expect(order.indexOf('concurrencyConfig')).toBeGreaterThan(
+        order.indexOf('provisionConfig'),
+      );
+      expect(Object.keys(deploy.timings)).toContain('trigger.run');
+    });
+
     it('should return merged result when all resources run successfully', async () => {
       const result = await deploy.run();
 
@@ -22,6 +22,12 @@ jest.mock('../../../../../src/resources/ram');
 jest.mock('../../../../../src/resources/vpc-nas');
 jest.mock('../../../../../src/resources/oss');
 
+// Resolve directly, without reading or writing the local resource cache
+jest.mock('../../../../../src/utils/resource-cache', () => ({
+  cachedResource: jest.fn((_scope, _key, resolve) => resolve()),
+  invalidateResourceCache: jest.fn(),
+}));
+
 const getRootHomeMock = jest.requireMock('@serverless-devs/utils').getRootHome;
 const calculateCRC64Mock = utils.calculateCRC64 as jest.Mock;
 const getFileSizeMock = utils.getFileSize as jest.Mock;
@@ -2,6 +2,11 @@ import ProvisionConfig from '../../../../../src/subCommands/deploy/impl/provisio
 import { IInputs } from '../../../../../src/interface';
 import logger from '../../../../../src/logger';
 import { sleep } from '../../../../../src/utils';
+import {
+  RemoteCache,
+  cachedRead,
+  runWithRemoteCache,
+} from '../../../../../src/resources/fc/impl/remote-cache';
 
 // Mocks
 jest.mock('../../../../../src/utils');
@@ -419,6 +424,39 @@ describe('ProvisionConfig', () => {
       );
     });
 
+    it('should read live provision config on every poll inside a remote cache scope', async () => {
+      provisionConfig = new ProvisionConfig(mockInputs, mockOpts);
+
+      const getProvisionConfig = jest
+        .fn()
+        .mockResolvedValueOnce({ current: 5, target: 10 })
+        .mockResolvedValueOnce({ current: 10, target: 10 });
+      const mockFcSdk: any = {
+        region: 'cn-hangzhou',
+        credentials: { AccountID: 'test-account-id' },
+        disableFunctionInvocation: jest.fn().mockResolvedValue(undefined),
+        enableFunctionInvocation: jest.fn().mockResolvedValue(undefined),
+      };
+      mockFcSdk.getFunctionProvisionConfig = (functionName: string, qualifier: string) =>
+        cachedRead(mockFcSdk, 'getProvisionConfig', `provision/${functionName}`, qualifier, () =>
+          getProvisionConfig(functionName, qualifier),
+        );
+      Object.defineProperty(provisionConfig, 'fcSdk', {
+        value: mockFcSdk,
+        writable: true,
+      });
+
+      await runWithRemoteCache(new RemoteCache(), () =>
+        (provisionConfig as any).waitForProvisionReady('LATEST', { target: 10 }),
+      );
+
+      expect(getProvisionConfig).toHaveBeenCalledTimes(2);
+      expect(logger.warn).not.toHaveBeenCalled();
+      expect(logger.info).toHaveBeenCalledWith(
+        'ProvisionConfig of test-function/LATEST is ready. Current: 10, Target: 10',
+      );
+    });
+
     it('should throw error when currentError occurs and is not internal error', async () => {
       provisionConfig = new ProvisionConfig(mockInputs, mockOpts);
 
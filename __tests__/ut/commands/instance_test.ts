@@ -1,3 +1,4 @@
+import _ from 'lodash';
 import Instance from '../../../src/subCommands/instance';
 import FC from '../../../src/resources/fc';
 import { IInputs } from '../../../src/interface';
@@ -274,4 +275,105 @@ describe('Instance', () => {
       );
     });
   });
+
+  describe('exec in batch', () => {
+    let stdoutSpy: jest.SpyInstance;
+
+    beforeEach(() => {
+      stdoutSpy = jest.spyOn(process.stdout, 'write').mockImplementation(() => true);
+      mockFcInstance.listInstances.mockResolvedValue({
+        instances: [{ instanceId: 'c-1-a' }, { instanceId: 'c-1-b' }, { instanceId: 'c-2-a' }],
+      });
+      mockFcInstance.execInstanceCommand = jest.fn(
+        async (_functionName, instanceId, _rawData, _qualifier, { onStdout }) => {
+          if (instanceId === 'c-2-a') {
+            throw new Error('instance not found');
+          }
+          const exitCode = instanceId.endsWith('a') ? 0 : 2;
+          onStdout(Buffer.from('hello\nwor'));
+          onStdout(Buffer.from(`ld\n__FC_INSTANCE_EXEC_EXIT_CODE__${exitCode}\n`));
+        },
+      );
+    });
+
+    afterEach(() => {
+      stdoutSpy.mockRestore();
+      process.exitCode = undefined;
+    });
+
+    it('should exec in all instances and collect exit codes', async () => {
+      mockInputs.args = ['exec', '--all', '--cmd', 'ls', '--concurrency', '2'];
+      instance = new Instance(mockInputs);
+
+      const results = await instance.exec();
+
+      expect(mockFcInstance.execInstanceCommand).toHaveBeenCalledTimes(3);
+      expect(mockFcInstance.execInstanceCommand.mock.calls[0][2]).toEqual([
+        'bash',
+        '-c',
+        'ls\necho "__FC_INSTANCE_EXEC_EXIT_CODE__$?"',
+      ]);
+      expect(results).toEqual([
+        { instanceId: 'c-1-a', exitCode: 0, duration: expect.any(Number) },
+        { instanceId: 'c-1-b', exitCode: 2, duration: expect.any(Number) },
+        {
+          instanceId: 'c-2-a',
+          exitCode: null,
+          duration: expect.any(Number),
+          error: 'instance not found',
+        },
+      ]);
+      expect(stdoutSpy).toHaveBeenCalledWith('[c-1-a] hello\n');
+      expect(stdoutSpy).toHaveBeenCalledWith('[c-1-a] world\n');
+      expect(process.exitCode).toBe(1);
+    });
+
+    it('should run the command in --workdir', async () => {
+      mockInputs.args = ['exec', '--all', '--cmd', 'ls', '--workdir', '/app'];
+      instance = new Instance(mockInputs);
+
+      await instance.exec();
+
+      expect(mockFcInstance.execInstanceCommand.mock.calls[0][2]).toEqual([
+        'bash',
+        '-c',
+        'cd /app && {\nls\n}\necho "__FC_INSTANCE_EXEC_EXIT_CODE__$?"',
+      ]);
+    });
+
+    it('should read the exit code when the output has no trailing newline', async () => {
+      mockInputs.args = ['exec', '--instance-filter', 'c-1-a', '--cmd', 'printf abc'];
+      mockFcInstance.execInstanceCommand.mockImplementation(
+        async (_functionName, _instanceId, _rawData, _qualifier, { onStdout }) => {
+          onStdout(Buffer.from('abc__FC_INSTANCE_EXEC_EXIT_CODE__0\n'));
+        },
+      );
+      instance = new Instance(mockInputs);
+
+      const results = await instance.exec();
+
+      expect(results).toEqual([{ instanceId: 'c-1-a', exitCode: 0, duration: expect.any(Number) }]);
+      expect(stdoutSpy).toHaveBeenCalledWith('[c-1-a] abc\n');
+      expect(stdoutSpy).not.toHaveBeenCalledWith(
+        expect.stringContaining('__FC_INSTANCE_EXEC_EXIT_CODE__'),
+      );
+      expect(process.exitCode).toBeUndefined();
+    });
+
+    it('should exec in instances matched by the filter', async () => {
+      mockInputs.args = ['exec', '--instance-filter', 'c-1-*', '--cmd', 'ls'];
+      instance = new Instance(mockInputs);
+
+      const results = await instance.exec();
+
+      expect(_.map(results, 'instanceId')).toEqual(['c-1-a', 'c-1-b']);
+    });
+
+    it('should require --cmd in batch mode', async () => {
+      mockInputs.args = ['exec', '--all'];
+      instance = new Instance(mockInputs);
+
+      await expect(instance.exec()).rejects.toThrow('--cmd must be specified');
+    });
+  });
 });
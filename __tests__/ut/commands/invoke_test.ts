@@ -350,4 +350,64 @@ describe('Invoke', () => {
       expect(logger.write).toHaveBeenCalled();
     });
   });
+
+  describe('batch invoke', () => {
+    it('should replay events with concurrency and report stats', async () => {
+      (fs.readFileSync as jest.Mock).mockReturnValue('{"id": 1}\n\n{"id": 2}\n');
+      const error: any = new Error('throttled');
+      error.code = 'ResourceThrottled';
+      mockFcInstance.invokeFunction
+        .mockResolvedValueOnce({
+          headers: { 'x-fc-instance-id': 'i-1', 'x-fc-invocation-duration': '10' },
+        })
+        .mockResolvedValueOnce({
+          headers: { 'x-fc-instance-id': 'i-2', 'x-fc-invocation-duration': '20' },
+        })
+        .mockResolvedValueOnce({
+          headers: {
+            'x-fc-instance-id': 'i-1',
+            'x-fc-invocation-duration': '5',
+            'x-fc-error-type': 'UnhandledInvocationError',
+          },
+        })
+        .mockRejectedValueOnce(error);
+
+      mockInputs.args = [
+        '--events-file',
+        'events.jsonl',
+        '--count',
+        '4',
+        '--concurrency',
+        '2',
+        '--silent',
+      ];
+      const invoke = new Invoke(mockInputs);
+      const result: any = await invoke.run();
+
+      expect(mockFcInstance.invokeFunction).toHaveBeenCalledTimes(4);
+      expect(mockFcInstance.invokeFunction).toHaveBeenNthCalledWith(
+        2,
+        'test-function',
+        expect.objectContaining({ payload: '{"id": 2}', logType: 'None', maxIdleConns: 2 }),
+      );
+      expect(result).toEqual(
+        expect.objectContaining({
+          count: 4,
+          success: 2,
+          failed: 2,
+          instances: 2,
+          coldStarts: 2,
+          billedDuration: 35,
+          errors: { UnhandledInvocationError: 1, ResourceThrottled: 1 },
+        }),
+      );
+    });
+
+    it('should throw error when concurrency is invalid', () => {
+      mockInputs.args = ['--concurrency', '0'];
+      expect(() => new Invoke(mockInputs)).toThrow(
+        "Invalid 'concurrency': 0, it should be a positive integer",
+      );
+    });
+  });
 });
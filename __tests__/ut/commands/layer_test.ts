@@ -6,7 +6,7 @@ import fs from 'fs';
 import path from 'path';
 import { getRootHome } from '@serverless-devs/utils';
 import zip from '@serverless-devs/zip';
-import downloads from '@serverless-devs/downloads';
+import { downloadWithCache } from '../../../src/utils/download';
 import { promptForConfirmOrDetails, calculateCRC64 } from '../../../src/utils';
 
 // Mock dependencies
@@ -109,9 +109,8 @@ jest.mock('@serverless-devs/zip', () => ({
   __esModule: true,
   default: jest.fn().mockResolvedValue({ outputFile: '/tmp/test.zip' }),
 }));
-jest.mock('@serverless-devs/downloads', () => ({
-  __esModule: true,
-  default: jest.fn().mockResolvedValue(undefined),
+jest.mock('../../../src/utils/download', () => ({
+  downloadWithCache: jest.fn(),
 }));
 jest.mock('@serverless-devs/utils', () => ({
   parseArgv: jest.fn(),
@@ -188,7 +187,7 @@ describe('Layer', () => {
     // Mock utils
     (getRootHome as jest.Mock).mockReturnValue('/root');
     (zip as jest.Mock).mockResolvedValue({ outputFile: '/tmp/test.zip' });
-    (downloads as jest.Mock).mockResolvedValue(undefined);
+    (downloadWithCache as jest.Mock).mockImplementation(async (_url, dest) => dest);
     (calculateCRC64 as jest.Mock).mockResolvedValue('crc64checksum');
     (promptForConfirmOrDetails as jest.Mock).mockResolvedValue(true);
     (fs.existsSync as jest.Mock).mockReturnValue(false);
@@ -755,6 +754,7 @@ describe('Layer', () => {
         compatibleRuntime: ['nodejs12'],
         layerVersionArn: 'arn:acs:fc:cn-hangzhou:123456789:layers/test-layer/versions/1',
         acl: 'private',
+        codeChecksum: '123456',
         code: {
           location: 'https://test.oss-cn-hangzhou.aliyuncs.com/layer.zip',
         },
@@ -764,13 +764,10 @@ describe('Layer', () => {
       const result = await layer.download();
 
       expect(mockFcInstance.getLayerVersion).toHaveBeenCalledWith('test-layer', '1');
-      expect(downloads).toHaveBeenCalledWith(
+      expect(downloadWithCache).toHaveBeenCalledWith(
         'https://test.oss-cn-hangzhou.aliyuncs.com/layer.zip',
-        {
-          dest: '/root/cache/layers/123456789-cn-hangzhou-test-layer',
-          filename: 1,
-          extract: false,
-        },
+        '/root/cache/layers/123456789-cn-hangzhou-test-layer/1.zip',
+        { checksum: '123456' },
       );
       expect(result).toBe('/root/cache/layers/123456789-cn-hangzhou-test-layer/1.zip');
     });
@@ -795,7 +792,7 @@ describe('Layer', () => {
       const layer = new Layer(mockInputs);
       const result = await layer.download();
 
-      expect(downloads).not.toHaveBeenCalled();
+      expect(downloadWithCache).not.toHaveBeenCalled();
       expect(result).toBe('/root/cache/layers/123456789-cn-hangzhou-test-layer/1.zip');
     });
   });
@@ -237,6 +237,28 @@ describe('List', () => {
     });
   });
 
+  describe('run - multiple regions', () => {
+    it('should list functions of each region and filter by wildcard', async () => {
+      mockInputs.args = ['--regions', 'cn-hangzhou,cn-beijing', '--function-name', 'test-func-1'];
+      list = new List(mockInputs);
+      mockFcSdk.listFunctions = jest.fn().mockResolvedValue(mockFunctionsArray);
+
+      const result = await list.run();
+      expect(mockFcSdk.listFunctions).toHaveBeenCalledTimes(2);
+      expect(result).toEqual({
+        functions: [
+          { region: 'cn-hangzhou', ...mockFunctionsArray[0] },
+          { region: 'cn-beijing', ...mockFunctionsArray[0] },
+        ],
+      });
+    });
+
+    it('should reject unknown output format', () => {
+      mockInputs.args = ['--output-format', 'xml'];
+      expect(() => new List(mockInputs)).toThrow('Invalid --output-format xml');
+    });
+  });
+
   describe('run - error handling', () => {
     it('should propagate auto-pagination API errors', async () => {
       mockInputs.args = [];
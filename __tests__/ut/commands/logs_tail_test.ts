@@ -0,0 +1,170 @@
+import LogTail, { DedupWindow } from '../../../src/subCommands/logs/tail';
+
+jest.mock('../../../src/logger', () => ({
+  __esModule: true,
+  default: { debug: jest.fn() },
+}));
+
+const callback =
+  (...responses: any[]) =>
+  jest.fn((params, cb) => {
+    const response = responses.length > 1 ? responses.shift() : responses[0];
+    if (response instanceof Error) {
+      cb(response);
+    } else {
+      cb(null, response);
+    }
+  });
+
+describe('DedupWindow', () => {
+  it('should keep only the latest keys', () => {
+    const window = new DedupWindow(2);
+
+    expect(window.add('a')).toBe(true);
+    expect(window.add('a')).toBe(false);
+    expect(window.add('b')).toBe(true);
+    expect(window.add('c')).toBe(true);
+    expect(window.size).toBe(2);
+    // a 已被淘汰
+    expect(window.add('a')).toBe(true);
+  });
+});
+
+describe('LogTail', () => {
+  const options = {
+    projectName: 'project',
+    logStoreName: 'logstore',
+    topics: ['FCLogs:test'],
+    cursorMode: true,
+  };
+  const parseLogs = (rawLogs: any[]) =>
+    rawLogs.map((item) => ({ timestamp: item.__time__, message: item.message, extra: {} }));
+
+  beforeEach(() => {
+    jest.spyOn(global, 'setTimeout').mockImplementation((fn: any) => {
+      fn();
+      return 0 as any;
+    });
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('should pull new logs of every shard from the end cursor', async () => {
+    const group = (topic: string, message: string) => ({
+      topic,
+      logs: [{ time: 100, contents: [{ key: 'message', value: message }] }],
+    });
+    const slsClient = {
+      listShards: callback({
+        body: [
+          { shardID: 0, status: 'readwrite' },
+          { shardID: 1, status: 'readonly' },
+        ],
+      }),
+      getCursor: callback({ body: { cursor: 'end-cursor' } }),
+      batchGetLogs: callback({
+        headers: { 'x-log-cursor': 'next-cursor', 'x-log-count': 2 },
+        body: {
+          logGroupList: [group('FCLogs:test', 'hello'), group('FCLogs:other', 'skipped')],
+        },
+      }),
+      getLogs: jest.fn(),
+    };
+    const printed = [];
+    const tail = new LogTail(slsClient, options, {
+      queryLogs: jest.fn(),
+      parseLogs,
+      onLogs: (logs) => {
+        printed.push(...logs);
+        tail.stop();
+      },
+    });
+
+    await tail.run();
+
+    expect(slsClient.getCursor).toHaveBeenCalledTimes(1);
+    expect(slsClient.getCursor).toHaveBeenCalledWith(
+      expect.objectContaining({ shardId: 0, from: 'end' }),
+      expect.any(Function),
+    );
+    expect(slsClient.batchGetLogs).toHaveBeenCalledWith(
+      expect.objectContaining({ shardId: 0, cursor: 'end-cursor' }),
+      expect.any(Function),
+    );
+    expect(printed).toEqual([{ timestamp: 100, message: 'hello', extra: {} }]);
+  });
+
+  it('should filter cursor logs by qualifier, instance and request fields', async () => {
+    const log = (contents: Record<string, string>) => ({
+      time: 100,
+      contents: Object.keys(contents).map((key) => ({ key, value: contents[key] })),
+    });
+    const slsClient = {
+      listShards: callback({ body: [{ shardID: 0, status: 'readwrite' }] }),
+      getCursor: callback({ body: { cursor: 'end-cursor' } }),
+      batchGetLogs: callback({
+        headers: { 'x-log-cursor': 'next-cursor', 'x-log-count': 4 },
+        body: {
+          logGroupList: [
+            {
+              topic: 'FCLogs:test',
+              logs: [
+                log({ message: 'req-1 matched', qualifier: '1', instanceID: 'c-1' }),
+                // 其它字段或日志内容中包含 1、c-1 时不匹配
+                log({ message: 'req-1 took 1 ms on c-1', qualifier: '10', instanceID: 'c-1' }),
+                log({ message: 'req-1 other instance', qualifier: '1', instanceID: 'c-11' }),
+                log({ message: 'req-2 other request', qualifier: '1', instanceID: 'c-1' }),
+              ],
+            },
+          ],
+        },
+      }),
+    };
+    const printed = [];
+    const tail = new LogTail(
+      slsClient,
+      { ...options, qualifier: '1', instanceId: 'c-1', requestId: 'req-1' },
+      {
+        queryLogs: jest.fn(),
+        parseLogs,
+        onLogs: (logs) => {
+          printed.push(...logs);
+          tail.stop();
+        },
+      },
+    );
+
+    await tail.run();
+
+    expect(printed.map((item) => item.message)).toEqual(['req-1 matched']);
+  });
+
+  it('should fallback to query and skip duplicated logs', async () => {
+    const slsClient = { listShards: callback(new Error('AccessDenied')) };
+    const first = [
+      { timestamp: 100, message: 'ok', extra: {} },
+      { timestamp: 100, message: 'ok', extra: {} },
+    ];
+    const second = [...first, { timestamp: 101, message: 'done', extra: {} }];
+    const queryLogs = jest.fn().mockResolvedValueOnce(first).mockResolvedValueOnce(second);
+    const printed = [];
+    const tail = new LogTail(slsClient, options, {
+      queryLogs,
+      parseLogs,
+      onLogs: (logs) => {
+        printed.push(...logs);
+        if (printed.length >= 3) {
+          tail.stop();
+        }
+      },
+    });
+
+    await tail.run();
+
+    expect(queryLogs).toHaveBeenCalledTimes(2);
+    // 同一秒内重复打印的日志保留，重叠窗口内已输出的日志不再重复输出
+    expect(printed.map((item) => item.message)).toEqual(['ok', 'ok', 'done']);
+  });
+});
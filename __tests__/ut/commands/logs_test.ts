@@ -4,6 +4,9 @@ import logger from '../../../src/logger';
 import { IInputs } from '../../../src/interface';
 import inquirer from 'inquirer';
 import { SLS } from 'aliyun-sdk';
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
 
 // Mock dependencies
 jest.mock('../../../src/resources/fc');
@@ -490,6 +493,290 @@ describe('Logs', () => {
     });
   });
 
+  describe('streamHistory', () => {
+    let outputFile: string;
+
+    beforeEach(() => {
+      logs = new Logs(mockInputs);
+      outputFile = path.join(os.tmpdir(), `fc-logs-${Date.now()}.jsonl`);
+    });
+
+    afterEach(() => {
+      fs.rmSync(outputFile, { force: true });
+    });
+
+    it('should page through sub-windows and write logs in time order', async () => {
+      const from = 1700000000;
+      mockSlsClient.getLogs.mockImplementation((params, callback) => {
+        // 第二个子区间先返回，验证输出仍按时间顺序
+        const size = params.from === from && params.offset === 0 ? 100 : 1;
+        const body = {};
+        for (let i = 0; i < size; i++) {
+          body[i] = {
+            message: `${params.from}-${params.offset + i}`,
+            __time__: params.from,
+          };
+        }
+        setTimeout(
+          () => callback(null, { body, headers: { 'x-log-progress': 'Complete' } }),
+          params.from === from ? 20 : 0,
+        );
+      });
+
+      await (logs as any).streamHistory({
+        projectName: 'test-project',
+        logStoreName: 'test-logstore',
+        topicFilter: '__topic__:"FCLogs:test-function"',
+        startTime: from * 1000,
+        endTime: (from + 600) * 1000,
+        outputFormat: 'jsonl',
+        outputFile,
+      });
+
+      const lines = fs.readFileSync(outputFile, 'utf8').trim().split('\n');
+      const messages = lines.map((line) => JSON.parse(line).message);
+      expect(mockSlsClient.getLogs).toHaveBeenCalledWith(
+        expect.objectContaining({ from, to: from + 300, line: 100, offset: 100 }),
+        expect.any(Function),
+      );
+      expect(messages).toHaveLength(102);
+      expect(messages[0]).toBe(`${from}-0`);
+      expect(messages[100]).toBe(`${from}-100`);
+      expect(messages[101]).toBe(`${from + 300}-0`);
+    });
+  });
+
+  describe('streamByType and summary', () => {
+    const from = 1700000000;
+    const props = {
+      projectName: 'test-project',
+      logStoreName: 'test-logstore',
+      topicFilter: '__topic__:"FCLogs:test-function"',
+      startTime: from * 1000,
+      endTime: (from + 3600) * 1000,
+      outputFormat: 'jsonl',
+    };
+    let outputFile: string;
+
+    beforeEach(() => {
+      logs = new Logs(mockInputs);
+      outputFile = path.join(os.tmpdir(), `fc-logs-type-${Date.now()}.jsonl`);
+    });
+
+    afterEach(() => {
+      fs.rmSync(outputFile, { force: true });
+    });
+
+    it('should only fetch the time windows of failed requests', async () => {
+      mockSlsClient.getLogs.mockImplementation((params, callback) => {
+        if (params.query.includes('| select')) {
+          callback(null, {
+            body: {
+              0: {
+                requestId: 'req-2',
+                instanceID: 'i-1',
+                errors: '1',
+                startTime: `${from + 10}`,
+                endTime: `${from + 12}`,
+              },
+            },
+            headers: { 'x-log-progress': 'Complete' },
+          });
+          return;
+        }
+        callback(null, {
+          body: {
+            0: { message: 'FC Invoke Start RequestId: req-1', __time__: from + 9 },
+            1: { message: 'FC Invoke Start RequestId: req-2', __time__: from + 10 },
+            2: { message: 'Error: boom', __time__: from + 11 },
+          },
+          headers: { 'x-log-progress': 'Complete' },
+        });
+      });
+
+      await logs.streamByType({ ...props, type: 'fail', outputFile } as any);
+
+      expect(mockSlsClient.getLogs).toHaveBeenCalledTimes(3);
+      expect(mockSlsClient.getLogs).toHaveBeenLastCalledWith(
+        expect.objectContaining({ from: from + 10, to: from + 13 }),
+        expect.any(Function),
+      );
+      const lines = fs.readFileSync(outputFile, 'utf8').trim().split('\n');
+      expect(lines.map((line) => JSON.parse(line).message)).toEqual([
+        'FC Invoke Start RequestId: req-2',
+        'Error: boom',
+      ]);
+    });
+
+    it('should fetch all lines of a failed request when the error is not the first line', async () => {
+      mockSlsClient.getLogs.mockImplementation((params, callback) => {
+        if (params.query.includes('| select')) {
+          callback(null, {
+            body: {
+              0: {
+                requestId: 'req-2',
+                instanceID: 'i-1',
+                errors: '1',
+                startTime: `${from + 10}`,
+                endTime: `${from + 15}`,
+              },
+            },
+            headers: { 'x-log-progress': 'Complete' },
+          });
+          return;
+        }
+        callback(null, {
+          body: {
+            0: { message: 'FC Invoke Start RequestId: req-2', __time__: from + 10 },
+            1: { message: 'req-2 loading model', __time__: from + 11 },
+            2: { message: 'Error: boom', __time__: from + 14 },
+            3: { message: 'FC Invoke End RequestId: req-2', __time__: from + 15 },
+          },
+          headers: { 'x-log-progress': 'Complete' },
+        });
+      });
+
+      await logs.streamByType({ ...props, type: 'fail', outputFile } as any);
+
+      const { query } = mockSlsClient.getLogs.mock.calls[0][0];
+      // 聚合全部日志，只保留包含错误日志的请求
+      expect(query).not.toContain(' and error |');
+      expect(query).toContain('having count_if(isError) > 0');
+      expect(mockSlsClient.getLogs).toHaveBeenLastCalledWith(
+        expect.objectContaining({ from: from + 10, to: from + 16 }),
+        expect.any(Function),
+      );
+      const lines = fs.readFileSync(outputFile, 'utf8').trim().split('\n');
+      expect(lines.map((line) => JSON.parse(line).message)).toEqual([
+        'FC Invoke Start RequestId: req-2',
+        'req-2 loading model',
+        'Error: boom',
+        'FC Invoke End RequestId: req-2',
+      ]);
+    });
+
+    it('should not fetch logs when there is no failed request', async () => {
+      mockSlsClient.getLogs.mockImplementation((params, callback) => {
+        callback(null, { body: {}, headers: { 'x-log-progress': 'Complete' } });
+      });
+
+      await logs.streamByType({ ...props, type: 'fail', outputFile } as any);
+
+      expect(mockSlsClient.getLogs).toHaveBeenCalledTimes(2);
+      expect(logger.info).toHaveBeenCalledWith('No failed request found');
+    });
+
+    it('should classify by request window when error lines carry no requestId', async () => {
+      const req1 = '1-00000000-00000000-000000000001';
+      const req2 = '1-00000000-00000000-000000000002';
+      mockSlsClient.getLogs.mockImplementation((params, callback) => {
+        if (params.query.includes('as unattributed')) {
+          callback(null, {
+            body: { 0: { unattributed: '2' } },
+            headers: { 'x-log-progress': 'Complete' },
+          });
+          return;
+        }
+        if (params.query.includes('| select') || params.from !== from) {
+          callback(null, { body: {}, headers: { 'x-log-progress': 'Complete' } });
+          return;
+        }
+        const messages = [
+          `FC Invoke Start RequestId: ${req1}`,
+          `FC Invoke Start RequestId: ${req2}`,
+          'Traceback (most recent call last):',
+          'hello',
+          `FC Invoke End RequestId: ${req1}`,
+          'ValueError: bad input',
+          `FC Invoke End RequestId: ${req2}`,
+        ];
+        // req1 在实例 i-1，req2 在实例 i-2，两个请求的日志交错
+        const instances = ['i-1', 'i-2', 'i-2', 'i-1', 'i-1', 'i-2', 'i-2'];
+        const body = {};
+        messages.forEach((message, i) => {
+          body[i] = { message, instanceID: instances[i], __time__: from + i };
+        });
+        callback(null, { body, headers: { 'x-log-progress': 'Complete' } });
+      });
+
+      const readLogs = () =>
+        fs
+          .readFileSync(outputFile, 'utf8')
+          .trim()
+          .split('\n')
+          .map((line) => JSON.parse(line));
+      await logs.streamByType({ ...props, type: 'fail', outputFile } as any);
+      const failed = readLogs();
+      await logs.streamByType({ ...props, type: 'success', outputFile } as any);
+      const succeeded = readLogs();
+
+      expect(failed.map(({ message }) => message)).toEqual([
+        `FC Invoke Start RequestId: ${req2}`,
+        'Traceback (most recent call last):',
+        'ValueError: bad input',
+        `FC Invoke End RequestId: ${req2}`,
+      ]);
+      expect(new Set(failed.map(({ requestId }) => requestId))).toEqual(new Set([req2]));
+      expect(succeeded.map(({ message }) => message)).toEqual([
+        `FC Invoke Start RequestId: ${req1}`,
+        'hello',
+        `FC Invoke End RequestId: ${req1}`,
+      ]);
+    });
+
+    it('should summarize requests of each instance', async () => {
+      mockSlsClient.getLogs.mockImplementation((params, callback) => {
+        callback(null, {
+          body: {
+            0: {
+              instanceID: 'i-1',
+              requests: '10',
+              failedRequests: '2',
+              avgDuration: '12.5',
+              p99Duration: '30',
+              maxDuration: '31.2',
+            },
+            1: {
+              instanceID: 'i-2',
+              requests: '5',
+              failedRequests: '0',
+              avgDuration: 'null',
+              p99Duration: 'null',
+              maxDuration: 'null',
+            },
+          },
+          headers: { 'x-log-progress': 'Complete' },
+        });
+      });
+
+      const result = await logs.summary(props as any);
+
+      expect(mockSlsClient.getLogs.mock.calls[0][0].query).toContain('group by instanceID');
+      expect(result).toEqual({
+        requests: 15,
+        failedRequests: 2,
+        instances: [
+          {
+            instanceId: 'i-1',
+            requests: 10,
+            failedRequests: 2,
+            avgDuration: 12.5,
+            p99Duration: 30,
+            maxDuration: 31.2,
+          },
+          {
+            instanceId: 'i-2',
+            requests: 5,
+            failedRequests: 0,
+            avgDuration: null,
+            p99Duration: null,
+            maxDuration: null,
+          },
+        ],
+      });
+    });
+  });
+
   describe('filterByKeywords', () => {
     beforeEach(() => {
       logs = new Logs(mockInputs);
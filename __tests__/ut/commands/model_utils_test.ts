@@ -7,6 +7,7 @@ import {
   retryFileManagerRsyncAndCheckStatus,
   retryFileManagerRm,
   extractOssMountDir,
+  TaskStatusPoller,
 } from '../../../src/subCommands/model/utils';
 import DevClient from '@alicloud/devs20230714';
 import * as $OpenApi from '@alicloud/openapi-client';
@@ -615,3 +616,60 @@ describe('extractOssMountDir', () => {
     expect(result).toBeUndefined();
   });
 });
+
+describe('TaskStatusPoller', () => {
+  const status = (currentBytes: number, finished = false, errorMessage?: string) => ({
+    body: {
+      requestId: 'req-123',
+      data: {
+        finished,
+        errorMessage,
+        startTime: Date.now(),
+        finishedTime: Date.now(),
+        progress: { currentBytes, totalBytes: 100 },
+      },
+    },
+  });
+
+  it('should poll all in-flight tasks in one loop', async () => {
+    const responses = {
+      'task-1': [status(50), status(100, true)],
+      'task-2': [status(100, true)],
+      'task-3': [status(10, true, 'NoSuchFileError')],
+    };
+    const devClient: any = {
+      getFileManagerTask: jest.fn(async (taskID) => responses[taskID].shift()),
+    };
+    const poller = new TaskStatusPoller(devClient, 3, {
+      minInterval: 1,
+      maxInterval: 5,
+      showProgress: false,
+    });
+
+    const first = poller.wait('task-1', 'file-1', 60000);
+    const second = poller.wait('task-2', 'file-2', 60000);
+    const third = poller.wait('task-3', 'file-3', 60000);
+
+    await expect(first).resolves.toEqual(expect.objectContaining({ finished: true }));
+    await expect(second).resolves.toEqual(expect.objectContaining({ finished: true }));
+    await expect(third).rejects.toThrow('file-3: NoSuchFileError');
+    expect(poller.polls).toBe(4);
+  });
+
+  it('should reject tasks exceeding the timeout', async () => {
+    const devClient: any = {
+      getFileManagerTask: jest.fn().mockResolvedValue({
+        body: {
+          data: {
+            finished: false,
+            startTime: Date.now() - 10000,
+            progress: { currentBytes: 1, totalBytes: 100 },
+          },
+        },
+      }),
+    };
+    const poller = new TaskStatusPoller(devClient, 1, { minInterval: 1, showProgress: false });
+
+    await expect(poller.wait('task-1', 'file-1', 5000)).rejects.toThrow('Download timeout');
+  });
+});
@@ -1,3 +1,4 @@
+import _ from 'lodash';
 import Remove from '../../../../src/subCommands/remove';
 import FC from '../../../../src/resources/fc';
 import logger from '../../../../src/logger';
@@ -236,6 +237,47 @@ describe('Remove', () => {
       expect(mockFcInstance.removeTrigger).toHaveBeenCalledWith('test-function', 'trigger-2');
     });
 
+    it('should report deleted triggers and keep going after a failure', async () => {
+      (remove as any).resources = {
+        triggerNames: ['trigger-1', 'trigger-2', 'trigger-3'],
+      };
+      mockFcInstance.removeTrigger.mockImplementation(async (functionName, triggerName) => {
+        if (triggerName === 'trigger-2') {
+          throw new Error('remove failed');
+        }
+      });
+
+      await (remove as any).removeTrigger();
+
+      expect(mockFcInstance.removeTrigger).toHaveBeenCalledTimes(3);
+      expect(logger.info).toHaveBeenCalledWith('Triggers of test-function: 2 deleted, 1 failed');
+    });
+
+    it('should attempt every trigger when one keeps being throttled', async () => {
+      jest.useFakeTimers();
+      const triggerNames = _.times(8, (i) => `trigger-${i + 1}`);
+      (remove as any).resources = { triggerNames };
+      mockFcInstance.removeTrigger.mockImplementation(async (functionName, triggerName) => {
+        if (triggerName === 'trigger-1') {
+          throw Object.assign(new Error('throttled'), { statusCode: 429 });
+        }
+      });
+
+      try {
+        const removing = (remove as any).removeTrigger();
+        await jest.runAllTimersAsync();
+        await removing;
+      } finally {
+        jest.useRealTimers();
+      }
+
+      const removed = mockFcInstance.removeTrigger.mock.calls.map(([, name]) => name);
+      expect(_.uniq(removed).sort()).toEqual(triggerNames);
+      // 首次请求加 FC_THROTTLING_RETRY_COUNT 次重试
+      expect(removed.filter((name) => name === 'trigger-1')).toHaveLength(6);
+      expect(logger.info).toHaveBeenCalledWith('Triggers of test-function: 7 deleted, 1 failed');
+    });
+
     it('should skip trigger removal when no triggers specified', async () => {
       (remove as any).resources = {
         triggerNames: [],
@@ -276,4 +318,75 @@ describe('Remove', () => {
       expect(mockFcInstance.removeAsyncInvokeConfig).not.toHaveBeenCalled();
     });
   });
+
+  describe('fanout', () => {
+    let stdoutSpy: jest.SpyInstance;
+    let stderrSpy: jest.SpyInstance;
+
+    beforeEach(() => {
+      stdoutSpy = jest.spyOn(process.stdout, 'write').mockImplementation(() => true);
+      stderrSpy = jest.spyOn(process.stderr, 'write').mockImplementation(() => true);
+    });
+
+    afterEach(() => {
+      jest.restoreAllMocks();
+    });
+
+    it('should refuse to remove every function when only --regions is passed', () => {
+      mockInputs.args = ['--regions', 'cn-hangzhou', '-y'];
+
+      expect(() => Remove.parseFanout(mockInputs)).toThrow(
+        'Please specify --prefix or --function-name',
+      );
+    });
+
+    it('should reject a blank --prefix', () => {
+      mockInputs.args = ['--regions', 'cn-hangzhou', '--prefix', '  ', '-y'];
+
+      expect(() => Remove.parseFanout(mockInputs)).toThrow('--prefix must not be empty');
+    });
+
+    it('should only write result records to stdout in jsonl format', async () => {
+      mockInputs.args = ['--function-name', 'a,b', '--output-format', 'jsonl', '-y'];
+      const fanout = Remove.parseFanout(mockInputs);
+      jest.spyOn(Remove.prototype, 'forceRemove').mockImplementation(async function (this: any) {
+        expect(this.quiet).toBe(true);
+        if (this.functionName === 'a') {
+          throw new Error('Failed to remove triggers: t1');
+        }
+      });
+
+      await Remove.runFanout(mockInputs, fanout);
+
+      const lines = _.sortBy(
+        stdoutSpy.mock.calls.map(([chunk]) => JSON.parse(chunk)),
+        'functionName',
+      );
+      expect(lines).toEqual([
+        {
+          region: 'cn-hangzhou',
+          functionName: 'a',
+          error: 'Failed to remove triggers: t1',
+        },
+        { region: 'cn-hangzhou', functionName: 'b', result: 'removed' },
+      ]);
+      expect(stderrSpy).toHaveBeenCalledWith('Remove 2 functions:\n');
+      expect(logger.write).not.toHaveBeenCalled();
+    });
+
+    it('should fail forceRemove when a trigger is not removed', async () => {
+      remove = new Remove(mockInputs);
+      remove.quiet = true;
+      jest.spyOn(remove as any, 'computingRemoveResource').mockImplementation(async () => {
+        (remove as any).resources = { triggerNames: ['trigger-1', 'trigger-2'] };
+      });
+      mockFcInstance.removeTrigger.mockImplementation(async (functionName, triggerName) => {
+        if (triggerName === 'trigger-2') {
+          throw new Error('remove failed');
+        }
+      });
+
+      await expect(remove.forceRemove()).rejects.toThrow('Failed to remove triggers: trigger-2');
+    });
+  });
 });
@@ -3,7 +3,7 @@ import FC, { GetApiType } from '../../../src/resources/fc';
 import { IInputs } from '../../../src/interface';
 import fs from 'fs';
 import fs_extra from 'fs-extra';
-import downloads from '@serverless-devs/downloads';
+import { downloadWithCache, extractZip } from '../../../src/utils/download';
 
 // Mock the ScalingPolicy import that's causing issues
 jest.mock('@alicloud/fc20230330', () => ({
@@ -64,7 +64,12 @@ jest.mock('fs-extra', () => ({
   removeSync: jest.fn(),
 }));
 
-jest.mock('@serverless-devs/downloads');
+jest.mock('../../../src/utils/download', () => ({
+  downloadWithCache: jest.fn(),
+  evictDownloadCache: jest.fn(),
+  extractZip: jest.fn(),
+  getDownloadCacheDir: jest.fn(() => '/root/.s/cache/code'),
+}));
 
 describe('Sync', () => {
   let mockInputs: IInputs;
@@ -174,6 +179,7 @@ describe('Sync', () => {
 
     mockFcInstance.getFunctionCode.mockResolvedValue({
       url: 'https://test.oss-cn-hangzhou.aliyuncs.com/code.zip',
+      checksum: '123456',
     });
 
     // Set up the FC constructor mock to return our mock instance
@@ -189,7 +195,8 @@ describe('Sync', () => {
     (fs_extra.removeSync as jest.Mock).mockReturnValue(undefined);
 
     // Mock downloads
-    (downloads as jest.Mock).mockResolvedValue(undefined);
+    (downloadWithCache as jest.Mock).mockImplementation(async (_url, dest) => dest);
+    (extractZip as jest.Mock).mockResolvedValue(undefined);
   });
 
   afterEach(() => {
@@ -341,7 +348,7 @@ describe('Sync', () => {
       const sync = new Sync(mockInputs);
       await sync.run();
 
-      expect(downloads).not.toHaveBeenCalled();
+      expect(downloadWithCache).not.toHaveBeenCalled();
     });
 
     it('should handle function role', async () => {
@@ -358,7 +365,7 @@ describe('Sync', () => {
       const sync = new Sync(mockInputs);
       await sync.run();
 
-      expect(downloads).toHaveBeenCalled();
+      expect(downloadWithCache).toHaveBeenCalled();
     });
 
     it('should handle scaling config successfully', async () => {
@@ -441,10 +448,15 @@ describe('Sync', () => {
       expect(fs_extra.removeSync).toHaveBeenCalledWith(
         expect.stringContaining('cn-hangzhou_test-function'),
       );
-      expect(downloads).toHaveBeenCalledWith('https://test.oss-cn-hangzhou.aliyuncs.com/code.zip', {
-        dest: expect.stringContaining('cn-hangzhou_test-function'),
-        extract: true,
-      });
+      expect(downloadWithCache).toHaveBeenCalledWith(
+        'https://test.oss-cn-hangzhou.aliyuncs.com/code.zip',
+        '/root/.s/cache/code/123456.zip',
+        { checksum: '123456' },
+      );
+      expect(extractZip).toHaveBeenCalledWith(
+        '/root/.s/cache/code/123456.zip',
+        expect.stringContaining('cn-hangzhou_test-function'),
+      );
       expect(fs.mkdirSync).toHaveBeenCalledWith(expect.stringContaining('sync-clone'), {
         recursive: true,
       });
@@ -467,7 +479,7 @@ describe('Sync', () => {
 
       await sync.write(functionConfig, [], {}, {}, {}, {}, {});
 
-      expect(downloads).not.toHaveBeenCalled();
+      expect(downloadWithCache).not.toHaveBeenCalled();
       expect(fs_extra.removeSync).not.toHaveBeenCalled();
     });
 
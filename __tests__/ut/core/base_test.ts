@@ -10,6 +10,12 @@ jest.mock('../../../src/utils');
 jest.mock('../../../src/resources/fc');
 jest.mock('../../../src/commands-help');
 
+// Resolve directly, without reading or writing the local resource cache
+jest.mock('../../../src/utils/resource-cache', () => ({
+  cachedResource: jest.fn((_scope, _key, resolve) => resolve()),
+  invalidateResourceCache: jest.fn(),
+}));
+
 // Mock logger
 jest.mock('../../../src/logger', () => ({
   debug: jest.fn(),
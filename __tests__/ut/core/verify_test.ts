@@ -1,10 +1,22 @@
-import verify from '../../../src/utils/verify';
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import verify, {
+  getValidator,
+  getValidatorCacheDir,
+  resetValidator,
+} from '../../../src/utils/verify';
 import logger from '../../../src/logger';
 
+const mockRootHome = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-verify-home-'));
+
 // Mock logger
 jest.mock('../../../src/logger', () => ({
   debug: jest.fn(),
 }));
+jest.mock('@serverless-devs/utils', () => ({
+  getRootHome: jest.fn(() => mockRootHome),
+}));
 
 describe('verify', () => {
   beforeEach(() => {
@@ -34,4 +46,44 @@ describe('verify', () => {
 
     expect(logger.debug).toHaveBeenCalledWith(expect.stringContaining('Validating file path:'));
   });
+
+  it('should cache the compiled validator on disk and reuse it', () => {
+    fs.rmSync(getValidatorCacheDir(), { recursive: true, force: true });
+    resetValidator();
+    const compiled = getValidator();
+    const files = fs.readdirSync(getValidatorCacheDir());
+    expect(files.sort()).toEqual([
+      expect.stringMatching(/^validate-[0-9a-f]{16}\.js$/),
+      expect.stringMatching(/^validate-[0-9a-f]{16}\.js\.json$/),
+    ]);
+
+    resetValidator();
+    const cached = getValidator();
+    expect(cached).not.toBe(compiled);
+    expect(logger.debug).toHaveBeenCalledWith(expect.stringContaining('Use cached validator:'));
+    expect(cached({ region: 'cn-hangzhou', functionName: 'test', runtime: 'nodejs18' })).toBe(
+      compiled({ region: 'cn-hangzhou', functionName: 'test', runtime: 'nodejs18' }),
+    );
+  });
+
+  it('should regenerate the cached validator when its code does not match the hash', () => {
+    fs.rmSync(getValidatorCacheDir(), { recursive: true, force: true });
+    resetValidator();
+    getValidator();
+    const file = path.join(
+      getValidatorCacheDir(),
+      fs.readdirSync(getValidatorCacheDir()).find((name) => name.endsWith('.js')),
+    );
+    const original = fs.readFileSync(file, 'utf-8');
+    fs.writeFileSync(file, 'module.exports = () => { throw new Error("tampered"); };');
+
+    jest.clearAllMocks();
+    resetValidator();
+    const validate = getValidator();
+    expect(logger.debug).not.toHaveBeenCalledWith(expect.stringContaining('Use cached validator:'));
+    expect(validate({ region: 'cn-hangzhou', functionName: 'test', runtime: 'nodejs18' })).toBe(
+      true,
+    );
+    expect(fs.readFileSync(file, 'utf-8')).toBe(original);
+  });
 });
@@ -216,6 +216,34 @@ describe('BaseLocalStart', () => {
     });
   });
 
+  describe('multiple instances', () => {
+    it('should default to one instance with instanceConcurrency of the function', () => {
+      mockInputs.props.instanceConcurrency = 5;
+
+      expect(baseLocalStart.getInstances()).toBe(1);
+      expect(baseLocalStart.getInstanceConcurrency()).toBe(5);
+    });
+
+    it('should read --instances and --instance-concurrency and allocate increasing ports', async () => {
+      (baseLocalStart as any)._argsData = { instances: '3', 'instance-concurrency': '2' };
+      (portFinder.getPortPromise as jest.Mock).mockImplementation(async ({ port }) => port);
+
+      expect(baseLocalStart.getInstances()).toBe(3);
+      expect(baseLocalStart.getInstanceConcurrency()).toBe(2);
+      await baseLocalStart.allocateServerPort();
+      await baseLocalStart.allocateServerPort();
+      expect(baseLocalStart.serverPorts).toEqual([9000, 9001]);
+      expect(baseLocalStart.serverPort).toBe(9001);
+    });
+
+    it('should name extra containers by index', () => {
+      const name = baseLocalStart.getContainerName();
+      (baseLocalStart as any).containerIndex = 2;
+
+      expect(baseLocalStart.getContainerName()).toBe(`${name}-2`);
+    });
+  });
+
   describe('setupHttpProxy', () => {
     it('should setup HTTP proxy server correctly', async () => {
       // Mock logger.log to avoid the error
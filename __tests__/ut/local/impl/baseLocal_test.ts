@@ -7,6 +7,7 @@ import path from 'path';
 import * as fs from 'fs-extra';
 import { v4 as uuidV4 } from 'uuid';
 import tmpDir from 'temp-dir';
+import { getCachedMergedLayer } from '../../../../src/subCommands/local/impl/layerCache';
 
 // Mock external dependencies
 jest.mock('../../../../src/logger', () => ({
@@ -22,6 +23,7 @@ jest.mock('path');
 jest.mock('fs-extra');
 jest.mock('uuid');
 jest.mock('temp-dir');
+jest.mock('../../../../src/subCommands/local/impl/layerCache');
 
 describe('BaseLocal', () => {
   let mockInputs: IInputs;
@@ -162,6 +164,36 @@ describe('BaseLocal', () => {
     });
   });
 
+  describe('getMountString', () => {
+    it('should mount the cached extracted code dir read-only', async () => {
+      const instance = new BaseLocal(mockInputs);
+      (instance as any).unzippedCodeDir = '/root/.s/fc/local-code/abc';
+
+      await expect(instance.getMountString()).resolves.toBe(
+        '-v /root/.s/fc/local-code/abc:/code:ro',
+      );
+    });
+
+    it('should mount the code directory read-write', async () => {
+      const instance = new BaseLocal(mockInputs);
+      jest.spyOn(instance, 'getCodeUri').mockResolvedValue('/test/base/dir/code');
+
+      await expect(instance.getMountString()).resolves.toBe('-v /test/base/dir/code:/code');
+    });
+  });
+
+  describe('getLayerMountString', () => {
+    it('should mount the cached merged layers read-only', async () => {
+      mockInputs.props.layers = ['acs:fc:cn-hangzhou:123:layers/test/versions/1'];
+      (getCachedMergedLayer as jest.Mock).mockReturnValue('/root/.s/layer/merged/abc');
+      const instance = new BaseLocal(mockInputs);
+
+      await expect(instance.getLayerMountString()).resolves.toBe(
+        ' -v /root/.s/layer/merged/abc:/opt:ro',
+      );
+    });
+  });
+
   describe('getCredentials', () => {
     it('should return credentials from inputs', async () => {
       const instance = new BaseLocal(mockInputs);
@@ -0,0 +1,71 @@
+import * as fs from 'fs';
+import os from 'os';
+import path from 'path';
+import extract from 'extract-zip';
+import { calculateCRC64 } from '../../../../src/utils';
+import {
+  evictExtractedCode,
+  getExtractedCodeDir,
+} from '../../../../src/subCommands/local/impl/codeCache';
+
+const mockRootHome = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-code-cache-home-'));
+jest.mock('@serverless-devs/utils', () => ({
+  getRootHome: () => mockRootHome,
+}));
+jest.mock('extract-zip', () => jest.fn());
+jest.mock('../../../../src/utils', () => ({
+  calculateCRC64: jest.fn(),
+}));
+jest.mock('../../../../src/logger', () => ({
+  debug: jest.fn(),
+  log: jest.fn(),
+}));
+
+describe('codeCache', () => {
+  const baseDir = path.join(mockRootHome, 'fc', 'local-code');
+
+  beforeEach(() => {
+    (extract as unknown as jest.Mock).mockImplementation(async (src, { dir }) => {
+      fs.writeFileSync(path.join(dir, 'app.txt'), 'x'.repeat(600 * 1024));
+    });
+  });
+
+  afterEach(() => {
+    fs.rmSync(path.join(mockRootHome, 'fc'), { recursive: true, force: true });
+    jest.clearAllMocks();
+  });
+
+  it('should extract once and reuse the directory for the same checksum', async () => {
+    (calculateCRC64 as jest.Mock).mockResolvedValue('123');
+
+    const first = await getExtractedCodeDir('/code/app.jar', 1024);
+    const second = await getExtractedCodeDir('/code/app.jar', 1024);
+
+    expect(first).toBe(path.join(baseDir, '123'));
+    expect(second).toBe(first);
+    expect(extract).toHaveBeenCalledTimes(1);
+    expect(fs.readdirSync(baseDir).sort()).toEqual(['123', '123.json']);
+  });
+
+  it('should remove the temp directory when extraction fails', async () => {
+    (calculateCRC64 as jest.Mock).mockResolvedValue('456');
+    (extract as unknown as jest.Mock).mockRejectedValue(new Error('invalid zip'));
+
+    await expect(getExtractedCodeDir('/code/broken.zip', 1024)).rejects.toThrow('invalid zip');
+    expect(fs.readdirSync(baseDir)).toEqual([]);
+  });
+
+  it('should evict least recently used code over the size limit', async () => {
+    (calculateCRC64 as jest.Mock).mockResolvedValueOnce('old').mockResolvedValueOnce('recent');
+    const old = await getExtractedCodeDir('/code/old.zip', 1024);
+    const recent = await getExtractedCodeDir('/code/recent.zip', 1024);
+    const meta = JSON.parse(fs.readFileSync(`${old}.json`, 'utf8'));
+    fs.writeFileSync(`${old}.json`, JSON.stringify({ ...meta, lastUsed: 0 }));
+
+    evictExtractedCode(1);
+
+    expect(fs.existsSync(old)).toBe(false);
+    expect(fs.existsSync(`${old}.json`)).toBe(false);
+    expect(fs.existsSync(recent)).toBe(true);
+  });
+});
@@ -1,5 +1,8 @@
 import _ from 'lodash';
 import * as portFinder from 'portfinder';
+import logger from '../../../../src/logger';
+import { BaseLocalInvoke } from '../../../../src/subCommands/local/impl/invoke/baseLocalInvoke';
+import { CustomLocalInvoke } from '../../../../src/subCommands/local/impl/invoke/customLocalInvoke';
 
 // Mock dependencies
 jest.mock('../../../../src/logger', () => ({
@@ -17,6 +20,45 @@ jest.mock('portfinder');
 describe('CustomLocalInvoke', () => {
   afterEach(() => {
     jest.clearAllMocks();
+    jest.restoreAllMocks();
+  });
+
+  describe('beforeInvoke', () => {
+    const createInstance = (argsData: any) => {
+      const instance = Object.create(CustomLocalInvoke.prototype);
+      instance._argsData = argsData;
+      return instance as CustomLocalInvoke;
+    };
+
+    beforeEach(() => {
+      jest.spyOn(BaseLocalInvoke.prototype, 'beforeInvoke').mockReturnValue(true);
+    });
+
+    it('should reject --event-dir', () => {
+      const instance = createInstance({ 'event-dir': './events' });
+
+      expect(instance.beforeInvoke()).toBe(false);
+      expect(logger.error).toHaveBeenCalledWith(
+        '--event-dir is not supported by custom runtime, please use --event-file',
+      );
+    });
+
+    it('should warn that --keep-warm is ignored', () => {
+      const instance = createInstance({ 'keep-warm': true });
+
+      expect(instance.beforeInvoke()).toBe(true);
+      expect(logger.warn).toHaveBeenCalledWith(
+        '--keep-warm is not supported by custom runtime, the container will be removed after invoke.',
+      );
+    });
+
+    it('should return false when super.beforeInvoke returns false', () => {
+      (BaseLocalInvoke.prototype.beforeInvoke as jest.Mock).mockReturnValue(false);
+      const instance = createInstance({ 'event-dir': './events' });
+
+      expect(instance.beforeInvoke()).toBe(false);
+      expect(logger.error).not.toHaveBeenCalled();
+    });
   });
 
   describe('getDebugArgs', () => {
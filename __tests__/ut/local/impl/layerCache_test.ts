@@ -0,0 +1,76 @@
+import * as fs from 'fs';
+import os from 'os';
+import path from 'path';
+import {
+  buildMergedLayer,
+  evictMergedLayers,
+  getCachedMergedLayer,
+  getMergedLayerKey,
+} from '../../../../src/subCommands/local/impl/layerCache';
+
+const mockRootHome = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-layer-cache-home-'));
+jest.mock('@serverless-devs/utils', () => ({
+  getRootHome: () => mockRootHome,
+}));
+jest.mock('../../../../src/logger', () => ({
+  debug: jest.fn(),
+}));
+
+const writeLayer = (name: string, files: Record<string, string>) => {
+  const dir = path.join(mockRootHome, 'src', name);
+  Object.keys(files).forEach((file) => {
+    fs.mkdirSync(path.dirname(path.join(dir, file)), { recursive: true });
+    fs.writeFileSync(path.join(dir, file), files[file]);
+  });
+  return dir;
+};
+
+describe('layerCache', () => {
+  afterEach(() => {
+    fs.rmSync(path.join(mockRootHome, 'layer'), { recursive: true, force: true });
+    fs.rmSync(path.join(mockRootHome, 'src'), { recursive: true, force: true });
+  });
+
+  it('should depend on runtime and layer order in cache key', () => {
+    expect(getMergedLayerKey('nodejs18', ['a', 'b'])).toBe(
+      getMergedLayerKey('nodejs18', ['a', 'b']),
+    );
+    expect(getMergedLayerKey('nodejs18', ['a', 'b'])).not.toBe(
+      getMergedLayerKey('nodejs18', ['b', 'a']),
+    );
+    expect(getMergedLayerKey('nodejs18', ['a'])).not.toBe(getMergedLayerKey('python3.10', ['a']));
+  });
+
+  it('should merge layers with hard links and keep files of the first layer', () => {
+    const first = writeLayer('first', { 'nodejs/a.js': 'first', 'shared.txt': 'first' });
+    const second = writeLayer('second', { 'nodejs/b.js': 'second', 'shared.txt': 'second' });
+
+    expect(getCachedMergedLayer('nodejs18', ['l1', 'l2'])).toBeUndefined();
+    const merged = buildMergedLayer('nodejs18', ['l1', 'l2'], [first, second], 1024);
+
+    expect(fs.readFileSync(path.join(merged, 'shared.txt'), 'utf8')).toBe('first');
+    expect(fs.readFileSync(path.join(merged, 'nodejs/b.js'), 'utf8')).toBe('second');
+    expect(fs.statSync(path.join(merged, 'nodejs/a.js')).ino).toBe(
+      fs.statSync(path.join(first, 'nodejs/a.js')).ino,
+    );
+    expect(getCachedMergedLayer('nodejs18', ['l1', 'l2'])).toBe(merged);
+    // 元数据不能出现在挂载到 /opt 的目录中
+    expect(fs.readdirSync(merged).sort()).toEqual(['nodejs', 'shared.txt']);
+    expect(fs.existsSync(`${merged}.json`)).toBe(true);
+  });
+
+  it('should evict least recently used stacks over the size limit', () => {
+    const layer = writeLayer('big', { 'data.bin': 'x'.repeat(600 * 1024) });
+    const old = buildMergedLayer('nodejs18', ['old'], [layer], 1024);
+    const recent = buildMergedLayer('nodejs18', ['recent'], [layer], 1024);
+    const metaFile = `${old}.json`;
+    const meta = JSON.parse(fs.readFileSync(metaFile, 'utf8'));
+    fs.writeFileSync(metaFile, JSON.stringify({ ...meta, lastUsed: 0 }));
+
+    evictMergedLayers(1);
+
+    expect(fs.existsSync(old)).toBe(false);
+    expect(fs.existsSync(`${old}.json`)).toBe(false);
+    expect(fs.existsSync(recent)).toBe(true);
+  });
+});
@@ -0,0 +1,57 @@
+import { Histogram, ProxyPool } from '../../../../src/subCommands/local/impl/start/proxyPool';
+
+describe('proxyPool', () => {
+  it('should dispatch to the least busy instance within instanceConcurrency', async () => {
+    const pool = new ProxyPool([9000, 9001], 2);
+
+    const upstreams = await Promise.all([pool.acquire(), pool.acquire(), pool.acquire()]);
+
+    expect(upstreams.map(({ port }) => port)).toEqual([9000, 9001, 9000]);
+    expect(pool.stats().requests.inflight).toBe(3);
+    expect(pool.stats().queue.length).toBe(0);
+  });
+
+  it('should queue requests when all instances are busy and hand over on release', async () => {
+    const pool = new ProxyPool([9000], 1);
+    const first = await pool.acquire();
+
+    let second: any;
+    pool.acquire().then((upstream) => {
+      second = upstream;
+    });
+    await Promise.resolve();
+    expect(second).toBeUndefined();
+    expect(pool.stats().queue).toMatchObject({ length: 1, max: 1 });
+
+    pool.release(first, 20, 200);
+    await Promise.resolve();
+    expect(second).toBe(first);
+    expect(pool.stats().requests.inflight).toBe(1);
+
+    pool.release(second);
+    const stats = pool.stats();
+    expect(stats.requests).toMatchObject({
+      total: 2,
+      inflight: 0,
+      statusCodes: { 200: 1, aborted: 1 },
+    });
+    expect(stats.latency.count).toBe(1);
+    expect(stats.queue.wait.count).toBe(2);
+    expect(stats.instances).toEqual([{ index: 0, port: 9000, active: 0, served: 1 }]);
+  });
+
+  it('should estimate percentiles from histogram buckets', () => {
+    const histogram = new Histogram();
+    [3, 8, 40, 45, 60, 70, 80, 90, 95, 2000].forEach((value) => histogram.observe(value));
+
+    const { count, avg, p50, p95, max, buckets } = histogram.toJSON();
+    expect({ count, avg, p50, p95, max }).toEqual({
+      count: 10,
+      avg: 249,
+      p50: 100,
+      p95: 2000,
+      max: 2000,
+    });
+    expect(buckets).toMatchObject({ le_5: 1, le_10: 1, le_50: 2, le_100: 5, le_2500: 1 });
+  });
+});
@@ -0,0 +1,98 @@
+import * as fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { execSync } from 'child_process';
+import {
+  getCodeFingerprint,
+  getContainerConfigHash,
+  getWarmContainer,
+  saveWarmContainer,
+  summarizeInvokeStats,
+  sweepIdleContainers,
+} from '../../../../src/subCommands/local/impl/invoke/warmPool';
+
+const mockRootHome = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-warm-pool-home-'));
+jest.mock('@serverless-devs/utils', () => ({
+  getRootHome: () => mockRootHome,
+}));
+jest.mock('child_process', () => ({
+  execSync: jest.fn(),
+}));
+jest.mock('../../../../src/logger', () => ({
+  debug: jest.fn(),
+}));
+
+describe('warmPool', () => {
+  afterEach(() => {
+    fs.rmSync(path.join(mockRootHome, 'fc'), { recursive: true, force: true });
+    jest.clearAllMocks();
+  });
+
+  it('should ignore container name, host port and instance id in config hash', () => {
+    const cmd = (name: string, port: number, instanceId: string) =>
+      `docker run --name ${name} -d --rm -p ${port}:9000 --memory=128m -v /code:/code -e "FC_INSTANCE_ID=${instanceId}" -e "FC_RUNTIME=nodejs18" image`;
+
+    expect(getContainerConfigHash(cmd('a', 9000, 'x'))).toBe(
+      getContainerConfigHash(cmd('b', 9001, 'y')),
+    );
+    expect(getContainerConfigHash(cmd('a', 9000, 'x'))).not.toBe(
+      getContainerConfigHash(cmd('a', 9000, 'x').replace('128m', '256m')),
+    );
+  });
+
+  it('should change the config hash when the code changes', () => {
+    const codeDir = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-warm-pool-code-'));
+    fs.writeFileSync(path.join(codeDir, 'index.js'), 'exports.handler = () => 1;');
+    const cmd = 'docker run --name a -d --rm -p 9000:9000 -v /code:/code image';
+    const before = getContainerConfigHash(cmd, getCodeFingerprint(codeDir));
+
+    expect(getContainerConfigHash(cmd, getCodeFingerprint(codeDir))).toBe(before);
+    fs.writeFileSync(path.join(codeDir, 'index.js'), 'exports.handler = () => 10;');
+    expect(getContainerConfigHash(cmd, getCodeFingerprint(codeDir))).not.toBe(before);
+    fs.rmSync(codeDir, { recursive: true, force: true });
+  });
+
+  it('should reuse a running warm container', () => {
+    (execSync as jest.Mock).mockReturnValue(Buffer.from('true\n'));
+    saveWarmContainer({ name: 'warm', port: 9001, hash: 'hash', lastUsed: Date.now() });
+
+    expect(getWarmContainer('hash')).toEqual(expect.objectContaining({ name: 'warm', port: 9001 }));
+  });
+
+  it('should drop the state of a stopped container', () => {
+    (execSync as jest.Mock).mockImplementation(() => {
+      throw new Error('No such object');
+    });
+    saveWarmContainer({ name: 'warm', port: 9001, hash: 'hash', lastUsed: Date.now() });
+
+    expect(getWarmContainer('hash')).toBeUndefined();
+    expect(fs.existsSync(path.join(mockRootHome, 'fc', 'local-warm-pool', 'hash.json'))).toBe(
+      false,
+    );
+  });
+
+  it('should remove idle containers only', () => {
+    saveWarmContainer({ name: 'idle', port: 9001, hash: 'idle', lastUsed: Date.now() - 700000 });
+    saveWarmContainer({ name: 'busy', port: 9002, hash: 'busy', lastUsed: Date.now() });
+
+    sweepIdleContainers(600);
+
+    expect(execSync).toHaveBeenCalledTimes(1);
+    expect(execSync).toHaveBeenCalledWith('docker rm -f idle', { stdio: 'ignore' });
+    expect(fs.readdirSync(path.join(mockRootHome, 'fc', 'local-warm-pool'))).toEqual([
+      'busy.json',
+    ]);
+  });
+
+  it('should summarize cold and warm latency separately', () => {
+    const summary = summarizeInvokeStats([
+      { event: 'a.json', cold: true, latency: 3000 },
+      { event: 'b.json', cold: false, latency: 20 },
+      { event: 'c.json', cold: false, latency: 40 },
+    ]);
+
+    expect(summary).toContain('Invocations: 3 (cold: 1, warm: 2)');
+    expect(summary).toContain('Cold latency: 3000 ms');
+    expect(summary).toContain('Warm latency: avg 30 ms, p50 20 ms, p95 40 ms, max 40 ms');
+  });
+});
@@ -0,0 +1,87 @@
+import axios from 'axios';
+import {
+  getRemoteManifest,
+  getRepositoryDigests,
+  parseImage,
+} from '../../../../src/resources/acr/registry';
+
+jest.mock('axios');
+jest.mock('../../../../src/logger', () => ({
+  debug: jest.fn(),
+}));
+
+const mockedAxios = axios as jest.Mocked<typeof axios>;
+
+describe('acr registry', () => {
+  const image = 'registry.cn-hangzhou.aliyuncs.com/ns/repo:v1';
+  const auth = { username: 'user', password: 'token' };
+
+  afterEach(() => {
+    jest.clearAllMocks();
+  });
+
+  it('should parse image reference', () => {
+    expect(parseImage(image)).toEqual({
+      registry: 'registry.cn-hangzhou.aliyuncs.com',
+      repository: 'ns/repo',
+      tag: 'v1',
+    });
+    expect(parseImage('registry-vpc.cn-hangzhou.aliyuncs.com/ns/repo').tag).toBe('latest');
+  });
+
+  it('should match local digests of the same repository in vpc and internet registry', () => {
+    const repoDigests = [
+      'registry-vpc.cn-hangzhou.aliyuncs.com/ns/repo@sha256:aaa',
+      'registry.cn-hangzhou.aliyuncs.com/ns/other@sha256:bbb',
+    ];
+    expect(getRepositoryDigests(repoDigests, image)).toEqual(['sha256:aaa']);
+  });
+
+  it('should get manifest digest and size with bearer token', async () => {
+    const manifest = { config: { size: 100 }, layers: [{ size: 1000 }, { size: 2000 }] };
+    mockedAxios.get
+      .mockResolvedValueOnce({
+        status: 401,
+        headers: {
+          'www-authenticate':
+            'Bearer realm="https://dockerauth.cn-hangzhou.aliyuncs.com/auth",service="registry"',
+        },
+      })
+      .mockResolvedValueOnce({ status: 200, data: { token: 'bearer-token' } })
+      .mockResolvedValueOnce({
+        status: 200,
+        headers: { 'docker-content-digest': 'sha256:ccc' },
+        data: JSON.stringify(manifest),
+      });
+
+    await expect(getRemoteManifest(image, auth)).resolves.toEqual({
+      digest: 'sha256:ccc',
+      size: 3100,
+    });
+    expect(mockedAxios.get).toHaveBeenNthCalledWith(
+      2,
+      'https://dockerauth.cn-hangzhou.aliyuncs.com/auth',
+      {
+        params: { service: 'registry', scope: 'repository:ns/repo:pull' },
+        auth,
+        timeout: 5000,
+      },
+    );
+    expect(mockedAxios.get.mock.calls[2][1].headers.Authorization).toBe('Bearer bearer-token');
+  });
+
+  it('should return undefined when the tag does not exist', async () => {
+    mockedAxios.get.mockResolvedValueOnce({ status: 404, headers: {} });
+
+    await expect(getRemoteManifest(image, auth)).resolves.toBeUndefined();
+  });
+
+  it('should query the registry with a timeout and reject when it expires', async () => {
+    mockedAxios.get.mockRejectedValueOnce(
+      Object.assign(new Error('timeout of 5000ms exceeded'), { code: 'ECONNABORTED' }),
+    );
+
+    await expect(getRemoteManifest(image, auth)).rejects.toThrow('timeout of 5000ms exceeded');
+    expect(mockedAxios.get.mock.calls[0][1].timeout).toBe(5000);
+  });
+});
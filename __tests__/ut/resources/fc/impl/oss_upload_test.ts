@@ -0,0 +1,108 @@
+import * as fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { multipartUploadFile } from '../../../../../src/resources/fc/impl/oss-upload';
+
+const mockRootHome = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-oss-upload-home-'));
+jest.mock('@serverless-devs/utils', () => ({
+  getRootHome: () => mockRootHome,
+}));
+jest.mock('../../../../../src/utils');
+jest.mock('../../../../../src/logger', () => ({
+  debug: jest.fn(),
+  info: jest.fn(),
+  spin: jest.fn(),
+}));
+
+describe('multipartUploadFile', () => {
+  let filePath: string;
+
+  beforeEach(() => {
+    filePath = path.join(os.tmpdir(), `fc-oss-upload-${Date.now()}.zip`);
+    fs.writeFileSync(filePath, 'zip-content');
+  });
+
+  afterEach(() => {
+    fs.rmSync(filePath, { force: true });
+    fs.rmSync(path.join(mockRootHome, 'fc'), { recursive: true, force: true });
+  });
+
+  it('should upload with configured part size and parallel', async () => {
+    const ossClient = {
+      multipartUpload: jest.fn().mockResolvedValue({ res: { headers: {} } }),
+    };
+
+    const name = await multipartUploadFile(ossClient, 'bucket', 'account/object', filePath);
+
+    expect(name).toBe('account/object');
+    expect(ossClient.multipartUpload).toHaveBeenCalledWith(
+      'account/object',
+      filePath,
+      expect.objectContaining({ parallel: 5, partSize: 8 * 1024 * 1024 }),
+    );
+  });
+
+  it('should resume from the saved checkpoint after failure', async () => {
+    const checkpoint = { name: 'account/old-object', uploadId: 'upload-id', fileSize: 11 };
+    const failing = {
+      multipartUpload: jest.fn(async (name, file, options) => {
+        await options.progress(0.5, checkpoint);
+        const err: any = new Error('socket hang up');
+        err.code = 'ConnectionTimeoutError';
+        throw err;
+      }),
+    };
+    // 模拟进程中断：超过重试次数后抛出异常，断点已落盘
+    await expect(multipartUploadFile(failing, 'bucket', 'account/new', filePath)).rejects.toThrow(
+      'socket hang up',
+    );
+
+    const resumed = {
+      multipartUpload: jest.fn().mockResolvedValue({ res: { headers: {} } }),
+    };
+    const name = await multipartUploadFile(resumed, 'bucket', 'account/new', filePath);
+
+    expect(name).toBe('account/old-object');
+    expect(resumed.multipartUpload).toHaveBeenCalledWith(
+      'account/old-object',
+      filePath,
+      expect.objectContaining({ checkpoint }),
+    );
+  });
+
+  it('should restart when the checkpoint is no longer valid', async () => {
+    const checkpoint = { name: 'account/old-object', uploadId: 'upload-id', fileSize: 11 };
+    const ossClient = {
+      multipartUpload: jest
+        .fn()
+        .mockImplementationOnce(async (name, file, options) => {
+          await options.progress(0.5, checkpoint);
+          const err: any = new Error('upload expired');
+          err.code = 'NoSuchUpload';
+          throw err;
+        })
+        .mockResolvedValueOnce({ res: { headers: {} } }),
+    };
+
+    const name = await multipartUploadFile(ossClient, 'bucket', 'account/new', filePath);
+
+    expect(name).toBe('account/new');
+    expect(ossClient.multipartUpload).toHaveBeenLastCalledWith(
+      'account/new',
+      filePath,
+      expect.objectContaining({ checkpoint: undefined }),
+    );
+  });
+
+  it('should throw when oss crc64 does not match', async () => {
+    const ossClient = {
+      multipartUpload: jest
+        .fn()
+        .mockResolvedValue({ res: { headers: { 'x-oss-hash-crc64ecma': '222' } } }),
+    };
+
+    await expect(
+      multipartUploadFile(ossClient, 'bucket', 'account/object', filePath, '111'),
+    ).rejects.toThrow('Uploaded code checksum mismatch');
+  });
+});
@@ -0,0 +1,88 @@
+import {
+  RemoteCache,
+  cachedRead,
+  invalidateAfter,
+  runWithRemoteCache,
+} from '../../../../../src/resources/fc/impl/remote-cache';
+
+jest.mock('../../../../../src/logger', () => ({
+  debug: jest.fn(),
+}));
+
+describe('RemoteCache', () => {
+  const owner = { region: 'cn-hangzhou', credentials: { AccountID: '123' } as any };
+
+  it('should not cache outside of a cache scope', async () => {
+    const fetcher = jest.fn().mockResolvedValue({ state: 'Active' });
+
+    await cachedRead(owner, 'getFunction', 'function/test', undefined, fetcher);
+    await cachedRead(owner, 'getFunction', 'function/test', undefined, fetcher);
+
+    expect(fetcher).toHaveBeenCalledTimes(2);
+  });
+
+  it('should share reads in scope and return copies', async () => {
+    const cache = new RemoteCache();
+    const fetcher = jest.fn().mockResolvedValue({ body: { layers: ['a'] } });
+
+    await runWithRemoteCache(cache, async () => {
+      const [first, second] = await Promise.all([
+        cachedRead(owner, 'getFunction', 'function/test', 'LATEST', fetcher),
+        cachedRead(owner, 'getFunction', 'function/test', 'LATEST', fetcher),
+      ]);
+      first.body.layers.push('b');
+      const third = await cachedRead(owner, 'getFunction', 'function/test', 'LATEST', fetcher);
+
+      expect(second).toEqual({ body: { layers: ['a'] } });
+      expect(third).toEqual({ body: { layers: ['a'] } });
+      // qualifier 不同时分别请求
+      await cachedRead(owner, 'getFunction', 'function/test', 'prod', fetcher);
+    });
+
+    expect(fetcher).toHaveBeenCalledTimes(2);
+    expect(cache.stats).toEqual({ hits: 2, misses: 2, invalidations: 0 });
+  });
+
+  it('should invalidate entries after writes, even failed ones', async () => {
+    const cache = new RemoteCache();
+    const getTrigger = jest.fn().mockResolvedValue({});
+    const listTriggers = jest.fn().mockResolvedValue([]);
+
+    await runWithRemoteCache(cache, async () => {
+      await cachedRead(owner, 'getTrigger', 'trigger/test/http', undefined, getTrigger);
+      await cachedRead(owner, 'listTriggers', 'triggers/test', undefined, listTriggers);
+      await expect(
+        invalidateAfter(owner, ['trigger/test/http', 'triggers/test'], () =>
+          Promise.reject(new Error('update failed')),
+        ),
+      ).rejects.toThrow('update failed');
+      await cachedRead(owner, 'getTrigger', 'trigger/test/http', undefined, getTrigger);
+      await cachedRead(owner, 'listTriggers', 'triggers/test', undefined, listTriggers);
+    });
+
+    expect(getTrigger).toHaveBeenCalledTimes(2);
+    expect(listTriggers).toHaveBeenCalledTimes(2);
+  });
+
+  it('should not cache failed reads', async () => {
+    const cache = new RemoteCache();
+    const fetcher = jest
+      .fn()
+      .mockRejectedValueOnce(new Error('throttled'))
+      .mockResolvedValueOnce({ reservedConcurrency: 10 });
+
+    await runWithRemoteCache(cache, async () => {
+      await expect(
+        cachedRead(owner, 'getConcurrencyConfig', 'concurrency/test', undefined, fetcher),
+      ).rejects.toThrow('throttled');
+      const result = await cachedRead(
+        owner,
+        'getConcurrencyConfig',
+        'concurrency/test',
+        undefined,
+        fetcher,
+      );
+      expect(result).toEqual({ reservedConcurrency: 10 });
+    });
+  });
+});
@@ -248,7 +248,7 @@ describe('FC', () => {
       });
 
       const mockOssClient = {
-        put: jest.fn().mockResolvedValue({}),
+        multipartUpload: jest.fn().mockResolvedValue({ res: { headers: {} } }),
       };
       (OSS as jest.Mock).mockImplementation(() => mockOssClient);
       (path.normalize as jest.Mock).mockReturnValue('/test/path');
@@ -0,0 +1,112 @@
+import * as fs from 'fs';
+import os from 'os';
+import path from 'path';
+import CodeCache, { evictCodeCache, getCodeCacheBaseDir } from '../../../src/utils/code-cache';
+import log from '../../../src/logger';
+log._set(console);
+
+const mockRootHome = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-code-cache-home-'));
+jest.mock('@serverless-devs/utils', () => ({
+  getRootHome: () => mockRootHome,
+}));
+
+describe('CodeCache', () => {
+  let codeUri: string;
+  let zipFile: string;
+
+  beforeEach(() => {
+    codeUri = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-code-cache-code-'));
+    fs.writeFileSync(path.join(codeUri, 'index.js'), 'exports.handler = () => 1;');
+    fs.mkdirSync(path.join(codeUri, 'lib'));
+    fs.writeFileSync(path.join(codeUri, 'lib', 'a.js'), 'module.exports = 1;');
+    zipFile = path.join(os.tmpdir(), `fc-code-cache-${Date.now()}.zip`);
+    fs.writeFileSync(zipFile, 'zip-content');
+  });
+
+  afterEach(() => {
+    fs.rmSync(codeUri, { recursive: true, force: true });
+    fs.rmSync(path.join(mockRootHome, 'fc'), { recursive: true, force: true });
+  });
+
+  it('should miss when there is no manifest', async () => {
+    const cache = new CodeCache(codeUri, 'cn-hangzhou_test');
+    await cache.scan();
+    expect(cache.lookup()).toBeUndefined();
+  });
+
+  it('should reuse the cached zip when code is unchanged', async () => {
+    const first = new CodeCache(codeUri, 'cn-hangzhou_test');
+    await first.scan();
+    const cachedZip = first.save(zipFile, 'crc64-value');
+    expect(fs.existsSync(zipFile)).toBe(false);
+    expect(fs.readFileSync(cachedZip, 'utf-8')).toBe('zip-content');
+
+    // mtime 变化但内容不变，仍然命中
+    const future = new Date(Date.now() + 10000);
+    fs.utimesSync(path.join(codeUri, 'index.js'), future, future);
+
+    const second = new CodeCache(codeUri, 'cn-hangzhou_test');
+    await second.scan();
+    expect(second.lookup()).toEqual({ zipFile: cachedZip, crc64: 'crc64-value' });
+  });
+
+  it('should miss when a file content changes', async () => {
+    const first = new CodeCache(codeUri, 'cn-hangzhou_test');
+    await first.scan();
+    first.save(zipFile, 'crc64-value');
+
+    fs.writeFileSync(path.join(codeUri, 'lib', 'a.js'), 'module.exports = 2;');
+
+    const second = new CodeCache(codeUri, 'cn-hangzhou_test');
+    await second.scan();
+    expect(second.lookup()).toBeUndefined();
+  });
+
+  it('should miss when a file is added', async () => {
+    const first = new CodeCache(codeUri, 'cn-hangzhou_test');
+    await first.scan();
+    first.save(zipFile, 'crc64-value');
+
+    fs.writeFileSync(path.join(codeUri, 'new.js'), '');
+
+    const second = new CodeCache(codeUri, 'cn-hangzhou_test');
+    await second.scan();
+    expect(second.lookup()).toBeUndefined();
+  });
+
+  it('should miss after invalidate', async () => {
+    const first = new CodeCache(codeUri, 'cn-hangzhou_test');
+    await first.scan();
+    first.save(zipFile, 'crc64-value');
+    first.invalidate();
+
+    const second = new CodeCache(codeUri, 'cn-hangzhou_test');
+    await second.scan();
+    expect(second.lookup()).toBeUndefined();
+  });
+
+  it('should evict the least recently deployed zips over the size limit', async () => {
+    const saveZip = async (key: string, minutesAgo: number) => {
+      const cache = new CodeCache(codeUri, key);
+      await cache.scan();
+      const file = path.join(os.tmpdir(), `fc-code-cache-${key}-${Date.now()}.zip`);
+      fs.writeFileSync(file, Buffer.alloc(700 * 1024));
+      cache.save(file, 'crc64-value');
+      const time = new Date(Date.now() - minutesAgo * 60000);
+      fs.utimesSync(cache.manifestFile, time, time);
+      return cache;
+    };
+    const oldest = await saveZip('cn-hangzhou_a', 3);
+    const current = await saveZip('cn-hangzhou_b', 2);
+    const newest = await saveZip('cn-hangzhou_c', 1);
+
+    evictCodeCache(2, current.cacheDir);
+
+    expect(fs.readdirSync(getCodeCacheBaseDir()).sort()).toEqual([
+      'cn-hangzhou_b',
+      'cn-hangzhou_c',
+    ]);
+    expect(fs.existsSync(oldest.zipFile)).toBe(false);
+    expect(fs.existsSync(newest.zipFile)).toBe(true);
+  });
+});
@@ -0,0 +1,158 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import http from 'http';
+import { AddressInfo } from 'net';
+import { getRootHome } from '@serverless-devs/utils';
+import {
+  downloadWithCache,
+  evictDownloadCache,
+  getDownloadCacheDir,
+} from '../../../src/utils/download';
+import { calculateCRC64 } from '../../../src/utils';
+
+jest.mock('../../../src/logger', () => ({
+  debug: jest.fn(),
+}));
+jest.mock('@serverless-devs/utils', () => ({
+  getRootHome: jest.fn(),
+}));
+
+describe('downloadWithCache', () => {
+  const content = Buffer.from(Array.from({ length: 1000 }, (_v, i) => i % 251));
+  let server: http.Server;
+  let url: string;
+  let supportRange: boolean;
+  let stallOnce: boolean;
+  let requests: string[];
+  let tempDir: string;
+
+  beforeAll(async () => {
+    server = http.createServer((req, res) => {
+      const range = /bytes=(\d+)-(\d+)/.exec(req.headers.range || '');
+      requests.push(req.headers.range || 'full');
+      if (stallOnce && req.headers.range !== 'bytes=0-0') {
+        // 只返回一半数据后不再响应，模拟读取卡住
+        stallOnce = false;
+        res.writeHead(206, {
+          'Content-Range': `bytes 0-${content.length - 1}/${content.length}`,
+          'Content-Length': content.length,
+        });
+        res.write(content.subarray(0, 500));
+        return;
+      }
+      if (!supportRange || !range) {
+        res.writeHead(200, { 'Content-Length': content.length });
+        res.end(content);
+        return;
+      }
+      const start = parseInt(range[1], 10);
+      const end = Math.min(parseInt(range[2], 10), content.length - 1);
+      res.writeHead(206, {
+        'Content-Range': `bytes ${start}-${end}/${content.length}`,
+        'Content-Length': end - start + 1,
+      });
+      res.end(content.subarray(start, end + 1));
+    });
+    await new Promise<void>((resolve) => server.listen(0, '127.0.0.1', resolve));
+    url = `http://127.0.0.1:${(server.address() as AddressInfo).port}/code.zip`;
+  });
+
+  afterAll(() => {
+    server.close();
+  });
+
+  beforeEach(() => {
+    supportRange = true;
+    stallOnce = false;
+    requests = [];
+    tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-download-'));
+    (getRootHome as jest.Mock).mockReturnValue(tempDir);
+  });
+
+  afterEach(() => {
+    fs.rmSync(tempDir, { recursive: true, force: true });
+  });
+
+  it('should download in parts and verify checksum', async () => {
+    const dest = path.join(tempDir, 'code.zip');
+    const source = path.join(tempDir, 'source');
+    fs.writeFileSync(source, content);
+    const checksum = await calculateCRC64(source);
+
+    await downloadWithCache(url, dest, { checksum, partSize: 300, concurrency: 2 });
+
+    expect(fs.readFileSync(dest)).toEqual(content);
+    expect(requests).toEqual(
+      expect.arrayContaining(['bytes=0-299', 'bytes=300-599', 'bytes=600-899', 'bytes=900-999']),
+    );
+    expect(fs.existsSync(`${dest}.parts`)).toBe(false);
+  });
+
+  it('should skip the download when the file is cached', async () => {
+    const dest = path.join(tempDir, 'code.zip');
+    fs.writeFileSync(dest, 'cached');
+
+    await downloadWithCache(url, dest);
+
+    expect(requests).toEqual([]);
+  });
+
+  it('should resume from downloaded parts', async () => {
+    const dest = path.join(tempDir, 'code.zip');
+    fs.mkdirSync(`${dest}.parts`);
+    fs.writeFileSync(path.join(`${dest}.parts`, 'size'), `${content.length}`);
+    fs.writeFileSync(path.join(`${dest}.parts`, '0'), content.subarray(0, 500));
+    fs.writeFileSync(path.join(`${dest}.parts`, '1'), content.subarray(500, 700));
+
+    await downloadWithCache(url, dest, { partSize: 500 });
+
+    expect(fs.readFileSync(dest)).toEqual(content);
+    expect(requests).toEqual(['bytes=0-0', 'bytes=700-999']);
+  });
+
+  it('should download in one stream when range is not supported', async () => {
+    supportRange = false;
+    const dest = path.join(tempDir, 'code.zip');
+
+    await downloadWithCache(url, dest, { partSize: 300 });
+
+    expect(fs.readFileSync(dest)).toEqual(content);
+  });
+
+  it('should reject on checksum mismatch', async () => {
+    const dest = path.join(tempDir, 'code.zip');
+
+    await expect(downloadWithCache(url, dest, { checksum: '1' })).rejects.toThrow(
+      'Checksum of',
+    );
+    expect(fs.existsSync(dest)).toBe(false);
+  });
+
+  it('should retry and resume when reading the response times out', async () => {
+    stallOnce = true;
+    const dest = path.join(tempDir, 'code.zip');
+
+    await downloadWithCache(url, dest, { partSize: 1000, timeout: 200 });
+
+    expect(fs.readFileSync(dest)).toEqual(content);
+    expect(requests).toEqual(['bytes=0-0', 'bytes=0-999', 'bytes=500-999']);
+  });
+
+  it('should evict the least recently used code packages over the cache size', () => {
+    const cacheDir = getDownloadCacheDir();
+    fs.mkdirSync(cacheDir, { recursive: true });
+    const mb = Buffer.alloc(1024 * 1024);
+    ['old', 'middle', 'new'].forEach((name, index) => {
+      const file = path.join(cacheDir, `${name}.zip`);
+      fs.writeFileSync(file, mb);
+      const time = new Date(Date.now() - (3 - index) * 60000);
+      fs.utimesSync(file, time, time);
+    });
+    fs.writeFileSync(path.join(cacheDir, 'other.zip.tmp-1'), mb);
+
+    evictDownloadCache(2, path.join(cacheDir, 'old.zip'));
+
+    expect(fs.readdirSync(cacheDir).sort()).toEqual(['new.zip', 'old.zip', 'other.zip.tmp-1']);
+  });
+});
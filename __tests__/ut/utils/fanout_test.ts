@@ -0,0 +1,93 @@
+import FC from '../../../src/resources/fc';
+import {
+  RegionClientPool,
+  globToRegExp,
+  parseFanoutSelector,
+  resolveFanoutTargets,
+  runFanout,
+} from '../../../src/utils/fanout';
+
+jest.mock('../../../src/resources/fc');
+jest.mock('../../../src/utils', () => ({
+  tableShow: jest.fn(),
+}));
+jest.mock('../../../src/logger', () => ({
+  debug: jest.fn(),
+  warn: jest.fn(),
+}));
+
+describe('fanout', () => {
+  const credential = { AccountID: '123', AccessKeyID: 'ak', AccessKeySecret: 'sk' } as any;
+
+  afterEach(() => {
+    jest.clearAllMocks();
+  });
+
+  it('should match function names by glob', () => {
+    expect(globToRegExp('api-*').test('api-user')).toBe(true);
+    expect(globToRegExp('api-?').test('api-12')).toBe(false);
+    expect(globToRegExp('a.b').test('axb')).toBe(false);
+  });
+
+  it('should only enter fanout mode for multiple regions, prefix or patterns', () => {
+    expect(parseFanoutSelector({ 'function-name': 'test' }, 'cn-hangzhou')).toBeUndefined();
+    expect(parseFanoutSelector({ 'function-name': 'a,b' }, 'cn-hangzhou')).toEqual({
+      regions: ['cn-hangzhou'],
+      prefix: undefined,
+      names: ['a', 'b'],
+    });
+    expect(
+      parseFanoutSelector({ regions: 'cn-hangzhou,cn-beijing', prefix: 'tmp-' }, 'cn-hangzhou'),
+    ).toEqual({ regions: ['cn-hangzhou', 'cn-beijing'], prefix: 'tmp-', names: [] });
+  });
+
+  it('should reuse one client per region when resolving targets', async () => {
+    (FC as unknown as jest.Mock).mockImplementation((region) => ({
+      listFunctions: jest
+        .fn()
+        .mockResolvedValue([{ functionName: `api-${region}` }, { functionName: 'worker' }]),
+    }));
+    const pool = new RegionClientPool(credential, 'ua');
+
+    const targets = await resolveFanoutTargets(
+      pool,
+      { regions: ['cn-hangzhou', 'cn-beijing'], names: ['api-*'] },
+      4,
+    );
+
+    expect(targets).toEqual([
+      { region: 'cn-hangzhou', functionName: 'api-cn-hangzhou' },
+      { region: 'cn-beijing', functionName: 'api-cn-beijing' },
+    ]);
+    expect(pool.get('cn-hangzhou')).toBe(pool.get('cn-hangzhou'));
+    expect(FC).toHaveBeenCalledTimes(2);
+  });
+
+  it('should record failures per function without stopping the others', async () => {
+    (FC as unknown as jest.Mock).mockImplementation(() => ({}));
+    const pool = new RegionClientPool(credential, 'ua');
+    const write = jest.spyOn(process.stdout, 'write').mockImplementation(() => true);
+
+    const records = await runFanout(
+      [
+        { region: 'cn-hangzhou', functionName: 'a' },
+        { region: 'cn-hangzhou', functionName: 'b' },
+      ],
+      pool,
+      'jsonl',
+      async ({ functionName }) => {
+        if (functionName === 'a') {
+          throw new Error('denied');
+        }
+        return 'removed';
+      },
+    );
+    write.mockRestore();
+
+    expect(records).toEqual([
+      { region: 'cn-hangzhou', functionName: 'a', error: 'denied' },
+      { region: 'cn-hangzhou', functionName: 'b', result: 'removed' },
+    ]);
+    expect(write).toHaveBeenCalledTimes(2);
+  });
+});
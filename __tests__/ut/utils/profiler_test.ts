@@ -0,0 +1,109 @@
+import {
+  Profiler,
+  addSpanAttr,
+  runWithProfiler,
+  traceClient,
+  traceSpan,
+} from '../../../src/utils/profiler';
+
+const delay = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+describe('profiler', () => {
+  it('should record nested spans with attrs', async () => {
+    const profiler = new Profiler();
+
+    await runWithProfiler(profiler, () =>
+      traceSpan('function.run', 'stage', async () => {
+        await traceSpan('uploadCode', 'file', async (span) => {
+          span.attrs.bytes = 1024;
+          await delay(5);
+        });
+        addSpanAttr('retries');
+        addSpanAttr('retries');
+      }),
+    );
+
+    const [upload, stage] = profiler.spans;
+    expect(stage).toMatchObject({ name: 'function.run', attrs: { retries: 2 } });
+    expect(upload).toMatchObject({
+      name: 'uploadCode',
+      parentId: stage.id,
+      attrs: { bytes: 1024 },
+    });
+    expect(upload.duration).toBeGreaterThan(0);
+    expect(stage.duration).toBeGreaterThanOrEqual(upload.duration);
+  });
+
+  it('should record errors and not record outside the profiler scope', async () => {
+    const profiler = new Profiler();
+    const error: any = new Error('denied');
+    error.code = 'AccessDenied';
+
+    await expect(
+      runWithProfiler(profiler, () =>
+        traceSpan('pushAcr', 'image', async () => {
+          throw error;
+        }),
+      ),
+    ).rejects.toThrow('denied');
+    expect(traceSpan('zip', 'file', () => 1)).toBe(1);
+
+    expect(profiler.spans).toHaveLength(1);
+    expect(profiler.spans[0].attrs.error).toBe('AccessDenied');
+  });
+
+  it('should trace async client methods only', async () => {
+    const profiler = new Profiler();
+    const client = traceClient(
+      {
+        name: 'fc',
+        getFunction(functionName: string) {
+          return this.getFunctionWithOptions(functionName);
+        },
+        async getFunctionWithOptions(functionName: string) {
+          return `${this.name}/${functionName}`;
+        },
+        getEndpoint() {
+          return 'endpoint';
+        },
+      },
+      'fc',
+    );
+
+    const result = await runWithProfiler(profiler, async () => {
+      expect(client.getEndpoint()).toBe('endpoint');
+      return await client.getFunction('test');
+    });
+
+    expect(result).toBe('fc/test');
+    expect(profiler.spans.map(({ name, category }) => `${category}:${name}`)).toEqual([
+      'api:fc.getFunction',
+    ]);
+  });
+
+  it('should summarize and export chrome trace with nested lanes', async () => {
+    const profiler = new Profiler();
+
+    await runWithProfiler(profiler, () =>
+      traceSpan('trigger.run', 'stage', () =>
+        Promise.all([
+          traceSpan('fc.createTrigger', 'api', () => delay(5)),
+          traceSpan('fc.createTrigger', 'api', () => delay(10)),
+        ]),
+      ),
+    );
+
+    expect(profiler.summary().map(({ name, count }) => [name, count])).toEqual(
+      expect.arrayContaining([
+        ['trigger.run', 1],
+        ['fc.createTrigger', 2],
+      ]),
+    );
+    const { traceEvents } = profiler.toChromeTrace();
+    expect(traceEvents).toHaveLength(3);
+    expect(traceEvents[0]).toMatchObject({ name: 'trigger.run', ph: 'X', tid: 1 });
+    // 并发的两个子 span 不能出现在同一个 tid 上
+    expect(traceEvents[1].tid).not.toBe(traceEvents[2].tid);
+    expect(profiler.toJSON().spans).toHaveLength(3);
+  });
+});
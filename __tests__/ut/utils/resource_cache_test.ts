@@ -0,0 +1,82 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+
+const mockRootHome = fs.mkdtempSync(path.join(os.tmpdir(), 'fc-resource-cache-home-'));
+
+jest.mock('@serverless-devs/utils', () => ({
+  getRootHome: jest.fn(() => mockRootHome),
+}));
+jest.mock('../../../src/logger', () => ({
+  debug: jest.fn(),
+}));
+
+// 重新加载模块，模拟新的进程
+const loadModule = () => {
+  let mod: typeof import('../../../src/utils/resource-cache');
+  jest.isolateModules(() => {
+    mod = require('../../../src/utils/resource-cache');
+  });
+  return mod;
+};
+
+describe('resource-cache', () => {
+  const scope = { accountID: '123456789', region: 'cn-hangzhou' };
+
+  afterEach(() => {
+    fs.rmSync(path.join(mockRootHome, 'cache'), { recursive: true, force: true });
+  });
+
+  afterAll(() => {
+    fs.rmSync(mockRootHome, { recursive: true, force: true });
+  });
+
+  it('should resolve the same resource only once per process', async () => {
+    const { cachedResource } = loadModule();
+    const resolve = jest.fn().mockResolvedValue('acs:ram::123456789:role/oss-trigger-role');
+
+    const results = await Promise.all([
+      cachedResource({ accountID: scope.accountID }, 'role/oss-trigger', resolve),
+      cachedResource({ accountID: scope.accountID }, 'role/oss-trigger', resolve),
+    ]);
+
+    expect(resolve).toHaveBeenCalledTimes(1);
+    expect(results[0]).toBe(results[1]);
+  });
+
+  it('should reuse the persisted resource after validation', async () => {
+    const vpcConfig = { vpcId: 'vpc-1', vSwitchIds: ['vsw-1'], securityGroupId: 'sg-1' };
+    await loadModule().cachedResource(scope, 'vpc-nas/vpc/{}', async () => ({ vpcConfig }));
+
+    const resolve = jest.fn().mockResolvedValue({ vpcConfig: { vpcId: 'vpc-2' } });
+    const validate = jest.fn().mockResolvedValue(true);
+    const result = await loadModule().cachedResource(scope, 'vpc-nas/vpc/{}', resolve, validate);
+
+    expect(result).toEqual({ vpcConfig });
+    expect(validate).toHaveBeenCalledWith({ vpcConfig });
+    expect(resolve).not.toHaveBeenCalled();
+
+    const invalid = jest.fn().mockRejectedValue(new Error('InvalidVpcId.NotFound'));
+    const resolved = await loadModule().cachedResource(scope, 'vpc-nas/vpc/{}', resolve, invalid);
+    expect(resolved).toEqual({ vpcConfig: { vpcId: 'vpc-2' } });
+  });
+
+  it('should not cache failures and should drop entries on invalidate', async () => {
+    const { cachedResource, invalidateResourceCache } = loadModule();
+    await expect(
+      cachedResource(scope, 'sls/project/logstore', () => Promise.reject(new Error('denied'))),
+    ).rejects.toThrow('denied');
+
+    const resolve = jest.fn().mockResolvedValue({ project: 'project', logstore: 'logstore' });
+    await cachedResource(scope, 'sls/project/logstore', resolve);
+    await cachedResource({ accountID: scope.accountID }, 'slr/FC', async () => true);
+    invalidateResourceCache(scope);
+
+    const next = loadModule();
+    const resolveAgain = jest.fn().mockResolvedValue(true);
+    await next.cachedResource(scope, 'sls/project/logstore', resolve);
+    await next.cachedResource({ accountID: scope.accountID }, 'slr/FC', resolveAgain);
+    expect(resolve).toHaveBeenCalledTimes(2);
+    expect(resolveAgain).toHaveBeenCalledTimes(1);
+  });
+});
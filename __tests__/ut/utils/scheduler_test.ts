@@ -0,0 +1,172 @@
+import { fetchAll, runPool, runTaskGraph, runThrottledPool } from '../../../src/utils/scheduler';
+
+const delay = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+describe('runPool', () => {
+  it('should keep result order and respect concurrency', async () => {
+    let running = 0;
+    let maxRunning = 0;
+    const result = await runPool([1, 2, 3, 4, 5], 2, async (item) => {
+      running++;
+      maxRunning = Math.max(maxRunning, running);
+      await delay(5 * (6 - item));
+      running--;
+      return item * 2;
+    });
+
+    expect(result).toEqual([2, 4, 6, 8, 10]);
+    expect(maxRunning).toBe(2);
+  });
+
+  it('should throw the first error and stop starting new items', async () => {
+    const worker = jest.fn(async (item: number) => {
+      if (item === 1) {
+        throw new Error('failed');
+      }
+      return item;
+    });
+
+    await expect(runPool([1, 2, 3, 4], 1, worker)).rejects.toThrow('failed');
+    expect(worker).toHaveBeenCalledTimes(1);
+  });
+});
+
+describe('runTaskGraph', () => {
+  it('should run tasks after their dependencies and record timings', async () => {
+    const order: string[] = [];
+    const task = (name: string, deps: string[] = []) => ({
+      name,
+      deps,
+      run: async () => {
+        order.push(`start:${name}`);
+        await delay(5);
+        order.push(`end:${name}`);
+        return name;
+      },
+    });
+
+    const { results, timings } = await runTaskGraph(
+      [task('function'), task('trigger', ['function']), task('domain', ['function', 'unknown'])],
+      4,
+    );
+
+    expect(order.indexOf('start:trigger')).toBeGreaterThan(order.indexOf('end:function'));
+    expect(order.indexOf('start:domain')).toBeGreaterThan(order.indexOf('end:function'));
+    expect(results).toEqual({ function: 'function', trigger: 'trigger', domain: 'domain' });
+    expect(Object.keys(timings).sort()).toEqual(['domain', 'function', 'trigger']);
+  });
+
+  it('should not run dependents of a failed task', async () => {
+    const dependent = jest.fn().mockResolvedValue(true);
+
+    await expect(
+      runTaskGraph(
+        [
+          { name: 'function', run: () => Promise.reject(new Error('deploy failed')) },
+          { name: 'trigger', deps: ['function'], run: dependent },
+        ],
+        4,
+      ),
+    ).rejects.toThrow('deploy failed');
+    expect(dependent).not.toHaveBeenCalled();
+  });
+
+  it('should reject circular dependencies', async () => {
+    await expect(
+      runTaskGraph(
+        [
+          { name: 'a', deps: ['b'], run: jest.fn() },
+          { name: 'b', deps: ['a'], run: jest.fn() },
+        ],
+        2,
+      ),
+    ).rejects.toThrow('circular dependencies');
+  });
+});
+
+describe('runThrottledPool', () => {
+  const throttled = () => {
+    const err: any = new Error('too many requests');
+    err.statusCode = 429;
+    return err;
+  };
+  const options = {
+    isThrottled: (ex) => ex.statusCode === 429,
+    retries: 3,
+    baseDelayMs: 5,
+    maxDelayMs: 20,
+  };
+
+  it('should retry throttled items and keep result order', async () => {
+    const attempts: Record<number, number> = {};
+    const onThrottled = jest.fn();
+    const result = await runThrottledPool(
+      [1, 2, 3, 4],
+      3,
+      async (item) => {
+        attempts[item] = (attempts[item] || 0) + 1;
+        if (item === 2 && attempts[item] < 3) {
+          throw throttled();
+        }
+        return item * 10;
+      },
+      { ...options, onThrottled },
+    );
+
+    expect(result).toEqual([10, 20, 30, 40]);
+    expect(attempts[2]).toBe(3);
+    expect(onThrottled).toHaveBeenCalledTimes(2);
+    expect(onThrottled).toHaveBeenCalledWith(2, 1, expect.any(Number));
+  });
+
+  it('should throw after throttling retries are exhausted', async () => {
+    const worker = jest.fn(async () => {
+      throw throttled();
+    });
+
+    await expect(runThrottledPool([1], 2, worker, options)).rejects.toThrow('too many requests');
+    expect(worker).toHaveBeenCalledTimes(4);
+  });
+
+  it('should not retry other errors', async () => {
+    const worker = jest.fn(async () => {
+      throw new Error('invalid argument');
+    });
+
+    await expect(runThrottledPool([1], 2, worker, options)).rejects.toThrow('invalid argument');
+    expect(worker).toHaveBeenCalledTimes(1);
+  });
+});
+
+describe('fetchAll', () => {
+  it('should fetch concurrently and collect errors by name', async () => {
+    let running = 0;
+    let maxRunning = 0;
+    const call = (value: any, ms: number) => async () => {
+      running++;
+      maxRunning = Math.max(maxRunning, running);
+      await delay(ms);
+      running--;
+      if (value instanceof Error) {
+        throw value;
+      }
+      return value;
+    };
+
+    const { values, errors } = await fetchAll(
+      {
+        function: call({ functionName: 'f' }, 10),
+        triggers: call(new Error('list failed'), 5),
+        concurrency: call(new Error('not found'), 1),
+        vpcBinding: call({}, 1),
+      },
+      4,
+    );
+
+    expect(maxRunning).toBe(4);
+    expect(values).toEqual({ function: { functionName: 'f' }, vpcBinding: {} });
+    // 异常顺序与声明顺序一致，而不是完成顺序
+    expect(Object.keys(errors)).toEqual(['triggers', 'concurrency']);
+    expect(errors.triggers.message).toBe('list failed');
+  });
+});
@@ -0,0 +1,83 @@
+import { sleep } from '../../../src/utils';
+import {
+  getInterruptSignal,
+  getWaitStats,
+  nextWaitDelay,
+  resetWaitStats,
+  waitUntil,
+} from '../../../src/utils/waiter';
+
+jest.mock('../../../src/utils', () => ({
+  sleep: jest.fn().mockResolvedValue(undefined),
+}));
+jest.mock('../../../src/logger', () => ({
+  debug: jest.fn(),
+}));
+
+describe('waiter', () => {
+  afterEach(() => {
+    resetWaitStats();
+    jest.clearAllMocks();
+  });
+
+  it('should check immediately and stop once done', async () => {
+    const check = jest
+      .fn()
+      .mockResolvedValueOnce({ done: false })
+      .mockResolvedValueOnce({ done: true, value: 'ok' });
+
+    const result = await waitUntil(check, { name: 'state' });
+
+    expect(result).toEqual(expect.objectContaining({ done: true, value: 'ok', attempts: 2 }));
+    expect(check).toHaveBeenNthCalledWith(1, 0);
+    expect(sleep).toHaveBeenCalledTimes(1);
+    expect(getWaitStats().state).toEqual(
+      expect.objectContaining({ count: 1, attempts: 2, unfinished: 0 }),
+    );
+  });
+
+  it('should return unfinished result when max attempts reached', async () => {
+    const check = jest.fn().mockResolvedValue({ done: false });
+
+    const result = await waitUntil(check, { name: 'state', maxAttempts: 3 });
+
+    expect(result.done).toBe(false);
+    expect(check).toHaveBeenCalledTimes(3);
+    expect(getWaitStats().state.unfinished).toBe(1);
+  });
+
+  it('should stop when cancelled', async () => {
+    const signal = { aborted: false };
+    const check = jest.fn().mockImplementation(async () => {
+      signal.aborted = true;
+      return { done: false };
+    });
+
+    await expect(waitUntil(check, { name: 'state', signal })).rejects.toThrow(
+      'Waiting for state was cancelled',
+    );
+    expect(check).toHaveBeenCalledTimes(1);
+  });
+
+  it('should stop waiting on Ctrl-C', async () => {
+    (sleep as jest.Mock).mockReturnValueOnce(new Promise(() => undefined));
+    const check = jest.fn().mockResolvedValue({ done: false });
+
+    const waiting = waitUntil(check, { name: 'state', signal: getInterruptSignal() });
+    await new Promise((resolve) => setImmediate(resolve));
+    process.emit('DEVS:SIGINT' as any);
+
+    await expect(waiting).rejects.toThrow('Waiting for state was cancelled');
+    expect(check).toHaveBeenCalledTimes(1);
+    expect(getInterruptSignal().aborted).toBe(true);
+  });
+
+  it('should back off but not wait past the expected completion time', () => {
+    const options = { name: 'state', minDelayMs: 1000, maxDelayMs: 30000 };
+
+    expect(nextWaitDelay(0, 0, options)).toBeLessThanOrEqual(1000);
+    expect(nextWaitDelay(10, 0, options)).toBeGreaterThanOrEqual(15000);
+    expect(nextWaitDelay(10, 8000, { ...options, expectedMs: 10000 })).toBe(2000);
+    expect(nextWaitDelay(10, 59000, { ...options, timeoutMs: 60000 })).toBe(1000);
+  });
+});
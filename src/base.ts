@@ -17,6 +17,27 @@ import { ICredentials } from '@serverless-devs/component-interface';
 import Role, { RamClient } from './resources/ram';
 import { TriggerType } from './interface/base';
 import { isAuto } from './utils';
+import { cachedResource } from './utils/resource-cache';
+
+const pendingCredentials = new WeakMap<IInputs, Promise<any>>();
+
+// 默认触发器角色，key 为缓存中的资源标识
+const DEFAULT_TRIGGER_ROLES: Record<string, { key: string; init: (client: RamClient) => any }> = {
+  [TriggerType.oss]: { key: 'role/oss-trigger', init: (client) => client.initFcOssTriggerRole() },
+  [TriggerType.log]: { key: 'role/sls-trigger', init: (client) => client.initFcSlsTriggerRole() },
+  [TriggerType.mns_topic]: {
+    key: 'role/mns-trigger',
+    init: (client) => client.initFcMnsTriggerRole(),
+  },
+  [TriggerType.cdn_events]: {
+    key: 'role/cdn-trigger',
+    init: (client) => client.initFcCdnTriggerRole(),
+  },
+  [TriggerType.tablestore]: {
+    key: 'role/ots-trigger',
+    init: (client) => client.initFcOtsTriggerRole(),
+  },
+};
 
 export default class Base {
   commands: any;
@@ -85,19 +106,21 @@ export default class Base {
         }
       }
     }
+    // 各触发器的角色并发解析，相同的默认角色在进程内只解析一次
     const triggers = _.cloneDeep(_.get(inputs, 'props.triggers', []));
-    for (let i = 0; i < triggers.length; i++) {
-      const trigger = triggers[i];
-      const invocationRole = _.get(trigger, 'invocationRole');
-      let triggerRole = await this._handleRole(invocationRole, needCredential, inputs);
-      if (triggerRole === undefined) {
-        triggerRole = await this._handleDefaultTriggerRole(inputs, trigger);
-      }
-      if (triggerRole !== undefined) {
-        _.set(trigger, 'invocationRole', triggerRole);
-        inputs.props.triggers[i] = trigger;
-      }
-    }
+    await Promise.all(
+      triggers.map(async (trigger, i) => {
+        const invocationRole = _.get(trigger, 'invocationRole');
+        let triggerRole = await this._handleRole(invocationRole, needCredential, inputs);
+        if (triggerRole === undefined) {
+          triggerRole = await this._handleDefaultTriggerRole(inputs, trigger);
+        }
+        if (triggerRole !== undefined) {
+          _.set(trigger, 'invocationRole', triggerRole);
+          inputs.props.triggers[i] = trigger;
+        }
+      }),
+    );
     log.debug(`handle pre run config: ${JSON.stringify(inputs.props)}`);
   }
 
@@ -108,9 +131,7 @@ export default class Base {
   ): Promise<string> {
     const needHandleRole = _.isString(role) && role !== '' && !Role.isRoleArnFormat(role);
     if (needCredential || needHandleRole) {
-      if (_.isEmpty(inputs.credential)) {
-        inputs.credential = await inputs.getCredential();
-      }
+      await this._ensureCredential(inputs);
       if (needHandleRole) {
         const arn = Role.completionArn(role, (inputs.credential as ICredentials).AccountID);
         return arn.toLowerCase();
@@ -130,37 +151,34 @@ export default class Base {
     2. 针对 EB 触发器，GetOrCreate 和控制台一样的 service linked role
   */
   private async _handleDefaultTriggerRole(inputs: IInputs, trigger: any): Promise<string> {
-    let triggerRole;
+    let triggerRole: string;
     const triggerType = _.get(trigger, 'triggerType');
-    if (_.isEmpty(inputs.credential)) {
-      inputs.credential = await inputs.getCredential();
-    }
-    const ramClient = new RamClient(inputs.credential as ICredentials);
-    switch (triggerType) {
-      case TriggerType.oss:
-        triggerRole = await ramClient.initFcOssTriggerRole();
-        break;
-      case TriggerType.log:
-        triggerRole = await ramClient.initFcSlsTriggerRole();
-        break;
-      case TriggerType.mns_topic:
-        triggerRole = await ramClient.initFcMnsTriggerRole();
-        break;
-      case TriggerType.cdn_events:
-        triggerRole = await ramClient.initFcCdnTriggerRole();
-        break;
-      case TriggerType.tablestore:
-        triggerRole = await ramClient.initFcOtsTriggerRole();
-        break;
-      case TriggerType.eventbridge: {
-        // eb 触发器没有 trigger role, get or create slr role
-        const { eventSourceType } = trigger.triggerConfig.eventSourceConfig;
-        await ramClient.initSlrRole('SENDTOFC');
-        await ramClient.initSlrRole(eventSourceType.toUpperCase());
-        break;
-      }
-      default:
-        log.debug(`${triggerType} don't have default trigger role`);
+    const credential = await this._ensureCredential(inputs);
+    const ramClient = new RamClient(credential);
+    const scope = { accountID: credential.AccountID };
+    const defaultRole = DEFAULT_TRIGGER_ROLES[triggerType];
+    if (defaultRole) {
+      // 缓存的角色只需校验属于当前账号，角色被删除导致部署失败时由 deploy 清理缓存
+      triggerRole = await cachedResource(
+        scope,
+        defaultRole.key,
+        () => defaultRole.init(ramClient),
+        async (arn: string) => _.includes(_.toLower(arn), `acs:ram::${scope.accountID}:role/`),
+      );
+    } else if (triggerType === TriggerType.eventbridge) {
+      // eb 触发器没有 trigger role, get or create slr role
+      const { eventSourceType } = trigger.triggerConfig.eventSourceConfig;
+      const slrNames = _.uniq(['SENDTOFC', eventSourceType.toUpperCase()]);
+      await Promise.all(
+        slrNames.map((name) =>
+          cachedResource(scope, `slr/${name}`, async () => {
+            await ramClient.initSlrRole(name);
+            return true;
+          }),
+        ),
+      );
+    } else {
+      log.debug(`${triggerType} don't have default trigger role`);
     }
     if (triggerRole === undefined) {
       return triggerRole;
@@ -169,4 +187,15 @@ export default class Base {
     log.info(`triggerName = ${trigger.triggerName} use default triggerRole = ${triggerRole}`);
     return triggerRole;
   }
+
+  // 多个触发器并发处理角色时共享同一次 getCredential
+  private async _ensureCredential(inputs: IInputs): Promise<ICredentials> {
+    if (_.isEmpty(inputs.credential)) {
+      if (!pendingCredentials.has(inputs)) {
+        pendingCredentials.set(inputs, inputs.getCredential());
+      }
+      inputs.credential = await pendingCredentials.get(inputs);
+    }
+    return inputs.credential as ICredentials;
+  }
 }
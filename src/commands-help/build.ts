@@ -20,6 +20,10 @@ Examples:
         '--custom-args <string>',
         '[Optional] Additional parameters when using the default build behavior, such as specifying a pypi or NPM source',
       ],
+      [
+        '--disable-build-cache',
+        '[Optional] Reinstall dependencies instead of restoring them from the local build cache',
+      ],
       ['--command <string>', '[Optional] Using custom commands'],
       ['--script-file <scriptFile>', '[Optional] Using custom shell scripts'],
       [
@@ -8,7 +8,9 @@ Examples:
   $ s deploy --function code
   $ s deploy --function config
   $ s deploy --trigger triggerName
-  $ s deploy --trigger triggerName1,trigggerName2`,
+  $ s deploy --trigger triggerName1,trigggerName2
+  $ s deploy --profile
+  $ s deploy --profile-output deploy-trace.json --profile-format chrome-trace`,
     summary: 'Deploy local resources online',
     option: [
       ['-y, --assume-yes', "[Optional] Don't ask, delete directly"],
@@ -21,6 +23,15 @@ Examples:
         '--trigger [triggerName]',
         "[Optional] Only deploy trigger only. Specify a trigger name to deploy only the specified trigger; Multiple names can be split by ','",
       ],
+      ['--profile', '[Optional] Print the time spent in each deploy step as a table'],
+      [
+        '--profile-output [filePath]',
+        '[Optional] Write the timing spans of OpenAPI calls, file operations and waits to a file',
+      ],
+      [
+        "--profile-format ['json'/'chrome-trace']",
+        "[Optional] Format of --profile-output, default is 'json'. 'chrome-trace' can be opened in chrome://tracing or Perfetto",
+      ],
     ],
   },
 };
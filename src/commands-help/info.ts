@@ -6,14 +6,27 @@ Examples with Yaml:
   $ s info
 
 Examples with CLI:
-  $ s cli fc3 info --region cn-hangzhou --function-name  test -a default`,
+  $ s cli fc3 info --region cn-hangzhou --function-name  test -a default
+  $ s cli fc3 info --regions cn-hangzhou,cn-beijing --function-name 'api-*' --output-format table -a default`,
     summary: 'Query online resource details',
     option: [
       [
         '--region <region>',
         '[C-Required] Specify fc region, you can see all supported regions in https://help.aliyun.com/document_detail/2512917.html',
       ],
-      ['--function-name <functionName>', '[C-Required] Specify function name'],
+      [
+        '--function-name <functionName>',
+        "[C-Required] Specify function name, multiple names can be split by ',', wildcards '*' and '?' are supported",
+      ],
+      [
+        '--regions <regions>',
+        "[Optional] Run against multiple regions concurrently, multiple regions can be split by ','",
+      ],
+      ['--prefix <prefix>', '[Optional] Run against all functions with the prefix'],
+      [
+        '--output-format <format>',
+        '[Optional] Output format of multiple functions: json (default), jsonl (streamed), table',
+      ],
     ],
   },
 };
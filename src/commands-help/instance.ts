@@ -14,6 +14,8 @@ Examples with Yaml:
   $ s instance exec --instance-id c-6******-27c4833c325445879a28 --workdir /app
   $ s instance exec --instance-id c-6******-27c4833c325445879a28 --no-workdir
   $ s instance exec --instance-id \`s invoke  | grep "Invoke instanceId:" |  sed "s/.*: //"\`
+  $ s instance exec --all --cmd "nvidia-smi"
+  $ s instance exec --instance-filter "c-64fec1fc-*" --cmd "df -h" --concurrency 20
 
 Examples with CLI:
   $ s cli fc3 instance exec --instance-id c-64fec1fc-27c4833c325445879a28 --region cn-hangzhou --function-name test -a default
@@ -27,15 +29,30 @@ Examples with CLI:
             '[C-Required] Specify the fc region, you can see all supported regions in https://help.aliyun.com/document_detail/2512917.html',
           ],
           ['--function-name <functionName>', '[C-Required] Specify function name'],
-          ['--instance-id <instanceId>', '[Required] Specify function instance id'],
+          [
+            '--instance-id <instanceId>',
+            '[Required] Specify function instance id, not required with --all or --instance-filter',
+          ],
           ['--cmd <cmd>', '[Optional] Command string to be executed'],
+          [
+            '--all',
+            '[Optional] Execute --cmd in all active instances concurrently, output lines are prefixed with the instance id',
+          ],
+          [
+            '--instance-filter <pattern>',
+            '[Optional] Execute --cmd in active instances whose id matches the pattern, supports * and ?',
+          ],
+          [
+            '--concurrency <number>',
+            '[Optional] Number of instances executed at the same time with --all or --instance-filter, default is 10',
+          ],
           [
             '--shell <shell>',
             '[Optional] Specify shell to use (e.g., /bin/sh, /bin/bash), default is bash',
           ],
           [
             '--workdir <workdir>',
-            '[Optional] Specify initial working directory (e.g., /, /app). If not specified, defaults to /code or / as fallback',
+            '[Optional] Specify initial working directory (e.g., /, /app). If not specified, defaults to /code or / as fallback (--all/--instance-filter keep the container\'s default WORKDIR)',
           ],
           [
             '--no-workdir',
@@ -7,6 +7,8 @@ Examples with Yaml:
   $ s invoke -f evt.json
   $ s invoke --invocation-type Async
   $ s invoke --invocation-type Async  --async-task-id  task-uuid
+  $ s invoke -f evt.json --count 100 --concurrency 10
+  $ s invoke --events-file events.jsonl --count 1000 --concurrency 20 --qps 50
 
 Examples with CLI:
   $ s cli fc3 invoke -e "payload" --region cn-huhehaote --function-name test -a default`,
@@ -35,6 +37,16 @@ Examples with CLI:
         '--async-task-id <asyncTaskId>',
         '[Optional] Specify The ID of the asynchronous task, only takes effect when --invocation-type=Async',
       ],
+      [
+        '--events-file <eventsFile>',
+        '[Optional] Specify a JSON Lines file, each line is an event, events are replayed in turn',
+      ],
+      [
+        '--count <count>',
+        '[Optional] Batch mode: total invocations, default is the number of events',
+      ],
+      ['--concurrency <concurrency>', '[Optional] Batch mode: concurrent invocations, default: 1'],
+      ['--qps <qps>', '[Optional] Batch mode: target invocations per second'],
     ],
   },
 };
@@ -4,14 +4,23 @@ export default {
 Example:
   $ s list
   $ s list --prefix test --table
-  $ s cli fc3 list --prefix test --limit 20 --next-token xxx --region cn-hangzhou -a default`,
+  $ s cli fc3 list --prefix test --limit 20 --next-token xxx --region cn-hangzhou -a default
+  $ s cli fc3 list --regions cn-hangzhou,cn-shanghai --function-name 'api-*' --output-format jsonl -a default`,
     summary: 'List all functions',
     option: [
       [
         '--region <region>',
         '[C-Required] Specify the fc region, you can see all supported regions in https://help.aliyun.com/document_detail/2512917.html',
       ],
+      [
+        '--regions <regions>',
+        "[Optional] List functions in multiple regions concurrently, multiple regions can be split by ','",
+      ],
       ['--prefix <prefix>', '[Optional] Specify the prefix of function name'],
+      [
+        '--function-name <functionName>',
+        "[Optional] Filter function names, supports wildcards '*' and '?', multiple names can be split by ','",
+      ],
       [
         '--limit <limit>',
         '[Optional] Specify the max number of functions to return per page, if not specified, all functions will be listed',
@@ -21,6 +30,10 @@ Example:
         '[Optional] Specify the next token for pagination, only works with --limit',
       ],
       ['--table', '[Optional] Specify if output the result as table format'],
+      [
+        '--output-format <format>',
+        '[Optional] Output format: json (default), jsonl (one function per line, streamed), table',
+      ],
     ],
   },
 };
@@ -5,8 +5,10 @@ export default {
 Examples:
   $ s local invoke -e '{"key":"val"}'
   $ s local invoke -f evt.json
+  $ s local invoke --event-dir ./events --keep-warm
   $ s local invoke -e '{"key":"val"}' -c vscode -d 3000
-  $ s local start`,
+  $ s local start
+  $ s local start --instances 4 --instance-concurrency 10`,
     summary: 'Local invoke fc function',
     option: [
       [
@@ -17,6 +19,14 @@ Examples:
         '-f, --event-file string',
         '[Optional] A file containing event data passed to the function during invoke',
       ],
+      [
+        '--event-dir string',
+        '[Optional] Invoke with every .json event file in the directory in order, reusing one container, not supported by custom runtime',
+      ],
+      [
+        '--keep-warm',
+        '[Optional] Keep the container running after invoke and reuse it in later invokes with the same config, it is removed after FC_LOCAL_WARM_IDLE_TIMEOUT (default 600s) idle, not supported by custom runtime',
+      ],
       [
         '-c, --config [vscode/intellij]',
         '[Optional] Select which IDE to use when debugging and output related debug config tips for the IDE.value: vscode/intellij',
@@ -25,6 +35,14 @@ Examples:
         '-d, --debug-port number',
         '[Optional] Specify the local function container starting in debug mode, and exposing this port on localhost',
       ],
+      [
+        '--instances number',
+        '[Optional] [local start] Start multiple function containers behind the local proxy, requests are dispatched to the least busy one (default: 1). Proxy stats are served at /__fc_local/stats',
+      ],
+      [
+        '--instance-concurrency number',
+        '[Optional] [local start] Max concurrent requests per container, requests wait in queue when all containers are busy (default: instanceConcurrency in s.yaml or 1)',
+      ],
     ],
   },
   verify: false,
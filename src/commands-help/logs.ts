@@ -5,6 +5,7 @@ export default {
 Examples with Yaml:
   $ s logs --tail
   $ s logs -s 2023-11-02T02:54:00+08:00 -e 2023-11-02T02:54:59+08:00
+  $ s logs -s 2023-11-02T02:00:00+08:00 -e 2023-11-02T03:00:00+08:00 --output-format jsonl --output-file ./logs.jsonl
 
 
 Examples with CLI:
@@ -31,12 +32,21 @@ Examples with CLI:
       ],
       ['--tail', '[Optional] Continuous log output mode'],
       ['--type <type>', '[Optional] Query according to Log type, value: success/fail'],
+      [
+        '--summary',
+        '[Optional] Show request count, failed request count and duration statistics of each instance',
+      ],
       ['--qualifier <qualifier>', '[Optional] Query according to the specified version or alias'],
       ['--match <match>', '[Optional] The matched character is highlighted'],
       [
         '--search <search>',
         '[Optional] Query according to keyword, Document: https://help.aliyun.com/document_detail/29060.html',
       ],
+      [
+        '--output-format <format>',
+        '[Optional] History log output format, value: text/plain/jsonl, default: text (plain when --output-file is set)',
+      ],
+      ['--output-file <path>', '[Optional] Write history logs to the file instead of stdout'],
     ],
   },
   verify: false,
@@ -10,14 +10,27 @@ Examples with Yaml:
   $ s remove --trigger triggerName1,trigggerName2
 
 Examples with CLI:
-  $ s cli fc3 remove --region cn-hangzhou --function-name test -a default`,
+  $ s cli fc3 remove --region cn-hangzhou --function-name test -a default
+  $ s cli fc3 remove --regions cn-hangzhou,cn-shanghai --prefix tmp- --output-format jsonl -y -a default`,
     summary: 'Remove resources online',
     option: [
       [
         '--region <region>',
         '[C-Required] Specify fc region, you can see all supported regions in https://help.aliyun.com/document_detail/2512917.html',
       ],
-      ['--function-name <functionName>', '[C-Required] Specify function name'],
+      [
+        '--function-name <functionName>',
+        "[C-Required] Specify function name, multiple names can be split by ',', wildcards '*' and '?' are supported",
+      ],
+      [
+        '--regions <regions>',
+        "[Optional] Run against multiple regions concurrently, multiple regions can be split by ','",
+      ],
+      ['--prefix <prefix>', '[Optional] Run against all functions with the prefix'],
+      [
+        '--output-format <format>',
+        '[Optional] Output format of multiple functions: json (default), jsonl (streamed), table',
+      ],
       [
         '--trigger [triggerName]',
         "[Optional] Only remove trigger only. Specify a trigger name to deploy only the specified trigger; Multiple names can be split by ','; A null value means to delete all triggers",
@@ -81,9 +81,138 @@ export const FC_INSTANCE_EXEC_TIMEOUT: number = parseInt(
   10,
 );
 
+// s instance exec --all/--instance-filter 批量执行时同时打开的连接数
+export const FC_INSTANCE_EXEC_CONCURRENCY: number = parseInt(
+  process.env.FC_INSTANCE_EXEC_CONCURRENCY || '10',
+  10,
+);
+
 export const FC_CONTAINER_ACCELERATED_TIMEOUT: number = parseInt(
   process.env.FC_CONTAINER_ACCELERATED_TIMEOUT || '40',
   10,
 );
 
 export const FC_DEPLOY_RETRY_COUNT = 3;
+
+// 状态轮询的预计完成耗时（秒），接近该时间时按最小间隔查询，避免完成后多等一个退避间隔
+// 镜像加速（函数状态 Pending/InProgress）
+export const FC_FUNCTION_STATE_EXPECTED_WAIT: number = parseInt(
+  process.env.FC_FUNCTION_STATE_EXPECTED_WAIT || '60',
+  10,
+);
+
+// 预留实例、弹性实例扩缩到目标值
+export const FC_INSTANCE_SCALING_EXPECTED_WAIT: number = parseInt(
+  process.env.FC_INSTANCE_SCALING_EXPECTED_WAIT || '30',
+  10,
+);
+
+// 设置 FC_CODE_CACHE_DISABLE=true 关闭代码包缓存，每次部署都重新压缩
+export const FC_CODE_CACHE_DISABLE: boolean = process.env.FC_CODE_CACHE_DISABLE === 'true';
+
+// 部署代码包缓存（~/.s/fc/code-cache）的大小上限，单位 MB，超出后按最近部署时间淘汰
+export const FC_CODE_CACHE_SIZE: number = parseInt(process.env.FC_CODE_CACHE_SIZE || '2048', 10);
+
+// 代码包分片上传配置，分片大小单位为 MB
+export const FC_CODE_UPLOAD_PART_SIZE: number =
+  parseInt(process.env.FC_CODE_UPLOAD_PART_SIZE || '8', 10) * 1024 * 1024;
+
+export const FC_CODE_UPLOAD_PARALLEL: number = parseInt(
+  process.env.FC_CODE_UPLOAD_PARALLEL || '5',
+  10,
+);
+
+// 部署时无依赖关系的资源（触发器、异步配置、自定义域名等）的并发数
+export const FC_DEPLOY_CONCURRENCY: number = parseInt(
+  process.env.FC_DEPLOY_CONCURRENCY || '4',
+  10,
+);
+
+// 触发器创建、更新、删除的并发数，遇到限流时自动降低
+export const FC_TRIGGER_CONCURRENCY: number = parseInt(
+  process.env.FC_TRIGGER_CONCURRENCY || '5',
+  10,
+);
+
+// 单个 API 调用被限流后的重试次数
+export const FC_THROTTLING_RETRY_COUNT = 5;
+
+// info、sync、plan 并发读取远端资源的并发数
+export const FC_REMOTE_FETCH_CONCURRENCY: number = parseInt(
+  process.env.FC_REMOTE_FETCH_CONCURRENCY || '8',
+  10,
+);
+
+// 设置 FC_REMOTE_CACHE_DISABLE=true 关闭部署过程中的远端读取缓存
+export const FC_REMOTE_CACHE_DISABLE: boolean = process.env.FC_REMOTE_CACHE_DISABLE === 'true';
+
+// 历史日志按时间切分为子区间并发查询：子区间长度（秒）与并发数
+export const FC_LOGS_QUERY_WINDOW: number = parseInt(
+  process.env.FC_LOGS_QUERY_WINDOW || '300',
+  10,
+);
+
+export const FC_LOGS_QUERY_CONCURRENCY: number = parseInt(
+  process.env.FC_LOGS_QUERY_CONCURRENCY || '4',
+  10,
+);
+
+// s local invoke --keep-warm 保留的容器空闲超过该时间（秒）后，在下次 local invoke 时清理
+export const FC_LOCAL_WARM_IDLE_TIMEOUT: number = parseInt(
+  process.env.FC_LOCAL_WARM_IDLE_TIMEOUT || '600',
+  10,
+);
+
+// s local 合并后的层缓存（~/.s/layer/merged）的大小上限，单位 MB，超出后按最近使用时间淘汰
+export const FC_LOCAL_LAYER_CACHE_SIZE: number = parseInt(
+  process.env.FC_LOCAL_LAYER_CACHE_SIZE || '4096',
+  10,
+);
+
+// s local 解压 zip/jar/war 代码包的缓存（~/.s/fc/local-code）的大小上限，单位 MB
+export const FC_LOCAL_CODE_CACHE_SIZE: number = parseInt(
+  process.env.FC_LOCAL_CODE_CACHE_SIZE || '2048',
+  10,
+);
+
+// list、info、remove 跨函数/地域批量执行时的并发数
+export const FC_FANOUT_CONCURRENCY: number = parseInt(
+  process.env.FC_FANOUT_CONCURRENCY || '8',
+  10,
+);
+
+// s sync、s layer download 分段下载代码包时的并发连接数
+export const FC_DOWNLOAD_CONCURRENCY: number = parseInt(
+  process.env.FC_DOWNLOAD_CONCURRENCY || '4',
+  10,
+);
+
+// s sync、s layer download 分段下载代码包时每段的大小，单位 MB
+export const FC_DOWNLOAD_PART_SIZE: number = parseInt(
+  process.env.FC_DOWNLOAD_PART_SIZE || '8',
+  10,
+);
+
+// s sync、s layer download 下载代码包时建立连接和两次读取数据之间的超时时间，单位秒，超时后重试
+export const FC_DOWNLOAD_TIMEOUT: number = parseInt(process.env.FC_DOWNLOAD_TIMEOUT || '60', 10);
+
+// s sync 下载的代码包缓存（~/.s/cache/code）的大小上限，单位 MB，超出后按最近使用时间淘汰
+export const FC_DOWNLOAD_CACHE_SIZE: number = parseInt(
+  process.env.FC_DOWNLOAD_CACHE_SIZE || '2048',
+  10,
+);
+
+// 推送镜像前查询镜像仓库 manifest 的超时时间，单位秒，超时后直接推送
+export const FC_REGISTRY_TIMEOUT: number = parseInt(process.env.FC_REGISTRY_TIMEOUT || '5', 10);
+
+// s build 依赖构建缓存（~/.s/cache/build）的大小上限，单位 MB，设置为 0 时不使用缓存
+export const FC_BUILD_CACHE_SIZE: number = parseInt(
+  process.env.FC_BUILD_CACHE_SIZE || '4096',
+  10,
+);
+
+// 已解析的 RAM 角色以及 auto 创建的 VPC/NAS/SLS 资源的本地缓存有效期，单位秒，设置为 0 时不使用缓存
+export const FC_RESOURCE_CACHE_TTL: number = parseInt(
+  process.env.FC_RESOURCE_CACHE_TTL || '86400',
+  10,
+);
@@ -8,35 +8,18 @@ import FC from './resources/fc';
 import Base from './base';
 import logger from './logger';
 
-import BuilderFactory, { BuildType } from './subCommands/build';
-import Local from './subCommands/local';
-import Deploy from './subCommands/deploy';
-import Info from './subCommands/info';
-import Plan from './subCommands/plan';
-import Invoke from './subCommands/invoke';
-import Provision from './subCommands/provision';
-import Scaling from './subCommands/scaling';
-import Layer from './subCommands/layer';
-import Session from './subCommands/session';
-import Instance from './subCommands/instance';
-import Remove from './subCommands/remove';
-import Sync from './subCommands/sync';
-import Version from './subCommands/version';
-import Alias from './subCommands/alias';
-import Concurrency from './subCommands/concurrency';
-import SYaml2To3 from './subCommands/2to3';
-import Logs from './subCommands/logs';
-import List from './subCommands/list';
 import { SCHEMA_FILE_PATH } from './constant';
 import { checkDockerIsOK, isAppCenter, isYunXiao } from './utils';
-import { Model } from './subCommands/model';
 
 (process as any).noDeprecation = true;
 
+// 子命令在调用时才加载，避免 s info、s invoke 等命令加载 SLS、Model、Docker 构建等无关的 SDK
+
 export default class Fc extends Base {
   // 部署函数
   public async deploy(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Deploy } = await import('./subCommands/deploy');
     logger.info(`userAgent: ${inputs.userAgent}`);
     const deploy = new Deploy(inputs);
     const result = await deploy.run();
@@ -47,7 +30,12 @@ export default class Fc extends Base {
 
   public async info(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Info } = await import('./subCommands/info');
 
+    const fanout = Info.parseFanout(inputs);
+    if (fanout) {
+      return await Info.runFanout(inputs, fanout);
+    }
     const info = new Info(inputs);
     const result = await info.run();
     logger.debug(`Get info: ${JSON.stringify(result)}`);
@@ -57,6 +45,7 @@ export default class Fc extends Base {
 
   public async plan(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Plan } = await import('./subCommands/plan');
 
     const plan = new Plan(inputs);
     const result = await plan.run();
@@ -67,72 +56,88 @@ export default class Fc extends Base {
 
   public async invoke(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Invoke } = await import('./subCommands/invoke');
     const invoke = new Invoke(inputs);
     return await invoke.run();
   }
 
   public async sync(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Sync } = await import('./subCommands/sync');
     const sync = new Sync(inputs);
     return await sync.run();
   }
 
   public async remove(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Remove } = await import('./subCommands/remove');
+    const fanout = Remove.parseFanout(inputs);
+    if (fanout) {
+      return await Remove.runFanout(inputs, fanout);
+    }
     const remove = new Remove(inputs);
     return await remove.run();
   }
 
   public async version(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Version } = await import('./subCommands/version');
     const v = new Version(inputs);
     return await v[v.subCommand]();
   }
 
   public async alias(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Alias } = await import('./subCommands/alias');
     const alias = new Alias(inputs);
     return await alias[alias.subCommand]();
   }
 
   public async concurrency(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Concurrency } = await import('./subCommands/concurrency');
     const concurrency = new Concurrency(inputs);
     return await concurrency[concurrency.subCommand]();
   }
 
   public async provision(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Provision } = await import('./subCommands/provision');
     const provision = new Provision(inputs);
     return await provision[provision.subCommand]();
   }
 
   public async scaling(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Scaling } = await import('./subCommands/scaling');
     const scaling = new Scaling(inputs);
     return await scaling[scaling.subCommand]();
   }
 
   public async layer(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Layer } = await import('./subCommands/layer');
     const layer = new Layer(inputs);
     return await layer[layer.subCommand]();
   }
 
   public async session(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Session } = await import('./subCommands/session');
     const session = new Session(inputs);
     return await session[session.subCommand]();
   }
 
   public async instance(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Instance } = await import('./subCommands/instance');
     const instance = new Instance(inputs);
     return await instance[instance.subCommand]();
   }
 
   public async build(inputs: IInputs) {
     await super.handlePreRun(inputs, false);
+    const { default: BuilderFactory, BuildType } = await import('./subCommands/build');
     const build = new BuilderFactory(inputs);
     if (build.findCloudBuildYaml()) {
       return await build.runit();
@@ -162,6 +167,7 @@ export default class Fc extends Base {
 
   public async local(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Local } = await import('./subCommands/local');
     checkDockerIsOK();
 
     const { _: command } = parseArgv(inputs.args);
@@ -181,24 +187,28 @@ export default class Fc extends Base {
 
   public async s2tos3(inputs: IInputs) {
     await super.handlePreRun(inputs, false);
+    const { default: SYaml2To3 } = await import('./subCommands/2to3');
     const trans = new SYaml2To3(inputs);
     return await trans.run();
   }
 
   public async logs(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: Logs } = await import('./subCommands/logs');
     const logs = new Logs(inputs);
     return await logs.run();
   }
 
   public async list(inputs: IInputs) {
     await super.handlePreRun(inputs, true);
+    const { default: List } = await import('./subCommands/list');
     const list = new List(inputs);
     return await list.run();
   }
 
   public async model(inputs: IInputs) {
     await super.handlePreRun(inputs, false);
+    const { Model } = await import('./subCommands/model');
     const model = new Model(inputs);
     logger.debug(`model inputs: ${model.subCommand}`);
     return await model[model.subCommand]();
@@ -134,6 +134,7 @@ export interface IFunction {
   cpu?: number;
   memorySize?: number;
   timeout?: number;
+  instanceConcurrency?: number;
   sessionAffinity?: string;
   sessionAffinityConfig?: ISessionAffinityConfig | string;
   instanceIsolationMode?: string;
@@ -1,7 +1,23 @@
 import { ICredentials } from '@serverless-devs/component-interface';
 import _ from 'lodash';
-import { getDockerTmpUser, getAcrEEInstanceID, getAcrImageMeta } from './login';
-import { runCommand, checkDockerIsOK, sleep } from '../../utils';
+import {
+  IDockerTmpConfig,
+  getDockerTmpUser,
+  getAcrEEInstanceID,
+  getAcrImageMeta,
+  isDockerLoggedIn,
+  recordDockerLogin,
+} from './login';
+import {
+  IRegistryAuth,
+  getLocalRepoDigests,
+  getRemoteManifest,
+  getRepositoryDigests,
+  parseImage,
+} from './registry';
+import { runCommand, checkDockerIsOK } from '../../utils';
+import { waitUntil } from '../../utils/waiter';
+import { addSpanAttr } from '../../utils/profiler';
 import { IRegion } from '../../interface';
 import logger from '../../logger';
 
@@ -77,48 +93,125 @@ export default class Acr {
       instanceID = await Acr.getAcrEEInstanceID(imageUrl, this.credential);
     }
     const image = Acr.vpcImage2InternetImage(imageUrl);
-    const { dockerTmpUser, dockerTmpToken } = await getDockerTmpUser(
-      this.region,
-      this.credential,
-      instanceID,
-    );
+    const dockerTmpConfig = await getDockerTmpUser(this.region, this.credential, instanceID);
+    const auth = {
+      username: dockerTmpConfig.dockerTmpUser,
+      password: dockerTmpConfig.dockerTmpToken,
+    };
+
+    if (await this.isImagePushed(imageUrl, image, auth)) {
+      logger.info(`The digest of ${image} in registry is the same as local, skip push`);
+      return;
+    }
+
     logger.info(`try to docker push ${image} ...`);
+    const start = Date.now();
+    let pushedImage = image;
     try {
       if (image !== imageUrl) {
         const commandStr = `docker tag ${imageUrl} ${image}`;
         await runCommand(commandStr, runCommand.showStdout.inherit);
       }
-      let dockerCmdStr = `echo ${dockerTmpToken} | docker login ${image} --username ${dockerTmpUser} --password-stdin`;
-      if (process.platform === 'win32') {
-        dockerCmdStr = `echo|set /p="${dockerTmpToken}" | docker login ${image} --username ${dockerTmpUser} --password-stdin`;
-      }
-      await runCommand(dockerCmdStr, runCommand.showStdout.inherit);
-
-      dockerCmdStr = `docker push ${image}`;
-      await runCommand(dockerCmdStr, runCommand.showStdout.inherit);
-      logger.debug(`wait 3s to acr image ready`);
-      await sleep(3);
+      await this.dockerPush(image, dockerTmpConfig);
     } catch (err) {
       try {
-        if (image !== imageUrl) {
-          // 尝试推送下 vpc 地址， 可以 s 工具运行在 vpc 内的 ECS 上
-          logger.info(`retry to docker push ${imageUrl} ...`);
-          let dockerCmdStr = `echo ${dockerTmpToken} | docker login ${imageUrl} --username ${dockerTmpUser} --password-stdin`;
-          if (process.platform === 'win32') {
-            dockerCmdStr = `echo|set /p="${dockerTmpToken}" | docker login ${imageUrl} --username ${dockerTmpUser} --password-stdin`;
-          }
-          await runCommand(dockerCmdStr, runCommand.showStdout.inherit);
-
-          dockerCmdStr = `docker push ${imageUrl}`;
-          await runCommand(dockerCmdStr, runCommand.showStdout.inherit);
-          logger.debug(`wait 3s to acr image ready`);
-          await sleep(3);
+        if (image === imageUrl) {
+          throw err;
         }
+        // 尝试推送下 vpc 地址， 可以 s 工具运行在 vpc 内的 ECS 上
+        logger.info(`retry to docker push ${imageUrl} ...`);
+        await this.dockerPush(imageUrl, dockerTmpConfig);
+        pushedImage = imageUrl;
       } catch (err2) {
         logger.error(
           `Fail to push image, if you have already pushed the image, you can use the "--skip-push" option to avoid pushing the image again. for example: s deploy --skip-push`,
         );
+        return;
+      }
+    }
+    await this.waitImageReady(imageUrl, pushedImage, auth, start);
+  }
+
+  /**
+   * 本地镜像记录的 digest 与镜像仓库中 tag 的 digest 一致时无需推送
+   */
+  private async isImagePushed(imageUrl: string, image: string, auth: IRegistryAuth) {
+    const localDigests = getRepositoryDigests(await getLocalRepoDigests(imageUrl), image);
+    if (_.isEmpty(localDigests)) {
+      return false;
+    }
+    try {
+      const manifest = await getRemoteManifest(image, auth);
+      logger.debug(`${image} remote digest: ${manifest?.digest}, local: ${localDigests}`);
+      return Boolean(manifest) && localDigests.includes(manifest.digest);
+    } catch (ex) {
+      logger.debug(`Get remote manifest of ${image} error: ${ex.message}`);
+      return false;
+    }
+  }
+
+  /**
+   * 临时密码未变化时复用已有的 docker login；复用的登录失效导致推送失败时重新登录再推送一次
+   */
+  private async dockerPush(image: string, dockerTmpConfig: IDockerTmpConfig) {
+    const { registry } = parseImage(image);
+    const reuseLogin = isDockerLoggedIn(registry, dockerTmpConfig);
+    if (!reuseLogin) {
+      await this.dockerLogin(image, dockerTmpConfig);
+    }
+    try {
+      await runCommand(`docker push ${image}`, runCommand.showStdout.inherit);
+    } catch (ex) {
+      if (!reuseLogin) {
+        throw ex;
       }
+      logger.debug(`docker push ${image} with cached login error: ${ex.message}, login again`);
+      recordDockerLogin(registry);
+      await this.dockerLogin(image, dockerTmpConfig);
+      await runCommand(`docker push ${image}`, runCommand.showStdout.inherit);
+    }
+  }
+
+  private async dockerLogin(image: string, { dockerTmpUser, dockerTmpToken }: IDockerTmpConfig) {
+    let dockerCmdStr = `echo ${dockerTmpToken} | docker login ${image} --username ${dockerTmpUser} --password-stdin`;
+    if (process.platform === 'win32') {
+      dockerCmdStr = `echo|set /p="${dockerTmpToken}" | docker login ${image} --username ${dockerTmpUser} --password-stdin`;
     }
+    await runCommand(dockerCmdStr, runCommand.showStdout.inherit);
+    recordDockerLogin(parseImage(image).registry, { dockerTmpUser, dockerTmpToken });
+  }
+
+  /**
+   * 轮询镜像仓库直到 tag 指向刚推送的 digest，并输出推送耗时和镜像大小
+   * 无法获取本地 digest 时只等待 tag 可查询
+   */
+  private async waitImageReady(
+    imageUrl: string,
+    pushedImage: string,
+    auth: IRegistryAuth,
+    start: number,
+  ) {
+    const localDigests = getRepositoryDigests(await getLocalRepoDigests(imageUrl), pushedImage);
+    const { done, value: manifest } = await waitUntil(
+      async () => {
+        const remote = await getRemoteManifest(pushedImage, auth).catch((ex) => {
+          logger.debug(`Get remote manifest of ${pushedImage} error: ${ex.message}`);
+          return undefined;
+        });
+        const ready =
+          Boolean(remote) && (_.isEmpty(localDigests) || localDigests.includes(remote.digest));
+        return { done: ready, value: remote };
+      },
+      { name: 'acr image ready', minDelayMs: 500, maxDelayMs: 3000, timeoutMs: 30 * 1000 },
+    );
+    if (!done) {
+      logger.warn(`${pushedImage} is not ready in registry after 30s`);
+    }
+    const seconds = ((Date.now() - start) / 1000).toFixed(1);
+    const size = manifest?.size || 0;
+    addSpanAttr('bytes', size);
+    logger.info(
+      `Pushed ${pushedImage} in ${seconds}s, image size ${(size / 1024 / 1024).toFixed(1)}MB`,
+    );
   }
 }
@@ -3,7 +3,9 @@ import _ from 'lodash';
 import fse from 'fs-extra';
 import * as os from 'os';
 import path from 'path';
+import crypto from 'crypto';
 import random from 'string-random';
+import { getRootHome } from '@serverless-devs/utils';
 import Pop from '@alicloud/pop-core';
 import logger from '../../logger';
 import { ICredentials } from '@serverless-devs/component-interface';
@@ -12,11 +14,49 @@ import { IRegion } from '../../interface';
 // eslint-disable-next-line @typescript-eslint/no-require-imports
 const { ROAClient } = require('@alicloud/pop-core');
 
-interface IDockerTmpConfig {
+export interface IDockerTmpConfig {
   dockerTmpUser: string;
   dockerTmpToken: string;
+  // 临时密码过期时间，毫秒时间戳
+  expireTime?: number;
 }
 
+// 接口未返回过期时间时按 30 分钟处理；距离过期不足 5 分钟时重新获取，避免推送大镜像的过程中过期
+const DEFAULT_TOKEN_TTL = 30 * 60 * 1000;
+const TOKEN_EXPIRE_MARGIN = 5 * 60 * 1000;
+
+/**
+ * tokens: 临时账号缓存，key 为 账号 + AK + 地域 + 实例的哈希，文件权限 600
+ * logins: 已经 docker login 过的 registry 及对应的临时密码哈希
+ */
+type AcrCacheName = 'tokens' | 'logins';
+
+const getCacheFile = (name: AcrCacheName) =>
+  path.join(getRootHome(), 'cache', 'acr', `${name}.json`);
+
+const sha256 = (value: string) => crypto.createHash('sha256').update(value).digest('hex');
+
+function readCache(name: AcrCacheName): Record<string, any> {
+  try {
+    return fse.readJsonSync(getCacheFile(name));
+  } catch (ex) {
+    return {};
+  }
+}
+
+function updateCache(name: AcrCacheName, key: string, value: any) {
+  try {
+    const content = readCache(name);
+    content[key] = value;
+    fse.outputFileSync(getCacheFile(name), JSON.stringify(content, null, 2), { mode: 0o600 });
+  } catch (ex) {
+    logger.debug(`Update acr ${name} cache error: ${ex}`);
+  }
+}
+
+const isTokenValid = (config?: IDockerTmpConfig) =>
+  Boolean(config?.dockerTmpToken) && config.expireTime - TOKEN_EXPIRE_MARGIN > Date.now();
+
 function getAcrClient(region: IRegion, credentials: ICredentials) {
   const acrClient = new ROAClient({
     accessKeyId: credentials?.AccessKeyID,
@@ -60,6 +100,7 @@ async function getAuthorizationToken(region: IRegion, credentials: ICredentials)
   return {
     dockerTmpUser: response?.data?.tempUserName,
     dockerTmpToken: response?.data?.authorizationToken,
+    expireTime: response?.data?.expireDate,
   };
 }
 
@@ -135,6 +176,7 @@ async function getAuthorizationTokenForAcrEE(
   return {
     dockerTmpUser: result.TempUsername,
     dockerTmpToken: result.AuthorizationToken,
+    expireTime: result.ExpireTime,
   };
 }
 
@@ -196,20 +238,47 @@ export async function mockDockerConfigFile(
   await setDockerConfigInformation(dockerConfigPath, fileContent, imageName.split('/')[0], auth);
 }
 
+/**
+ * 获取登录镜像仓库的临时账号，缓存到过期前 5 分钟
+ */
 export async function getDockerTmpUser(
   region: IRegion,
   credentials: ICredentials,
   instanceID: string,
 ): Promise<IDockerTmpConfig> {
+  const key = sha256(
+    [credentials?.AccountID, credentials?.AccessKeyID, region, instanceID || ''].join('/'),
+  );
+  const cached: IDockerTmpConfig = readCache('tokens')[key];
+  if (isTokenValid(cached)) {
+    logger.debug(`Use cached acr temporary user ${cached.dockerTmpUser}`);
+    return cached;
+  }
+
   let dockerTmpConfig: IDockerTmpConfig;
   if (instanceID) {
     dockerTmpConfig = await getAuthorizationTokenForAcrEE(region, credentials, instanceID);
   } else {
     dockerTmpConfig = await getAuthorizationTokenOfRegisrty(region, credentials);
   }
+  dockerTmpConfig.expireTime = dockerTmpConfig.expireTime || Date.now() + DEFAULT_TOKEN_TTL;
+  updateCache('tokens', key, dockerTmpConfig);
   return dockerTmpConfig;
 }
 
+/**
+ * 当前临时密码是否已经 docker login 过该 registry 且未过期
+ */
+export function isDockerLoggedIn(registry: string, config: IDockerTmpConfig): boolean {
+  const login = readCache('logins')[registry];
+  return isTokenValid(config) && login?.token === sha256(config.dockerTmpToken);
+}
+
+export function recordDockerLogin(registry: string, config?: IDockerTmpConfig) {
+  const login = config ? { token: sha256(config.dockerTmpToken) } : undefined;
+  updateCache('logins', registry, login);
+}
+
 export async function getAcrEEInstanceID(
   region: IRegion,
   credentials: ICredentials,
@@ -0,0 +1,137 @@
+import axios from 'axios';
+import crypto from 'crypto';
+import { execFile } from 'child_process';
+import { promisify } from 'util';
+import _ from 'lodash';
+import logger from '../../logger';
+import { FC_REGISTRY_TIMEOUT } from '../../default/config';
+
+const execFileAsync = promisify(execFile);
+
+const MANIFEST_ACCEPT = [
+  'application/vnd.docker.distribution.manifest.v2+json',
+  'application/vnd.docker.distribution.manifest.list.v2+json',
+  'application/vnd.oci.image.manifest.v1+json',
+  'application/vnd.oci.image.index.v1+json',
+].join(', ');
+
+export interface IImageReference {
+  registry: string;
+  // 例如 namespace/repo
+  repository: string;
+  tag: string;
+}
+
+export interface IRegistryAuth {
+  username: string;
+  password: string;
+}
+
+export interface IRemoteManifest {
+  digest: string;
+  // manifest 中记录的 config 与各层大小之和（压缩后），即完整推送时需要传输的字节数
+  size: number;
+}
+
+export function parseImage(image: string): IImageReference {
+  const [registry, ...rest] = image.split('/');
+  const name = rest.join('/');
+  const index = name.lastIndexOf(':');
+  if (index === -1) {
+    return { registry, repository: name, tag: 'latest' };
+  }
+  return { registry, repository: name.substring(0, index), tag: name.substring(index + 1) };
+}
+
+function parseChallenge(challenge: string): Record<string, string> {
+  const params: Record<string, string> = {};
+  const reg = /(\w+)="([^"]*)"/g;
+  let match = reg.exec(challenge);
+  while (match) {
+    params[match[1]] = match[2];
+    match = reg.exec(challenge);
+  }
+  return params;
+}
+
+/**
+ * Registry V2 token 认证：用临时账号换取仓库的 pull 权限 token
+ */
+async function getBearerToken(ref: IImageReference, auth: IRegistryAuth, challenge: string) {
+  const { realm, service } = parseChallenge(challenge);
+  const res = await axios.get(realm, {
+    params: { service, scope: `repository:${ref.repository}:pull` },
+    auth,
+    timeout: FC_REGISTRY_TIMEOUT * 1000,
+  });
+  return res.data.token || res.data.access_token;
+}
+
+/**
+ * 查询镜像仓库中 tag 对应的 manifest，tag 不存在时返回 undefined
+ * 请求超时会抛出异常，调用方按未推送处理，不会阻塞推送
+ */
+export async function getRemoteManifest(
+  image: string,
+  auth: IRegistryAuth,
+): Promise<IRemoteManifest | undefined> {
+  const ref = parseImage(image);
+  const url = `https://${ref.registry}/v2/${ref.repository}/manifests/${ref.tag}`;
+  const options = {
+    headers: { Accept: MANIFEST_ACCEPT } as Record<string, string>,
+    // 保留原始内容，响应头中没有 digest 时按内容计算
+    transformResponse: (data: string) => data,
+    validateStatus: () => true,
+    timeout: FC_REGISTRY_TIMEOUT * 1000,
+  };
+  let res = await axios.get(url, { ...options, auth });
+  const challenge = res.headers['www-authenticate'] || '';
+  if (res.status === 401 && /^bearer/i.test(challenge)) {
+    const token = await getBearerToken(ref, auth, challenge);
+    options.headers.Authorization = `Bearer ${token}`;
+    res = await axios.get(url, options);
+  }
+  if (res.status === 404) {
+    return undefined;
+  }
+  if (res.status !== 200) {
+    throw new Error(`Get manifest of ${image} failed, status ${res.status}`);
+  }
+
+  const manifest = JSON.parse(res.data);
+  const digest =
+    res.headers['docker-content-digest'] ||
+    `sha256:${crypto.createHash('sha256').update(res.data).digest('hex')}`;
+  const blobs = [manifest.config, ...(manifest.layers || manifest.manifests || [])];
+  return { digest, size: _.sumBy(_.compact(blobs), 'size') };
+}
+
+/**
+ * 本地镜像的 RepoDigests，推送或拉取过的仓库才会记录，格式为 registry/namespace/repo@sha256:xxx
+ */
+export async function getLocalRepoDigests(image: string): Promise<string[]> {
+  try {
+    const { stdout } = await execFileAsync('docker', [
+      'image',
+      'inspect',
+      '--format',
+      '{{json .RepoDigests}}',
+      image,
+    ]);
+    return JSON.parse(stdout.trim()) || [];
+  } catch (ex) {
+    logger.debug(`Inspect local image ${image} error: ${ex.message}`);
+    return [];
+  }
+}
+
+/**
+ * 本地镜像在同名仓库中记录的 digest，不区分公网和 vpc 地址
+ */
+export function getRepositoryDigests(repoDigests: string[], image: string): string[] {
+  const { repository } = parseImage(image);
+  return repoDigests
+    .map((repoDigest) => repoDigest.split('@'))
+    .filter(([name]) => parseImage(name).repository === repository)
+    .map(([, digest]) => digest);
+}
@@ -39,6 +39,11 @@ export const isAccessDenied = (ex) => ex.statusCode === 403;
 
 export const isInvalidArgument = (ex) => ex.statusCode === 400;
 
+const THROTTLING_ERROR_CODES = ['TooManyRequests', 'Throttling', 'ThrottlingException'];
+
+export const isThrottling = (ex) =>
+  ex?.statusCode === 429 || THROTTLING_ERROR_CODES.includes(ex?.code);
+
 export const isFailedState = (ex) => {
   if (_.startsWith(ex.message, 'retry to wait function state ok failed reach 3 times')) {
     return true;
@@ -66,6 +66,8 @@ import { IProvision } from '../../../interface/cli-config/provision';
 import * as $Util from '@alicloud/tea-util';
 import { isAppCenter } from '../../../utils';
 import { IScalingConfig } from '../../../interface/scaling_config';
+import { cachedRead, invalidateAfter } from './remote-cache';
+import { traceClient } from '../../../utils/profiler';
 
 // eslint-disable-next-line @typescript-eslint/no-require-imports
 const httpx = require('httpx');
@@ -145,8 +147,9 @@ export default class FC_Client {
       userAgent,
     });
 
-    this.fc20230330Client = new FCClient(config);
-    this.fc20230330InvokeClient = new FCClient(invokeConfig);
+    // --profile 时记录每次 OpenAPI 调用的耗时
+    this.fc20230330Client = traceClient(new FCClient(config), 'fc');
+    this.fc20230330InvokeClient = traceClient(new FCClient(invokeConfig), 'fc');
   }
 
   async createFunction(config: IFunction): Promise<CreateFunctionResponse> {
@@ -164,7 +167,9 @@ export default class FC_Client {
     }
     const runtime = new $Util.RuntimeOptions({});
 
-    return await this.fc20230330Client.createFunctionWithOptions(request, headers, runtime);
+    return await invalidateAfter(this, [`function/${config.functionName}`], () =>
+      this.fc20230330Client.createFunctionWithOptions(request, headers, runtime),
+    );
   }
 
   async updateFunction(config: IFunction): Promise<UpdateFunctionResponse> {
@@ -182,11 +187,16 @@ export default class FC_Client {
     }
     const runtime = new $Util.RuntimeOptions({});
 
-    return await this.fc20230330Client.updateFunctionWithOptions(
-      config.functionName,
-      request,
-      headers,
-      runtime,
+    return await invalidateAfter(
+      this,
+      [`function/${config.functionName}`],
+      () =>
+        this.fc20230330Client.updateFunctionWithOptions(
+          config.functionName,
+          request,
+          headers,
+          runtime,
+        ),
     );
   }
 
@@ -195,17 +205,26 @@ export default class FC_Client {
       body: new CreateTriggerInput(config),
     });
 
-    return await this.fc20230330Client.createTrigger(functionName, request);
+    return await invalidateAfter(
+      this,
+      [`trigger/${functionName}/${config.triggerName}`, `triggers/${functionName}`],
+      () => this.fc20230330Client.createTrigger(functionName, request),
+    );
   }
 
   async removeTrigger(functionName: string, triggerName: string) {
     const headers = {};
     const runtime = new RuntimeOptions({});
-    const result = await this.fc20230330Client.deleteTriggerWithOptions(
-      functionName,
-      triggerName,
-      headers,
-      runtime,
+    const result = await invalidateAfter(
+      this,
+      [`trigger/${functionName}/${triggerName}`, `triggers/${functionName}`],
+      () =>
+        this.fc20230330Client.deleteTriggerWithOptions(
+          functionName,
+          triggerName,
+          headers,
+          runtime,
+        ),
     );
     return result;
   }
@@ -218,7 +237,11 @@ export default class FC_Client {
     const request = new UpdateTriggerRequest({
       body: new UpdateTriggerInput(triggerConfig),
     });
-    return await this.fc20230330Client.updateTrigger(functionName, triggerName, request);
+    return await invalidateAfter(
+      this,
+      [`trigger/${functionName}/${triggerName}`, `triggers/${functionName}`],
+      () => this.fc20230330Client.updateTrigger(functionName, triggerName, request),
+    );
   }
 
   async invokeFunction(
@@ -228,16 +251,21 @@ export default class FC_Client {
       qualifier,
       invokeType,
       asyncTaskId,
+      logType: customLogType,
+      maxIdleConns,
     }: {
       payload?: string;
       qualifier?: string;
       invokeType?: string;
       asyncTaskId?: string;
+      logType?: string;
+      // 批量调用时复用的长连接数
+      maxIdleConns?: number;
     } = {},
   ) {
-    const runtime = new RuntimeOptions({});
+    const runtime = new RuntimeOptions(maxIdleConns ? { keepAlive: true, maxIdleConns } : {});
     // xFcLogType in ['None' , 'Tail'], xFcInvocationType in ['Sync, 'Async', 'Task']
-    let logType = 'Tail';
+    let logType = customLogType || 'Tail';
     if (invokeType === 'Async' || invokeType === 'Task') {
       logType = 'None';
     }
@@ -363,7 +391,13 @@ export default class FC_Client {
 
   async getFunctionProvisionConfig(functionName: string, qualifier: string) {
     const request = new GetProvisionConfigRequest({ qualifier });
-    const result = await this.fc20230330Client.getProvisionConfig(functionName, request);
+    const result = await cachedRead(
+      this,
+      'getProvisionConfig',
+      `provision/${functionName}`,
+      qualifier,
+      () => this.fc20230330Client.getProvisionConfig(functionName, request),
+    );
     const { body } = result.toMap();
     logger.debug(`Get ${functionName}(${qualifier}) provision body: ${JSON.stringify(body)}`);
     if (_.isEmpty(body.functionArn)) {
@@ -374,7 +408,11 @@ export default class FC_Client {
 
   async removeFunctionProvisionConfig(functionName: string, qualifier: string) {
     const request = new DeleteProvisionConfigRequest({ qualifier });
-    const result = await this.fc20230330Client.deleteProvisionConfig(functionName, request);
+    const result = await invalidateAfter(
+      this,
+      [`provision/${functionName}`, `scaling/${functionName}`],
+      () => this.fc20230330Client.deleteProvisionConfig(functionName, request),
+    );
     const { body } = result.toMap();
     logger.debug(
       `Delete ${functionName}(${qualifier}) provision result body: ${JSON.stringify(body)}`,
@@ -388,13 +426,23 @@ export default class FC_Client {
       qualifier,
       body: new PutProvisionConfigInput(config),
     });
-    const result = await this.fc20230330Client.putProvisionConfig(functionName, request);
+    const result = await invalidateAfter(
+      this,
+      [`provision/${functionName}`, `scaling/${functionName}`],
+      () => this.fc20230330Client.putProvisionConfig(functionName, request),
+    );
     const { body } = result.toMap();
     return body;
   }
 
   async getFunctionConcurrency(functionName: string) {
-    const result = await this.fc20230330Client.getConcurrencyConfig(functionName);
+    const result = await cachedRead(
+      this,
+      'getConcurrencyConfig',
+      `concurrency/${functionName}`,
+      undefined,
+      () => this.fc20230330Client.getConcurrencyConfig(functionName),
+    );
     const { body } = result.toMap();
     logger.debug(`list ${functionName} concurrency body: ${JSON.stringify(body)}`);
     return body;
@@ -404,15 +452,18 @@ export default class FC_Client {
     const request = new PutConcurrencyConfigRequest({
       body: new PutConcurrencyInput({ reservedConcurrency }),
     });
-
-    const result = await this.fc20230330Client.putConcurrencyConfig(functionName, request);
+    const result = await invalidateAfter(this, [`concurrency/${functionName}`], () =>
+      this.fc20230330Client.putConcurrencyConfig(functionName, request),
+    );
     const { body } = result.toMap();
 
     return body;
   }
 
   async removeFunctionConcurrency(functionName: string) {
-    const result = await this.fc20230330Client.deleteConcurrencyConfig(functionName);
+    const result = await invalidateAfter(this, [`concurrency/${functionName}`], () =>
+      this.fc20230330Client.deleteConcurrencyConfig(functionName),
+    );
     const { body } = result.toMap();
 
     return body;
@@ -464,12 +515,16 @@ export default class FC_Client {
     });
 
     logger.debug(`putAsyncInvokeConfig config = ${JSON.stringify(request)}`);
-    return await this.fc20230330Client.putAsyncInvokeConfig(functionName, request);
+    return await invalidateAfter(this, [`asyncInvokeConfig/${functionName}`], () =>
+      this.fc20230330Client.putAsyncInvokeConfig(functionName, request),
+    );
   }
 
   async removeAsyncInvokeConfig(functionName: string, qualifier: string) {
     const request = new DeleteAsyncInvokeConfigRequest({ qualifier });
-    const result = await this.fc20230330Client.deleteAsyncInvokeConfig(functionName, request);
+    const result = await invalidateAfter(this, [`asyncInvokeConfig/${functionName}`], () =>
+      this.fc20230330Client.deleteAsyncInvokeConfig(functionName, request),
+    );
     const { body } = result.toMap();
     logger.debug(
       `Delete ${functionName}(${qualifier}) asyncInvokeConfig result body: ${JSON.stringify(body)}`,
@@ -479,11 +534,15 @@ export default class FC_Client {
 
   async createVpcBinding(functionName: string, vpcId: string): Promise<any> {
     const request = new CreateVpcBindingRequest({ body: new CreateVpcBindingInput({ vpcId }) });
-    return await this.fc20230330Client.createVpcBinding(functionName, request);
+    return await invalidateAfter(this, [`vpcBinding/${functionName}`], () =>
+      this.fc20230330Client.createVpcBinding(functionName, request),
+    );
   }
 
   async deleteVpcBinding(functionName: string, vpcId: string): Promise<any> {
-    return await this.fc20230330Client.deleteVpcBinding(functionName, vpcId);
+    return await invalidateAfter(this, [`vpcBinding/${functionName}`], () =>
+      this.fc20230330Client.deleteVpcBinding(functionName, vpcId),
+    );
   }
 
   async listLayers(query: any) {
@@ -614,7 +673,13 @@ export default class FC_Client {
   async getFunctionScalingConfig(functionName: string, qualifier?: string) {
     const request = new GetScalingConfigRequest({ qualifier });
     try {
-      const result = await this.fc20230330Client.getScalingConfig(functionName, request);
+      const result = await cachedRead(
+        this,
+        'getScalingConfig',
+        `scaling/${functionName}`,
+        qualifier,
+        () => this.fc20230330Client.getScalingConfig(functionName, request),
+      );
       const { body } = result.toMap();
       logger.debug(
         `Get ${functionName}(${qualifier}) scaling config body: ${JSON.stringify(body)}`,
@@ -635,14 +700,22 @@ export default class FC_Client {
       qualifier,
       body: new PutScalingConfigInput(config),
     });
-    const result = await this.fc20230330Client.putScalingConfig(functionName, request);
+    const result = await invalidateAfter(
+      this,
+      [`scaling/${functionName}`, `provision/${functionName}`],
+      () => this.fc20230330Client.putScalingConfig(functionName, request),
+    );
     const { body } = result.toMap();
     return body;
   }
 
   async removeFunctionScalingConfig(functionName: string, qualifier: string) {
     const request = new DeleteScalingConfigRequest({ qualifier });
-    const result = await this.fc20230330Client.deleteScalingConfig(functionName, request);
+    const result = await invalidateAfter(
+      this,
+      [`scaling/${functionName}`, `provision/${functionName}`],
+      () => this.fc20230330Client.deleteScalingConfig(functionName, request),
+    );
     const { body } = result.toMap();
     logger.debug(
       `Delete ${functionName}(${qualifier}) scaling config result body: ${JSON.stringify(body)}`,
@@ -659,13 +732,17 @@ export default class FC_Client {
       reason,
       abortOngoingRequest,
     });
-    const result = await this.fc20230330Client.disableFunctionInvocation(functionName, request);
+    const result = await invalidateAfter(this, [`function/${functionName}`], () =>
+      this.fc20230330Client.disableFunctionInvocation(functionName, request),
+    );
     const { body } = result.toMap();
     logger.debug(`DisableFunction ${functionName} result body: ${JSON.stringify(body)}`);
     return body;
   }
   async enableFunctionInvocation(functionName: string) {
-    const result = await this.fc20230330Client.enableFunctionInvocation(functionName);
+    const result = await invalidateAfter(this, [`function/${functionName}`], () =>
+      this.fc20230330Client.enableFunctionInvocation(functionName),
+    );
     const { body } = result.toMap();
     logger.debug(`EnableFunction ${functionName} result body: ${JSON.stringify(body)}`);
     return body;
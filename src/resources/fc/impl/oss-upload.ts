@@ -0,0 +1,158 @@
+/* eslint-disable no-await-in-loop */
+/* eslint no-constant-condition: ["error", { "checkLoops": false }] */
+import crypto from 'crypto';
+import * as fs from 'fs';
+import path from 'path';
+import { getRootHome } from '@serverless-devs/utils';
+import logger from '../../../logger';
+import { isAppCenter } from '../../../utils';
+import {
+  FC_CODE_UPLOAD_PARALLEL,
+  FC_CODE_UPLOAD_PART_SIZE,
+  FC_DEPLOY_RETRY_COUNT,
+} from '../../../default/config';
+
+interface ICheckpointRecord {
+  bucket: string;
+  checkpoint: any;
+}
+
+const RESTART_ERROR_CODES = ['NoSuchUpload', 'InvalidPart', 'AccessDenied', 'InvalidAccessKeyId'];
+
+const checkpointPath = (filePath: string, stat?: fs.Stats): string => {
+  const key = crypto
+    .createHash('sha1')
+    .update(`${filePath}\0${stat?.size}\0${stat?.mtimeMs}`)
+    .digest('hex');
+  return path.join(getRootHome(), 'fc', 'upload-checkpoint', `${key}.json`);
+};
+
+const readCheckpoint = (cptFile: string, bucket: string, stat?: fs.Stats): any => {
+  try {
+    const record: ICheckpointRecord = JSON.parse(fs.readFileSync(cptFile, 'utf-8'));
+    if (
+      record.bucket === bucket &&
+      record.checkpoint?.uploadId &&
+      record.checkpoint?.fileSize === stat?.size
+    ) {
+      return record.checkpoint;
+    }
+  } catch (ex) {
+    // 没有断点记录
+  }
+  return undefined;
+};
+
+const writeCheckpoint = (cptFile: string, bucket: string, checkpoint: any) => {
+  try {
+    fs.mkdirSync(path.dirname(cptFile), { recursive: true });
+    const tmpFile = `${cptFile}.${process.pid}.tmp`;
+    fs.writeFileSync(tmpFile, JSON.stringify({ bucket, checkpoint }));
+    fs.renameSync(tmpFile, cptFile);
+  } catch (ex) {
+    logger.debug(`Unable to save upload checkpoint ${cptFile}: ${ex.message}`);
+  }
+};
+
+const removeCheckpoint = (cptFile: string) => {
+  try {
+    fs.rmSync(cptFile, { force: true });
+  } catch (ex) {
+    logger.debug(`Unable to remove upload checkpoint ${cptFile}: ${ex.message}`);
+  }
+};
+
+const formatSize = (bytes: number) => `${(bytes / (1024 * 1024)).toFixed(2)}MB`;
+
+/**
+ * 分片并发上传文件到 oss，断点记录保存在 ~/.s/fc/upload-checkpoint，中断后再次部署从断点续传
+ * 如果传入 crc64，上传完成后与 oss 服务端计算的 x-oss-hash-crc64ecma 比对，无需再次读取文件
+ * @returns 实际写入的 objectName（续传时沿用断点中的 objectName）
+ */
+export async function multipartUploadFile(
+  ossClient: any,
+  bucket: string,
+  objectName: string,
+  filePath: string,
+  crc64?: string,
+): Promise<string> {
+  let stat: fs.Stats;
+  try {
+    stat = fs.statSync(filePath);
+  } catch (ex) {
+    logger.debug(`Unable to stat ${filePath}: ${ex.message}`);
+  }
+  const fileSize = stat?.size || 0;
+  const cptFile = checkpointPath(filePath, stat);
+  let checkpoint = readCheckpoint(cptFile, bucket, stat);
+  if (checkpoint) {
+    logger.debug(
+      `Resume upload ${filePath} to ${checkpoint.name}, ${checkpoint.doneParts?.length} parts done`,
+    );
+  }
+
+  const startTime = Date.now();
+  let reportedPercent = -1;
+  const progress = async (p: number, cpt: any) => {
+    if (cpt) {
+      checkpoint = cpt;
+      writeCheckpoint(cptFile, bucket, cpt);
+    }
+    const percent = Math.floor(p * 100);
+    if (percent < reportedPercent + 10 && percent !== 100) {
+      return;
+    }
+    reportedPercent = percent;
+    const seconds = Math.max((Date.now() - startTime) / 1000, 0.001);
+    const speed = `${formatSize((fileSize * p) / seconds)}/s`;
+    if (isAppCenter()) {
+      logger.info(`uploading code ${percent}% of ${formatSize(fileSize)}, ${speed}`);
+    } else {
+      logger.spin('uploading', 'code', `${percent}% of ${formatSize(fileSize)}, ${speed}`);
+    }
+  };
+
+  let retry = 0;
+  let result: any;
+  while (true) {
+    try {
+      result = await ossClient.multipartUpload(checkpoint?.name || objectName, filePath, {
+        parallel: FC_CODE_UPLOAD_PARALLEL,
+        partSize: FC_CODE_UPLOAD_PART_SIZE,
+        checkpoint,
+        progress,
+        timeout: 600000, // 10min 每个分片
+      });
+      break;
+    } catch (ex) {
+      logger.debug(`Multipart upload ${filePath} error: ${ex.message}`);
+      if (checkpoint && RESTART_ERROR_CODES.includes(ex.code)) {
+        // 断点已失效（分片任务过期或临时凭证无权写入旧 object），从头上传
+        logger.debug(`Checkpoint is no longer valid, restart upload from the beginning`);
+        checkpoint = undefined;
+        removeCheckpoint(cptFile);
+      } else if (retry >= FC_DEPLOY_RETRY_COUNT) {
+        throw ex;
+      }
+      retry += 1;
+      logger.debug(`Retrying upload ${filePath} ${retry} times`);
+    }
+  }
+  const uploadedName = checkpoint?.name || objectName;
+  removeCheckpoint(cptFile);
+
+  const seconds = (Date.now() - startTime) / 1000;
+  logger.debug(
+    `Uploaded ${formatSize(fileSize)} to ${uploadedName} in ${seconds}s (${formatSize(
+      fileSize / Math.max(seconds, 0.001),
+    )}/s)`,
+  );
+
+  const remoteCrc64 = result?.res?.headers?.['x-oss-hash-crc64ecma'];
+  if (crc64 && remoteCrc64 && remoteCrc64 !== crc64) {
+    throw new Error(
+      `Uploaded code checksum mismatch, local crc64=${crc64}, oss crc64=${remoteCrc64}`,
+    );
+  }
+  return uploadedName;
+}
@@ -0,0 +1,124 @@
+import { AsyncLocalStorage } from 'async_hooks';
+import _ from 'lodash';
+import { ICredentials } from '@serverless-devs/component-interface';
+import logger from '../../../logger';
+import { FC_REMOTE_CACHE_DISABLE } from '../../../default/config';
+
+export interface IRemoteCacheStats {
+  // 命中缓存、节省的 OpenAPI 调用次数
+  hits: number;
+  // 实际发出的 OpenAPI 调用次数
+  misses: number;
+  invalidations: number;
+}
+
+/**
+ * 单次命令内的远端读取缓存：key 为 资源 + API + qualifier
+ * 缓存的是 SDK 原始响应，每次返回深拷贝，调用方对结果的修改不会污染缓存
+ * 并发的相同读取共享同一个请求；失败的请求不缓存
+ */
+export class RemoteCache {
+  readonly stats: IRemoteCacheStats = { hits: 0, misses: 0, invalidations: 0 };
+  private entries = new Map<string, Promise<any>>();
+
+  async get<T>(
+    api: string,
+    resource: string,
+    qualifier: string | undefined,
+    fetcher: () => Promise<T>,
+  ): Promise<T> {
+    const key = `${resource}#${api}#${qualifier || ''}`;
+    let entry = this.entries.get(key);
+    if (entry) {
+      this.stats.hits++;
+      logger.debug(`Remote cache hit: ${key}`);
+    } else {
+      this.stats.misses++;
+      entry = fetcher();
+      this.entries.set(key, entry);
+      entry.catch(() => {
+        if (this.entries.get(key) === entry) {
+          this.entries.delete(key);
+        }
+      });
+    }
+    return _.cloneDeep(await entry);
+  }
+
+  /**
+   * 写操作后清理资源对应的缓存，resource 为前缀匹配，例如 trigger/<functionName>/ 会清理该函数的所有触发器
+   */
+  invalidate(resource: string) {
+    for (const key of Array.from(this.entries.keys())) {
+      if (key.startsWith(resource.endsWith('/') ? resource : `${resource}#`)) {
+        this.entries.delete(key);
+        this.stats.invalidations++;
+      }
+    }
+  }
+}
+
+const storage = new AsyncLocalStorage<RemoteCache>();
+
+/**
+ * 在缓存作用域内执行：作用域内所有 FC 实例共享同一份缓存，作用域外不缓存
+ */
+export async function runWithRemoteCache<T>(cache: RemoteCache, fn: () => Promise<T>): Promise<T> {
+  if (FC_REMOTE_CACHE_DISABLE) {
+    return await fn();
+  }
+  return await storage.run(cache, fn);
+}
+
+export const getRemoteCache = (): RemoteCache | undefined => storage.getStore();
+
+interface ICacheOwner {
+  region: string;
+  credentials: ICredentials;
+}
+
+const cacheResource = ({ region, credentials }: ICacheOwner, resource: string) =>
+  `${credentials?.AccountID}/${region}/${resource}`;
+
+/**
+ * 通过缓存读取远端资源，不在缓存作用域内时直接请求
+ * @param resource 资源路径，例如 function/<functionName>、trigger/<functionName>/<triggerName>
+ */
+export async function cachedRead<T>(
+  owner: ICacheOwner,
+  api: string,
+  resource: string,
+  qualifier: string | undefined,
+  fetcher: () => Promise<T>,
+): Promise<T> {
+  const cache = getRemoteCache();
+  if (!cache) {
+    return await fetcher();
+  }
+  return await cache.get(api, cacheResource(owner, resource), qualifier, fetcher);
+}
+
+export function invalidateCache(owner: ICacheOwner, ...resources: string[]) {
+  const cache = getRemoteCache();
+  if (!cache) {
+    return;
+  }
+  for (const resource of resources) {
+    cache.invalidate(cacheResource(owner, resource));
+  }
+}
+
+/**
+ * 执行写操作，无论成功与否都清理对应资源的缓存（失败时远端也可能已部分变更）
+ */
+export async function invalidateAfter<T>(
+  owner: ICacheOwner,
+  resources: string[],
+  write: () => Promise<T>,
+): Promise<T> {
+  try {
+    return await write();
+  } finally {
+    invalidateCache(owner, ...resources);
+  }
+}
@@ -37,10 +37,12 @@ import { RuntimeOptions } from '@alicloud/tea-util';
 
 import logger from '../../logger';
 import { sleep, removeNullValues, isAppCenter } from '../../utils/index';
+import { waitUntil } from '../../utils/waiter';
 import {
   FC_DEPLOY_RETRY_COUNT,
   FC_INSTANCE_EXEC_TIMEOUT,
   FC_CONTAINER_ACCELERATED_TIMEOUT,
+  FC_FUNCTION_STATE_EXPECTED_WAIT,
 } from '../../default/config';
 
 import FC_Client, { fc2Client } from './impl/client';
@@ -60,12 +62,16 @@ import {
   isFailedState,
   isFunctionStateWaitTimedOut,
   isFunctionScalingConfigError,
+  isThrottling,
 } from './error-code';
 import { isCustomContainerRuntime, isCustomRuntime, computeLocalAuto } from './impl/utils';
 import replaceFunctionConfig from './impl/replace-function-config';
+import { multipartUploadFile } from './impl/oss-upload';
+import { cachedRead, invalidateAfter, invalidateCache } from './impl/remote-cache';
 import { IAlias } from '../../interface/cli-config/alias';
 import { TriggerType } from '../../interface/base';
 import { removeScalingConfigSDK } from '../../subCommands/deploy/utils';
+import { addSpanAttr } from '../../utils/profiler';
 
 export enum GetApiType {
   original = 'original', // 直接返回接口返回值
@@ -84,8 +90,6 @@ export default class FC extends FC_Client {
   async untilFunctionStateOK(config: IFunction, reason: string) {
     const retryInterval = 2;
     const startTime = new Date().getTime();
-    const calculateRetryTime = (minute: number) =>
-      new Date().getTime() - startTime > minute * 60 * 1000;
 
     // 默认重试 3 min
     const maxRetryContainerAcceleratedTime = FC_CONTAINER_ACCELERATED_TIMEOUT;
@@ -120,62 +124,59 @@ export default class FC extends FC_Client {
         }
       }
       let failedTimes = 0; // 初始化失败次数
-      while (true) {
-        const functionMeta = await this.getFunction(
-          config.functionName,
-          GetApiType.simpleUnsupported,
-        );
-        const state = _.get(functionMeta, 'state');
-        const lastUpdateStatus = _.get(functionMeta, 'lastUpdateStatus');
-        logger.debug(
-          `untilFunctionStateOK ==>  function State=${state},  LastUpdateStatus=${lastUpdateStatus}`,
-        );
-        if (state === 'Pending' || lastUpdateStatus === 'InProgress') {
-          if (calculateRetryTime(maxRetryContainerAcceleratedTime)) {
-            throw new Error(
-              `retry to wait function state ok timeout, function State=${state},  LastUpdateStatus=${lastUpdateStatus}`,
-            );
-          }
-          await sleep(retryInterval);
-          if (isAppCenter()) {
-            logger.info(
-              `${
-                config.customContainerConfig.image
-              } optimization is not ready, function state=${state}, lastUpdateStatus=${lastUpdateStatus}, waiting ${
-                (new Date().getTime() - startTime) / 1000
-              } seconds...`,
-            );
-          } else {
-            logger.spin(
-              'checking',
-              `${config.customContainerConfig.image}`,
-              `optimization is not ready, function state=${state}, lastUpdateStatus=${lastUpdateStatus}, waiting ${
-                (new Date().getTime() - startTime) / 1000
-              } seconds...`,
-            );
+      const { done, value } = await waitUntil(
+        async () => {
+          // 轮询状态需要最新的结果，跳过缓存
+          invalidateCache(this, `function/${config.functionName}`);
+          const functionMeta = await this.getFunction(
+            config.functionName,
+            GetApiType.simpleUnsupported,
+          );
+          const state = _.get(functionMeta, 'state');
+          const lastUpdateStatus = _.get(functionMeta, 'lastUpdateStatus');
+          logger.debug(
+            `untilFunctionStateOK ==>  function State=${state},  LastUpdateStatus=${lastUpdateStatus}`,
+          );
+          if (state === 'Pending' || lastUpdateStatus === 'InProgress') {
+            const waiting = `optimization is not ready, function state=${state}, lastUpdateStatus=${lastUpdateStatus}, waiting ${
+              (new Date().getTime() - startTime) / 1000
+            } seconds...`;
+            if (isAppCenter()) {
+              logger.info(`${config.customContainerConfig.image} ${waiting}`);
+            } else {
+              logger.spin('checking', `${config.customContainerConfig.image}`, waiting);
+            }
+            return { done: false, value: { state, lastUpdateStatus } };
           }
-        } else if (state === 'Failed') {
-          failedTimes++;
-          if (failedTimes < 3) {
-            logger.debug(`retry to wait function state ok failed but not reach 3 times.`);
-          } else {
+          if (state === 'Failed') {
+            failedTimes++;
+            if (failedTimes < 3) {
+              logger.debug(`retry to wait function state ok failed but not reach 3 times.`);
+              return { done: false, value: { state, lastUpdateStatus } };
+            }
             throw new Error(
               `retry to wait function state ok failed reach 3 times, function State=${state},  LastUpdateStatus=${lastUpdateStatus}`,
             );
           }
-          await sleep(retryInterval);
-        } else {
-          if (isAppCenter()) {
-            logger.info(`${config.customContainerConfig.image} optimization is ready`);
-          } else {
-            logger.spin(
-              'checked',
-              `${config.customContainerConfig.image}`,
-              `optimization is ready`,
-            );
-          }
-          break;
-        }
+          return { done: true };
+        },
+        {
+          name: 'function-state',
+          minDelayMs: retryInterval * 1000,
+          maxDelayMs: 15 * 1000,
+          expectedMs: FC_FUNCTION_STATE_EXPECTED_WAIT * 1000,
+          timeoutMs: maxRetryContainerAcceleratedTime * 60 * 1000,
+        },
+      );
+      if (!done) {
+        throw new Error(
+          `retry to wait function state ok timeout, function State=${value?.state},  LastUpdateStatus=${value?.lastUpdateStatus}`,
+        );
+      }
+      if (isAppCenter()) {
+        logger.info(`${config.customContainerConfig.image} optimization is ready`);
+      } else {
+        logger.spin('checked', `${config.customContainerConfig.image}`, `optimization is ready`);
       }
     }
   }
@@ -203,8 +204,6 @@ export default class FC extends FC_Client {
 
     // 计算是否超时
     const startTime = new Date().getTime();
-    const calculateRetryTime = (minute: number) =>
-      new Date().getTime() - startTime > minute * 60 * 1000;
 
     if (config?.tags) {
       config.tags = this.tagsToLowerCase(config?.tags);
@@ -340,6 +339,7 @@ export default class FC extends FC_Client {
           throw ex;
         }
         retry += 1;
+        addSpanAttr('retries');
         if (isAppCenter()) {
           const action = needUpdate ? 'update' : 'create';
           logger.info(
@@ -361,8 +361,13 @@ export default class FC extends FC_Client {
 
   /**
    * 创建或者修改触发器
+   * 限流异常直接抛出，由调用方的并发池统一退避重试
+   * @returns 触发器的变更结果：created / updated / unchanged
    */
-  async deployTrigger(functionName: string, config: ITrigger): Promise<void> {
+  async deployTrigger(
+    functionName: string,
+    config: ITrigger,
+  ): Promise<'created' | 'updated' | 'unchanged'> {
     logger.debug(`Deploy trigger use config(${functionName}): ${JSON.stringify(config)}`);
 
     let needUpdate = false;
@@ -380,7 +385,7 @@ export default class FC extends FC_Client {
     if (config.triggerConfig && instanceOfIHttpTriggerConfig(config.triggerConfig)) {
       config.triggerConfig = convertIHttpTriggerConfig(config.triggerConfig);
       if (!validateIHttpTriggerConfig(config.triggerConfig)) {
-        return;
+        return 'unchanged';
       }
     }
 
@@ -395,7 +400,7 @@ export default class FC extends FC_Client {
           logger.debug(`Need create trigger ${id}`);
           try {
             await this.createTrigger(functionName, config);
-            return;
+            return 'created';
           } catch (ex) {
             logger.debug(`Create trigger error: ${ex.message}`);
             if (ex.code !== FC_API_ERROR_CODE.TriggerAlreadyExists) {
@@ -410,20 +415,21 @@ export default class FC extends FC_Client {
         const { triggerType } = config;
         if (UNSUPPORTED_UPDATE_TRIGGER_LIST.includes(triggerType)) {
           logger.warn(`${id} ${triggerType} trigger is no need update!`);
-        } else {
-          await this.updateTrigger(functionName, triggerName, config);
+          return 'unchanged';
         }
-        return;
+        await this.updateTrigger(functionName, triggerName, config);
+        return 'updated';
       } catch (ex) {
         logger.debug(`Deploy trigger error: ${ex}`);
 
         // TODO: 如果是权限问题不重试直接异常
-        if (isAccessDenied(ex) || isInvalidArgument(ex)) {
+        if (isAccessDenied(ex) || isInvalidArgument(ex) || isThrottling(ex)) {
           throw ex;
         } else if (retry > FC_DEPLOY_RETRY_COUNT) {
           throw ex;
         }
         retry += 1;
+        addSpanAttr('retries');
         if (isAppCenter()) {
           const action = needUpdate ? 'update' : 'create';
           logger.info(`retrying ${action} trigger ${this.region}/${id} ${retry} times`);
@@ -443,10 +449,11 @@ export default class FC extends FC_Client {
   }
 
   /**
-   * 上传代码包到临时 oss
+   * 上传代码包到临时 oss，分片并发上传并支持断点续传
    */
   async uploadCodeToTmpOss(
     zipFile: string,
+    crc64?: string,
   ): Promise<{ ossBucketName: string; ossObjectName: string }> {
     const client = fc2Client(this.region, this.credentials, this.customEndpoint);
 
@@ -493,8 +500,13 @@ export default class FC extends FC_Client {
         };
       },
     });
-    const ossObjectName = `${client.accountid}/${objectName}`;
-    await (ossClient as any).put(ossObjectName, path.normalize(zipFile));
+    const ossObjectName = await multipartUploadFile(
+      ossClient,
+      ossBucket,
+      `${client.accountid}/${objectName}`,
+      path.normalize(zipFile),
+      crc64,
+    );
 
     const config = { ossBucketName: ossBucket, ossObjectName };
     logger.debug(`tempCodeBucketToken response: ${JSON.stringify(config)}`);
@@ -510,7 +522,13 @@ export default class FC extends FC_Client {
     qualifier?: string,
   ): Promise<GetFunctionResponse | Record<string, any>> {
     const getFunctionRequest = new GetFunctionRequest({ qualifier });
-    const result = await this.fc20230330Client.getFunction(functionName, getFunctionRequest);
+    const result = await cachedRead(
+      this,
+      'getFunction',
+      `function/${functionName}`,
+      qualifier,
+      () => this.fc20230330Client.getFunction(functionName, getFunctionRequest),
+    );
     logger.debug(`Get function ${functionName} response:`);
     logger.debug(result);
 
@@ -607,11 +625,13 @@ export default class FC extends FC_Client {
   ): Promise<any> {
     const runtime = new RuntimeOptions({});
     const headers: { [key: string]: string } = {};
-    const result = await this.fc20230330Client.getTriggerWithOptions(
-      functionName,
-      triggerName,
-      headers,
-      runtime,
+    const result = await cachedRead(
+      this,
+      'getTrigger',
+      `trigger/${functionName}/${triggerName}`,
+      undefined,
+      () =>
+        this.fc20230330Client.getTriggerWithOptions(functionName, triggerName, headers, runtime),
     );
     if (type === GetApiType.original) {
       return result;
@@ -728,7 +748,7 @@ export default class FC extends FC_Client {
     disable_list_remote_alb_triggers: string,
   ) {
     let nextToken: string;
-    const limit = 10;
+    const limit = 100;
     const triggers: any[] = [];
 
     while (true) {
@@ -738,15 +758,20 @@ export default class FC extends FC_Client {
         'x-fc-disable-list-remote-eb-triggers': disable_list_remote_eb_triggers || 'false',
         'x-fc-disable-list-remote-alb-triggers': disable_list_remote_alb_triggers || 'false',
       };
-      logger.info(`listTriggers headers: ${JSON.stringify(headers, null, 2)}`);
-      const result = await this.fc20230330Client.listTriggersWithOptions(
-        functionName,
-        request,
-        headers,
-        runtime,
+      logger.debug(`listTriggers headers: ${JSON.stringify(headers)}`);
+      const result = await cachedRead(
+        this,
+        'listTriggers',
+        `triggers/${functionName}`,
+        `${headers['x-fc-disable-list-remote-eb-triggers']}|${
+          headers['x-fc-disable-list-remote-alb-triggers']
+        }|${nextToken || ''}`,
+        () => this.fc20230330Client.listTriggersWithOptions(functionName, request, headers, runtime),
       );
-      logger.info(`listTriggers result: ${JSON.stringify(result, null, 2)}`);
       const { body } = result.toMap();
+      logger.debug(
+        `listTriggers got ${body.triggers?.length} triggers, nextToken: ${body.nextToken}`,
+      );
       triggers.push(...body.triggers);
       if (!body.nextToken) {
         // eslint-disable-next-line prefer-const
@@ -778,11 +803,13 @@ export default class FC extends FC_Client {
     const runtime = new RuntimeOptions({});
     const headers: { [key: string]: string } = {};
     const req = new GetAsyncInvokeConfigRequest({ qualifier });
-    const result = await this.fc20230330Client.getAsyncInvokeConfigWithOptions(
-      functionName,
-      req,
-      headers,
-      runtime,
+    const result = await cachedRead(
+      this,
+      'getAsyncInvokeConfig',
+      `asyncInvokeConfig/${functionName}`,
+      qualifier,
+      () =>
+        this.fc20230330Client.getAsyncInvokeConfigWithOptions(functionName, req, headers, runtime),
     );
     if (type === GetApiType.original) {
       return result;
@@ -825,7 +852,13 @@ export default class FC extends FC_Client {
     functionName: string,
     type: `${GetApiType}` = GetApiType.original,
   ): Promise<any> {
-    const result = await this.fc20230330Client.listVpcBindings(functionName);
+    const result = await cachedRead(
+      this,
+      'listVpcBindings',
+      `vpcBinding/${functionName}`,
+      undefined,
+      () => this.fc20230330Client.listVpcBindings(functionName),
+    );
     if (type === GetApiType.original) {
       return result;
     }
@@ -971,6 +1004,96 @@ export default class FC extends FC_Client {
     });
   }
 
+  /**
+   * 非交互式执行命令：不占用本地 stdin 和 tty，输出通过回调返回，连接关闭后 resolve
+   * 超过 timeout（秒）未结束时主动关闭连接并 reject
+   */
+  async execInstanceCommand(
+    functionName: string,
+    instanceId: string,
+    rawData: string[],
+    qualifier: string,
+    {
+      onStdout,
+      onStderr,
+      timeout = FC_INSTANCE_EXEC_TIMEOUT,
+    }: {
+      onStdout: (data: Buffer) => void;
+      onStderr: (data: Buffer) => void;
+      timeout?: number;
+    },
+  ): Promise<void> {
+    const client = fc2Client(this.region, this.credentials, this.customEndpoint) as any;
+    client.version = '2023-03-30';
+    const queries = {
+      FC_INSTANCE_EXEC_TIMEOUT: timeout,
+      stdin: 'false',
+      tty: 'false',
+      stdout: 'true',
+      stderr: 'true',
+      command: rawData,
+      qualifier,
+    };
+    logger.debug(`${instanceId} command-exec command:\n${JSON.stringify(queries, null, 2)}`);
+
+    await new Promise<void>((resolve, reject) => {
+      const ws = client.websocket(
+        `/functions/${functionName}/instances/${instanceId}/exec`,
+        queries,
+      );
+      let failed: Error;
+      const ticker = setInterval(() => {
+        try {
+          ws.ping();
+        } catch (e) {
+          ws.close();
+        }
+      }, 5000);
+      const timer = setTimeout(() => {
+        failed = new Error(`Exec in instance ${instanceId} timed out after ${timeout}s`);
+        ws.close();
+      }, timeout * 1000);
+
+      ws.on('unexpected-response', (req, incoming) => {
+        let data = [];
+        incoming.on('data', (chunk) => {
+          data = data.concat(chunk);
+        });
+        incoming.on('end', () => {
+          try {
+            failed = new Error(JSON.parse(data.toString()).ErrorMessage);
+          } catch (ex) {
+            failed = new Error(`Exec in instance ${instanceId} failed: ${data.toString()}`);
+          }
+          ws.close();
+        });
+      });
+      ws.on('error', (e) => {
+        failed = failed || e;
+      });
+      ws.on('close', () => {
+        clearInterval(ticker);
+        clearTimeout(timer);
+        if (failed) {
+          reject(failed);
+        } else {
+          resolve();
+        }
+      });
+      ws.on('ping', (data) => ws.pong(data));
+      ws.on('message', (message) => {
+        if (!!message && message.length >= 2) {
+          const data = message.slice(1);
+          if (message[0] === 1) {
+            onStdout(data);
+          } else if (message[0] === 2) {
+            onStderr(data);
+          }
+        }
+      });
+    });
+  }
+
   async createFunctionSession(functionName: string, config: any) {
     let nasConfig: NASConfig | undefined;
     if (config.nasConfig && !_.isEmpty(config.nasConfig.mountPoints)) {
@@ -1257,7 +1380,9 @@ export default class FC extends FC_Client {
         resourceType: 'function',
       }),
     });
-    const result = await this.fc20230330Client.changeResourceGroup(request);
+    const result = await invalidateAfter(this, [`function/${functionName}`], () =>
+      this.fc20230330Client.changeResourceGroup(request),
+    );
     const { statusCode } = result.toMap();
     if (statusCode === 200) {
       logger.debug(`changeResourceGroup success`);
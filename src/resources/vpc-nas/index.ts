@@ -94,6 +94,38 @@ export default class VpcNas {
     return VPC_AND_NAS_NAME;
   }
 
+  /**
+   * 轻量校验缓存的 auto 资源是否仍然存在：VPC 以及 NAS 文件系统各查询一次
+   */
+  async isDeployed(result: { vpcConfig?: IVpcConfig; fileSystemId?: string }): Promise<boolean> {
+    const requestOption = {
+      method: 'POST',
+      formatParams: false,
+    };
+    const vpcId = result?.vpcConfig?.vpcId;
+    if (vpcId) {
+      const vpc: any = await this.vpcClient.request(
+        'DescribeVpcAttribute',
+        { RegionId: this.region, VpcId: vpcId },
+        requestOption,
+      );
+      if (vpc?.VpcId !== vpcId) {
+        return false;
+      }
+    }
+    if (result?.fileSystemId) {
+      const nas: any = await this.client.request(
+        'DescribeFileSystems',
+        { RegionId: this.region, FileSystemId: result.fileSystemId },
+        requestOption,
+      );
+      if (!nas?.TotalCount) {
+        return false;
+      }
+    }
+    return true;
+  }
+
   async deploy({
     nasAuto,
     vpcConfig,
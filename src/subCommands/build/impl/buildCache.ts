@@ -0,0 +1,167 @@
+import path from 'path';
+import crypto from 'crypto';
+import * as fs from 'fs-extra';
+import { getRootHome } from '@serverless-devs/utils';
+import logger from '../../../logger';
+import { ICacheEntry, evictLeastRecentlyUsed, getPathSize } from '../../../utils/cache-eviction';
+
+interface IBuildCacheMeta {
+  // 缓存的依赖目录，相对于代码目录
+  dirs: string[];
+  runtime: string;
+  image: string;
+  // 依赖目录的文件大小之和，单位 byte
+  size: number;
+  lastUsed: number;
+}
+
+// 影响依赖安装结果的清单文件，内容变化时缓存失效
+export const BUILD_MANIFEST_FILES = [
+  'apt-get.list',
+  'requirements.txt',
+  'package.json',
+  'package-lock.json',
+  'npm-shrinkwrap.json',
+  'yarn.lock',
+  'composer.json',
+  'composer.lock',
+  'pom.xml',
+];
+
+export const getBuildCacheBaseDir = () => path.join(getRootHome(), 'cache', 'build');
+
+// maven 本地仓库，挂载到构建容器中复用已下载的依赖，与依赖目录一起计入构建缓存的大小
+export const getMavenRepositoryCacheDir = () => path.join(getBuildCacheBaseDir(), 'm2');
+
+const getMetaFile = (dir: string) => `${dir}.json`;
+
+/**
+ * 使用 maven 本地仓库前调用，记录最近使用时间，返回仓库目录
+ */
+export function useMavenRepositoryCache(): string {
+  const dir = getMavenRepositoryCacheDir();
+  fs.ensureDirSync(dir);
+  fs.writeJsonSync(getMetaFile(dir), { lastUsed: Date.now() });
+  return dir;
+}
+
+function readMeta(dir: string): IBuildCacheMeta | undefined {
+  try {
+    return fs.readJsonSync(getMetaFile(dir));
+  } catch (ex) {
+    return undefined;
+  }
+}
+
+/**
+ * 计算构建缓存的 key：运行时、构建镜像、构建命令以及清单文件的内容
+ * @param buildDir 代码目录
+ * @param parts 运行时、构建镜像、构建命令等影响构建结果的参数
+ */
+export function getBuildCacheKey(buildDir: string, parts: string[]): string {
+  const hash = crypto.createHash('sha256');
+  for (const part of parts) {
+    hash.update(`${part}\n`);
+  }
+  for (const name of BUILD_MANIFEST_FILES) {
+    const file = path.join(buildDir, name);
+    if (fs.existsSync(file)) {
+      hash.update(`${name}\n`);
+      hash.update(fs.readFileSync(file));
+    }
+  }
+  return hash.digest('hex').slice(0, 32);
+}
+
+/**
+ * 命中缓存时将依赖目录复制回代码目录，返回恢复的目录；未命中时返回 undefined
+ */
+export function restoreBuildCache(key: string, buildDir: string): string[] | undefined {
+  const dir = path.join(getBuildCacheBaseDir(), key);
+  const meta = readMeta(dir);
+  if (!meta || !fs.existsSync(dir)) {
+    return undefined;
+  }
+  for (const name of meta.dirs) {
+    const target = path.join(buildDir, name);
+    fs.removeSync(target);
+    fs.copySync(path.join(dir, name), target);
+  }
+  fs.writeJsonSync(getMetaFile(dir), { ...meta, lastUsed: Date.now() });
+  return meta.dirs;
+}
+
+/**
+ * 构建完成后保存依赖目录，先复制到临时目录再原子重命名
+ * @param maxCacheSize 缓存大小上限，单位 MB
+ */
+export function saveBuildCache(
+  key: string,
+  buildDir: string,
+  dirs: string[],
+  meta: { runtime: string; image: string },
+  maxCacheSize: number,
+) {
+  const dir = path.join(getBuildCacheBaseDir(), key);
+  const existDirs = dirs.filter((name) => fs.existsSync(path.join(buildDir, name)));
+  if (existDirs.length === 0 || readMeta(dir)) {
+    return;
+  }
+
+  const tmpDir = `${dir}.tmp-${process.pid}-${Date.now()}`;
+  try {
+    for (const name of existDirs) {
+      fs.copySync(path.join(buildDir, name), path.join(tmpDir, name));
+    }
+    fs.removeSync(dir);
+    fs.renameSync(tmpDir, dir);
+    const size = getPathSize(dir);
+    fs.writeJsonSync(getMetaFile(dir), { ...meta, dirs: existDirs, size, lastUsed: Date.now() });
+    const sizeInMB = (size / 1024 / 1024).toFixed(1);
+    logger.info(`Build cache saved: ${existDirs.join(', ')} (${sizeInMB}MB)`);
+  } catch (ex) {
+    fs.removeSync(tmpDir);
+    logger.debug(`Save build cache ${dir} error: ${ex}`);
+    return;
+  }
+  evictBuildCache(maxCacheSize, dir);
+}
+
+/**
+ * 构建缓存（包括 maven 本地仓库）超过上限时，按最近使用时间从旧到新淘汰
+ * @param maxCacheSize 单位 MB
+ * @param keepDir 当前正在使用的目录，不会被淘汰
+ */
+export function evictBuildCache(maxCacheSize: number, keepDir?: string) {
+  const baseDir = getBuildCacheBaseDir();
+  if (!fs.existsSync(baseDir)) {
+    return;
+  }
+  const m2Dir = getMavenRepositoryCacheDir();
+  const remove = (dir: string) => () => {
+    fs.removeSync(getMetaFile(dir));
+    fs.removeSync(dir);
+  };
+  const entries: ICacheEntry[] = fs
+    .readdirSync(baseDir)
+    .filter((name) => name.endsWith('.json'))
+    .map((name) => path.join(baseDir, path.basename(name, '.json')))
+    .filter((dir) => dir !== m2Dir)
+    .map((dir) => ({ dir, meta: readMeta(dir) }))
+    .filter(({ meta }) => meta)
+    .map(({ dir, meta }) => ({
+      path: dir,
+      size: meta.size,
+      lastUsed: meta.lastUsed,
+      remove: remove(dir),
+    }));
+  if (fs.existsSync(m2Dir)) {
+    entries.push({
+      path: m2Dir,
+      size: getPathSize(m2Dir),
+      lastUsed: readMeta(m2Dir)?.lastUsed || fs.statSync(m2Dir).mtimeMs,
+      remove: remove(m2Dir),
+    });
+  }
+  evictLeastRecentlyUsed('build', entries, maxCacheSize, keepDir ? [keepDir] : []);
+}
@@ -14,6 +14,15 @@ import chalk from 'chalk';
 import { v4 as uuidV4 } from 'uuid';
 import tmpDir from 'temp-dir';
 import * as fs from 'fs-extra';
+import {
+  evictBuildCache,
+  getBuildCacheKey,
+  getMavenRepositoryCacheDir,
+  restoreBuildCache,
+  saveBuildCache,
+  useMavenRepositoryCache,
+} from './buildCache';
+import { FC_BUILD_CACHE_SIZE } from '../../../default/config';
 
 export class DefaultBuilder extends Builder {
   private opts: any;
@@ -22,7 +31,7 @@ export class DefaultBuilder extends Builder {
     super(inputs);
     const opts = parseArgv(inputs.args, {
       alias: { help: 'h' },
-      boolean: ['help', 'use-sandbox', 'publish-layer'],
+      boolean: ['help', 'use-sandbox', 'publish-layer', 'disable-build-cache'],
       string: ['custom-env', 'custom-args', 'command', 'script-file'],
     });
     this.opts = opts;
@@ -70,12 +79,13 @@ export class DefaultBuilder extends Builder {
       return await runCommand(dockerCmdStr, runCommand.showStdout.inherit);
     }
     let shellScript = '';
+    let tasks: string[] = [];
     if (this.opts['command']) {
       shellScript = `"${this.opts['command']}"`;
     } else if (this.opts['script-file']) {
       shellScript = undefined;
     } else {
-      let tasks = this.getBuildTasks();
+      tasks = this.getBuildTasks();
       logger.debug(`DefaultBuilder tasks=${JSON.stringify(tasks)}`);
       if (_.isEmpty(tasks)) {
         logger.info('No need build for this project.');
@@ -84,21 +94,60 @@ export class DefaultBuilder extends Builder {
       shellScript = `"${tasks.join(' && ')}"`;
     }
 
-    if (isAppCenter() || isYunXiao()) {
+    const isLocalShell = isAppCenter() || isYunXiao();
+    const image = isLocalShell ? 'local' : await this.getRuntimeBuildImage();
+    const cacheDirs = this.getBuildCacheDirs(tasks);
+    let cacheKey: string;
+    if (cacheDirs) {
+      cacheKey = getBuildCacheKey(buildDir, [
+        this.getRuntime(),
+        image,
+        tasks.join(' && '),
+        _.get(this.opts, 'custom-env', ''),
+      ]);
+      const startTime = Date.now();
+      const restored = restoreBuildCache(cacheKey, buildDir);
+      if (restored) {
+        logger.info(
+          `Build cache hit, restored ${restored.join(', ')} in ${Date.now() - startTime}ms`,
+        );
+        if (this.opts['publish-layer']) {
+          await this.handle_publish_layer();
+        }
+        return;
+      }
+      logger.info('Build cache miss, installing dependencies');
+    }
+
+    if (isLocalShell) {
       let cmdStr = `bash -c`;
       if (this.opts['script-file']) {
         cmdStr = `bash ${this.opts['script-file']}`;
       }
       await runCommand(cmdStr, runCommand.showStdout.pipe, shellScript, buildDir);
     } else {
-      let dockerCmdStr = `docker run --platform linux/amd64 --rm ${this.getCustomEnvStr()} -v ${buildDir}:/code ${await this.getRuntimeBuildImage()} bash -c`;
+      const mavenMountStr = this.getMavenCacheMountStr(tasks);
+      const dockerRunStr = `docker run --platform linux/amd64 --rm ${this.getCustomEnvStr()}${mavenMountStr} -v ${buildDir}:/code ${image}`;
+      let dockerCmdStr = `${dockerRunStr} bash -c`;
       if (this.opts['script-file']) {
-        dockerCmdStr = `docker run --platform linux/amd64 --rm ${this.getCustomEnvStr()} -v ${buildDir}:/code ${await this.getRuntimeBuildImage()} bash ${
-          this.opts['script-file']
-        }`;
+        dockerCmdStr = `${dockerRunStr} bash ${this.opts['script-file']}`;
       }
       logger.debug(`shellScript = ${shellScript}`);
       await runCommand(dockerCmdStr, runCommand.showStdout.pipe, shellScript, buildDir);
+      if (mavenMountStr) {
+        // maven 本地仓库不经过 saveBuildCache，构建后单独检查缓存大小
+        evictBuildCache(FC_BUILD_CACHE_SIZE, getMavenRepositoryCacheDir());
+      }
+    }
+
+    if (cacheKey) {
+      saveBuildCache(
+        cacheKey,
+        buildDir,
+        cacheDirs,
+        { runtime: this.getRuntime(), image },
+        FC_BUILD_CACHE_SIZE,
+      );
     }
 
     if (this.opts['publish-layer']) {
@@ -106,6 +155,39 @@ export class DefaultBuilder extends Builder {
     }
   }
 
+  /**
+   * 默认构建任务安装依赖的目录，命中构建缓存时直接恢复
+   * 自定义命令、脚本以及 mvn package 等产物依赖源码的任务不缓存，返回 undefined
+   */
+  getBuildCacheDirs(tasks: string[]): string[] | undefined {
+    if (_.isEmpty(tasks) || this.opts['disable-build-cache'] || FC_BUILD_CACHE_SIZE <= 0) {
+      return undefined;
+    }
+    const dirs: string[] = [];
+    for (const task of tasks) {
+      if (task.startsWith('apt-get-install ')) {
+        dirs.push('apt-archives');
+      } else if (task.startsWith('pip install ')) {
+        dirs.push(buildPythonLocalPath);
+      } else if (task.startsWith('npm install')) {
+        dirs.push('node_modules');
+      } else if (task.startsWith('composer install')) {
+        dirs.push('vendor');
+      } else {
+        return undefined;
+      }
+    }
+    return dirs;
+  }
+
+  // mvn package 无法缓存产物，挂载本地 maven 仓库以复用已下载的依赖
+  getMavenCacheMountStr(tasks: string[]): string {
+    if (this.opts['disable-build-cache'] || !tasks.some((task) => task.startsWith('mvn '))) {
+      return '';
+    }
+    return ` -v ${useMavenRepositoryCache()}:/root/.m2`;
+  }
+
   public async handle_publish_layer() {
     logger.debug('publish layer .......');
     const region = this.getRegion();
@@ -10,7 +10,11 @@ import { getRootHome } from '@serverless-devs/utils';
 
 import logger from '../../../logger';
 import { IFunction, IInputs } from '../../../interface';
-import { FC_RESOURCES_EMPTY_CONFIG } from '../../../default/config';
+import {
+  FC_CODE_CACHE_DISABLE,
+  FC_CODE_CACHE_SIZE,
+  FC_RESOURCES_EMPTY_CONFIG,
+} from '../../../default/config';
 import Acr from '../../../resources/acr';
 import Sls from '../../../resources/sls';
 import { RamClient } from '../../../resources/ram';
@@ -25,8 +29,11 @@ import {
   checkFcDir,
   _downloadFromUrl,
 } from '../../../utils';
+import CodeCache, { evictCodeCache } from '../../../utils/code-cache';
 import OSS from '../../../resources/oss';
 import { setNodeModulesBinPermissions } from '../../../resources/fc/impl/utils';
+import { traceSpan } from '../../../utils/profiler';
+import { cachedResource } from '../../../utils/resource-cache';
 
 type IType = 'code' | 'config' | boolean;
 interface IOpts {
@@ -128,10 +135,12 @@ export default class Service extends Base {
       logger.debug('sessionAffinityConfig', config.sessionAffinityConfig);
       config.sessionAffinityConfig = JSON.stringify(config.sessionAffinityConfig);
     }
-    await this.fcSdk.deployFunction(config, {
-      slsAuto: !_.isEmpty(this.createResource.sls),
-      type: this.type,
-    });
+    await traceSpan('deployFunction', 'stage', () =>
+      this.fcSdk.deployFunction(config, {
+        slsAuto: !_.isEmpty(this.createResource.sls),
+        type: this.type,
+      }),
+    );
     return this.needDeploy;
   }
 
@@ -257,7 +266,7 @@ export default class Service extends Base {
       throw new Error('CustomContainerRuntime must have a valid image URL');
     }
     if (Acr.isAcrRegistry(image)) {
-      await this._getAcr().pushAcr(image);
+      await traceSpan('pushAcr', 'image', () => this._getAcr().pushAcr(image));
     } else {
       logger.info(
         'By default, the push is skipped if the image is not from an ACR (Aliyun Container Registry) registry.',
@@ -298,8 +307,28 @@ export default class Service extends Base {
     logger.debug(`Need zip file: ${needZip}`);
 
     let generateZipFilePath = '';
+    let crc64Value: string;
+    let codeCache: CodeCache;
     if (needZip) {
       setNodeModulesBinPermissions(zipPath);
+      if (!FC_CODE_CACHE_DISABLE) {
+        const cacheKey = `${this.inputs.props.region}_${this.local.functionName}`;
+        codeCache = new CodeCache(zipPath, cacheKey);
+        try {
+          await codeCache.scan();
+          const cached = codeCache.lookup();
+          if (cached) {
+            logger.debug(`Code is not changed, reuse cached zip file: ${cached.zipFile}`);
+            zipPath = cached.zipFile;
+            crc64Value = cached.crc64;
+          }
+        } catch (ex) {
+          logger.debug(`Unable to use code cache: ${ex.message}`);
+          codeCache = undefined;
+        }
+      }
+    }
+    if (needZip && !crc64Value) {
       const zipConfig = {
         codeUri: zipPath,
         outputFileName: `${this.inputs.props.region}_${this.local.functionName}_${Date.now()}`,
@@ -308,7 +337,12 @@ export default class Service extends Base {
         logger: logger.instance,
       };
       const start = new Date();
-      generateZipFilePath = (await zip(zipConfig)).outputFile;
+      generateZipFilePath = await traceSpan('zip', 'file', async (span) => {
+        const { outputFile } = await zip(zipConfig);
+        // eslint-disable-next-line no-param-reassign
+        span.attrs.bytes = fs.statSync(outputFile).size;
+        return outputFile;
+      });
       const end = new Date();
       const milliseconds = end.getTime() - start.getTime();
       logger.debug(`压缩程序执行时间: ${milliseconds / 1000}s`);
@@ -318,13 +352,32 @@ export default class Service extends Base {
     // debug show zip file size
     getFileSize(zipPath);
 
-    const crc64Value = await calculateCRC64(zipPath);
+    if (!crc64Value) {
+      crc64Value = await traceSpan('crc64', 'file', () => calculateCRC64(zipPath));
+    }
+    if (codeCache && generateZipFilePath) {
+      try {
+        zipPath = codeCache.save(generateZipFilePath, crc64Value);
+        generateZipFilePath = '';
+        evictCodeCache(FC_CODE_CACHE_SIZE, codeCache.cacheDir);
+      } catch (ex) {
+        logger.debug(`Unable to save code cache: ${ex.message}`);
+        codeCache.invalidate();
+      }
+    }
     logger.debug(`code zip crc64=${crc64Value}; codeChecksum=${this.codeChecksum}`);
     if (this.codeChecksum) {
       if (this.codeChecksum === crc64Value) {
         logger.debug(
           yellow(`skip uploadCode because code is no changed, codeChecksum=${crc64Value}`),
         );
+        if (generateZipFilePath) {
+          try {
+            fs.rmSync(generateZipFilePath);
+          } catch (ex) {
+            logger.debug(`Unable to remove zip file: ${generateZipFilePath}`);
+          }
+        }
         if (downloadedTempFile) {
           try {
             logger.debug(`Removing temp download dir: ${downloadedTempFile}`);
@@ -338,7 +391,11 @@ export default class Service extends Base {
         logger.debug(`\x1b[33mcodeChecksum from ${this.codeChecksum} to ${crc64Value}\x1b[0m`);
       }
     }
-    const ossConfig = await this.fcSdk.uploadCodeToTmpOss(zipPath);
+    const ossConfig = await traceSpan('uploadCode', 'file', (span) => {
+      // eslint-disable-next-line no-param-reassign
+      span.attrs.bytes = fs.statSync(zipPath).size;
+      return this.fcSdk.uploadCodeToTmpOss(zipPath, crc64Value);
+    });
     logger.debug('ossConfig: ', ossConfig);
     _.set(this.local, 'code', ossConfig);
 
@@ -374,10 +431,16 @@ export default class Service extends Base {
     logger.debug(
       `Deploy auto compute local auto, nasAuto: ${nasAuto}; vpcAuto: ${vpcAuto}; slsAuto: ${slsAuto}; roleAuto: ${roleAuto}; ossAuto: ${ossAuto}`,
     );
+    // 角色及 auto 资源的解析结果按账号 + 地域缓存，见 utils/resource-cache
+    const accountID = (credential as ICredentials)?.AccountID;
 
     if (slsAuto) {
       const sls = new Sls(region, credential as ICredentials);
-      const { project, logstore } = await sls.deploy();
+      const projectName = Sls.generateProjectName(region, accountID);
+      const slsKey = `sls/${projectName}/${Sls.generateLogstoreName()}`;
+      const { project, logstore } = await traceSpan('sls', 'auto', () =>
+        cachedResource({ accountID, region }, slsKey, () => sls.deploy()),
+      );
       const logAutoConfig = parseAutoConfig(this.local.logConfig as string);
       const logParams = logAutoConfig?.params || {};
       const customFields: Record<string, any> = { ...logParams };
@@ -412,8 +475,8 @@ logConfig:
       }
       logger.info(`ossAuto code to ${ossEndpoint}`);
       const oss = new OSS(region, credential as ICredentials, ossEndpoint);
-      const { ossBucket, readOnly, mountDir, bucketPath } = await oss.deploy(
-        this.inputs.props.ossMountConfig as string,
+      const { ossBucket, readOnly, mountDir, bucketPath } = await traceSpan('oss', 'auto', () =>
+        oss.deploy(this.inputs.props.ossMountConfig as string),
       );
 
       logger.write(
@@ -442,7 +505,9 @@ ossMountConfig:
 
     if (roleAuto) {
       const client = new RamClient(credential as ICredentials);
-      const arn = await client.initFcDefaultServiceRole();
+      const arn = await traceSpan('role', 'auto', () =>
+        cachedResource({ accountID }, 'role/fc-default', () => client.initFcDefaultServiceRole()),
+      );
       logger.write(yellow(`Using role: ${arn}\n`));
       this.createResource.role = { arn };
 
@@ -452,17 +517,30 @@ ossMountConfig:
       (nasAuto || vpcAuto || slsAuto || FC.isCustomContainerRuntime(this.local?.runtime))
     ) {
       const client = new RamClient(credential as ICredentials);
-      await client.initSlrRole('FC');
+      await traceSpan('slr', 'auto', () =>
+        cachedResource({ accountID }, 'slr/FC', async () => {
+          await client.initSlrRole('FC');
+          return true;
+        }),
+      );
     }
 
     if (nasAuto || vpcAuto) {
       const client = new VPC_NAS(region, credential as ICredentials);
       const localVpcAuto = _.isString(this.local.vpcConfig) ? undefined : this.local.vpcConfig;
       // @ts-ignore: nas auto 会返回 mountTargetDomain 和 fileSystemId
-      const { vpcConfig, mountTargetDomain, fileSystemId } = await client.deploy({
-        nasAuto,
-        vpcConfig: localVpcAuto,
-      });
+      const vpcNasKey = `vpc-nas/${nasAuto ? 'nas' : 'vpc'}/${JSON.stringify(localVpcAuto || {})}`;
+      const { vpcConfig, mountTargetDomain, fileSystemId } = await traceSpan(
+        'vpc-nas',
+        'auto',
+        () =>
+          cachedResource(
+            { accountID, region },
+            vpcNasKey,
+            () => client.deploy({ nasAuto, vpcConfig: localVpcAuto }),
+            (cached) => client.isDeployed(cached as any),
+          ),
+      );
 
       if (vpcAuto) {
         const { vSwitchIds } = vpcConfig;
@@ -6,6 +6,9 @@ import { IInputs } from '../../../interface';
 import logger from '../../../logger';
 import Base from './base';
 import { sleep } from '../../../utils';
+import { getInterruptSignal, waitUntil } from '../../../utils/waiter';
+import { invalidateCache } from '../../../resources/fc/impl/remote-cache';
+import { FC_INSTANCE_SCALING_EXPECTED_WAIT } from '../../../default/config';
 import { provisionConfigErrorRetry } from '../utils';
 // import Logs from '../../logs';
 
@@ -109,67 +112,63 @@ export default class ProvisionConfig extends Base {
     }
 
     let getCurrentErrorCount = 0;
-    const maxRetries = 180;
-
-    for (let index = 0; index < maxRetries; index++) {
-      // eslint-disable-next-line no-await-in-loop
-      const result = await this.fcSdk.getFunctionProvisionConfig(this.functionName, qualifier);
-      const { current, currentError, target: remoteTarget } = result || {};
-
-      // 检查是否已达到目标值
-      if (current === undefined || current === remoteTarget) {
-        logger.info(
-          `ProvisionConfig of ${this.functionName}/${qualifier} is ready. Current: ${current}, Target: ${remoteTarget}`,
-        );
-        return;
-      }
+    const { done } = await waitUntil(
+      async (index) => {
+        // 轮询状态需要最新的结果，跳过缓存
+        invalidateCache(this.fcSdk, `provision/${this.functionName}`);
+        const result = await this.fcSdk.getFunctionProvisionConfig(this.functionName, qualifier);
+        const { current, currentError, target: remoteTarget } = result || {};
+
+        // 检查是否已达到目标值
+        if (current === undefined || current === remoteTarget) {
+          logger.info(
+            `ProvisionConfig of ${this.functionName}/${qualifier} is ready. Current: ${current}, Target: ${remoteTarget}`,
+          );
+          return { done: true };
+        }
 
-      // 处理错误情况
-      if (currentError && currentError.length > 0) {
-        /*
-              logger.warn('=========== LAST 10 MINUTES LOGS START ==========');
-              const iInput = _.cloneDeep(this.inputs);
-              iInput.args = [
-                '--start-time',
-                (new Date().getTime() - 10 * 60 * 1000).toString(),
-                '--end-time',
-                new Date().getTime().toString(),
-              ];
-              const logs = new Logs(iInput);
-              // eslint-disable-next-line no-await-in-loop
-              await logs.run();
-              logger.warn('=========== LAST 10 MINUTES END =========== ');
-          */
-        // 如果是系统内部错误，则继续尝试
-        if (
-          !(
-            currentError.includes('an internal error has occurred') ||
-            currentError.includes('Resources are being replenished')
-          )
-        ) {
-          // 不是系统内部错误，满足一定的重试次数则退出
-          getCurrentErrorCount++;
-          if (getCurrentErrorCount > 3 || (index > 6 && getCurrentErrorCount > 0)) {
-            logger.error(
-              `get ${this.functionName}/${qualifier} provision config getCurrentErrorCount=${getCurrentErrorCount}`,
-            );
-            throw new Error(
-              `get ${this.functionName}/${qualifier} provision config error: ${currentError}`,
-            );
+        // 处理错误情况
+        if (currentError && currentError.length > 0) {
+          // 如果是系统内部错误，则继续尝试
+          if (
+            !(
+              currentError.includes('an internal error has occurred') ||
+              currentError.includes('Resources are being replenished')
+            )
+          ) {
+            // 不是系统内部错误，满足一定的重试次数则退出
+            getCurrentErrorCount++;
+            if (getCurrentErrorCount > 3 || (index > 6 && getCurrentErrorCount > 0)) {
+              logger.error(
+                `get ${this.functionName}/${qualifier} provision config getCurrentErrorCount=${getCurrentErrorCount}`,
+              );
+              throw new Error(
+                `get ${this.functionName}/${qualifier} provision config error: ${currentError}`,
+              );
+            }
           }
         }
-      }
 
-      logger.info(
-        `waiting ${this.functionName}/${qualifier} provision OK: current: ${current}, target: ${realTarget}`,
+        logger.info(
+          `waiting ${this.functionName}/${qualifier} provision OK: current: ${current}, target: ${realTarget}`,
+        );
+        return { done: false };
+      },
+      {
+        name: 'provision-ready',
+        minDelayMs: 2000,
+        maxDelayMs: 10000,
+        expectedMs: FC_INSTANCE_SCALING_EXPECTED_WAIT * 1000,
+        timeoutMs: 15 * 60 * 1000,
+        maxAttempts: 180,
+        signal: getInterruptSignal(),
+      },
+    );
+    if (!done) {
+      logger.warn(
+        `Timeout waiting for provisionConfig of ${this.functionName}/${qualifier} to be ready`,
       );
-
-      // eslint-disable-next-line no-await-in-loop
-      await sleep(5);
     }
-    logger.warn(
-      `Timeout waiting for provisionConfig of ${this.functionName}/${qualifier} to be ready`,
-    );
   }
 
   /**
@@ -182,27 +181,36 @@ export default class ProvisionConfig extends Base {
         await this.fcSdk.removeFunctionProvisionConfig(this.functionName, qualifier);
 
         // 等待预配置实例数降至0
-        const maxRetries = 12;
-        for (let index = 0; index < maxRetries; index++) {
-          // eslint-disable-next-line no-await-in-loop
-          const result = await this.fcSdk.getFunctionProvisionConfig(this.functionName, qualifier);
-          const { current } = result || {};
-
-          if (current === 0 || !current) {
-            logger.info(
-              `ProvisionConfig of ${this.functionName}/${qualifier} removed successfully`,
+        const { done } = await waitUntil(
+          async () => {
+            invalidateCache(this.fcSdk, `provision/${this.functionName}`);
+            const result = await this.fcSdk.getFunctionProvisionConfig(
+              this.functionName,
+              qualifier,
             );
-            return;
-          }
-
-          logger.info(`waiting ${this.functionName}/${qualifier} provision current to 0 ...`);
-          // eslint-disable-next-line no-await-in-loop
-          await sleep(5);
-        }
-
-        logger.warn(
-          `Timeout waiting for provisionConfig of ${this.functionName}/${qualifier} to be removed`,
+            const { current } = result || {};
+            if (current === 0 || !current) {
+              logger.info(
+                `ProvisionConfig of ${this.functionName}/${qualifier} removed successfully`,
+              );
+              return { done: true };
+            }
+            logger.info(`waiting ${this.functionName}/${qualifier} provision current to 0 ...`);
+            return { done: false };
+          },
+          {
+            name: 'provision-removed',
+            minDelayMs: 2000,
+            maxDelayMs: 10000,
+            maxAttempts: 12,
+            signal: getInterruptSignal(),
+          },
         );
+        if (!done) {
+          logger.warn(
+            `Timeout waiting for provisionConfig of ${this.functionName}/${qualifier} to be removed`,
+          );
+        }
       }
     } catch (ex) {
       logger.error(
@@ -6,6 +6,9 @@ import { IInputs } from '../../../interface';
 import logger from '../../../logger';
 import Base from './base';
 import { sleep } from '../../../utils';
+import { getInterruptSignal, waitUntil } from '../../../utils/waiter';
+import { invalidateCache } from '../../../resources/fc/impl/remote-cache';
+import { FC_INSTANCE_SCALING_EXPECTED_WAIT } from '../../../default/config';
 import { provisionConfigErrorRetry, removeScalingConfigSDK } from '../utils';
 
 interface IOpts {
@@ -106,55 +109,65 @@ export default class ScalingConfig extends Base {
     }
 
     let getCurrentErrorCount = 0;
-    const maxRetries = 180;
+    const { done } = await waitUntil(
+      async (index) => {
+        // 轮询状态需要最新的结果，跳过缓存
+        invalidateCache(this.fcSdk, `scaling/${this.functionName}`);
+        const result = await this.fcSdk.getFunctionScalingConfig(this.functionName, qualifier);
+        const { currentInstances, currentError, targetInstances } = result || {};
 
-    for (let index = 0; index < maxRetries; index++) {
-      // eslint-disable-next-line no-await-in-loop
-      const result = await this.fcSdk.getFunctionScalingConfig(this.functionName, qualifier);
-      const { currentInstances, currentError, targetInstances } = result || {};
-
-      logger.debug(
-        `get ${this.functionName}/${qualifier} scaling config result: ${JSON.stringify(result)}`,
-      );
-      // 检查是否已达到最小实例数
-      if (currentInstances === undefined || currentInstances === targetInstances) {
-        logger.info(
-          `ScalingConfig of ${this.functionName}/${qualifier} is ready. CurrentInstances: ${currentInstances}, TargetInstances: ${targetInstances}`,
+        logger.debug(
+          `get ${this.functionName}/${qualifier} scaling config result: ${JSON.stringify(result)}`,
         );
-        return;
-      }
-      if (currentError && currentError.length > 0) {
-        // 如果是系统内部错误，则继续尝试
-        if (
-          !(
-            currentError.includes('an internal error has occurred') ||
-            currentError.includes('Resources are being replenished')
-          )
-        ) {
-          // 不是系统内部错误，满足一定的重试次数则退出
-          getCurrentErrorCount++;
-          if (getCurrentErrorCount > 3 || (index > 6 && getCurrentErrorCount > 0)) {
-            logger.error(
-              `get ${this.functionName}/${qualifier} scaling config getCurrentErrorCount=${getCurrentErrorCount}`,
-            );
-            throw new Error(
-              `get ${this.functionName}/${qualifier} scaling config error: ${currentError}`,
-            );
+        // 检查是否已达到最小实例数
+        if (currentInstances === undefined || currentInstances === targetInstances) {
+          logger.info(
+            `ScalingConfig of ${this.functionName}/${qualifier} is ready. CurrentInstances: ${currentInstances}, TargetInstances: ${targetInstances}`,
+          );
+          return { done: true };
+        }
+        if (currentError && currentError.length > 0) {
+          // 如果是系统内部错误，则继续尝试
+          if (
+            !(
+              currentError.includes('an internal error has occurred') ||
+              currentError.includes('Resources are being replenished')
+            )
+          ) {
+            // 不是系统内部错误，满足一定的重试次数则退出
+            getCurrentErrorCount++;
+            if (getCurrentErrorCount > 3 || (index > 6 && getCurrentErrorCount > 0)) {
+              logger.error(
+                `get ${this.functionName}/${qualifier} scaling config getCurrentErrorCount=${getCurrentErrorCount}`,
+              );
+              throw new Error(
+                `get ${this.functionName}/${qualifier} scaling config error: ${currentError}`,
+              );
+            }
           }
         }
-      }
 
-      logger.info(
-        `waiting ${this.functionName}/${qualifier} scaling OK: currentInstances: ${currentInstances}, targetInstances: ${targetInstances}`,
-      );
+        logger.info(
+          `waiting ${this.functionName}/${qualifier} scaling OK: currentInstances: ${currentInstances}, targetInstances: ${targetInstances}`,
+        );
+        return { done: false };
+      },
+      {
+        name: 'scaling-ready',
+        minDelayMs: 2000,
+        maxDelayMs: 10000,
+        expectedMs: FC_INSTANCE_SCALING_EXPECTED_WAIT * 1000,
+        timeoutMs: 15 * 60 * 1000,
+        maxAttempts: 180,
+        signal: getInterruptSignal(),
+      },
+    );
 
-      // eslint-disable-next-line no-await-in-loop
-      await sleep(5);
+    if (!done) {
+      logger.warn(
+        `Timeout waiting for scalingConfig of ${this.functionName}/${qualifier} to be ready`,
+      );
     }
-
-    logger.warn(
-      `Timeout waiting for scalingConfig of ${this.functionName}/${qualifier} to be ready`,
-    );
   }
 
   /**
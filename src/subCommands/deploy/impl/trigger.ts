@@ -1,4 +1,3 @@
-/* eslint-disable no-await-in-loop */
 import _ from 'lodash';
 import inquirer from 'inquirer';
 import { diffConvertYaml } from '@serverless-devs/diff';
@@ -12,8 +11,13 @@ import {
 import logger from '../../../logger';
 import Base from './base';
 import { GetApiType } from '../../../resources/fc';
-import { FC_API_ERROR_CODE } from '../../../resources/fc/error-code';
-import { FC_TRIGGER_DEFAULT_CONFIG } from '../../../default/config';
+import { FC_API_ERROR_CODE, isThrottling } from '../../../resources/fc/error-code';
+import {
+  FC_THROTTLING_RETRY_COUNT,
+  FC_TRIGGER_CONCURRENCY,
+  FC_TRIGGER_DEFAULT_CONFIG,
+} from '../../../default/config';
+import { runThrottledPool } from '../../../utils/scheduler';
 
 interface IOpts {
   yes: boolean | undefined;
@@ -23,6 +27,7 @@ interface IOpts {
 export default class Trigger extends Base {
   local: ITrigger[] = [];
   remote: any[] = [];
+  summary: { created: number; updated: number; unchanged: number };
   readonly functionName: string;
 
   constructor(inputs: IInputs, opts: IOpts) {
@@ -82,59 +87,96 @@ export default class Trigger extends Base {
   }
 
   async run() {
-    for (let index = 0; index < this.local.length; index++) {
-      const remoteConfig = this.remote[index] || {};
-      const localConfig = this.local[index];
+    const summary = { created: 0, updated: 0, unchanged: 0 };
+    await runThrottledPool(
+      this.local,
+      FC_TRIGGER_CONCURRENCY,
+      async (localConfig, index) => {
+        const status = await this._deployOne(localConfig, this.remote[index] || {});
+        summary[status]++;
+      },
+      this.throttlingOptions('deploy'),
+    );
+    this.summary = summary;
+    if (!_.isEmpty(this.local)) {
+      logger.info(
+        `Triggers of ${this.functionName}: ${summary.created} created, ${summary.updated} updated, ${summary.unchanged} unchanged`,
+      );
+    }
+    return this.needDeploy;
+  }
 
-      const id = `${this.functionName}/${localConfig.triggerName}`;
-      if (this.needDeploy) {
-        if (!this.checkUpdateEBTrigger(localConfig, remoteConfig)) {
-          logger.info(
-            `Skipping the deployment of the eventbridge trigger ${id} since its configuration has not  any changes.`,
-          );
-          return this.needDeploy;
-        }
-        await this.fcSdk.deployTrigger(this.functionName, localConfig);
-      } else if (_.isEmpty(remoteConfig)) {
-        // 如果不需要部署，但是远端资源不存在，则尝试创建一下
-        logger.debug(
-          `Online configuration does not exist, specified not to deploy, attempting to create ${id}`,
+  private async _deployOne(
+    localConfig: ITrigger,
+    remoteConfig: any,
+  ): Promise<'created' | 'updated' | 'unchanged'> {
+    const id = `${this.functionName}/${localConfig.triggerName}`;
+    if (this.needDeploy) {
+      if (!this.checkUpdateEBTrigger(localConfig, remoteConfig)) {
+        logger.info(
+          `Skipping the deployment of the eventbridge trigger ${id} since its configuration has not  any changes.`,
         );
-        try {
-          await this.fcSdk.createTrigger(this.functionName, localConfig);
-        } catch (ex) {
-          logger.debug(`Create trigger error: ${ex.message}`);
-          if (ex.code !== FC_API_ERROR_CODE.FunctionAlreadyExists) {
-            throw ex;
-          }
+        return 'unchanged';
+      }
+      // deployTrigger 会改写 triggerConfig，限流重试时需要使用原始配置
+      return await this.fcSdk.deployTrigger(this.functionName, _.cloneDeep(localConfig));
+    }
+    if (_.isEmpty(remoteConfig)) {
+      // 如果不需要部署，但是远端资源不存在，则尝试创建一下
+      logger.debug(
+        `Online configuration does not exist, specified not to deploy, attempting to create ${id}`,
+      );
+      try {
+        await this.fcSdk.createTrigger(this.functionName, localConfig);
+        return 'created';
+      } catch (ex) {
+        logger.debug(`Create trigger error: ${ex.message}`);
+        if (ex.code !== FC_API_ERROR_CODE.FunctionAlreadyExists) {
+          throw ex;
         }
-      } else {
-        logger.debug(
-          `Online configuration exists, specified not to deploy, skipping deployment ${id}`,
-        );
       }
+      return 'unchanged';
     }
-    return this.needDeploy;
+    logger.debug(`Online configuration exists, specified not to deploy, skipping deployment ${id}`);
+    return 'unchanged';
   }
 
-  private async _getRemote() {
-    for (const config of this.local) {
-      const { triggerName } = config;
-      try {
-        const result = await this.fcSdk.getTrigger(
-          this.functionName,
-          triggerName,
-          GetApiType.simpleUnsupported,
-        );
-        this.remote.push(result);
-        continue;
-      } catch (ex) {
+  private throttlingOptions(action: string) {
+    return {
+      isThrottled: isThrottling,
+      retries: FC_THROTTLING_RETRY_COUNT,
+      onThrottled: (config: ITrigger, attempt: number, delayMs: number) => {
         logger.debug(
-          `Get remote trigger(${this.functionName}/${triggerName}) config error: ${ex.message}`,
+          `${action} trigger ${this.functionName}/${config.triggerName} throttled, retry ${attempt} times after ${delayMs}ms`,
         );
-      }
-      this.remote.push({});
-    }
+      },
+    };
+  }
+
+  private async _getRemote() {
+    this.remote = await runThrottledPool(
+      this.local,
+      FC_TRIGGER_CONCURRENCY,
+      async (config) => {
+        const { triggerName } = config;
+        try {
+          return await this.fcSdk.getTrigger(
+            this.functionName,
+            triggerName,
+            GetApiType.simpleUnsupported,
+          );
+        } catch (ex) {
+          if (isThrottling(ex)) {
+            throw ex;
+          }
+          logger.debug(
+            `Get remote trigger(${this.functionName}/${triggerName}) config error: ${ex.message}`,
+          );
+        }
+        return {};
+      },
+      this.throttlingOptions('get'),
+    );
   }
 
   private async _plan() {
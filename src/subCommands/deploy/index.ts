@@ -1,4 +1,8 @@
+import _ from 'lodash';
+import fs from 'fs';
+import path from 'path';
 import { parseArgv } from '@serverless-devs/utils';
+import { ICredentials } from '@serverless-devs/component-interface';
 
 import Service from './impl/function';
 import Trigger from './impl/trigger';
@@ -9,10 +13,18 @@ import ProvisionConfig from './impl/provision_config';
 import ConcurrencyConfig from './impl/concurrency_config';
 import ScalingConfig from './impl/scaling_config';
 import logger from '../../logger';
-import { verify, isAppCenter } from '../../utils';
+import { verify, isAppCenter, tableShow } from '../../utils';
 import { IInputs } from '../../interface';
 import Info from '../info/index';
 import { GetApiType } from '../../resources/fc';
+import { runTaskGraph } from '../../utils/scheduler';
+import { FC_DEPLOY_CONCURRENCY } from '../../default/config';
+import { RemoteCache, runWithRemoteCache } from '../../resources/fc/impl/remote-cache';
+import { Profiler, runWithProfiler, traceSpan } from '../../utils/profiler';
+import { invalidateResourceCache } from '../../utils/resource-cache';
+
+const PROFILE_FORMATS = ['json', 'chrome-trace'];
+const PROFILE_TABLE_KEYS = ['category', 'name', 'count', 'totalMs', 'maxMs', 'retries', 'bytes'];
 
 export default class Deploy {
   readonly opts: Record<string, any>;
@@ -25,6 +37,8 @@ export default class Deploy {
   readonly provisionConfig?: ProvisionConfig;
   readonly concurrencyConfig?: ConcurrencyConfig;
   readonly scalingConfig?: ScalingConfig;
+  // 各阶段耗时，单位 ms
+  readonly timings: Record<string, number> = {};
 
   constructor(readonly inputs: IInputs) {
     if (isAppCenter()) {
@@ -36,7 +50,8 @@ export default class Deploy {
       alias: {
         'assume-yes': 'y',
       },
-      boolean: ['skip-push', 'async_invoke_config'],
+      boolean: ['skip-push', 'async_invoke_config', 'profile'],
+      string: ['profile-output', 'profile-format'],
     });
 
     // TODO: 更完善的验证
@@ -46,6 +61,12 @@ export default class Deploy {
     if (inputs.props.scalingConfig && inputs.props.provisionConfig) {
       throw new Error('scalingConfig and provisionConfig cannot be used at the same time');
     }
+    const profileFormat = this.opts['profile-format'];
+    if (profileFormat && !PROFILE_FORMATS.includes(profileFormat)) {
+      throw new Error(
+        `--profile-format only supports ${PROFILE_FORMATS.join(', ')}, but got ${profileFormat}`,
+      );
+    }
 
     const {
       function: type,
@@ -82,40 +103,122 @@ export default class Deploy {
   }
 
   async run() {
-    // 调用前置
-    await this.service?.before();
-    await this.trigger?.before();
-    await this.asyncInvokeConfig?.before();
-    await this.vpcBinding?.before();
-    await this.customDomain?.before();
-    if (this.inputs.props.provisionConfig) {
-      await this.provisionConfig?.before();
-    } else {
-      await this.scalingConfig?.before();
+    // 同一次部署内共享远端读取缓存，避免 plan、部署、轮询和 Info 重复请求相同资源
+    const remoteCache = new RemoteCache();
+    const deploy = () => runWithRemoteCache(remoteCache, () => this.deploy());
+    const { profile, 'profile-output': profileOutput } = this.opts;
+    const profiler = profile || profileOutput ? new Profiler() : undefined;
+    let result: any;
+    try {
+      result = profiler ? await runWithProfiler(profiler, deploy) : await deploy();
+    } catch (ex) {
+      // 缓存的角色或 auto 资源可能已被删除，失败后清理，下次部署重新解析
+      const accountID = (this.inputs.credential as ICredentials)?.AccountID;
+      if (accountID) {
+        invalidateResourceCache({ accountID, region: this.inputs.props.region });
+      }
+      throw ex;
+    } finally {
+      // 部署失败时同样输出，便于定位卡在哪一步
+      if (profiler) {
+        this.reportProfile(profiler);
+      }
     }
-    await this.concurrencyConfig?.before();
-
-    // 调用运行
-    const run1 = await this.service?.run();
-    const run2 = await this.trigger?.run();
-    const run3 = await this.asyncInvokeConfig?.run();
-    const run4 = await this.vpcBinding?.run();
-    const run5 = await this.customDomain?.run();
-    let run6;
-    if (this.inputs.props.provisionConfig) {
-      run6 = await this.provisionConfig?.run();
-    } else {
-      run6 = await this.scalingConfig?.run();
+    const { hits, misses } = remoteCache.stats;
+    logger.debug(`deploy remote cache: ${misses} OpenAPI calls, ${hits} calls saved`);
+    return result;
+  }
+
+  /**
+   * --profile 输出各步骤耗时汇总表，--profile-output 导出完整的 span 记录
+   */
+  private reportProfile(profiler: Profiler) {
+    const { profile, 'profile-output': output, 'profile-format': format = 'json' } = this.opts;
+    if (profile) {
+      tableShow(profiler.summary(), PROFILE_TABLE_KEYS);
+    }
+    if (output) {
+      const file = path.resolve(output);
+      const data = format === 'chrome-trace' ? profiler.toChromeTrace() : profiler.toJSON();
+      fs.mkdirSync(path.dirname(file), { recursive: true });
+      fs.writeFileSync(file, JSON.stringify(data, null, 2));
+      logger.info(`Deploy profile written to ${file}`);
     }
-    const run7 = await this.concurrencyConfig?.run();
+  }
+
+  private async deploy() {
+    const stages = this.getStages();
+
+    // 调用前置：before 中可能会交互确认 diff，只有指定了 --assume-yes/--no-assume-yes 时才并发
+    const beforeConcurrency = _.isBoolean(this.opts['assume-yes']) ? FC_DEPLOY_CONCURRENCY : 1;
+    const before = await runTaskGraph(
+      stages.map(({ name, stage }) => ({
+        name,
+        run: () => traceSpan(`${name}.before`, 'stage', () => stage.before()),
+      })),
+      beforeConcurrency,
+    );
+
+    // 调用运行：函数部署完成后，其余无依赖关系的资源并发部署
+    const run = await runTaskGraph(
+      stages.map(({ name, deps, stage }) => ({
+        name,
+        deps,
+        run: () => traceSpan(`${name}.run`, 'stage', () => stage.run()),
+      })),
+      FC_DEPLOY_CONCURRENCY,
+    );
+
+    for (const { name } of stages) {
+      this.timings[`${name}.before`] = before.timings[name];
+      this.timings[`${name}.run`] = run.timings[name];
+    }
+    logger.debug(`deploy stage timings(ms): ${JSON.stringify(this.timings)}`);
+
+    const scalingStage = this.inputs.props.provisionConfig ? 'provisionConfig' : 'scalingConfig';
+    const allStages = [
+      'function',
+      'trigger',
+      'asyncInvokeConfig',
+      'vpcBinding',
+      'customDomain',
+      scalingStage,
+      'concurrencyConfig',
+    ];
     // 获取输出
-    if (run1 && run2 && run3 && run4 && run5 && run6 && run7) {
+    if (allStages.every((name) => run.results[name])) {
       const info = new Info(this.inputs);
       info.setGetApiType(GetApiType.simpleUnsupported);
-      const result = await info.run();
+      const result = await traceSpan('info', 'stage', () => info.run());
       const mergedObj = Object.assign({}, result);
       logger.debug(`mergedObj = ${JSON.stringify(mergedObj, null, 2)}`);
       return mergedObj;
     }
   }
+
+  /**
+   * 部署阶段及依赖关系：其余资源都依赖函数；concurrencyConfig 保持在 provision/scaling 之后
+   */
+  private getStages(): Array<{
+    name: string;
+    deps: string[];
+    stage: { before: () => Promise<any>; run: () => Promise<any> };
+  }> {
+    const scalingStage = this.inputs.props.provisionConfig
+      ? { name: 'provisionConfig', deps: ['function'], stage: this.provisionConfig }
+      : { name: 'scalingConfig', deps: ['function'], stage: this.scalingConfig };
+    return [
+      { name: 'function', deps: [], stage: this.service },
+      { name: 'trigger', deps: ['function'], stage: this.trigger },
+      { name: 'asyncInvokeConfig', deps: ['function'], stage: this.asyncInvokeConfig },
+      { name: 'vpcBinding', deps: ['function'], stage: this.vpcBinding },
+      { name: 'customDomain', deps: ['function'], stage: this.customDomain },
+      scalingStage,
+      {
+        name: 'concurrencyConfig',
+        deps: ['function', scalingStage.name],
+        stage: this.concurrencyConfig,
+      },
+    ].filter(({ stage }) => stage);
+  }
 }
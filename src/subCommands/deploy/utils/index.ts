@@ -1,5 +1,7 @@
 import logger from '../../../logger';
 import { isProvisionConfigError, sleep } from '../../../utils';
+import { getInterruptSignal, waitUntil } from '../../../utils/waiter';
+import { invalidateCache } from '../../../resources/fc/impl/remote-cache';
 
 export async function provisionConfigErrorRetry(
   fcSdk: any,
@@ -62,23 +64,31 @@ export async function removeScalingConfigSDK(fcSdk: any, functionName: string, q
     await fcSdk.removeFunctionScalingConfig(functionName, qualifier);
 
     // 等待弹性配置实例数降至0
-    const maxRetries = 12;
-    for (let index = 0; index < maxRetries; index++) {
-      // eslint-disable-next-line no-await-in-loop
-      const result = await fcSdk.getFunctionScalingConfig(functionName, qualifier);
-      const { currentInstances } = result || {};
-
-      if (!currentInstances || currentInstances === 0) {
-        logger.info(`ScalingConfig of ${functionName}/${qualifier} removed successfully`);
-        return;
-      }
+    const { done } = await waitUntil(
+      async () => {
+        // 轮询状态需要最新的结果，跳过缓存
+        invalidateCache(fcSdk, `scaling/${functionName}`);
+        const result = await fcSdk.getFunctionScalingConfig(functionName, qualifier);
+        const { currentInstances } = result || {};
+        if (!currentInstances || currentInstances === 0) {
+          logger.info(`ScalingConfig of ${functionName}/${qualifier} removed successfully`);
+          return { done: true };
+        }
+        logger.info(`waiting ${functionName}/${qualifier} scaling currentInstances to 0 ...`);
+        return { done: false };
+      },
+      {
+        name: 'scaling-removed',
+        minDelayMs: 2000,
+        maxDelayMs: 10000,
+        maxAttempts: 12,
+        signal: getInterruptSignal(),
+      },
+    );
 
-      logger.info(`waiting ${functionName}/${qualifier} scaling currentInstances to 0 ...`);
-      // eslint-disable-next-line no-await-in-loop
-      await sleep(5);
+    if (!done) {
+      logger.warn(`Timeout waiting for scalingConfig of ${functionName}/${qualifier} to be removed`);
     }
-
-    logger.warn(`Timeout waiting for scalingConfig of ${functionName}/${qualifier} to be removed`);
   } catch (err) {
     logger.error(`Remove for scalingConfig of ${functionName}/${qualifier} error: ${err.message}`);
     throw err;
@@ -1,4 +1,3 @@
-/* eslint-disable no-await-in-loop */
 import { ICredentials, IInputs as _IInputs } from '@serverless-devs/component-interface';
 import _, { isEmpty } from 'lodash';
 import { IInputs, IRegion, TriggerType, checkRegion } from '../../interface';
@@ -8,6 +7,16 @@ import { parseArgv } from '@serverless-devs/utils';
 import loadComponent from '@serverless-devs/load-component';
 import { getUserAgent, transformCustomDomainProps } from '../../utils';
 import { FC3_DOMAIN_COMPONENT_NAME } from '../../constant';
+import { FC_FANOUT_CONCURRENCY, FC_REMOTE_FETCH_CONCURRENCY } from '../../default/config';
+import { fetchAll, runPool } from '../../utils/scheduler';
+import {
+  IFanoutArgs,
+  RegionClientPool,
+  parseFanoutArgs,
+  renderFanoutResults,
+  resolveFanoutTargets,
+  runFanout,
+} from '../../utils/fanout';
 
 export default class Info {
   readonly region: IRegion;
@@ -16,7 +25,43 @@ export default class Info {
   readonly fcSdk: FC;
   getApiType: GetApiType;
 
-  constructor(private inputs: IInputs) {
+  /**
+   * 解析批量参数：--regions、--prefix、逗号分隔或带通配符的 --function-name
+   */
+  static parseFanout(inputs: IInputs): IFanoutArgs | undefined {
+    return parseFanoutArgs(inputs);
+  }
+
+  /**
+   * 批量获取多个地域/函数的信息，按地域复用 FC 客户端，单个函数失败不影响其它函数
+   */
+  static async runFanout(inputs: IInputs, fanout: IFanoutArgs) {
+    const { selector, outputFormat } = fanout;
+    const pool = new RegionClientPool(
+      inputs.credential as ICredentials,
+      getUserAgent(inputs.userAgent, 'info'),
+      { region: _.get(inputs, 'props.region'), endpoint: _.get(inputs, 'props.endpoint') },
+    );
+    const targets = await resolveFanoutTargets(pool, selector, FC_FANOUT_CONCURRENCY);
+    logger.debug(`info fanout targets: ${targets.length}`);
+    const records = await runFanout(targets, pool, outputFormat, async (target, fcSdk) => {
+      // 批量模式下只查询远端函数本身，忽略 yaml 中与单个函数绑定的配置
+      const targetInputs = {
+        ...inputs,
+        args: [],
+        props: { region: target.region, functionName: target.functionName },
+      } as IInputs;
+      return await new Info(targetInputs, fcSdk).run();
+    });
+    return renderFanoutResults(
+      records,
+      outputFormat,
+      ['runtime', 'state', 'lastModifiedTime'],
+      (result) => _.pick(result, ['runtime', 'state', 'lastModifiedTime']),
+    );
+  }
+
+  constructor(private inputs: IInputs, fcSdk?: FC) {
     const opts = parseArgv(inputs.args, {
       alias: { help: 'h' },
       boolean: ['help'],
@@ -39,10 +84,12 @@ export default class Info {
     }
     this.triggersName = _.get(inputs, 'props.triggers', []).map((item) => item.triggerName);
     const userAgent = getUserAgent(inputs.userAgent, 'info');
-    this.fcSdk = new FC(this.region, this.inputs.credential as ICredentials, {
-      endpoint: inputs.props.endpoint,
-      userAgent,
-    });
+    this.fcSdk =
+      fcSdk ||
+      new FC(this.region, this.inputs.credential as ICredentials, {
+        endpoint: inputs.props.endpoint,
+        userAgent,
+      });
     this.getApiType = GetApiType.simple;
   }
 
@@ -51,14 +98,34 @@ export default class Info {
   }
 
   async run() {
-    const functionConfig = await this.getFunction();
-    const triggers = await this.getTriggers();
-    const asyncInvokeConfig = await this.getAsyncInvokeConfig();
-    const vpcBindingConfig = await this.getVpcBing();
-    const customDomain = await this.getCustomDomain();
-    const provisionConfig = await this.getProvisionConfig();
-    const scalingConfig = await this.getScalingConfig();
-    const concurrencyConfig = await this.getConcurrencyConfig();
+    // 各项远端读取互不依赖，并发获取；保持串行时的报错行为，按顺序抛出第一个异常
+    const { values, errors } = await fetchAll(
+      {
+        functionConfig: () => this.getFunction(),
+        triggers: () => this.getTriggers(),
+        asyncInvokeConfig: () => this.getAsyncInvokeConfig(),
+        vpcBindingConfig: () => this.getVpcBing(),
+        customDomain: () => this.getCustomDomain(),
+        provisionConfig: () => this.getProvisionConfig(),
+        scalingConfig: () => this.getScalingConfig(),
+        concurrencyConfig: () => this.getConcurrencyConfig(),
+      },
+      FC_REMOTE_FETCH_CONCURRENCY,
+    );
+    if (!_.isEmpty(errors)) {
+      logger.debug(`Get remote info of ${this.functionName} failed: ${_.keys(errors)}`);
+      throw _.values(errors)[0];
+    }
+    const {
+      functionConfig,
+      triggers,
+      asyncInvokeConfig,
+      vpcBindingConfig,
+      customDomain,
+      provisionConfig,
+      scalingConfig,
+      concurrencyConfig,
+    } = values;
     let info: any = {
       region: this.region,
     };
@@ -73,14 +140,14 @@ export default class Info {
       concurrencyConfig: isEmpty(concurrencyConfig) ? undefined : concurrencyConfig,
     });
     if (!_.isEmpty(triggers)) {
+      const httpTriggers = await runPool(triggers, FC_REMOTE_FETCH_CONCURRENCY, async (t: any) =>
+        t.triggerType === TriggerType.http && t.qualifier === 'LATEST'
+          ? await this.fcSdk.getTrigger(this.functionName, t.triggerName, GetApiType.simple)
+          : undefined,
+      );
       for (let i = 0; i < triggers.length; i++) {
-        const t = triggers[i];
-        if (t.triggerType === TriggerType.http && t.qualifier === 'LATEST') {
-          const t2 = await this.fcSdk.getTrigger(
-            this.functionName,
-            t.triggerName,
-            GetApiType.simple,
-          );
+        const t2 = httpTriggers[i];
+        if (t2) {
           info.url = {
             system_url: t2.httpTrigger.urlInternet,
             system_intranet_url: t2.httpTrigger.urlIntranet,
@@ -109,13 +176,12 @@ export default class Info {
   }
 
   async getTriggers(): Promise<any[]> {
-    const result: any[] = [];
-    for (const triggerName of this.triggersName) {
-      // eslint-disable-next-line no-await-in-loop
-      const config = await this.fcSdk.getTrigger(this.functionName, triggerName, this.getApiType);
-      result.push(config);
-    }
-    return result;
+    return await runPool(
+      this.triggersName,
+      FC_REMOTE_FETCH_CONCURRENCY,
+      async (triggerName) =>
+        await this.fcSdk.getTrigger(this.functionName, triggerName, this.getApiType),
+    );
   }
 
   async getAsyncInvokeConfig(): Promise<any> {
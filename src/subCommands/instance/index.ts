@@ -5,9 +5,60 @@ import logger from '../../logger';
 import _ from 'lodash';
 import FC from '../../resources/fc';
 import { getUserAgent } from '../../utils';
+import { globToRegExp } from '../../utils/fanout';
+import { runPool } from '../../utils/scheduler';
+import { FC_INSTANCE_EXEC_CONCURRENCY } from '../../default/config';
 
 const commandsList = Object.keys(commandsHelp.subCommands);
 
+// 批量执行时在命令结束后输出退出码，用于收集每个实例的执行结果
+const EXIT_CODE_MARKER = '__FC_INSTANCE_EXEC_EXIT_CODE__';
+
+export interface IInstanceExecResult {
+  instanceId: string;
+  // 命令中途 exit 或连接异常时为 null
+  exitCode: number | null;
+  // 单位 ms
+  duration: number;
+  error?: string;
+}
+
+/**
+ * 按行输出并加上实例前缀，未换行的内容在 flush 时输出；识别并移除退出码标记
+ * 命令输出末尾没有换行时标记与最后一行输出在同一行
+ */
+function createLineWriter(
+  prefix: string,
+  stream: NodeJS.WriteStream,
+  onExitCode?: (code: number) => void,
+) {
+  let buffer = '';
+  const writeLine = (line: string) => {
+    const index = onExitCode ? line.lastIndexOf(EXIT_CODE_MARKER) : -1;
+    if (index >= 0) {
+      onExitCode(parseInt(line.substring(index + EXIT_CODE_MARKER.length), 10));
+      if (index > 0) {
+        stream.write(`${prefix} ${line.substring(0, index)}\n`);
+      }
+      return;
+    }
+    stream.write(`${prefix} ${line}\n`);
+  };
+  return {
+    write: (data: Buffer) => {
+      const lines = (buffer + data.toString()).split('\n');
+      buffer = lines.pop();
+      lines.forEach(writeLine);
+    },
+    flush: () => {
+      if (buffer) {
+        writeLine(buffer);
+        buffer = '';
+      }
+    },
+  };
+}
+
 export default class Instance {
   readonly subCommand: string;
   private region: IRegion;
@@ -17,8 +68,8 @@ export default class Instance {
   constructor(readonly inputs: IInputs) {
     const opts = parseArgv(inputs.args, {
       alias: { help: 'h', 'assume-yes': 'y' },
-      boolean: ['help', 'y', 'no-workdir'],
-      string: ['region', 'function-name', 'qualifier', 'shell', 'workdir'],
+      boolean: ['help', 'y', 'no-workdir', 'all'],
+      string: ['region', 'function-name', 'qualifier', 'shell', 'workdir', 'instance-filter'],
     });
     logger.debug(`Instance opts: ${JSON.stringify(opts)}`);
     const { region, _: subCommands } = opts;
@@ -67,11 +118,14 @@ export default class Instance {
     if (_.isEmpty(functionName)) {
       throw new Error('functionName not specified, please specify --function-name');
     }
+    const qualifier = this.opts.qualifier || 'LATEST';
+    if (this.opts.all || !_.isNil(this.opts['instance-filter'])) {
+      return await this.execBatch(functionName, qualifier);
+    }
     const instanceId = this.opts['instance-id'];
     if (_.isEmpty(instanceId)) {
       throw new Error('instanceId not specified, please specify --instance-id');
     }
-    const qualifier = this.opts.qualifier || 'LATEST';
     const cmd = this.opts.cmd as string;
     const shell = this.opts.shell || 'bash';
     const { workdir } = this.opts;
@@ -96,4 +150,79 @@ export default class Instance {
     }
     await this.fcSdk.instanceExec(functionName, instanceId, rawData, qualifier, true);
   }
+
+  /**
+   * 在多个实例中并发执行同一条命令，输出按行加上实例前缀，返回每个实例的退出码和耗时
+   * s instance exec --all --cmd "nvidia-smi"
+   * s instance exec --instance-filter "c-64fec1fc-*" --cmd "df -h" --concurrency 20
+   * s instance exec --all --cmd "ls -lh" --workdir /app
+   */
+  private async execBatch(functionName: string, qualifier: string) {
+    const cmd = this.opts.cmd as string;
+    if (_.isEmpty(cmd)) {
+      throw new Error('--cmd must be specified when using --all or --instance-filter');
+    }
+    const shell = this.opts.shell || 'bash';
+    const filter = this.opts['instance-filter'];
+    const concurrency = parseInt(this.opts.concurrency, 10) || FC_INSTANCE_EXEC_CONCURRENCY;
+
+    const body = await this.fcSdk.listInstances(functionName, qualifier);
+    let instanceIds: string[] = _.map(_.get(body, 'instances', []), 'instanceId');
+    if (filter) {
+      const reg = globToRegExp(filter);
+      instanceIds = instanceIds.filter((instanceId) => reg.test(instanceId));
+    }
+    if (_.isEmpty(instanceIds)) {
+      logger.warn(`No active instance of ${functionName} matched`);
+      return [];
+    }
+    logger.info(`Exec in ${instanceIds.length} instances with concurrency ${concurrency}`);
+
+    // 用换行分隔，cmd 以 & 或注释结尾时也能输出退出码
+    // 与单实例执行 --cmd 一致，只有指定 --workdir 时才切换目录；cd 失败时直接输出其退出码
+    const { workdir } = this.opts;
+    const script = workdir && !this.opts['no-workdir'] ? `cd ${workdir} && {\n${cmd}\n}` : cmd;
+    const rawData = [shell, '-c', `${script}\necho "${EXIT_CODE_MARKER}$?"`];
+    const results = await runPool(instanceIds, concurrency, (instanceId) =>
+      this.execInInstance(functionName, qualifier, instanceId, rawData),
+    );
+
+    const failed = results.filter(({ exitCode }) => exitCode !== 0);
+    if (!_.isEmpty(failed)) {
+      const failedIds = _.map(failed, 'instanceId').join(', ');
+      logger.error(`Exec failed in ${failed.length}/${results.length} instances: ${failedIds}`);
+      process.exitCode = 1;
+    }
+    return results;
+  }
+
+  private async execInInstance(
+    functionName: string,
+    qualifier: string,
+    instanceId: string,
+    rawData: string[],
+  ): Promise<IInstanceExecResult> {
+    const start = Date.now();
+    let exitCode: number | null = null;
+    const stdout = createLineWriter(`[${instanceId}]`, process.stdout, (code) => {
+      exitCode = code;
+    });
+    const stderr = createLineWriter(`[${instanceId}]`, process.stderr);
+    let error: string;
+    try {
+      await this.fcSdk.execInstanceCommand(functionName, instanceId, rawData, qualifier, {
+        onStdout: stdout.write,
+        onStderr: stderr.write,
+      });
+    } catch (ex) {
+      error = ex.message;
+      logger.debug(`Exec in instance ${instanceId} error: ${ex.message}`);
+    }
+    stdout.flush();
+    stderr.flush();
+    return _.omitBy(
+      { instanceId, exitCode, duration: Date.now() - start, error },
+      _.isUndefined,
+    ) as IInstanceExecResult;
+  }
 }
@@ -9,6 +9,7 @@ import logger from '../../logger';
 import FC from '../../resources/fc';
 import { parseArgv } from '@serverless-devs/utils';
 import { getUserAgent } from '../../utils';
+import { formatLoadTestResult, ILoadTestOptions, parseEventLines, runLoadTest } from './load-test';
 
 export default class Invoke {
   private functionName: string;
@@ -19,6 +20,9 @@ export default class Invoke {
   private asyncTaskId: string;
   private region: IRegion;
   private silent: boolean;
+  // 批量调用 / 压测模式
+  private events: string[];
+  private loadTest?: ILoadTestOptions;
 
   constructor(inputs: IInputs) {
     const {
@@ -31,12 +35,26 @@ export default class Invoke {
       region,
       'function-name': functionName,
       silent,
+      'events-file': eventsFile,
+      count,
+      concurrency,
+      qps,
     } = parseArgv(inputs.args, {
       alias: {
         event: 'e',
         'event-file': 'f',
       },
-      string: ['event', 'event-file', 'timeout', 'region', 'function-name'],
+      string: [
+        'event',
+        'event-file',
+        'timeout',
+        'region',
+        'function-name',
+        'events-file',
+        'count',
+        'concurrency',
+        'qps',
+      ],
       boolean: ['silent'],
     });
     this.region = region || _.get(inputs, 'props.region');
@@ -91,9 +109,40 @@ export default class Invoke {
       this.asyncTaskId = asyncTaskId;
     }
     this.silent = silent;
+
+    if (_.isString(eventsFile) && eventsFile) {
+      const p = path.isAbsolute(eventsFile) ? eventsFile : path.join(process.cwd(), eventsFile);
+      if (!fs.existsSync(p)) {
+        throw new Error(`Cannot find events-file "${eventsFile}".`);
+      }
+      this.events = parseEventLines(fs.readFileSync(p, 'utf-8'));
+    } else {
+      this.events = _.isNil(this.payload) ? [] : [this.payload];
+    }
+    if (eventsFile || count || concurrency || qps) {
+      this.loadTest = {
+        count: this.parsePositiveInt('count', count, Math.max(this.events.length, 1)),
+        concurrency: this.parsePositiveInt('concurrency', concurrency, 1),
+        qps: qps ? this.parsePositiveInt('qps', qps, 0) : undefined,
+      };
+    }
+  }
+
+  private parsePositiveInt(name: string, value: string, defaultValue: number): number {
+    if (_.isNil(value)) {
+      return defaultValue;
+    }
+    const num = parseInt(value, 10);
+    if (!_.isFinite(num) || num <= 0) {
+      throw new Error(`Invalid '${name}': ${value}, it should be a positive integer`);
+    }
+    return num;
   }
 
   async run() {
+    if (this.loadTest) {
+      return await this.runBatch();
+    }
     logger.debug(`Running invoke payload: ${this.payload}`);
 
     const result = await this.fcSdk.invokeFunction(this.functionName, {
@@ -113,6 +162,31 @@ export default class Invoke {
     }
   }
 
+  /**
+   * 批量调用：按并发或目标 QPS 回放事件，复用长连接，输出延迟分位数、冷启动率与错误统计
+   */
+  private async runBatch() {
+    const { count, concurrency, qps } = this.loadTest;
+    logger.info(
+      `Invoke ${this.functionName} ${count} times with concurrency ${concurrency}${
+        qps ? `, target qps ${qps}` : ''
+      }`,
+    );
+    const result = await runLoadTest(this.events, this.loadTest, (payload) =>
+      this.fcSdk.invokeFunction(this.functionName, {
+        payload,
+        qualifier: this.qualifier,
+        invokeType: this.invokeType,
+        logType: 'None',
+        maxIdleConns: concurrency,
+      }),
+    );
+    if (this.silent) {
+      return result;
+    }
+    logger.write(formatLoadTestResult(result));
+  }
+
   private showLog(headers, body) {
     const {
       'x-fc-code-checksum': codeChecksum,
@@ -0,0 +1,131 @@
+import _ from 'lodash';
+import { runPool } from '../../utils/scheduler';
+
+export interface ILoadTestOptions {
+  // 总调用次数
+  count: number;
+  concurrency: number;
+  // 目标 QPS，不设置时按并发上限尽快发送
+  qps?: number;
+}
+
+export interface ILoadTestResult {
+  count: number;
+  success: number;
+  failed: number;
+  // 单位 ms
+  duration: number;
+  qps: number;
+  latency: { min: number; p50: number; p90: number; p99: number; max: number; avg: number };
+  // 首次出现的实例数，即冷启动次数
+  coldStarts: number;
+  coldStartRate: number;
+  instances: number;
+  errors: Record<string, number>;
+  // x-fc-invocation-duration 之和，单位 ms
+  billedDuration: number;
+}
+
+const sleep = (ms: number) =>
+  new Promise((resolve) => {
+    setTimeout(resolve, ms);
+  });
+
+export const percentile = (sorted: number[], p: number): number =>
+  sorted.length ? sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)] : 0;
+
+/**
+ * 读取 JSON Lines 事件文件，每个非空行为一个事件
+ */
+export function parseEventLines(content: string): string[] {
+  return content
+    .split(/\r?\n/)
+    .map((line) => line.trim())
+    .filter((line) => line.length > 0);
+}
+
+/**
+ * 按并发或目标 QPS 回放事件，第 i 次调用使用 events[i % events.length]
+ * @param invoke 返回响应 headers，异常计入错误统计
+ */
+export async function runLoadTest(
+  events: string[],
+  options: ILoadTestOptions,
+  invoke: (payload: string) => Promise<{ headers?: Record<string, any> }>,
+): Promise<ILoadTestResult> {
+  const { count, concurrency, qps } = options;
+  const payloads = _.isEmpty(events) ? [undefined] : events;
+  const latencies: number[] = [];
+  const instances = new Set<string>();
+  const errors: Record<string, number> = {};
+  let coldStarts = 0;
+  let billedDuration = 0;
+  const start = Date.now();
+
+  await runPool(_.range(count), concurrency, async (index) => {
+    if (qps) {
+      const wait = start + (index * 1000) / qps - Date.now();
+      if (wait > 0) {
+        await sleep(wait);
+      }
+    }
+    const invokeStart = Date.now();
+    try {
+      const { headers = {} } = await invoke(payloads[index % payloads.length]);
+      latencies.push(Date.now() - invokeStart);
+      const instanceId = headers['x-fc-instance-id'];
+      if (instanceId && !instances.has(instanceId)) {
+        instances.add(instanceId);
+        coldStarts++;
+      }
+      billedDuration += Number(headers['x-fc-invocation-duration']) || 0;
+      if (headers['x-fc-error-type']) {
+        errors[headers['x-fc-error-type']] = (errors[headers['x-fc-error-type']] || 0) + 1;
+      }
+    } catch (ex) {
+      const type = ex?.code || ex?.name || 'Error';
+      errors[type] = (errors[type] || 0) + 1;
+    }
+  });
+
+  const duration = Date.now() - start;
+  const sorted = latencies.sort((a, b) => a - b);
+  const failed = _.sum(_.values(errors));
+  return {
+    count,
+    success: count - failed,
+    failed,
+    duration,
+    qps: duration ? Math.round((count * 100000) / duration) / 100 : count,
+    latency: {
+      min: sorted[0] || 0,
+      p50: percentile(sorted, 50),
+      p90: percentile(sorted, 90),
+      p99: percentile(sorted, 99),
+      max: sorted[sorted.length - 1] || 0,
+      avg: sorted.length ? Math.round(_.sum(sorted) / sorted.length) : 0,
+    },
+    coldStarts,
+    coldStartRate: sorted.length ? Math.round((coldStarts * 10000) / sorted.length) / 100 : 0,
+    instances: instances.size,
+    errors,
+    billedDuration,
+  };
+}
+
+export function formatLoadTestResult(result: ILoadTestResult): string {
+  const { latency } = result;
+  const lines = [
+    `Invocations: ${result.count} (success: ${result.success}, failed: ${result.failed})`,
+    `Duration: ${result.duration} ms, QPS: ${result.qps}`,
+    `Latency: min ${latency.min} ms, avg ${latency.avg} ms, p50 ${latency.p50} ms, p90 ${latency.p90} ms, p99 ${latency.p99} ms, max ${latency.max} ms`,
+    `Instances: ${result.instances}, cold start rate: ${result.coldStartRate}%`,
+    `Billed duration: ${result.billedDuration} ms`,
+  ];
+  if (!_.isEmpty(result.errors)) {
+    lines.push(
+      `Errors: ${_.map(result.errors, (times, type) => `${type} x ${times}`).join(', ')}`,
+    );
+  }
+  return lines.join('\n');
+}
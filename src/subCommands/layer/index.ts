@@ -6,7 +6,7 @@ import logger from '../../logger';
 import _ from 'lodash';
 import FC from '../../resources/fc';
 import zip from '@serverless-devs/zip';
-import downloads from '@serverless-devs/downloads';
+import { downloadWithCache } from '../../utils/download';
 import path from 'path';
 import fs from 'fs';
 import {
@@ -294,7 +294,7 @@ export default class Layer {
   }
 
   async download() {
-    const { code, layerName, version } = await this._getLayer();
+    const { code, layerName, version, codeChecksum } = await this._getLayer();
     const url = code.location;
 
     const localDir = path.join(
@@ -313,11 +313,7 @@ export default class Layer {
       codeUrl = url.replace('-internal.aliyuncs.com', '.aliyuncs.com');
     }
 
-    await downloads(codeUrl, {
-      dest: localDir,
-      filename: version,
-      extract: false,
-    });
+    await downloadWithCache(codeUrl, fileName, { checksum: codeChecksum });
     return fileName;
   }
 
@@ -4,6 +4,16 @@ import logger from '../../logger';
 import _ from 'lodash';
 import FC from '../../resources/fc';
 import { getUserAgent, tableShow } from '../../utils';
+import { runPool } from '../../utils/scheduler';
+import {
+  FanoutOutputFormat,
+  RegionClientPool,
+  listMatchedFunctions,
+  parseFanoutOutputFormat,
+  parseFanoutSelector,
+  writeJsonLine,
+} from '../../utils/fanout';
+import { FC_FANOUT_CONCURRENCY } from '../../default/config';
 
 const LIST_TABLE_KEYS = [
   'functionName',
@@ -18,12 +28,22 @@ export default class List {
   private region: IRegion;
   private fcSdk: FC;
   private opts: any;
+  private outputFormat: FanoutOutputFormat;
+  private pool: RegionClientPool;
 
   constructor(readonly inputs: IInputs) {
     const opts = parseArgv(inputs.args, {
       alias: { help: 'h' },
       boolean: ['help', 'table'],
-      string: ['region', 'prefix', 'limit', 'next-token'],
+      string: [
+        'region',
+        'regions',
+        'prefix',
+        'function-name',
+        'limit',
+        'next-token',
+        'output-format',
+      ],
     });
 
     logger.debug(`list opts: ${JSON.stringify(opts)}`);
@@ -39,12 +59,23 @@ export default class List {
     });
 
     this.opts = opts;
+    this.outputFormat = parseFanoutOutputFormat(opts);
+    this.pool = new RegionClientPool(inputs.credential, userAgent, {
+      region: this.region,
+      endpoint: inputs.props.endpoint,
+    });
   }
 
   async run() {
     const { limit, prefix } = this.opts;
     const nextToken = this.opts['next-token'];
 
+    // 前缀在单地域下也是原有参数，不作为批量模式的判断条件
+    const selector = parseFanoutSelector(_.omit(this.opts, 'prefix'), this.region);
+    if (selector || this.outputFormat === 'jsonl') {
+      return await this.listRegions(selector ? selector.regions : [this.region], selector?.names);
+    }
+
     if (limit) {
       const parsedLimit = parseInt(limit, 10);
       if (!parsedLimit || parsedLimit < 1) {
@@ -67,4 +98,30 @@ export default class List {
     }
     return { functions };
   }
+
+  /**
+   * 多地域并发列出函数，jsonl 格式下每个地域完成后立即输出
+   */
+  private async listRegions(regions: IRegion[], names: string[] = []) {
+    const { prefix } = this.opts;
+    const perRegion = await runPool(regions, FC_FANOUT_CONCURRENCY, async (region) => {
+      const functions = (await listMatchedFunctions(this.pool.get(region), prefix, names)).map(
+        (fn) => ({ region, ...fn }),
+      );
+      if (this.outputFormat === 'jsonl') {
+        functions.forEach((fn) => writeJsonLine(fn));
+      }
+      return functions;
+    });
+    const functions = _.flatten(perRegion);
+
+    if (this.outputFormat === 'jsonl') {
+      return;
+    }
+    if (this.outputFormat === 'table') {
+      tableShow(functions, ['region', ...LIST_TABLE_KEYS]);
+      return;
+    }
+    return { functions };
+  }
 }
@@ -3,10 +3,7 @@
 import path from 'path';
 import _ from 'lodash';
 import { v4 as uuidV4 } from 'uuid';
-import extract from 'extract-zip';
-import tmpDir from 'temp-dir';
 import * as fs from 'fs-extra';
-import * as rimraf from 'rimraf';
 import { parseArgv, getRootHome } from '@serverless-devs/utils';
 import { ICredentials } from '@serverless-devs/component-interface';
 import logger from '../../../logger';
@@ -25,20 +22,36 @@ import * as httpx from 'httpx';
 import FC from '../../../resources/fc';
 import downloads from '@serverless-devs/downloads';
 import decompress from 'decompress';
+import { runPool } from '../../../utils/scheduler';
+import { FC_LOCAL_CODE_CACHE_SIZE, FC_LOCAL_LAYER_CACHE_SIZE } from '../../../default/config';
+import { buildMergedLayer, getCachedMergedLayer } from './layerCache';
+import { getExtractedCodeDir } from './codeCache';
+
+// 并发查询、下载层的数量
+const LAYER_FETCH_CONCURRENCY = 4;
 
 export class BaseLocal {
   protected defaultDebugArgs: string;
   protected _argsData: any;
   protected unzippedCodeDir?: string;
   protected fcSdk: FC;
-  private _dockerName: string;
+  protected _dockerName: string;
   private baseDir: string;
 
   constructor(readonly inputs: IInputs) {
     this.baseDir = inputs.baseDir || process.cwd();
     logger.info(`Local baseDir is: ${this.baseDir}`);
     const argsData: { [key: string]: any } = parseArgv(this.inputs.args, {
-      string: ['event', 'event-file', 'config', 'debug-port'],
+      boolean: ['keep-warm'],
+      string: [
+        'event',
+        'event-file',
+        'event-dir',
+        'config',
+        'debug-port',
+        'instances',
+        'instance-concurrency',
+      ],
       alias: { event: 'e', 'event-file': 'f', config: 'c', 'debug-port': 'd' },
     });
     this._argsData = argsData;
@@ -151,53 +164,24 @@ export class BaseLocal {
     const codeUri = props.code as ICodeUri;
     const src: string = typeof codeUri === 'string' ? codeUri : codeUri.src;
     const { runtime } = props;
-    if (_.endsWith(src, '.zip') || (_.endsWith(src, '.jar') && runtime.startsWith('java'))) {
-      const tmpCodeDir: string = path.join(tmpDir, uuidV4());
-      await fs.ensureDir(tmpCodeDir);
-      logger.log(`code is a zip or jar format, will unzipping to ${tmpCodeDir}`);
-      await extract(src, { dir: tmpCodeDir });
-      this.unzippedCodeDir = tmpCodeDir;
-      return tmpCodeDir;
-    } else if (_.endsWith(src, '.jar') && FC.isCustomRuntime(runtime)) {
+    const resolvedCodeUri = path.isAbsolute(src) ? src : path.join(this.baseDir, src);
+    if (_.endsWith(src, '.jar') && FC.isCustomRuntime(runtime)) {
       const command = _.get(props, 'customRuntimeConfig.command', []);
       const args = _.get(props, 'customRuntimeConfig.args', []);
       const commandStr = `${_.join(command, ' ')} ${_.join(args, ' ')}`;
       if (commandStr.includes('java -jar')) {
-        const resolvedCodeUri = path.isAbsolute(src) ? src : path.join(this.baseDir, src);
         return path.dirname(resolvedCodeUri);
-      } else {
-        const resolvedCodeUri = path.isAbsolute(src) ? src : path.join(this.baseDir, src);
-        const tmpCodeDir = await this.tryUnzip(resolvedCodeUri);
-        this.unzippedCodeDir = tmpCodeDir;
-        return tmpCodeDir;
       }
-    } else if (_.endsWith(src, '.war')) {
-      const tmpCodeDir = await this.tryUnzip(src);
-      this.unzippedCodeDir = tmpCodeDir;
-      return tmpCodeDir;
-    } else {
-      const resolvedCodeUri = path.isAbsolute(src) ? src : path.join(this.baseDir, src);
-      return resolvedCodeUri;
     }
-  }
-
-  // jar and war try use unzip command, reminder user install unzip
-  async tryUnzip(src: string): Promise<string> {
-    const tmpCodeDir: string = path.join(tmpDir, uuidV4());
-    await fs.ensureDir(tmpCodeDir);
-    logger.log(`code is a jar or war format, will unzipping to ${tmpCodeDir}`);
-    try {
-      const result = execSync(`unzip -q ${src} -d ${tmpCodeDir}`, { encoding: 'utf-8' });
-      logger.info(result);
-    } catch (err) {
-      // https://linux.die.net/man/1/unzip
-      // 1:  one or more warning errors were encountered, but processing completed successfully anyway
-      if (err.status !== 1) {
-        logger.error(err);
-        logger.error('install unzip in your machine and retry');
-      }
+    if (
+      _.endsWith(src, '.zip') ||
+      _.endsWith(src, '.war') ||
+      (_.endsWith(src, '.jar') && (runtime.startsWith('java') || FC.isCustomRuntime(runtime)))
+    ) {
+      this.unzippedCodeDir = await getExtractedCodeDir(resolvedCodeUri, FC_LOCAL_CODE_CACHE_SIZE);
+      return this.unzippedCodeDir;
     }
-    return tmpCodeDir;
+    return resolvedCodeUri;
   }
 
   checkCodeUri(): boolean {
@@ -247,6 +231,10 @@ export class BaseLocal {
     // TODO: layer and  tmp dir
     const codeUri = await this.getCodeUri();
     logger.debug(`mount codeUri = ${codeUri}`);
+    // 解压目录是多次运行共享的缓存，只读挂载，与线上 zip 代码包的 /code 一致，避免函数写入污染缓存
+    if (codeUri === this.unzippedCodeDir) {
+      return `-v ${codeUri}:/code:ro`;
+    }
     return `-v ${codeUri}:/code`;
   }
 
@@ -469,11 +457,8 @@ export class BaseLocal {
 
   after() {
     logger.debug('after ...');
-    if (this.unzippedCodeDir) {
-      rimraf.sync(this.unzippedCodeDir);
-      console.log(`clean tmp code dir ${this.unzippedCodeDir} successfully`);
-      this.unzippedCodeDir = undefined;
-    }
+    // 解压目录由 codeCache 按大小上限统一淘汰，这里不再删除
+    this.unzippedCodeDir = undefined;
   }
 
   async checkServerReady(port: number, delay: number, maxRetries: number) {
@@ -547,19 +532,15 @@ export class BaseLocal {
       return '';
     }
 
-    let result = '';
-    const localLayerBaseDir = path.join(getRootHome(), 'layer');
-    const mergedDir = path.join(getRootHome(), 'temp', `${Date.now()}`);
-
-    if (fs.existsSync(mergedDir)) {
-      fs.rmdirSync(mergedDir);
+    // 相同 runtime 与层顺序的合并结果可直接复用，无需再查询层信息
+    const cachedDir = getCachedMergedLayer(runtime, layers);
+    if (cachedDir) {
+      logger.debug(`use cached merged layers ${cachedDir}`);
+      return ` -v ${cachedDir}:/opt:ro`;
     }
-    fs.mkdirSync(mergedDir, { recursive: true });
-    process.on('exit', () => {
-      fs.rmdirSync(mergedDir, { recursive: true });
-    });
 
-    for (const arn of layers) {
+    const localLayerBaseDir = path.join(getRootHome(), 'layer');
+    const layerDirs = await runPool(layers, LAYER_FETCH_CONCURRENCY, async (arn: string) => {
       const layerInfo = await this.fcSdk.getLayerVersionByArn(arn);
       if (!layerInfo.compatibleRuntime.includes(runtime)) {
         throw new Error(
@@ -583,7 +564,6 @@ export class BaseLocal {
       } else {
         logger.info(`fetching layer ${arn} ···`);
         // 此处因为downloads方法问题，被迫分解下载和解压操作，进行手动解压删除；后面有时间建议修复downloads，一步到位
-        // eslint-disable-next-line no-await-in-loop
         await downloads(
           layerInfo.code.location.replace('-internal.aliyuncs.com', '.aliyuncs.com'),
           {
@@ -596,33 +576,12 @@ export class BaseLocal {
         await decompress(zipPath, localLayerDir);
         fs.unlinkSync(zipPath);
       }
-      this.copyFolderContents(localLayerDir, mergedDir);
-    }
-    result += ` -v ${mergedDir}:/opt`;
-    return result;
-  }
-
-  copyFolderContents(source, target) {
-    // 读取源文件夹内容
-    const entries = fs.readdirSync(source, { withFileTypes: true });
-
-    // 确保目标文件夹存在
-    if (!fs.existsSync(target)) {
-      fs.mkdirSync(target, { recursive: true });
-    }
-
-    entries.forEach((entry) => {
-      const sourcePath = path.join(source, entry.name);
-      const targetPath = path.join(target, entry.name);
-
-      // 跳过已存在的目标文件或软链接
-
-      if (entry.isDirectory()) {
-        fs.mkdirSync(targetPath, { recursive: true });
-        this.copyFolderContents(sourcePath, targetPath);
-      } else if (!fs.existsSync(targetPath)) {
-        fs.copyFileSync(sourcePath, targetPath);
-      }
+      return localLayerDir;
     });
+
+    // 按 layers 顺序合并，同名文件以靠前的层为准
+    const mergedDir = buildMergedLayer(runtime, layers, layerDirs, FC_LOCAL_LAYER_CACHE_SIZE);
+    // 合并目录是指向层缓存文件的硬链接，只读挂载避免容器内写入同时改坏两份缓存（线上 /opt 也是只读）
+    return ` -v ${mergedDir}:/opt:ro`;
   }
 }
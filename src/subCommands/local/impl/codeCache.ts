@@ -0,0 +1,110 @@
+import path from 'path';
+import * as fs from 'fs-extra';
+import extract from 'extract-zip';
+import { getRootHome } from '@serverless-devs/utils';
+import logger from '../../../logger';
+import { calculateCRC64 } from '../../../utils';
+
+interface IExtractedCodeMeta {
+  src: string;
+  // 解压后的文件大小之和，单位 byte
+  size: number;
+  lastUsed: number;
+}
+
+export const getCodeCacheBaseDir = () => path.join(getRootHome(), 'fc', 'local-code');
+
+// 元数据与解压目录同级存放，避免出现在挂载到容器的 /code 中；元数据存在即表示解压完成
+const getMetaFile = (dir: string) => `${dir}.json`;
+
+function readMeta(dir: string): IExtractedCodeMeta | undefined {
+  try {
+    return fs.readJsonSync(getMetaFile(dir));
+  } catch (ex) {
+    return undefined;
+  }
+}
+
+function getDirSize(dir: string): number {
+  let size = 0;
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const entryPath = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      size += getDirSize(entryPath);
+    } else if (entry.isFile()) {
+      size += fs.statSync(entryPath).size;
+    }
+  }
+  return size;
+}
+
+/**
+ * 获取 zip/jar/war 代码包的解压目录，按代码包 CRC64 缓存，内容未变时跨次运行复用
+ * 先解压到临时目录，完成后再原子重命名，避免并发的 s local 读到不完整的目录
+ * @param src 代码包的绝对路径
+ * @param maxCacheSize 缓存大小上限，单位 MB
+ */
+export async function getExtractedCodeDir(src: string, maxCacheSize: number): Promise<string> {
+  const crc64Value = await calculateCRC64(src);
+  const dir = path.join(getCodeCacheBaseDir(), `${crc64Value}`);
+  const meta = readMeta(dir);
+  if (meta && fs.existsSync(dir)) {
+    logger.debug(`use cached code dir ${dir} of ${src}`);
+    fs.writeJsonSync(getMetaFile(dir), { ...meta, src, lastUsed: Date.now() });
+    return dir;
+  }
+
+  const tmpDir = `${dir}.tmp-${process.pid}-${Date.now()}`;
+  await fs.ensureDir(tmpDir);
+  logger.log(`code is a zip, jar or war format, will unzipping to ${dir}`);
+  try {
+    await extract(src, { dir: tmpDir });
+    if (readMeta(dir) && fs.existsSync(dir)) {
+      // 其它进程已经完成解压
+      fs.removeSync(tmpDir);
+    } else {
+      fs.removeSync(dir);
+      fs.renameSync(tmpDir, dir);
+      fs.writeJsonSync(getMetaFile(dir), { src, size: getDirSize(dir), lastUsed: Date.now() });
+    }
+  } catch (ex) {
+    fs.removeSync(tmpDir);
+    throw ex;
+  }
+  evictExtractedCode(maxCacheSize, dir);
+  return dir;
+}
+
+/**
+ * 解压缓存超过上限时，按最近使用时间从旧到新淘汰
+ * @param maxCacheSize 单位 MB
+ * @param keepDir 当前正在使用的目录，不会被淘汰
+ */
+export function evictExtractedCode(maxCacheSize: number, keepDir?: string) {
+  const baseDir = getCodeCacheBaseDir();
+  if (!fs.existsSync(baseDir)) {
+    return;
+  }
+  const entries = fs
+    .readdirSync(baseDir)
+    .filter((name) => name.endsWith('.json'))
+    .map((name) => path.join(baseDir, path.basename(name, '.json')))
+    .map((dir) => ({ dir, meta: readMeta(dir) }))
+    .filter(({ meta }) => meta)
+    .sort((a, b) => a.meta.lastUsed - b.meta.lastUsed);
+
+  let total = entries.reduce((sum, { meta }) => sum + meta.size, 0);
+  const limit = maxCacheSize * 1024 * 1024;
+  for (const { dir, meta } of entries) {
+    if (total <= limit) {
+      break;
+    }
+    if (dir === keepDir) {
+      continue;
+    }
+    logger.debug(`evict extracted code cache ${dir} of ${meta.src}`);
+    fs.removeSync(getMetaFile(dir));
+    fs.removeSync(dir);
+    total -= meta.size;
+  }
+}
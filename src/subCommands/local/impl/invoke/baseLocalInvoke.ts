@@ -4,15 +4,28 @@ import logger from '../../../../logger';
 import _ from 'lodash';
 import { runCommand } from '../../../../utils';
 import fs from 'fs';
+import path from 'path';
 import * as portFinder from 'portfinder';
 import { v4 as uuidV4 } from 'uuid';
 import chalk from 'chalk';
 import { execSync } from 'child_process';
 
 import * as httpx from 'httpx';
+import { FC_LOCAL_WARM_IDLE_TIMEOUT } from '../../../../default/config';
+import {
+  IInvokeStat,
+  getCodeFingerprint,
+  getContainerConfigHash,
+  getWarmContainer,
+  saveWarmContainer,
+  summarizeInvokeStats,
+  sweepIdleContainers,
+} from './warmPool';
 
 export class BaseLocalInvoke extends BaseLocal {
   port: number;
+  // 开启 --keep-warm 时容器的配置指纹
+  protected warmHash?: string;
 
   beforeInvoke(): boolean {
     logger.debug('beforeInvoke ...');
@@ -34,13 +47,94 @@ export class BaseLocalInvoke extends BaseLocal {
   }
 
   async runInvoke() {
+    const events = this.getEvents();
+    const { cold, startup } = await this.prepareContainer();
+
+    if (this.isDebug()) {
+      runCommand(`docker logs -f ${this.getContainerName()}`, runCommand.showStdout.pipe);
+    }
+    const stats: IInvokeStat[] = [];
+    for (let i = 0; i < events.length; i++) {
+      const { name, event } = events[i];
+      if (events.length > 1) {
+        logger.info(chalk.cyan(`Invoke with event ${name} (${i + 1}/${events.length})`));
+      }
+      const start = Date.now();
+      // eslint-disable-next-line no-await-in-loop
+      await this.invokeEvent(event);
+      // 冷启动耗时包含容器启动到就绪的时间
+      const isCold = cold && i === 0;
+      const latency = Date.now() - start + (isCold ? startup : 0);
+      stats.push({ event: name, cold: isCold, latency });
+    }
+    if (events.length > 1 || this.warmHash) {
+      logger.info(summarizeInvokeStats(stats));
+    }
+    this.releaseContainer();
+    process.exit();
+  }
+
+  /**
+   * 启动函数容器；开启 --keep-warm 时优先复用配置一致的预热容器
+   * @returns cold 是否新启动了容器，startup 容器启动到就绪的耗时（ms）
+   */
+  async prepareContainer(): Promise<{ cold: boolean; startup: number }> {
+    const start = Date.now();
     const cmdStr = await this.getLocalInvokeCmdStr();
+    if (this.canKeepWarm()) {
+      sweepIdleContainers(FC_LOCAL_WARM_IDLE_TIMEOUT);
+      this.warmHash = getContainerConfigHash(cmdStr, getCodeFingerprint(await this.getCodeUri()));
+      const warm = getWarmContainer(this.warmHash);
+      if (warm) {
+        logger.info(`Reuse warm container ${warm.name} on port ${warm.port}`);
+        this.port = warm.port;
+        this._dockerName = warm.name;
+        return { cold: false, startup: 0 };
+      }
+    }
     await runCommand(cmdStr, runCommand.showStdout.ignore);
     await this.checkServerReady(this.port, 1000, 20);
+    return { cold: true, startup: Date.now() - start };
+  }
 
+  /**
+   * 调用结束：预热容器保留给后续调用，否则 kill 容器
+   */
+  releaseContainer() {
+    if (this.warmHash) {
+      saveWarmContainer({
+        name: this.getContainerName(),
+        port: this.port,
+        hash: this.warmHash,
+        lastUsed: Date.now(),
+      });
+      logger.info(
+        `Container ${this.getContainerName()} is kept warm, it will be removed after ${FC_LOCAL_WARM_IDLE_TIMEOUT}s idle`,
+      );
+      return;
+    }
+    try {
+      execSync(`docker kill ${this.getContainerName()}`);
+    } catch (e) {
+      logger.error(`fail to docker kill ${this.getContainerName()}, error=${e}`);
+    }
+  }
+
+  // 断点调试需要每次重新挂载调试参数，无法跨进程复用容器
+  canKeepWarm(): boolean {
+    if (!_.get(this._argsData, 'keep-warm')) {
+      return false;
+    }
     if (this.isDebug()) {
-      runCommand(`docker logs -f ${this.getContainerName()}`, runCommand.showStdout.pipe);
+      logger.warn(
+        '--keep-warm is not supported with breakpoint debugging, the container will be removed after invoke.',
+      );
+      return false;
     }
+    return true;
+  }
+
+  async invokeEvent(event: string) {
     const credentials = await this.getCredentials();
     const requestId = uuidV4();
     const headers = {
@@ -64,7 +158,7 @@ export class BaseLocalInvoke extends BaseLocal {
       'X-Fc-Request-Id': requestId,
       'X-Fc-HTTP-Path': '/',
     };
-    const postData = Buffer.from(this.getEventString(), 'utf-8');
+    const postData = Buffer.from(event, 'utf-8');
     // 断点调试允许超时时间延长一小时
     const timeout = _.isEmpty(this.getDebugArgs())
       ? (this.getTimeout() + 3) * 1000
@@ -89,13 +183,30 @@ export class BaseLocalInvoke extends BaseLocal {
       headerInfo['x-fc-max-memory-usage']
     } MB`;
     console.log(`${chalk.green(abstract)}\n`);
-    // kill container
-    try {
-      execSync(`docker kill ${this.getContainerName()}`);
-    } catch (e) {
-      logger.error(`fail to docker kill ${this.getContainerName()}, error=${e}`);
+  }
+
+  /**
+   * 指定 --event-dir 时按文件名顺序调用目录下所有 .json 事件，复用同一个容器
+   */
+  getEvents(): { name: string; event: string }[] {
+    const eventDir = _.get(this._argsData, 'event-dir');
+    if (_.isEmpty(eventDir)) {
+      return [{ name: 'event', event: this.getEventString() }];
     }
-    process.exit();
+    if (!fs.existsSync(eventDir) || !fs.statSync(eventDir).isDirectory()) {
+      throw new Error(`event-dir ${eventDir} is not a directory`);
+    }
+    const files = fs
+      .readdirSync(eventDir)
+      .filter((file) => file.endsWith('.json'))
+      .sort();
+    if (_.isEmpty(files)) {
+      throw new Error(`No .json event file found in event-dir ${eventDir}`);
+    }
+    return files.map((file) => ({
+      name: file,
+      event: formatJsonString(fs.readFileSync(path.join(eventDir, file), 'utf-8')),
+    }));
   }
 
   getEventString(): string {
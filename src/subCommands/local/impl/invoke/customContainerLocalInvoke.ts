@@ -8,8 +8,6 @@ import chalk from 'chalk';
 import { runCommand } from '../../../../utils';
 
 export class CustomContainerLocalInvoke extends BaseLocalInvoke {
-  private _port: number;
-
   getDebugArgs(): string {
     if (_.isFinite(this.getDebugPort())) {
       // TODO 参数支持自定义调试参数实现断点调试
@@ -75,7 +73,7 @@ export class CustomContainerLocalInvoke extends BaseLocalInvoke {
     const port = await portFinder.getPortPromise({ port: this.getCaPort() });
     // const msg = `You can use curl or Postman to make an HTTP request to localhost:${port} to test the function.for example:`;
     // console.log('\x1b[33m%s\x1b[0m', msg);
-    this._port = port;
+    this.port = port;
     const image = await this.getRuntimeRunImage();
     const envStr = await this.getEnvString();
     const nasStr = this.getNasMountString();
@@ -95,11 +93,7 @@ export class CustomContainerLocalInvoke extends BaseLocalInvoke {
     return dockerCmdStr;
   }
 
-  async runInvoke() {
-    const cmdStr = await this.getLocalInvokeCmdStr();
-    await runCommand(cmdStr, runCommand.showStdout.ignore);
-    await this.checkServerReady(this._port, 1000, 20);
-
+  async invokeEvent(event: string) {
     const startTimeStamp = new Date().getTime();
     const credentials = await this.getCredentials();
     const requestId = uuidV4();
@@ -120,10 +114,10 @@ export class CustomContainerLocalInvoke extends BaseLocalInvoke {
         : '',
       'x-fc-function-initializer': this.getInitializer() ? this.getInitializer() : '',
     };
-    const postData = Buffer.from(this.getEventString(), 'utf-8');
+    const postData = Buffer.from(event, 'utf-8');
     const timeout = (this.getTimeout() + 3) * 1000;
     const { result } = await this.request(
-      `http://localhost:${this._port}/invoke`,
+      `http://localhost:${this.port}/invoke`,
       'POST',
       headers,
       postData,
@@ -132,7 +126,11 @@ export class CustomContainerLocalInvoke extends BaseLocalInvoke {
     const endTimeStamp = new Date().getTime();
     const billedDuration = endTimeStamp - startTimeStamp;
 
-    await runCommand(`docker logs ${this.getContainerName()}`, runCommand.showStdout.pipe);
+    // 预热容器会被多次调用，只输出本次调用期间的日志
+    await runCommand(
+      `docker logs --since ${startTimeStamp / 1000} ${this.getContainerName()}`,
+      runCommand.showStdout.pipe,
+    );
     console.log(result.toString());
 
     let maxMemoryUsed = this.getMemorySize();
@@ -161,12 +159,5 @@ export class CustomContainerLocalInvoke extends BaseLocalInvoke {
 
     const abstract = `RequestId: ${requestId}   Billed Duration: ${billedDuration} ms    Memory Size: ${this.getMemorySize()} MB    Max Memory Used: ${maxMemoryUsed} MB`;
     console.log(`${chalk.green(abstract)}\n`);
-    // kill container
-    try {
-      execSync(`docker kill ${this.getContainerName()}`);
-    } catch (e) {
-      logger.error(`fail to docker kill ${this.getContainerName()}, error=${e}`);
-    }
-    process.exit();
   }
 }
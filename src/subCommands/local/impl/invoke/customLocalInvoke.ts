@@ -6,6 +6,24 @@ import * as portFinder from 'portfinder';
 import chalk from 'chalk';
 
 export class CustomLocalInvoke extends BaseLocalInvoke {
+  // custom runtime 通过 docker run --event 单次调用，无法复用容器调用多个事件
+  beforeInvoke(): boolean {
+    const ret = super.beforeInvoke();
+    if (!ret) {
+      return ret;
+    }
+    if (this._argsData?.['event-dir']) {
+      logger.error('--event-dir is not supported by custom runtime, please use --event-file');
+      return false;
+    }
+    if (this._argsData?.['keep-warm']) {
+      logger.warn(
+        '--keep-warm is not supported by custom runtime, the container will be removed after invoke.',
+      );
+    }
+    return true;
+  }
+
   getDebugArgs(): string {
     if (_.isFinite(this.getDebugPort())) {
       // TODO 参数支持自定义调试参数实现断点调试
@@ -0,0 +1,161 @@
+import crypto from 'crypto';
+import path from 'path';
+import * as fs from 'fs-extra';
+import { execSync } from 'child_process';
+import { getRootHome } from '@serverless-devs/utils';
+import logger from '../../../../logger';
+
+export interface IWarmContainer {
+  name: string;
+  port: number;
+  hash: string;
+  lastUsed: number;
+}
+
+export interface IInvokeStat {
+  event: string;
+  cold: boolean;
+  // 单位 ms
+  latency: number;
+}
+
+const getPoolDir = () => path.join(getRootHome(), 'fc', 'local-warm-pool');
+
+/**
+ * 容器配置指纹：去掉每次都会变化的容器名、宿主机端口和实例 ID，其余参数（镜像、挂载、环境变量、内存）一致即可复用
+ * @param codeFingerprint 挂载代码的指纹，代码变化后不再复用已加载旧代码的容器
+ */
+export function getContainerConfigHash(dockerCmdStr: string, codeFingerprint = ''): string {
+  const normalized = dockerCmdStr
+    .replace(/--name \S+/, '')
+    .replace(/-p \d+:(\d+)/, '-p $1')
+    .replace(/-e "FC_INSTANCE_ID=[^"]*"/, '')
+    .replace(/\s+/g, ' ');
+  return crypto
+    .createHash('sha256')
+    .update(normalized)
+    .update(codeFingerprint)
+    .digest('hex')
+    .slice(0, 16);
+}
+
+/**
+ * 代码指纹：按文件相对路径、大小和修改时间计算，只读取文件元数据，不读取文件内容
+ * 层和 zip 代码包的解压目录按内容缓存，目录路径已经体现在 docker 命令中，无需计算
+ */
+export function getCodeFingerprint(codeUri: string): string {
+  const hash = crypto.createHash('sha256');
+  const walk = (file: string, relative: string) => {
+    const stat = fs.statSync(file);
+    if (!stat.isDirectory()) {
+      hash.update(`${relative}:${stat.size}:${stat.mtimeMs}\n`);
+      return;
+    }
+    for (const name of fs.readdirSync(file).sort()) {
+      if (name !== '.git') {
+        walk(path.join(file, name), path.join(relative, name));
+      }
+    }
+  };
+  try {
+    walk(codeUri, '');
+  } catch (ex) {
+    logger.debug(`fail to get code fingerprint of ${codeUri}: ${ex}`);
+    return '';
+  }
+  return hash.digest('hex');
+}
+
+function isContainerRunning(name: string): boolean {
+  try {
+    return execSync(`docker inspect -f "{{.State.Running}}" ${name}`).toString().trim() === 'true';
+  } catch (ex) {
+    return false;
+  }
+}
+
+function removeContainer(name: string) {
+  try {
+    execSync(`docker rm -f ${name}`, { stdio: 'ignore' });
+  } catch (ex) {
+    logger.debug(`fail to remove warm container ${name}: ${ex}`);
+  }
+}
+
+/**
+ * 获取配置一致且仍在运行的预热容器
+ */
+export function getWarmContainer(hash: string): IWarmContainer | undefined {
+  const stateFile = path.join(getPoolDir(), `${hash}.json`);
+  if (!fs.existsSync(stateFile)) {
+    return undefined;
+  }
+  try {
+    const container: IWarmContainer = fs.readJsonSync(stateFile);
+    if (isContainerRunning(container.name)) {
+      return container;
+    }
+  } catch (ex) {
+    logger.debug(`invalid warm container state ${stateFile}: ${ex}`);
+  }
+  fs.removeSync(stateFile);
+  return undefined;
+}
+
+export function saveWarmContainer(container: IWarmContainer) {
+  fs.ensureDirSync(getPoolDir());
+  fs.writeJsonSync(path.join(getPoolDir(), `${container.hash}.json`), container);
+}
+
+/**
+ * 清理空闲超时的预热容器
+ * @param idleTimeout 单位秒
+ */
+export function sweepIdleContainers(idleTimeout: number) {
+  const poolDir = getPoolDir();
+  if (!fs.existsSync(poolDir)) {
+    return;
+  }
+  for (const file of fs.readdirSync(poolDir)) {
+    const stateFile = path.join(poolDir, file);
+    try {
+      const container: IWarmContainer = fs.readJsonSync(stateFile);
+      if (Date.now() - container.lastUsed < idleTimeout * 1000) {
+        continue;
+      }
+      logger.debug(`remove idle warm container ${container.name}`);
+      removeContainer(container.name);
+    } catch (ex) {
+      logger.debug(`invalid warm container state ${stateFile}: ${ex}`);
+    }
+    fs.removeSync(stateFile);
+  }
+}
+
+const percentile = (sorted: number[], p: number) =>
+  sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)];
+
+/**
+ * 汇总调用耗时，冷启动与热调用分开统计
+ */
+export function summarizeInvokeStats(stats: IInvokeStat[]): string {
+  const cold = stats.filter((stat) => stat.cold).map((stat) => stat.latency);
+  const warm = stats
+    .filter((stat) => !stat.cold)
+    .map((stat) => stat.latency)
+    .sort((a, b) => a - b);
+  const lines = [`Invocations: ${stats.length} (cold: ${cold.length}, warm: ${warm.length})`];
+  if (cold.length) {
+    lines.push(`Cold latency: ${cold.join(', ')} ms`);
+  }
+  if (warm.length) {
+    const avg = Math.round(warm.reduce((sum, latency) => sum + latency, 0) / warm.length);
+    lines.push(
+      `Warm latency: avg ${avg} ms, p50 ${percentile(warm, 50)} ms, p95 ${percentile(
+        warm,
+        95,
+      )} ms, max ${warm[warm.length - 1]} ms`,
+    );
+  }
+  return lines.join('\n');
+}
@@ -0,0 +1,167 @@
+import crypto from 'crypto';
+import path from 'path';
+import * as fs from 'fs-extra';
+import { getRootHome } from '@serverless-devs/utils';
+import logger from '../../../logger';
+
+interface IMergedLayerMeta {
+  runtime: string;
+  arns: string[];
+  // 合并目录中文件大小之和，单位 byte
+  size: number;
+  lastUsed: number;
+}
+
+// 早期版本写在合并目录内部的元数据，这种目录只在淘汰时清理
+const LEGACY_META_FILE = '.fc-layer-meta.json';
+
+export const getMergedLayerBaseDir = () => path.join(getRootHome(), 'layer', 'merged');
+
+/**
+ * 合并层的缓存 key：runtime + 有序的层 ARN 列表，顺序不同时同名文件的覆盖关系不同
+ */
+export function getMergedLayerKey(runtime: string, arns: string[]): string {
+  return crypto
+    .createHash('sha256')
+    .update(JSON.stringify([runtime, ...arns]))
+    .digest('hex')
+    .slice(0, 16);
+}
+
+// 元数据与合并目录同级存放，避免出现在挂载到容器的 /opt 中；元数据存在即表示合并完成
+const getMetaFile = (dir: string) => `${dir}.json`;
+
+function readMeta(dir: string): IMergedLayerMeta | undefined {
+  try {
+    return fs.readJsonSync(getMetaFile(dir));
+  } catch (ex) {
+    return undefined;
+  }
+}
+
+/**
+ * 获取已合并的层目录，不存在时返回 undefined
+ */
+export function getCachedMergedLayer(runtime: string, arns: string[]): string | undefined {
+  const dir = path.join(getMergedLayerBaseDir(), getMergedLayerKey(runtime, arns));
+  const meta = readMeta(dir);
+  if (!meta || !fs.existsSync(dir)) {
+    return undefined;
+  }
+  fs.writeJsonSync(getMetaFile(dir), { ...meta, lastUsed: Date.now() });
+  return dir;
+}
+
+/**
+ * 将 source 中的文件以硬链接方式合并到 target，已存在的文件不覆盖（先合并的层优先）
+ * 跨设备等无法硬链接时退回复制
+ * @returns 新增文件大小之和
+ */
+export function linkFolderContents(source: string, target: string): number {
+  let size = 0;
+  fs.ensureDirSync(target);
+  for (const entry of fs.readdirSync(source, { withFileTypes: true })) {
+    const sourcePath = path.join(source, entry.name);
+    const targetPath = path.join(target, entry.name);
+    if (entry.isDirectory()) {
+      size += linkFolderContents(sourcePath, targetPath);
+    } else if (!fs.existsSync(targetPath) && !isSymlink(targetPath)) {
+      if (entry.isSymbolicLink()) {
+        fs.symlinkSync(fs.readlinkSync(sourcePath), targetPath);
+        continue;
+      }
+      try {
+        fs.linkSync(sourcePath, targetPath);
+      } catch (ex) {
+        fs.copyFileSync(sourcePath, targetPath);
+      }
+      size += fs.statSync(sourcePath).size;
+    }
+  }
+  return size;
+}
+
+function isSymlink(filePath: string): boolean {
+  try {
+    return fs.lstatSync(filePath).isSymbolicLink();
+  } catch (ex) {
+    return false;
+  }
+}
+
+/**
+ * 按顺序合并层目录并缓存，先在临时目录构建，完成后再原子重命名，避免并发的 s local 读到不完整的目录
+ * @param layerDirs 与 arns 顺序一致的本地层目录
+ */
+export function buildMergedLayer(
+  runtime: string,
+  arns: string[],
+  layerDirs: string[],
+  maxCacheSize: number,
+): string {
+  const baseDir = getMergedLayerBaseDir();
+  const dir = path.join(baseDir, getMergedLayerKey(runtime, arns));
+  const tmpDir = `${dir}.tmp-${process.pid}-${Date.now()}`;
+  fs.ensureDirSync(tmpDir);
+  try {
+    let size = 0;
+    for (const layerDir of layerDirs) {
+      size += linkFolderContents(layerDir, tmpDir);
+    }
+    if (readMeta(dir) && fs.existsSync(dir)) {
+      // 其它进程已经完成合并
+      fs.removeSync(tmpDir);
+    } else {
+      fs.removeSync(dir);
+      fs.renameSync(tmpDir, dir);
+      const meta: IMergedLayerMeta = { runtime, arns, size, lastUsed: Date.now() };
+      fs.writeJsonSync(getMetaFile(dir), meta);
+    }
+  } catch (ex) {
+    fs.removeSync(tmpDir);
+    throw ex;
+  }
+  evictMergedLayers(maxCacheSize, dir);
+  return dir;
+}
+
+/**
+ * 合并层缓存超过上限时，按最近使用时间从旧到新淘汰
+ * @param maxCacheSize 单位 MB
+ * @param keepDir 当前正在使用的目录，不会被淘汰
+ */
+export function evictMergedLayers(maxCacheSize: number, keepDir?: string) {
+  const baseDir = getMergedLayerBaseDir();
+  if (!fs.existsSync(baseDir)) {
+    return;
+  }
+  for (const name of fs.readdirSync(baseDir)) {
+    const dir = path.join(baseDir, name);
+    if (fs.existsSync(path.join(dir, LEGACY_META_FILE))) {
+      logger.debug(`remove merged layer cache ${dir} of legacy format`);
+      fs.removeSync(dir);
+    }
+  }
+  const entries = fs
+    .readdirSync(baseDir)
+    .filter((name) => name.endsWith('.json'))
+    .map((name) => path.join(baseDir, path.basename(name, '.json')))
+    .map((dir) => ({ dir, meta: readMeta(dir) }))
+    .filter(({ meta }) => meta)
+    .sort((a, b) => a.meta.lastUsed - b.meta.lastUsed);
+
+  let total = entries.reduce((sum, { meta }) => sum + meta.size, 0);
+  const limit = maxCacheSize * 1024 * 1024;
+  for (const { dir, meta } of entries) {
+    if (total <= limit) {
+      break;
+    }
+    if (dir === keepDir) {
+      continue;
+    }
+    logger.debug(`evict merged layer cache ${dir}, layers: ${meta.arns.join(', ')}`);
+    fs.removeSync(getMetaFile(dir));
+    fs.removeSync(dir);
+    total -= meta.size;
+  }
+}
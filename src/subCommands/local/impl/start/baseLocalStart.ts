@@ -7,14 +7,44 @@ import http from 'http';
 import { createProxyServer } from 'http-proxy';
 import chalk from 'chalk';
 import { parse } from 'url';
+import { execSync } from 'child_process';
+import { ProxyPool } from './proxyPool';
+
+// 本地代理的统计接口，返回请求速率、排队情况和耗时直方图
+export const LOCAL_STATS_PATH = '/__fc_local/stats';
 
 export class BaseLocalStart extends BaseLocal {
   serverPort: number;
   proxyPort: number;
+  // 每个运行时容器映射到本机的端口，--instances 大于 1 时有多个
+  serverPorts: number[] = [];
+  proxyPool: ProxyPool;
+  // 正在生成启动命令的容器序号，0 为主容器
+  private containerIndex = 0;
 
   beforeStart(): boolean {
     logger.debug('beforeStart ...');
-    return super.before();
+    const ret = super.before();
+    if (!ret) {
+      return ret;
+    }
+    const instances = this.getInstances();
+    const instanceConcurrency = this.getInstanceConcurrency();
+    if (!Number.isInteger(instances) || instances < 1) {
+      logger.error(`--instances must be a positive integer, but got ${instances}`);
+      return false;
+    }
+    if (!Number.isInteger(instanceConcurrency) || instanceConcurrency < 1) {
+      logger.error(
+        `--instance-concurrency must be a positive integer, but got ${instanceConcurrency}`,
+      );
+      return false;
+    }
+    if (instances > 1 && this.isDebug()) {
+      logger.error('breakpoint debugging only supports one instance, please remove --instances');
+      return false;
+    }
+    return true;
   }
 
   afterStart() {
@@ -31,15 +61,75 @@ export class BaseLocalStart extends BaseLocal {
     this.afterStart();
   }
 
+  getContainerName(): string {
+    const name = super.getContainerName();
+    return this.containerIndex ? `${name}-${this.containerIndex}` : name;
+  }
+
+  /**
+   * 本地启动的运行时容器数量，默认 1
+   */
+  getInstances(): number {
+    const instances = this._argsData?.instances;
+    return _.isNil(instances) ? 1 : Number(instances);
+  }
+
+  /**
+   * 单个容器同时处理的请求数，默认取函数配置的 instanceConcurrency
+   */
+  getInstanceConcurrency(): number {
+    const instanceConcurrency = this._argsData?.['instance-concurrency'];
+    if (!_.isNil(instanceConcurrency)) {
+      return Number(instanceConcurrency);
+    }
+    return this.inputs.props.instanceConcurrency || 1;
+  }
+
+  /**
+   * 代理是否需要把请求转换为运行时的 HTTP 调用接口，custom 运行时的容器直接处理原始请求
+   */
+  isInvokeApiProxy(): boolean {
+    return true;
+  }
+
   async runStart() {
-    const cmdStr = await this.getLocalStartCmdStr();
+    const cmdStrs: string[] = [];
+    for (let i = 0; i < this.getInstances(); i++) {
+      this.containerIndex = i;
+      // eslint-disable-next-line no-await-in-loop
+      cmdStrs.push(await this.getLocalStartCmdStr());
+    }
+    this.containerIndex = 0;
+    if (cmdStrs.length > 1) {
+      // 主容器由 BaseLocal 在 DEVS:SIGINT 时清理，这里清理其余容器
+      const names = _.range(1, cmdStrs.length).map((i) => `${super.getContainerName()}-${i}`);
+      process.on('DEVS:SIGINT', () => {
+        try {
+          execSync(`docker kill ${names.join(' ')}`, { stdio: 'ignore' });
+        } catch (e) {
+          logger.debug(`fail to docker kill ${names.join(' ')}, error=${e}`);
+        }
+      });
+    }
     this.setupHttpProxy();
-    await runCommand(cmdStr, runCommand.showStdout.pipe);
+    await Promise.all(cmdStrs.map((cmdStr) => runCommand(cmdStr, runCommand.showStdout.pipe)));
   }
 
-  async getLocalStartCmdStr(): Promise<string> {
-    const port = await portFinder.getPortPromise({ port: this.getCaPort() });
+  /**
+   * 为下一个容器查找可用的本机端口，多个容器依次递增
+   */
+  async allocateServerPort(): Promise<number> {
+    const lastPort = _.last(this.serverPorts);
+    const port = await portFinder.getPortPromise({
+      port: lastPort ? lastPort + 1 : this.getCaPort(),
+    });
     this.serverPort = port;
+    this.serverPorts.push(port);
+    return port;
+  }
+
+  async getLocalStartCmdStr(): Promise<string> {
+    const port = await this.allocateServerPort();
     const mntStr = await this.getMountString();
     const envStr = await this.getEnvString();
     const nasStr = this.getNasMountString();
@@ -55,41 +145,84 @@ export class BaseLocalStart extends BaseLocal {
   }
 
   async setupHttpProxy() {
+    const ports = _.isEmpty(this.serverPorts) ? [this.serverPort] : this.serverPorts;
+    await Promise.all(ports.map((port) => this.checkServerReady(port, 1000, 20)));
+
+    const instanceConcurrency = this.getInstanceConcurrency();
+    const pool = new ProxyPool(ports, instanceConcurrency);
+    this.proxyPool = pool;
+    // 复用到容器的长连接，每个容器的连接数不超过 instanceConcurrency
+    const agent = new http.Agent({ keepAlive: true, maxSockets: instanceConcurrency });
     // 创建一个代理服务器对象
-    await this.checkServerReady(this.serverPort, 1000, 20);
-    const proxy = createProxyServer({});
+    const proxy = createProxyServer({ agent });
+    const invokeApi = this.isInvokeApiProxy();
+    const printLogResult = invokeApi && !this.isDebug();
 
-    this.proxyPort = await portFinder.getPortPromise({ port: this.serverPort + 1 });
+    this.proxyPort = await portFinder.getPortPromise({ port: _.max(ports) + 1 });
     const msg = `You can use curl or Postman to make an HTTP request to localhost:${this.proxyPort} to test the function`;
     console.log(chalk.green(msg));
+    const statsUrl = `http://localhost:${this.proxyPort}${LOCAL_STATS_PATH}`;
+    const poolMsg = `Instances: ${ports.length}, instanceConcurrency: ${instanceConcurrency}`;
+    console.log(chalk.green(`${poolMsg}, stats: ${statsUrl}`));
 
     // 创建一个可以拦截请求的HTTP服务器
     http
-      .createServer((req, res) => {
-        // 在这里，你可以根据需要处理请求
-        // 添加你的自定义逻辑，比如验证、日志记录等
+      .createServer(async (req, res) => {
         const parsedUrl = parse(req.url, false);
         const { query, pathname } = parsedUrl;
+        if (pathname === LOCAL_STATS_PATH) {
+          res.writeHead(200, { 'Content-Type': 'application/json' });
+          res.end(JSON.stringify(pool.stats(), null, 2));
+          return;
+        }
         logger.info(`path=${pathname}; query=${query}`);
-        req.url = `/2023-03-30/functions/function/invocations?${query}`;
-        // 转发请求到实际的服务
-        proxy.web(req, res, {
-          target: `http://localhost:${this.serverPort}`,
-          headers: {
+
+        // 所有容器都在处理 instanceConcurrency 个请求时排队
+        const upstream = await pool.acquire();
+        if (req.socket.destroyed) {
+          pool.release(upstream);
+          return;
+        }
+        const startTime = Date.now();
+        let released = false;
+        const release = () => {
+          if (!released) {
+            released = true;
+            const statusCode = res.writableFinished ? res.statusCode : undefined;
+            pool.release(upstream, Date.now() - startTime, statusCode);
+          }
+        };
+        res.once('finish', release);
+        res.once('close', release);
+
+        const options: any = { target: `http://localhost:${upstream.port}` };
+        if (invokeApi) {
+          req.url = `/2023-03-30/functions/function/invocations?${query}`;
+          options.headers = {
             'X-Fc-HTTP-Path': pathname,
             'X-Fc-Event-Type': 'HTTP',
             'X-Fc-Log-Type': 'Tail',
-          },
+          };
+        }
+        // 转发请求到实际的服务
+        proxy.web(req, res, options, (err) => {
+          logger.error(`proxy request to instance ${upstream.index} error: ${err.message}`);
+          if (!res.headersSent) {
+            res.writeHead(502);
+          }
+          res.end();
         });
       })
       .listen(this.proxyPort, () => {
         logger.debug(`代理服务器在端口 ${this.proxyPort} 上运行`);
       });
-    proxy.on('proxyRes', async (proxyRes) => {
-      if (!this.isDebug()) {
-        if (proxyRes.headers['x-fc-log-result']) {
-          console.log(Buffer.from(proxyRes.headers['x-fc-log-result'], 'base64').toString());
-        }
+    proxy.on('proxyRes', (proxyRes, _req, res) => {
+      const logResult = proxyRes.headers['x-fc-log-result'];
+      if (printLogResult && logResult) {
+        // 响应发送完成后再解码打印日志，不阻塞响应
+        res.once('finish', () => {
+          console.log(Buffer.from(logResult as string, 'base64').toString());
+        });
       }
     });
   }
@@ -1,7 +1,6 @@
 import { BaseLocalStart } from './baseLocalStart';
 import _ from 'lodash';
 import logger from '../../../../logger';
-import * as portFinder from 'portfinder';
 import { execSync } from 'child_process';
 import { runCommand } from '../../../../utils';
 import chalk from 'chalk';
@@ -31,9 +30,11 @@ export class CustomContainerLocalStart extends BaseLocalStart {
   }
 
   async getLocalStartCmdStr(): Promise<string> {
-    const port = await portFinder.getPortPromise({ port: this.getCaPort() });
-    const msg = `You can use curl or Postman to make an HTTP request to localhost:${port} to test the function.`;
-    console.log(chalk.green(msg));
+    const port = await this.allocateServerPort();
+    if (_.isNil(this._argsData.instances)) {
+      const msg = `You can use curl or Postman to make an HTTP request to localhost:${port} to test the function.`;
+      console.log(chalk.green(msg));
+    }
     const mntStr = await this.getMountString();
     const envStr = await this.getEnvString();
     const nasStr = this.getNasMountString();
@@ -50,6 +51,10 @@ export class CustomContainerLocalStart extends BaseLocalStart {
     return dockerCmdStr;
   }
 
+  isInvokeApiProxy(): boolean {
+    return false;
+  }
+
   async runStart() {
     const image = await this.getRuntimeRunImage();
     process.on('DEVS:SIGINT', () => {
@@ -58,6 +63,10 @@ export class CustomContainerLocalStart extends BaseLocalStart {
       logger.debug(`stdout: ${out}`);
       process.exit();
     });
+    // 指定 --instances 时启动多个容器，由本地代理按 instanceConcurrency 分发请求
+    if (!_.isNil(this._argsData.instances)) {
+      return await super.runStart();
+    }
     const cmdStr = await this.getLocalStartCmdStr();
     await runCommand(cmdStr, runCommand.showStdout.inherit);
   }
@@ -13,7 +13,15 @@ export class CustomLocalStart extends BaseLocalStart {
     return '';
   }
 
+  isInvokeApiProxy(): boolean {
+    return false;
+  }
+
   async runStart() {
+    // 指定 --instances 时启动多个容器，由本地代理按 instanceConcurrency 分发请求
+    if (!_.isNil(this._argsData.instances)) {
+      return await super.runStart();
+    }
     const cmdStr = await this.getLocalStartCmdStr();
     const msg = `You can use curl or Postman to make an HTTP request to localhost:${this.getCaPort()} to test the function`;
     console.log(chalk.green(msg));
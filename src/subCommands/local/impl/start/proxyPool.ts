@@ -0,0 +1,179 @@
+import _ from 'lodash';
+
+export interface IUpstream {
+  index: number;
+  port: number;
+  // 正在处理的请求数，不超过 instanceConcurrency
+  active: number;
+  served: number;
+}
+
+interface IWaiter {
+  resolve: (upstream: IUpstream) => void;
+  enqueuedAt: number;
+}
+
+// 直方图桶上界，单位 ms，最后一个桶为 +Inf
+const HISTOGRAM_BUCKETS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000];
+
+// 请求速率按最近 60 秒统计，每秒一个计数器
+const RATE_WINDOW = 60;
+
+export class Histogram {
+  readonly counts: number[] = new Array(HISTOGRAM_BUCKETS.length + 1).fill(0);
+  count = 0;
+  sum = 0;
+  max = 0;
+
+  observe(value: number) {
+    const index = _.sortedIndex(HISTOGRAM_BUCKETS, value);
+    this.counts[index] += 1;
+    this.count += 1;
+    this.sum += value;
+    this.max = Math.max(this.max, value);
+  }
+
+  /**
+   * 按桶估算分位数，返回所在桶的上界（最后一个桶返回最大值）
+   */
+  percentile(p: number): number {
+    if (!this.count) {
+      return 0;
+    }
+    const rank = Math.ceil((p / 100) * this.count);
+    let seen = 0;
+    for (let i = 0; i < this.counts.length; i++) {
+      seen += this.counts[i];
+      if (seen >= rank) {
+        return i < HISTOGRAM_BUCKETS.length ? Math.min(HISTOGRAM_BUCKETS[i], this.max) : this.max;
+      }
+    }
+    return this.max;
+  }
+
+  toJSON() {
+    const buckets: Record<string, number> = {};
+    this.counts.forEach((count, i) => {
+      buckets[i < HISTOGRAM_BUCKETS.length ? `le_${HISTOGRAM_BUCKETS[i]}` : 'le_inf'] = count;
+    });
+    return {
+      count: this.count,
+      avg: this.count ? Math.round(this.sum / this.count) : 0,
+      p50: this.percentile(50),
+      p95: this.percentile(95),
+      p99: this.percentile(99),
+      max: this.max,
+      buckets,
+    };
+  }
+}
+
+/**
+ * s local start 的多实例代理：每个实例最多同时处理 instanceConcurrency 个请求，
+ * 新请求分配给当前处理请求最少的实例，所有实例都满时按先进先出排队
+ */
+export class ProxyPool {
+  readonly upstreams: IUpstream[];
+  private readonly waiters: IWaiter[] = [];
+  private readonly startedAt = Date.now();
+  // 环形计数器：rateSeconds 记录槽位对应的秒，rateCounts 记录该秒完成的请求数
+  private readonly rateSeconds: number[] = new Array(RATE_WINDOW).fill(0);
+  private readonly rateCounts: number[] = new Array(RATE_WINDOW).fill(0);
+  private readonly statusCodes: Record<string, number> = {};
+  private readonly latency = new Histogram();
+  private readonly queueWait = new Histogram();
+  private maxQueueLength = 0;
+  private total = 0;
+
+  constructor(ports: number[], readonly instanceConcurrency: number) {
+    this.upstreams = ports.map((port, index) => ({ index, port, active: 0, served: 0 }));
+  }
+
+  private pick(): IUpstream | undefined {
+    const idle = this.upstreams.filter(({ active }) => active < this.instanceConcurrency);
+    return _.minBy(idle, 'active');
+  }
+
+  /**
+   * 获取可用实例，没有空闲实例时排队等待；返回的实例使用完后必须调用 release
+   */
+  acquire(): Promise<IUpstream> {
+    this.total += 1;
+    const upstream = this.pick();
+    if (upstream) {
+      upstream.active += 1;
+      this.queueWait.observe(0);
+      return Promise.resolve(upstream);
+    }
+    return new Promise((resolve) => {
+      this.waiters.push({ resolve, enqueuedAt: Date.now() });
+      this.maxQueueLength = Math.max(this.maxQueueLength, this.waiters.length);
+    });
+  }
+
+  /**
+   * 释放实例并记录请求耗时，有排队的请求时直接交给它
+   * @param latency 请求耗时，单位 ms，不含排队时间；排队期间客户端已断开、未转发的请求不传
+   */
+  release(upstream: IUpstream, latency?: number, statusCode?: number) {
+    if (latency === undefined) {
+      this.statusCodes.aborted = (this.statusCodes.aborted || 0) + 1;
+    } else {
+      upstream.served += 1;
+      this.latency.observe(latency);
+      const code = statusCode ? `${statusCode}` : 'error';
+      this.statusCodes[code] = (this.statusCodes[code] || 0) + 1;
+      this.recordFinished();
+    }
+
+    const waiter = this.waiters.shift();
+    if (waiter) {
+      this.queueWait.observe(Date.now() - waiter.enqueuedAt);
+      waiter.resolve(upstream);
+      return;
+    }
+    upstream.active -= 1;
+  }
+
+  private recordFinished() {
+    const second = Math.floor(Date.now() / 1000);
+    const slot = second % RATE_WINDOW;
+    if (this.rateSeconds[slot] !== second) {
+      this.rateSeconds[slot] = second;
+      this.rateCounts[slot] = 0;
+    }
+    this.rateCounts[slot] += 1;
+  }
+
+  stats() {
+    const now = Date.now();
+    const second = Math.floor(now / 1000);
+    const finished = _.sum(
+      this.rateCounts.filter((_count, slot) => second - this.rateSeconds[slot] < RATE_WINDOW),
+    );
+    const window = Math.min(RATE_WINDOW, Math.max(Math.ceil((now - this.startedAt) / 1000), 1));
+    return {
+      uptime: Math.round((now - this.startedAt) / 1000),
+      instanceConcurrency: this.instanceConcurrency,
+      requests: {
+        total: this.total,
+        inflight: _.sumBy(this.upstreams, 'active'),
+        // 最近 60 秒完成的请求数 / 秒
+        rate: Math.round((finished / window) * 100) / 100,
+        statusCodes: { ...this.statusCodes },
+      },
+      queue: {
+        length: this.waiters.length,
+        max: this.maxQueueLength,
+        wait: this.queueWait.toJSON(),
+      },
+      latency: this.latency.toJSON(),
+      instances: this.upstreams.map(({ index, port, active, served }) => ({
+        index,
+        port,
+        active,
+        served,
+      })),
+    };
+  }
+}
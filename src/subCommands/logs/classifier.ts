@@ -0,0 +1,82 @@
+// 与 parseLogs 一致：FC 3.0 的 1-xxxxxxxx-xxxxxxxx-xxxxxxxxxxxx 或 UUID 格式的 requestId
+export const REQUEST_ID_REG =
+  '1-[0-9a-f]{8}-[0-9a-f]{8}-[0-9a-f]{12}|[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}';
+
+const requestIdRegExp = new RegExp(REQUEST_ID_REG);
+
+// 与 filterByKeywords 一致的错误日志判断
+export const isErrorLog = (message = '') =>
+  message.includes(' [ERROR] ') || message.includes('Error: ');
+
+/**
+ * 按请求窗口（FC Invoke Start 到 FC Invoke End）判断请求是否失败，窗口内任一行是错误日志即为失败
+ * 没有打印 requestId 的日志（custom 运行时的标准输出、异常堆栈的后续行）归属同一实例当前的请求
+ * 请求结束后才能确定是否输出，输出保持原有顺序，内存中只保留最早未结束的请求之后的日志
+ */
+export class RequestClassifier {
+  private queue: { item: any; requestId?: string }[] = [];
+  private failed: Set<string>;
+  private ended = new Set<string>();
+  // 每个实例正在处理的请求
+  private current: Record<string, string> = {};
+
+  /**
+   * @param selectFailed true 输出失败请求的日志，false 输出成功请求的日志
+   * @param failedRequestIds 已知失败的请求
+   */
+  constructor(private selectFailed: boolean, failedRequestIds: Iterable<string> = []) {
+    this.failed = new Set(failedRequestIds);
+  }
+
+  /**
+   * 按时间顺序传入日志，返回已经可以确定输出的日志
+   */
+  push(logs: any[]): any[] {
+    for (const item of logs) {
+      const message: string = item.message || '';
+      const instanceId = item.extra?.instanceID || '';
+      const found = message.match(requestIdRegExp);
+      const requestId = found ? found[0] : this.current[instanceId];
+      if (found && message.includes('FC Invoke Start')) {
+        this.current[instanceId] = requestId;
+      }
+      if (requestId) {
+        // eslint-disable-next-line no-param-reassign
+        item.requestId = requestId;
+        if (isErrorLog(message)) {
+          this.failed.add(requestId);
+        }
+        if (message.includes('FC Invoke End')) {
+          this.ended.add(requestId);
+          if (this.current[instanceId] === requestId) {
+            delete this.current[instanceId];
+          }
+        }
+      }
+      this.queue.push({ item, requestId });
+    }
+    return this.drain(false);
+  }
+
+  /**
+   * 日志全部传入后调用，未结束的请求按已有的日志判断
+   */
+  end(): any[] {
+    return this.drain(true);
+  }
+
+  private drain(all: boolean): any[] {
+    const ready = [];
+    while (this.queue.length) {
+      const { item, requestId } = this.queue[0];
+      if (requestId && !all && !this.ended.has(requestId)) {
+        break;
+      }
+      this.queue.shift();
+      if ((!!requestId && this.failed.has(requestId)) === this.selectFailed) {
+        ready.push(item);
+      }
+    }
+    return ready;
+  }
+}
@@ -6,10 +6,15 @@ import inquirer from 'inquirer';
 import { SLS } from 'aliyun-sdk';
 import moment from 'moment';
 import _ from 'lodash';
-import { TIME_ERROR_TIP, DATE_TIME_REG } from './constant';
+import { TIME_ERROR_TIP } from './constant';
 import FC, { GetApiType } from '../../resources/fc';
 import { ICredentials } from '@serverless-devs/component-interface';
 import { getUserAgent } from '../../utils';
+import { runPool } from '../../utils/scheduler';
+import { FC_LOGS_QUERY_CONCURRENCY, FC_LOGS_QUERY_WINDOW } from '../../default/config';
+import LogTail from './tail';
+import LogWriter, { formatColoredLog, LOG_OUTPUT_FORMATS, LogOutputFormat } from './writer';
+import { REQUEST_ID_REG, RequestClassifier } from './classifier';
 
 interface IGetLogs {
   projectName: string;
@@ -18,6 +23,21 @@ interface IGetLogs {
   to: string | number;
   topic?: string;
   query: string;
+  line?: number;
+  offset?: number;
+}
+
+interface ITimeWindow {
+  from: number;
+  to: number;
+}
+
+interface IStreamOptions {
+  // 默认按 FC_LOGS_QUERY_WINDOW 切分整个查询区间
+  windows?: ITimeWindow[];
+  filter?: (item: any) => boolean;
+  // 按请求窗口判断成功/失败，输出顺序不变
+  classifier?: RequestClassifier;
 }
 
 interface IRealtime {
@@ -42,16 +62,24 @@ interface IHistory extends IRealtime {
 interface IProps extends IHistory {
   region: string;
   tail: boolean;
+  summary?: boolean;
   functionName?: string;
+  outputFormat?: LogOutputFormat;
+  outputFile?: string;
 }
 
-const replaceAll = (string, search, replace) => string.split(search).join(replace);
+// SLS GetLogs 单次最多返回 100 条
+const LOGS_PAGE_SIZE = 100;
+const INCOMPLETE_RETRY_COUNT = 5;
+const REQUEST_ID_SQL = `regexp_extract(message, '(${REQUEST_ID_REG})', 1)`;
+// 与 filterByKeywords 一致的错误日志判断
+const ERROR_LOG_SQL = `(strpos(message, ' [ERROR] ') > 0 or strpos(message, 'Error: ') > 0)`;
+// 分析查询单次返回的行数上限
+const ANALYTIC_ROWS_LIMIT = 100000;
 const sleep = (ms: number) =>
   new Promise((resolve) => {
     setTimeout(resolve, ms);
   });
-const COLOR_MAP = ['\x1B[36m', '\x1B[32m', '\x1B[33m', '\x1B[34m'];
-const instanceIds = new Map();
 
 export default class Logs {
   logger = logger;
@@ -72,14 +100,18 @@ export default class Logs {
      *
      * search: 关键字查询（之前是 keyword，后修改为 search）
      * type: success | fail
+     * summary: 按实例统计请求数、失败数和耗时
      * request-id: 根据 request-id 过滤
      * instance-id: 根据 instance-id 过滤
      * qualifier: 查询指定版本或者别名
      * match: 匹配到的字符高亮
+     * output-format: 历史日志输出格式 text | plain | jsonl
+     * output-file: 历史日志写入文件
      */
     const apts = {
-      boolean: ['tail', 'help'],
+      boolean: ['tail', 'help', 'summary'],
       string: [
+        'type',
         'request-id',
         'search',
         'instance-id',
@@ -88,6 +120,8 @@ export default class Logs {
         'region',
         'query',
         'function-name',
+        'output-format',
+        'output-file',
       ],
       alias: { tail: 't', 'start-time': 's', 'end-time': 'e', 'request-id': 'r', help: 'h' },
     };
@@ -124,9 +158,12 @@ export default class Logs {
 
     if (props.tail) {
       await this.realtime(props);
+    } else if (props.summary) {
+      return await this.summary(props);
+    } else if (props.type) {
+      await this.streamByType(props);
     } else {
-      const historyLogs = await this.history(props);
-      this.printLogs(historyLogs, props.match);
+      await this.streamHistory(props);
     }
   }
 
@@ -182,6 +219,15 @@ export default class Logs {
     }
     logger.debug(topic, query);
 
+    const outputFile = this.opts?.['output-file'];
+    // 写入文件时默认不输出 ANSI 颜色
+    const outputFormat = this.opts?.['output-format'] || (outputFile ? 'plain' : 'text');
+    if (!LOG_OUTPUT_FORMATS.includes(outputFormat)) {
+      throw new Error(
+        `Invalid output-format ${outputFormat}, supported: ${LOG_OUTPUT_FORMATS.join(', ')}`,
+      );
+    }
+
     return {
       region: this.region,
       projectName: logConfig.project,
@@ -190,6 +236,7 @@ export default class Logs {
       topicFilter,
       query,
       tail: this.opts?.tail,
+      summary: this.opts?.summary,
       startTime: this.opts?.['start-time'] || new Date().getTime() - 60 * 60 * 1000,
       endTime: this.opts?.['end-time'] || new Date().getTime(),
       search: this.opts?.search || this.opts?.keyword,
@@ -199,6 +246,8 @@ export default class Logs {
       requestId: this.opts?.['request-id'],
       instanceId: this.opts?.['instance-id'],
       functionName,
+      outputFormat,
+      outputFile,
     };
   }
 
@@ -252,64 +301,24 @@ export default class Logs {
   printLogs(historyLogs: any[], match) {
     let requestId = '';
 
-    this.logger.debug(`print logs: ${JSON.stringify(historyLogs)}`);
+    this.logger.debug(`print logs: ${historyLogs.length}`);
     for (const item of historyLogs) {
-      const { message: log, requestId: rid, time, extra } = item;
-      if (requestId !== rid) {
+      if (requestId !== item.requestId) {
         this.logger.log('\n');
-        requestId = rid;
-      }
-
-      let l = log;
-
-      const tokens = l.split(' ');
-      if (tokens.length && DATE_TIME_REG.test(tokens[0])) {
-        tokens[0] = `\x1B[1;32m${moment(tokens[0]).format('YYYY-MM-DD HH:mm:ss')}\x1B[0m`;
-      }
-
-      if (tokens[2] === '[silly]') {
-        tokens.splice(2, 1);
-      }
-      l = tokens.join(' ');
-      // l = _.trim(tokens.join(' '), '\n');
-
-      l = replaceAll(l, 'Error', '\x1B[31mError\x1B[0m');
-      l = replaceAll(l, 'ERROR', '\x1B[31mERROR\x1B[0m');
-      l = replaceAll(l, 'error', '\x1B[31merror\x1B[0m');
-
-      if (time) {
-        l = `\x1B[2m${time}\x1B[0m ${l}`;
-      }
-      if (extra?.instanceID) {
-        const instanceId = extra.instanceID;
-        let colorIndex;
-        if (instanceIds.has(instanceId)) {
-          colorIndex = instanceIds.get(instanceId);
-        } else {
-          colorIndex = instanceIds.size % COLOR_MAP.length;
-          instanceIds.set(instanceId, colorIndex);
-        }
-        l = `${COLOR_MAP[colorIndex]}${instanceId}\x1B[0m ${l}`;
-      }
-
-      // if (extra?.qualifier) {
-      //   l = `${extra.qualifier} ${l}`;
-      // }
-
-      if (match) {
-        l = replaceAll(l, match, `\x1B[7m${match}\x1B[0m`);
+        requestId = item.requestId;
       }
-
-      console.log(l);
+      console.log(formatColoredLog(item, match));
     }
   }
 
   /**
    * 获取实时日志
+   * 未指定 query/search 时基于 shard cursor 只拉取新日志，否则通过查询接口轮询并去重
    */
   async realtime({
     projectName,
     logStoreName,
+    topic,
     topicFilter,
     query,
     search,
@@ -318,50 +327,32 @@ export default class Logs {
     requestId,
     instanceId,
   }: IRealtime) {
-    let timeStart;
-    let timeEnd;
-    let times = 1800;
-
-    /**
-     * 日志接口最小区间10s，查询间隔为 1s
-     * 实现：将 10s 的数据全都请求回来，然后记录输出的时间戳，同一时间戳的输出，输出过的时间戳则过滤掉
-     */
-    const consumedTimeStamps = [];
-    while (times > 0) {
-      await sleep(1500);
-      times -= 1;
-
-      timeStart = moment().subtract(10, 'seconds').unix();
-      timeEnd = moment().unix();
-      this.logger.debug(`realtime: ${times}, start: ${timeStart}, end: ${timeEnd}`);
+    const topics = [topic];
+    if (!_.isNil(instanceId) && _.startsWith(topic, 'FCLogs:')) {
+      topics.push(`FCInstanceEvents:/${topic.replace('FCLogs:', '')}`);
+    }
+    const slsQuery = this.getSlsQuery(query, search, qualifier, requestId, instanceId, topicFilter);
 
-      const pulledlogs = await this.getLogs({
+    const tail = new LogTail(
+      this.slsClient,
+      {
         projectName,
         logStoreName,
-        query: this.getSlsQuery(query, search, qualifier, requestId, instanceId, topicFilter),
-        from: timeStart,
-        to: timeEnd,
-      });
-
-      if (_.isEmpty(pulledlogs)) {
-        continue;
-      }
-
-      let showTimestamp = '';
-
-      const notConsumedLogs = _.filter(pulledlogs, (data) => {
-        const { timestamp } = data;
-        if (consumedTimeStamps.includes(timestamp)) {
-          return showTimestamp === timestamp;
-        }
-
-        showTimestamp = data.timestamp;
-        consumedTimeStamps.push(data.timestamp);
-        return true;
-      });
-
-      this.printLogs(notConsumedLogs, match);
-    }
+        topics,
+        qualifier,
+        instanceId,
+        requestId,
+        // SLS 查询语法无法在本地执行，指定 query/search 时只能使用查询接口
+        cursorMode: _.isNil(query) && _.isNil(search),
+      },
+      {
+        queryLogs: (from, to) =>
+          this.getLogs({ projectName, logStoreName, query: slsQuery, from, to }),
+        parseLogs: (rawLogs) => this.parseLogs(rawLogs),
+        onLogs: (logs) => this.printLogs(logs, match),
+      },
+    );
+    await tail.run();
   }
 
   /**
@@ -425,14 +416,322 @@ export default class Logs {
     startTime,
     endTime,
   }: IHistory) {
+    const { from, to } = this.getTimeRange(startTime, endTime);
+    const params = {
+      from,
+      to,
+      projectName,
+      logStoreName,
+      query: this.getSlsQuery(query, search, qualifier, requestId, instanceId, topicFilter),
+    };
+    const logsList = await this.getLogs(params);
+
+    return this.filterByKeywords(logsList, { type });
+  }
+
+  /**
+   * 流式获取历史日志：时间区间切分为子区间并发查询，每个子区间分页获取
+   * 按时间顺序逐页写出，内存中只保留正在查询的子区间
+   */
+  async streamHistory(
+    {
+      projectName,
+      logStoreName,
+      topicFilter,
+      query,
+      search,
+      requestId,
+      instanceId,
+      qualifier,
+      startTime,
+      endTime,
+      match,
+      outputFormat = 'text',
+      outputFile,
+    }: IProps,
+    { windows: specifiedWindows, filter, classifier }: IStreamOptions = {},
+  ) {
+    const slsQuery = this.getSlsQuery(query, search, qualifier, requestId, instanceId, topicFilter);
+    let windows = specifiedWindows;
+    if (!windows) {
+      const { from, to } = this.getTimeRange(startTime, endTime);
+      windows = this.splitTimeRange(from, to);
+      this.logger.debug(`stream history logs from ${from} to ${to}, windows: ${windows.length}`);
+    }
+
+    const writer = new LogWriter(outputFormat, match, outputFile);
+    // 非首个未完成的子区间先缓存，前面的子区间完成后再按顺序写出
+    const pending: any[][][] = windows.map(() => []);
+    const finished: boolean[] = windows.map(() => false);
+    let head = 0;
+    let flushing = Promise.resolve();
+    const flush = () => {
+      flushing = flushing.then(async () => {
+        while (head < windows.length) {
+          const pages = pending[head];
+          while (pages.length) {
+            const page = pages.shift();
+            await writer.write(classifier ? classifier.push(page) : page);
+          }
+          if (!finished[head]) {
+            return;
+          }
+          head++;
+        }
+      });
+      return flushing;
+    };
+
+    try {
+      await runPool(windows, FC_LOGS_QUERY_CONCURRENCY, async (window, index) => {
+        await this.pageLogs(
+          { projectName, logStoreName, query: slsQuery, from: window.from, to: window.to },
+          async (logs) => {
+            pending[index].push(filter ? logs.filter(filter) : logs);
+            await flush();
+          },
+        );
+        finished[index] = true;
+        await flush();
+      });
+      if (classifier) {
+        await flushing;
+        await writer.write(classifier.end());
+      }
+    } finally {
+      await flushing;
+      await writer.close();
+    }
+    if (outputFile) {
+      this.logger.info(`${writer.count} logs have been written to ${outputFile}`);
+    }
+  }
+
+  /**
+   * 按请求成功/失败输出日志：失败的 requestId 由 SLS 分析查询聚合得到，
+   * 只拉取失败请求所在时间段（fail）或全部区间（success）的日志，本地按 requestId 集合过滤
+   * 存在没有打印 requestId 的错误日志时服务端无法归属到请求，回退为拉取全部区间、本地按请求窗口判断
+   */
+  async streamByType(props: IProps) {
+    const { type } = props;
+    const queryErrorLog = type === 'failed' || type === 'fail';
+    if (!queryErrorLog && type !== 'success') {
+      throw new Error(`Invalid type ${type}, supported: success, fail`);
+    }
+    const [failedRequests, unattributedErrors] = await Promise.all([
+      this.queryFailedRequests(props),
+      this.countUnattributedErrors(props),
+    ]);
+    const errorRequestIds = new Set(failedRequests.map((item) => item.requestId));
+    this.logger.debug(
+      `failed requests: ${errorRequestIds.size}, error logs without requestId: ${unattributedErrors}`,
+    );
+
+    if (unattributedErrors > 0) {
+      await this.streamHistory(props, {
+        classifier: new RequestClassifier(queryErrorLog, errorRequestIds),
+      });
+      return;
+    }
+
+    if (!queryErrorLog) {
+      await this.streamHistory(props, { filter: (item) => !errorRequestIds.has(item.requestId) });
+      return;
+    }
+    if (_.isEmpty(failedRequests)) {
+      this.logger.info('No failed request found');
+      return;
+    }
+    await this.streamHistory(props, {
+      windows: this.mergeTimeWindows(
+        failedRequests.map(({ startTime, endTime }) => ({ from: startTime, to: endTime + 1 })),
+      ),
+      filter: (item) => errorRequestIds.has(item.requestId),
+    });
+  }
+
+  /**
+   * 通过 SLS 分析查询获取失败的请求，按 requestId、instanceId 聚合
+   * 时间范围取请求的全部日志（而非仅错误日志），保证输出包含 FC Invoke Start/End 等完整内容
+   */
+  async queryFailedRequests({
+    projectName,
+    logStoreName,
+    topicFilter,
+    query,
+    search,
+    requestId,
+    instanceId,
+    qualifier,
+    startTime,
+    endTime,
+  }: IProps): Promise<any[]> {
+    const { from, to } = this.getTimeRange(startTime, endTime);
+    const slsQuery = this.getSlsQuery(query, search, qualifier, requestId, instanceId, topicFilter);
+    const rows = await this.analyzeLogs({
+      projectName,
+      logStoreName,
+      from,
+      to,
+      query: [
+        `${slsQuery || '*'} | select requestId, instanceID, count_if(isError) as errors,`,
+        'min(__time__) as startTime, max(__time__) as endTime',
+        `from (select ${REQUEST_ID_SQL} as requestId, instanceID, __time__,`,
+        `${ERROR_LOG_SQL} as isError from log) where requestId is not null`,
+        'group by requestId, instanceID having count_if(isError) > 0',
+        `limit ${ANALYTIC_ROWS_LIMIT}`,
+      ].join(' '),
+    });
+    return rows.map((row) => ({
+      requestId: row.requestId,
+      instanceId: row.instanceID,
+      errors: Number(row.errors),
+      startTime: Number(row.startTime),
+      endTime: Number(row.endTime),
+    }));
+  }
+
+  /**
+   * 统计没有打印 requestId 的错误日志条数，例如 custom 运行时的标准输出、异常堆栈的后续行
+   */
+  async countUnattributedErrors({
+    projectName,
+    logStoreName,
+    topicFilter,
+    query,
+    search,
+    requestId,
+    instanceId,
+    qualifier,
+    startTime,
+    endTime,
+  }: IProps): Promise<number> {
+    const { from, to } = this.getTimeRange(startTime, endTime);
+    const slsQuery = this.getSlsQuery(query, search, qualifier, requestId, instanceId, topicFilter);
+    const rows = await this.analyzeLogs({
+      projectName,
+      logStoreName,
+      from,
+      to,
+      query: [
+        `${slsQuery || '*'} | select count(1) as unattributed from log`,
+        `where ${ERROR_LOG_SQL} and ${REQUEST_ID_SQL} is null`,
+      ].join(' '),
+    });
+    return Number(_.get(rows, '[0].unattributed')) || 0;
+  }
+
+  /**
+   * 按实例统计请求数、失败请求数和耗时，统计在 SLS 服务端完成
+   */
+  async summary({
+    projectName,
+    logStoreName,
+    topicFilter,
+    query,
+    search,
+    requestId,
+    instanceId,
+    qualifier,
+    startTime,
+    endTime,
+  }: IProps) {
+    const { from, to } = this.getTimeRange(startTime, endTime);
+    const slsQuery = this.getSlsQuery(query, search, qualifier, requestId, instanceId, topicFilter);
+    const rows = await this.analyzeLogs({
+      projectName,
+      logStoreName,
+      from,
+      to,
+      query: [
+        `${slsQuery || '*'} | select instanceID,`,
+        `count_if(strpos(message, 'FC Invoke Start') > 0) as requests,`,
+        `count(distinct if(${ERROR_LOG_SQL}, ${REQUEST_ID_SQL})) as failedRequests,`,
+        'round(avg(duration), 2) as avgDuration,',
+        'round(approx_percentile(duration, 0.99), 2) as p99Duration,',
+        'round(max(duration), 2) as maxDuration',
+        'from (select instanceID, message,',
+        `try_cast(regexp_extract(message, 'Duration: ([0-9.]+) ms', 1) as double) as duration`,
+        `from log) group by instanceID order by requests desc limit ${ANALYTIC_ROWS_LIMIT}`,
+      ].join(' '),
+    });
+    const toNumber = (value: any) => (_.isNil(value) || value === 'null' ? null : Number(value));
+    const instances = rows.map((row) => ({
+      instanceId: row.instanceID,
+      requests: toNumber(row.requests),
+      failedRequests: toNumber(row.failedRequests),
+      // 单位 ms，日志中没有耗时信息时为 null
+      avgDuration: toNumber(row.avgDuration),
+      p99Duration: toNumber(row.p99Duration),
+      maxDuration: toNumber(row.maxDuration),
+    }));
+    return {
+      requests: _.sumBy(instances, 'requests'),
+      failedRequests: _.sumBy(instances, 'failedRequests'),
+      instances,
+    };
+  }
+
+  /**
+   * 执行 SLS 分析查询（query | sql），返回结果行
+   */
+  async analyzeLogs(requestParams: IGetLogs): Promise<any[]> {
+    this.logger.debug(`analyze logs params: ${JSON.stringify(requestParams)}`);
+    for (let incomplete = 0; ; incomplete++) {
+      const response = await this.requestLogs(requestParams);
+      if (
+        response?.headers?.['x-log-progress'] !== 'Incomplete' ||
+        incomplete >= INCOMPLETE_RETRY_COUNT
+      ) {
+        return _.values(response?.body);
+      }
+      await sleep(500 * (incomplete + 1));
+    }
+  }
+
+  /**
+   * 分页获取一个时间区间内的所有日志，每页回调一次
+   */
+  async pageLogs(requestParams: IGetLogs, onPage: (logs: any[]) => Promise<void>) {
+    const state: { requestId?: string } = {};
+    let incomplete = 0;
+    for (let offset = 0; ; ) {
+      const response = await this.requestLogs({
+        ...requestParams,
+        line: LOGS_PAGE_SIZE,
+        offset,
+      });
+      // 结果不完整时 SLS 需要重新请求同一页
+      if (
+        response?.headers?.['x-log-progress'] === 'Incomplete' &&
+        incomplete < INCOMPLETE_RETRY_COUNT
+      ) {
+        incomplete++;
+        await sleep(500 * incomplete);
+        continue;
+      }
+      incomplete = 0;
+      const rawLogs = _.values(response?.body);
+      if (rawLogs.length) {
+        await onPage(this.parseLogs(rawLogs, '\n', state));
+      }
+      if (rawLogs.length < LOGS_PAGE_SIZE) {
+        return;
+      }
+      offset += rawLogs.length;
+    }
+  }
+
+  /**
+   * 解析查询时间区间，单位为秒
+   */
+  private getTimeRange(startTime: string, endTime: string): { from: number; to: number } {
     let from = moment().subtract(20, 'minutes').unix();
     let to = moment().unix();
     if (startTime && endTime) {
       // 支持时间戳和其他时间格式
-      const sTime = /^\d+$/g.test(startTime) ? startTime : startTime;
-      const eTime = /^\d+$/g.test(endTime) ? endTime : endTime;
-      from = Math.floor(new Date(sTime).getTime() / 1000);
-      to = Math.floor(new Date(eTime).getTime() / 1000);
+      from = Math.floor(new Date(startTime).getTime() / 1000);
+      to = Math.floor(new Date(endTime).getTime() / 1000);
     } else {
       // 20 minutes ago
       this.logger.warn('By default, find logs within 20 minutes...\n');
@@ -440,16 +739,34 @@ export default class Logs {
     if (_.isNaN(from) || _.isNaN(to)) {
       throw new Error(TIME_ERROR_TIP);
     }
-    const params = {
-      from,
-      to,
-      projectName,
-      logStoreName,
-      query: this.getSlsQuery(query, search, qualifier, requestId, instanceId, topicFilter),
-    };
-    const logsList = await this.getLogs(params);
+    return { from, to };
+  }
 
-    return this.filterByKeywords(logsList, { type });
+  /**
+   * 按 FC_LOGS_QUERY_WINDOW 将查询区间切分为子区间
+   */
+  private splitTimeRange(from: number, to: number): ITimeWindow[] {
+    const windows = [];
+    for (let start = from; start < to || windows.length === 0; start += FC_LOGS_QUERY_WINDOW) {
+      windows.push({ from: start, to: Math.min(start + FC_LOGS_QUERY_WINDOW, to) });
+    }
+    return windows;
+  }
+
+  /**
+   * 合并重叠的时间区间，结果按时间排序
+   */
+  private mergeTimeWindows(windows: ITimeWindow[]): ITimeWindow[] {
+    const merged: ITimeWindow[] = [];
+    for (const window of _.sortBy(windows, 'from')) {
+      const last = _.last(merged);
+      if (last && window.from <= last.to) {
+        last.to = Math.max(last.to, window.to);
+      } else {
+        merged.push({ ...window });
+      }
+    }
+    return merged;
   }
 
   /**
@@ -498,9 +815,6 @@ export default class Logs {
    */
   async getLogs(requestParams: IGetLogs, tabReplaceStr = '\n') {
     this.logger.debug(`get logs params: ${JSON.stringify(requestParams)}`);
-    // Topic filtering is handled by __topic__ in query, remove topic from SLS request params
-    const slsParams: any = { ...requestParams };
-    delete slsParams.topic;
 
     let count;
     let xLogCount;
@@ -509,14 +823,7 @@ export default class Logs {
     let result = [];
 
     do {
-      const response: any = await new Promise((resolve, reject) => {
-        this.slsClient.getLogs(slsParams, (error, data) => {
-          if (error) {
-            reject(error);
-          }
-          resolve(data);
-        });
-      });
+      const response: any = await this.requestLogs(requestParams);
       const { body } = response;
 
       if (_.isEmpty(body)) {
@@ -528,70 +835,79 @@ export default class Logs {
       xLogCount = response.headers['x-log-count'];
       xLogProgress = response.headers['x-log-progress'];
 
-      let requestId;
-      result = _.concat(
-        result,
-        _.values(body).map((cur) => {
-          const currentMessage = cur.message || '';
-          const found = currentMessage.match('(\\w{8}(-\\w{4}){3}-\\w{12}?)');
+      result = _.concat(result, this.parseLogs(_.values(body), tabReplaceStr));
+    } while (xLogCount !== count && xLogProgress !== 'Complete');
 
-          if (!_.isEmpty(found)) {
-            requestId = found[0];
-          }
+    return result;
+  }
 
-          // TODO: custom 不一定存在 requestId
-          if (currentMessage.includes('FC Invoke Start')) {
-            requestId = currentMessage.replace('FC Invoke Start RequestId: ', '');
-          }
+  private requestLogs(params: IGetLogs): Promise<any> {
+    // Topic filtering is handled by __topic__ in query, remove topic from SLS request params
+    const slsParams: any = { ...params };
+    delete slsParams.topic;
+    return new Promise((resolve, reject) => {
+      this.slsClient.getLogs(slsParams, (error, data) => {
+        if (error) {
+          reject(error);
+        }
+        resolve(data);
+      });
+    });
+  }
 
-          if (requestId) {
-            requestId = _.trim(requestId);
-          }
+  /**
+   * 将 SLS 原始日志转换为输出格式，未打印 requestId 的日志沿用前一条日志的 requestId
+   * @param state 分页获取时跨页保留 requestId
+   */
+  parseLogs(rawLogs: any[], tabReplaceStr = '\n', state: { requestId?: string } = {}) {
+    let { requestId } = state;
+    return rawLogs.map((cur) => {
+      const currentMessage = cur.message || '';
+      const found = currentMessage.match('(\\w{8}(-\\w{4}){3}-\\w{12}?)');
+
+      if (!_.isEmpty(found)) {
+        requestId = found[0];
+      }
 
-          return {
-            requestId,
-            timestamp: cur.__time__,
-            time: moment.unix(cur.__time__).format('YYYY-MM-DD H:mm:ss'),
-            message: _.trim(currentMessage, '\n').replace(new RegExp(/(\r)/g), tabReplaceStr),
-            extra: {
-              instanceID: cur.instanceID,
-              functionName: cur.functionName,
-              qualifier: cur.qualifier,
-              versionId: cur.versionId,
-            },
-          };
-        }, {}),
-      );
-    } while (xLogCount !== count && xLogProgress !== 'Complete');
+      // TODO: custom 不一定存在 requestId
+      if (currentMessage.includes('FC Invoke Start')) {
+        requestId = currentMessage.replace('FC Invoke Start RequestId: ', '');
+      }
 
-    return result;
+      if (requestId) {
+        requestId = _.trim(requestId);
+      }
+      state.requestId = requestId;
+
+      return {
+        requestId,
+        timestamp: cur.__time__,
+        time: moment.unix(cur.__time__).format('YYYY-MM-DD H:mm:ss'),
+        message: _.trim(currentMessage, '\n').replace(new RegExp(/(\r)/g), tabReplaceStr),
+        extra: {
+          instanceID: cur.instanceID,
+          functionName: cur.functionName,
+          qualifier: cur.qualifier,
+          versionId: cur.versionId,
+        },
+      };
+    });
   }
 
   /**
-   * 过滤日志信息
+   * 过滤日志信息：先单次遍历收集失败的 requestId，再单次遍历过滤
    */
   private filterByKeywords(logsList = [], { type }) {
-    const logsClone = _.cloneDeep(logsList);
-
     const queryErrorLog = type === 'failed' || type === 'fail';
-    if (queryErrorLog || type === 'success') {
-      const errorRequestIds: string[] = [];
-      _.forEach(logsClone, (value) => {
-        const curRequestId = value.requestId;
-        if (!curRequestId || errorRequestIds.includes(curRequestId)) {
-          return;
-        }
-        const curMessage = value.message;
-        const isError = curMessage?.includes(' [ERROR] ') || curMessage?.includes('Error: ');
-        if (isError) {
-          errorRequestIds.push(curRequestId);
-        }
-      });
-      if (queryErrorLog) {
-        return _.filter(logsClone, (value) => errorRequestIds.includes(value.requestId));
+    if (!queryErrorLog && type !== 'success') {
+      return logsList;
+    }
+    const errorRequestIds = new Set<string>();
+    for (const { requestId, message } of logsList) {
+      if (requestId && (message?.includes(' [ERROR] ') || message?.includes('Error: '))) {
+        errorRequestIds.add(requestId);
       }
-      return _.filter(logsClone, (value) => !errorRequestIds.includes(value.requestId));
     }
-    return logsClone;
+    return logsList.filter((value) => errorRequestIds.has(value.requestId) === queryErrorLog);
   }
 }
@@ -0,0 +1,267 @@
+/* eslint-disable no-await-in-loop */
+import crypto from 'crypto';
+import _ from 'lodash';
+import logger from '../../logger';
+
+// 空闲时轮询间隔从 MIN 逐步翻倍到 MAX，拉到新日志后恢复
+const MIN_INTERVAL = 1000;
+const MAX_INTERVAL = 8000;
+// 单个 shard 每次拉取的 LogGroup 数
+const PULL_COUNT = 100;
+// 查询接口轮询时每次回看的秒数，用于兜住延迟到达的日志
+const QUERY_LOOKBACK_SECONDS = 10;
+const MAX_CONSECUTIVE_ERRORS = 5;
+const DEFAULT_TIMEOUT = 45 * 60 * 1000;
+const DEDUP_WINDOW_SIZE = 10000;
+
+const sleep = (ms: number) =>
+  new Promise((resolve) => {
+    setTimeout(resolve, ms);
+  });
+
+/**
+ * 定长去重窗口：只保留最近 capacity 个 key，内存占用有上限
+ */
+export class DedupWindow {
+  private keys = new Set<string>();
+  private ring: string[];
+  private next = 0;
+
+  constructor(readonly capacity = DEDUP_WINDOW_SIZE) {
+    this.ring = new Array(capacity);
+  }
+
+  /**
+   * @returns key 是否首次出现
+   */
+  add(key: string): boolean {
+    if (this.keys.has(key)) {
+      return false;
+    }
+    const evicted = this.ring[this.next];
+    if (evicted !== undefined) {
+      this.keys.delete(evicted);
+    }
+    this.ring[this.next] = key;
+    this.next = (this.next + 1) % this.capacity;
+    this.keys.add(key);
+    return true;
+  }
+
+  get size() {
+    return this.keys.size;
+  }
+}
+
+export interface ITailOptions {
+  projectName: string;
+  logStoreName: string;
+  // cursor 模式下允许的 __topic__
+  topics: string[];
+  // cursor 模式下按字段精确过滤，requestId 匹配日志内容
+  qualifier?: string;
+  instanceId?: string;
+  requestId?: string;
+  // 是否可以使用 shard cursor 拉取；存在完整 SLS 查询语句时只能退回查询接口轮询
+  cursorMode: boolean;
+  timeout?: number;
+}
+
+export interface ITailHandlers {
+  // 查询接口轮询，时间单位为秒
+  queryLogs: (from: number, to: number) => Promise<any[]>;
+  // 将 SLS 原始日志转换为输出格式
+  parseLogs: (rawLogs: any[]) => any[];
+  onLogs: (logs: any[]) => void;
+}
+
+/**
+ * 实时日志：优先基于 shard cursor（PullLogs）只拉取新写入的日志，多个 shard 并发拉取
+ * 无法使用 cursor 时退回查询接口轮询，通过定长去重窗口过滤重复日志
+ */
+export default class LogTail {
+  private stopped = false;
+
+  constructor(
+    private slsClient: any,
+    private options: ITailOptions,
+    private handlers: ITailHandlers,
+  ) {}
+
+  async run() {
+    const deadline = Date.now() + (this.options.timeout || DEFAULT_TIMEOUT);
+    if (this.options.cursorMode) {
+      const cursors = await this.initCursors();
+      if (!_.isEmpty(cursors)) {
+        logger.debug(`tail logs by cursor, shards: ${_.keys(cursors)}`);
+        await Promise.all(
+          _.map(cursors, (cursor, shardId) => this.tailShard(Number(shardId), cursor, deadline)),
+        );
+        return;
+      }
+    }
+    logger.debug('tail logs by query');
+    await this.tailQuery(deadline);
+  }
+
+  stop() {
+    this.stopped = true;
+  }
+
+  private async initCursors(): Promise<Record<number, string>> {
+    const { projectName, logStoreName } = this.options;
+    try {
+      const { body: shards } = await this.call('listShards', { projectName, logStoreName });
+      // 分裂/合并后只读的 shard 不会再写入新日志
+      const shardIds = _.filter(shards, (shard) => shard.status !== 'readonly').map(
+        (shard) => shard.shardID,
+      );
+      const cursors: Record<number, string> = {};
+      await Promise.all(
+        shardIds.map(async (shardId) => {
+          const { body } = await this.call('getCursor', {
+            projectName,
+            logStoreName,
+            shardId,
+            from: 'end',
+          });
+          cursors[shardId] = body.cursor;
+        }),
+      );
+      return cursors;
+    } catch (ex) {
+      logger.debug(`Unable to tail logs by cursor, fallback to query: ${ex.message}`);
+      return {};
+    }
+  }
+
+  private async tailShard(shardId: number, initCursor: string, deadline: number) {
+    const { projectName, logStoreName } = this.options;
+    let cursor = initCursor;
+    let interval = MIN_INTERVAL;
+    let errors = 0;
+    while (!this.stopped && Date.now() < deadline) {
+      let response: any;
+      try {
+        response = await this.call('batchGetLogs', {
+          projectName,
+          logStoreName,
+          shardId,
+          cursor,
+          count: PULL_COUNT,
+        });
+        errors = 0;
+      } catch (ex) {
+        errors++;
+        logger.debug(`Pull logs of shard ${shardId} error(${errors}): ${ex.message}`);
+        if (errors >= MAX_CONSECUTIVE_ERRORS) {
+          throw ex;
+        }
+        await sleep(interval);
+        interval = Math.min(interval * 2, MAX_INTERVAL);
+        continue;
+      }
+
+      const nextCursor = response?.headers?.['x-log-cursor'];
+      const groupCount = Number(response?.headers?.['x-log-count'] || 0);
+      const rawLogs = this.filterRawLogs(this.flattenLogGroups(response?.body));
+      if (!_.isEmpty(rawLogs)) {
+        this.handlers.onLogs(this.handlers.parseLogs(rawLogs));
+      }
+      if (nextCursor) {
+        cursor = nextCursor;
+      }
+      // 拉满说明还有积压，立即继续拉取；否则按空闲程度退避
+      if (groupCount >= PULL_COUNT) {
+        interval = MIN_INTERVAL;
+        continue;
+      }
+      interval = groupCount > 0 ? MIN_INTERVAL : Math.min(interval * 2, MAX_INTERVAL);
+      logger.debug(`shard ${shardId}: pulled ${groupCount} log groups, next in ${interval}ms`);
+      await sleep(interval);
+    }
+  }
+
+  private async tailQuery(deadline: number) {
+    const window = new DedupWindow();
+    let interval = MIN_INTERVAL;
+    while (!this.stopped && Date.now() < deadline) {
+      await sleep(interval);
+      const to = Math.floor(Date.now() / 1000);
+      const from = to - QUERY_LOOKBACK_SECONDS;
+      const pulledLogs = await this.handlers.queryLogs(from, to);
+
+      // 同一时间戳的相同内容按出现次数区分，避免误过滤重复打印的日志
+      const occurrences: Record<string, number> = {};
+      const newLogs = _.filter(pulledLogs, (item) => {
+        const base = crypto
+          .createHash('sha1')
+          .update(`${item.timestamp}\0${item.extra?.instanceID}\0${item.message}`)
+          .digest('hex');
+        occurrences[base] = (occurrences[base] || 0) + 1;
+        return window.add(`${base}#${occurrences[base]}`);
+      });
+
+      interval = _.isEmpty(newLogs) ? Math.min(interval * 2, MAX_INTERVAL) : MIN_INTERVAL;
+      logger.debug(
+        `realtime: from ${from} to ${to}, ${newLogs.length} new logs, next in ${interval}ms`,
+      );
+      if (!_.isEmpty(newLogs)) {
+        this.handlers.onLogs(newLogs);
+      }
+    }
+  }
+
+  /**
+   * PullLogs 返回 LogGroup 列表，展开为与 GetLogs 相同的扁平结构
+   */
+  private flattenLogGroups(body: any): any[] {
+    const groups = _.isArray(body) ? body : body?.logGroupList || body?.LogGroupList || [];
+    const result = [];
+    for (const group of groups) {
+      const topic = group.topic ?? group.Topic ?? '';
+      for (const log of group.logs || group.Logs || []) {
+        const item: Record<string, any> = {
+          __topic__: topic,
+          __time__: log.time ?? log.Time,
+        };
+        for (const content of log.contents || log.Contents || []) {
+          item[content.key ?? content.Key] = content.value ?? content.Value;
+        }
+        result.push(item);
+      }
+    }
+    return result;
+  }
+
+  private filterRawLogs(rawLogs: any[]): any[] {
+    const { topics, qualifier, instanceId, requestId } = this.options;
+    return _.filter(rawLogs, (item) => {
+      if (!_.isEmpty(topics) && !topics.includes(item.__topic__)) {
+        return false;
+      }
+      if (qualifier && item.qualifier !== qualifier) {
+        return false;
+      }
+      if (instanceId && item.instanceID !== instanceId) {
+        return false;
+      }
+      return !requestId || _.includes(item.message, requestId);
+    });
+  }
+
+  private async call(method: string, params: any): Promise<any> {
+    if (!_.isFunction(this.slsClient?.[method])) {
+      throw new Error(`SLS client does not support ${method}`);
+    }
+    return await new Promise((resolve, reject) => {
+      this.slsClient[method](params, (error, data) => {
+        if (error) {
+          reject(error);
+          return;
+        }
+        resolve(data);
+      });
+    });
+  }
+}
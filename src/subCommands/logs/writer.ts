@@ -0,0 +1,117 @@
+import fs from 'fs';
+import path from 'path';
+import moment from 'moment';
+import { DATE_TIME_REG } from './constant';
+
+export type LogOutputFormat = 'text' | 'plain' | 'jsonl';
+
+export const LOG_OUTPUT_FORMATS: LogOutputFormat[] = ['text', 'plain', 'jsonl'];
+
+const COLOR_MAP = ['\x1B[36m', '\x1B[32m', '\x1B[33m', '\x1B[34m'];
+const ERROR_REG = /Error|ERROR|error/g;
+const instanceIds = new Map();
+
+const replaceAll = (string, search, replace) => string.split(search).join(replace);
+
+/**
+ * 彩色输出单条日志：时间、实例 ID 着色，错误关键字标红，match 高亮
+ */
+export function formatColoredLog(item: any, match?: string): string {
+  const { message: log, time, extra } = item;
+
+  const tokens = log.split(' ');
+  if (tokens.length && DATE_TIME_REG.test(tokens[0])) {
+    tokens[0] = `\x1B[1;32m${moment(tokens[0]).format('YYYY-MM-DD HH:mm:ss')}\x1B[0m`;
+  }
+
+  if (tokens[2] === '[silly]') {
+    tokens.splice(2, 1);
+  }
+  let l = tokens.join(' ');
+
+  l = l.replace(ERROR_REG, (word) => `\x1B[31m${word}\x1B[0m`);
+
+  if (time) {
+    l = `\x1B[2m${time}\x1B[0m ${l}`;
+  }
+  if (extra?.instanceID) {
+    const instanceId = extra.instanceID;
+    let colorIndex;
+    if (instanceIds.has(instanceId)) {
+      colorIndex = instanceIds.get(instanceId);
+    } else {
+      colorIndex = instanceIds.size % COLOR_MAP.length;
+      instanceIds.set(instanceId, colorIndex);
+    }
+    l = `${COLOR_MAP[colorIndex]}${instanceId}\x1B[0m ${l}`;
+  }
+
+  if (match) {
+    l = replaceAll(l, match, `\x1B[7m${match}\x1B[0m`);
+  }
+  return l;
+}
+
+/**
+ * 流式写出日志，逐页写入 stdout 或文件
+ * text: 彩色输出；plain: 无 ANSI 的纯文本；jsonl: 每行一个 JSON 对象
+ */
+export default class LogWriter {
+  private stream: NodeJS.WritableStream;
+  private fileStream?: fs.WriteStream;
+  private requestId = '';
+  count = 0;
+
+  constructor(private format: LogOutputFormat, private match?: string, outputFile?: string) {
+    if (outputFile) {
+      fs.mkdirSync(path.dirname(path.resolve(outputFile)), { recursive: true });
+      this.fileStream = fs.createWriteStream(outputFile);
+      this.stream = this.fileStream;
+    } else {
+      this.stream = process.stdout;
+    }
+  }
+
+  async write(logs: any[]) {
+    if (!logs.length) {
+      return;
+    }
+    const lines: string[] = [];
+    for (const item of logs) {
+      if (this.format === 'jsonl') {
+        lines.push(JSON.stringify(item));
+        continue;
+      }
+      // 不同请求之间空行分隔
+      if (this.requestId !== item.requestId) {
+        if (this.count || lines.length) {
+          lines.push('');
+        }
+        this.requestId = item.requestId;
+      }
+      if (this.format === 'plain') {
+        const instanceId = item.extra?.instanceID;
+        lines.push(
+          [item.time, instanceId, item.message].filter((value) => value !== undefined).join(' '),
+        );
+      } else {
+        lines.push(formatColoredLog(item, this.match));
+      }
+    }
+    this.count += logs.length;
+    if (!this.stream.write(`${lines.join('\n')}\n`)) {
+      // 背压：等待缓冲区写出，避免大量日志堆积在内存中
+      await new Promise((resolve) => this.stream.once('drain', resolve));
+    }
+  }
+
+  async close() {
+    if (!this.fileStream) {
+      return;
+    }
+    await new Promise((resolve, reject) => {
+      this.fileStream.once('error', reject);
+      this.fileStream.end(resolve);
+    });
+  }
+}
@@ -4,3 +4,6 @@ export const NEW_MODEL_SERVICE_CLIENT_READ_TIMEOUT: number =
   parseInt(process.env.NEW_MODEL_SERVICE_CLIENT_READ_TIMEOUT as string, 10) || 5 * 60 * 1000;
 export const MODEL_DOWNLOAD_TIMEOUT: number =
   parseInt(process.env.MODEL_DOWNLOAD_TIMEOUT as string, 10) || 40 * 60 * 1000;
+// 模型文件并发下载数，一个文件完成后立即开始下一个
+export const MODEL_DOWNLOAD_CONCURRENCY: number =
+  parseInt(process.env.MODEL_DOWNLOAD_CONCURRENCY as string, 10) || 5;
@@ -8,7 +8,10 @@ import {
   initClient,
   retryFileManagerRsyncAndCheckStatus,
   retryFileManagerRm,
+  TaskStatusPoller,
 } from './utils';
+import { MODEL_DOWNLOAD_CONCURRENCY } from './constants';
+import { runPool } from '../../utils/scheduler';
 
 export class ArtModelService {
   logger = logger;
@@ -107,62 +110,38 @@ export class ArtModelService {
       return;
     }
 
-    // 限制并发数量，避免同时发起过多请求
-    const MAX_CONCURRENT_DOWNLOADS = 5;
-    const results = [];
     let successCount = 0;
     let failureCount = 0;
     const failureDetails: Array<{ fileName: string; error: string }> = [];
 
-    // 使用并发控制执行下载任务
-    const downloadTasks = filesNeed.map((file) =>
-      this._downloadSingleFile.bind(this, devClient, file, {
-        name,
-        nasMountPoints,
-        ossMountPoints: processedOssMountPoints,
-        role,
-        region,
-        vpcConfig,
-        conflictResolution: process.env.MODEL_CONFLIC_HANDLING || modelConfig.conflictResolution,
-        timeout: modelConfig?.timeout,
-      }),
-    );
-
-    // 分批处理文件下载，每批最多 MAX_CONCURRENT_DOWNLOADS 个并发
-    for (let i = 0; i < downloadTasks.length; i += MAX_CONCURRENT_DOWNLOADS) {
-      const batch = downloadTasks.slice(i, i + MAX_CONCURRENT_DOWNLOADS);
-      const batchPromises = batch.map((task) => task());
+    const config = {
+      name,
+      nasMountPoints,
+      ossMountPoints: processedOssMountPoints,
+      role,
+      region,
+      vpcConfig,
+      conflictResolution: process.env.MODEL_CONFLIC_HANDLING || modelConfig.conflictResolution,
+      timeout: modelConfig?.timeout,
+    };
+    const poller = new TaskStatusPoller(devClient, filesNeed.length);
 
+    // 任意文件下载完成后立即开始下一个文件，单个大文件不会阻塞其它文件
+    await runPool(filesNeed, MODEL_DOWNLOAD_CONCURRENCY, async (file) => {
       try {
-        // eslint-disable-next-line no-await-in-loop
-        const batchResults = await Promise.allSettled(batchPromises);
-        // 处理批处理结果
-        // eslint-disable-next-line no-loop-func
-        batchResults.forEach((result, index) => {
-          if (result.status === 'fulfilled') {
-            results.push(result.value);
-            successCount++;
-            logger.info(
-              `[Download-model] Successfully downloaded file: ${filesNeed[i + index].fileName}`,
-            );
-          } else {
-            failureCount++;
-            const { fileName } = filesNeed[i + index];
-            const errorDetail = result.reason.stack || result.reason.toString();
-
-            // 记录详细错误信息到数组
-            failureDetails.push({
-              fileName,
-              error: errorDetail,
-            });
-          }
-        });
+        await this._downloadSingleFile(devClient, file, config, poller);
+        successCount++;
+        logger.info(`[Download-model] Successfully downloaded file: ${file.fileName}`);
       } catch (error) {
         failureCount++;
-        logger.error(`[Download-model] Batch download error: ${error.message}`);
-        logger.error(`[Download-model] Batch error details:`, error.stack || error);
+        // 记录详细错误信息到数组
+        failureDetails.push({
+          fileName: file.fileName,
+          error: error.stack || error.toString(),
+        });
       }
-    }
+    });
+    logger.debug(`[Download-model] getFileManagerTask calls: ${poller.polls}`);
 
     // 输出最终统计信息
     logger.info(
@@ -363,7 +342,12 @@ export class ArtModelService {
     }
   }
 
-  private async _downloadSingleFile(devClient: any, file: any, config: any) {
+  private async _downloadSingleFile(
+    devClient: any,
+    file: any,
+    config: any,
+    poller?: TaskStatusPoller,
+  ) {
     const { source, destination, fileName } = file;
     const {
       name,
@@ -402,6 +386,7 @@ export class ArtModelService {
         timeout,
         2,
         30,
+        poller,
       );
     } catch (error) {
       // 捕获并重新抛出错误，添加文件名信息
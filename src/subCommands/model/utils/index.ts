@@ -8,6 +8,9 @@ import DevClient from '@alicloud/devs20230714';
 import { sleep } from '../../../utils';
 import { isEmpty } from 'lodash';
 import logger from '../../../logger';
+import { TaskStatusPoller } from './poller';
+
+export { TaskStatusPoller } from './poller';
 
 function isInitializeError(errorMessage) {
   if (
@@ -182,9 +185,15 @@ export async function retryFileManagerRsyncAndCheckStatus(
   timeout: number,
   maxRetries = 2,
   baseDelay = 30,
+  poller?: TaskStatusPoller,
 ) {
   let lastError;
   let success = false;
+  // 批量下载时由共享的轮询器查询任务状态
+  const waitTask = (taskID: string) =>
+    poller
+      ? poller.wait(taskID, fileName, timeout)
+      : checkModelStatus(devClient, taskID, fileName, timeout);
 
   try {
     const req = await devClient.fileManagerRsync(fileManagerRsyncRequest);
@@ -200,7 +209,7 @@ export async function retryFileManagerRsyncAndCheckStatus(
       `[Download-model] requestId for ${fileName}: ${req.body.requestId}, taskID: ${taskID}`,
     );
 
-    await checkModelStatus(devClient, taskID, fileName, timeout);
+    await waitTask(taskID);
     success = true;
   } catch (error) {
     lastError = error;
@@ -241,7 +250,7 @@ export async function retryFileManagerRsyncAndCheckStatus(
         );
 
         // eslint-disable-next-line no-await-in-loop
-        await checkModelStatus(devClient, taskID, fileName, timeout);
+        await waitTask(taskID);
         success = true;
         break;
       } catch (retryError) {
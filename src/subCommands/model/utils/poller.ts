@@ -0,0 +1,195 @@
+import DevClient from '@alicloud/devs20230714';
+import logger from '../../../logger';
+
+interface IWatchedTask {
+  taskID: string;
+  fileName: string;
+  timeout: number;
+  resolve: (status: any) => void;
+  reject: (error: Error) => void;
+  nextPollAt: number;
+  interval: number;
+  currentBytes: number;
+  totalBytes: number;
+  lastBytes?: number;
+  lastPollAt?: number;
+}
+
+export interface ITaskStatusPollerOptions {
+  // 轮询间隔上下限，单位 ms
+  minInterval?: number;
+  maxInterval?: number;
+  // 是否输出整体下载进度
+  showProgress?: boolean;
+}
+
+const formatSize = (bytes: number) => `${(bytes / 1024 / 1024).toFixed(1)}MB`;
+
+const formatDuration = (ms: number) => {
+  const seconds = Math.ceil(ms / 1000);
+  return seconds >= 60 ? `${Math.floor(seconds / 60)}m${seconds % 60}s` : `${seconds}s`;
+};
+
+/**
+ * 共享的文件管理任务状态轮询器：所有进行中的任务由同一个轮询循环查询状态
+ * 每个任务按下载速率估算剩余时间调整查询间隔，大文件下载期间查询次数更少
+ */
+export class TaskStatusPoller {
+  // getFileManagerTask 调用次数
+  polls = 0;
+  private tasks = new Map<string, IWatchedTask>();
+  private timer?: NodeJS.Timeout;
+  private polling = false;
+  private finishedFiles = 0;
+  private finishedBytes = 0;
+  private startTime = Date.now();
+  private minInterval: number;
+  private maxInterval: number;
+  private showProgress: boolean;
+
+  constructor(
+    private devClient: DevClient,
+    private totalFiles: number,
+    options: ITaskStatusPollerOptions = {},
+  ) {
+    this.minInterval = options.minInterval || 2000;
+    this.maxInterval = options.maxInterval || 30000;
+    this.showProgress = options.showProgress !== false;
+  }
+
+  /**
+   * 等待任务结束，任务失败或超时时抛出异常
+   */
+  wait(taskID: string, fileName: string, timeout: number): Promise<any> {
+    return new Promise((resolve, reject) => {
+      this.tasks.set(taskID, {
+        taskID,
+        fileName,
+        timeout,
+        resolve,
+        reject,
+        nextPollAt: Date.now() + this.minInterval,
+        interval: this.minInterval,
+        currentBytes: 0,
+        totalBytes: 0,
+      });
+      this.schedule();
+    });
+  }
+
+  private schedule() {
+    if (this.timer || this.polling || this.tasks.size === 0) {
+      return;
+    }
+    let next = Infinity;
+    this.tasks.forEach((task) => {
+      next = Math.min(next, task.nextPollAt);
+    });
+    this.timer = setTimeout(() => {
+      this.timer = undefined;
+      this.tick();
+    }, Math.max(0, next - Date.now()));
+  }
+
+  private async tick() {
+    this.polling = true;
+    const now = Date.now();
+    const due = Array.from(this.tasks.values()).filter((task) => task.nextPollAt <= now);
+    await Promise.all(due.map((task) => this.poll(task)));
+    this.renderProgress();
+    this.polling = false;
+    this.schedule();
+  }
+
+  private async poll(task: IWatchedTask) {
+    const { taskID, fileName } = task;
+    try {
+      this.polls++;
+      const getFileManager = await this.devClient.getFileManagerTask(taskID);
+      logger.debug('getFileManagerTask', JSON.stringify(getFileManager, null, 2));
+      const modelStatus = getFileManager.body.data;
+      const now = Date.now();
+      task.totalBytes = (modelStatus.progress.totalBytes as any) - 0 || 0;
+      task.currentBytes = (modelStatus.progress.currentBytes as any) - 0 || 0;
+
+      if (modelStatus.finished) {
+        this.tasks.delete(taskID);
+        if (modelStatus.errorMessage) {
+          throw new Error(
+            `[Download-model] ${fileName}: ${modelStatus.errorMessage} ,requestId: ${getFileManager.body.requestId}`,
+          );
+        }
+        this.finishedFiles++;
+        this.finishedBytes += task.totalBytes;
+        this.clearProgress();
+        if (modelStatus.progress.total) {
+          const durationSeconds = Math.floor(
+            (modelStatus.finishedTime - modelStatus.startTime) / 1000,
+          );
+          logger.info(`Time taken for ${fileName || 'model'} download: ${durationSeconds}s.`);
+        }
+        logger.info(`[Download-model] Download ${fileName || 'model'} finished.`);
+        task.resolve(modelStatus);
+        return;
+      }
+
+      if (now - modelStatus.startTime > task.timeout) {
+        this.tasks.delete(taskID);
+        throw new Error(
+          `[Model-download] Download timeout after ${task.timeout / 1000 / 60} minutes`,
+        );
+      }
+
+      task.interval = this.nextInterval(task, now);
+      task.lastBytes = task.currentBytes;
+      task.lastPollAt = now;
+      task.nextPollAt = now + task.interval;
+    } catch (error) {
+      this.tasks.delete(taskID);
+      this.clearProgress();
+      logger.error(error.message);
+      task.reject(error);
+    }
+  }
+
+  /**
+   * 按下载速率估算剩余时间，取剩余时间的 1/5 作为下次查询间隔；暂无进度时逐步放大间隔
+   */
+  private nextInterval(task: IWatchedTask, now: number): number {
+    const { currentBytes, totalBytes, lastBytes, lastPollAt, interval } = task;
+    let next = interval * 1.5;
+    if (lastPollAt !== undefined && currentBytes > lastBytes && totalBytes > currentBytes) {
+      const rate = (currentBytes - lastBytes) / (now - lastPollAt);
+      next = (totalBytes - currentBytes) / rate / 5;
+    }
+    return Math.round(Math.min(this.maxInterval, Math.max(this.minInterval, next)));
+  }
+
+  private renderProgress() {
+    if (!this.showProgress || this.tasks.size === 0) {
+      return;
+    }
+    let currentBytes = this.finishedBytes;
+    let knownBytes = this.finishedBytes;
+    this.tasks.forEach((task) => {
+      currentBytes += task.currentBytes;
+      knownBytes += task.totalBytes;
+    });
+    const elapsed = Date.now() - this.startTime;
+    const speed = elapsed > 0 ? currentBytes / elapsed : 0;
+    const eta = speed > 0 ? formatDuration((knownBytes - currentBytes) / speed) : '-';
+    process.stdout.write(
+      `\r\x1B[K[Download-model] ${this.finishedFiles}/${this.totalFiles} files, ${formatSize(
+        currentBytes,
+      )}/${formatSize(knownBytes)}, ${formatSize(speed * 1000)}/s, ETA ${eta} (${
+        this.tasks.size
+      } in progress)`,
+    );
+  }
+
+  private clearProgress() {
+    if (this.showProgress) {
+      process.stdout.write('\r\x1B[K');
+    }
+  }
+}
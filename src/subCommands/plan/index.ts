@@ -11,11 +11,12 @@ import { diffConvertPlanYaml } from '@serverless-devs/diff';
 import FC, { GetApiType } from '../../resources/fc';
 import { FC_API_ERROR_CODE } from '../../resources/fc/error-code';
 import logger from '../../logger';
-import { FC_TRIGGER_DEFAULT_CONFIG } from '../../default/config';
+import { FC_REMOTE_FETCH_CONCURRENCY, FC_TRIGGER_DEFAULT_CONFIG } from '../../default/config';
 import loadComponent from '@serverless-devs/load-component';
 import { IInputs as _IInputs } from '@serverless-devs/component-interface';
 import { getUserAgent, transformCustomDomainProps } from '../../utils';
 import { FC3_DOMAIN_COMPONENT_NAME } from '../../constant';
+import { fetchAll, runPool } from '../../utils/scheduler';
 
 export default class Plan {
   readonly region: IRegion;
@@ -59,13 +60,30 @@ export default class Plan {
   }
 
   async run() {
-    const functionConfig = await this.planFunction();
-    const triggersConfig = await this.planTriggers();
-    const asyncInvokeConfig = await this.planAsyncInvokeConfig();
-    const vpcBindingConfig = await this.planVpcBinding();
-    const provisionConfig = await this.planProvisionConfig();
-    const scalingConfig = await this.planScalingConfig();
-    const concurrencyConfig = await this.planConcurrencyConfig();
+    const { values, errors } = await fetchAll(
+      {
+        functionConfig: () => this.planFunction(),
+        triggersConfig: () => this.planTriggers(),
+        asyncInvokeConfig: () => this.planAsyncInvokeConfig(),
+        vpcBindingConfig: () => this.planVpcBinding(),
+        provisionConfig: () => this.planProvisionConfig(),
+        scalingConfig: () => this.planScalingConfig(),
+        concurrencyConfig: () => this.planConcurrencyConfig(),
+      },
+      FC_REMOTE_FETCH_CONCURRENCY,
+    );
+    if (!_.isEmpty(errors)) {
+      throw _.values(errors)[0];
+    }
+    const {
+      functionConfig,
+      triggersConfig,
+      asyncInvokeConfig,
+      vpcBindingConfig,
+      provisionConfig,
+      scalingConfig,
+      concurrencyConfig,
+    } = values;
     let showDiff = `region: ${this.region}\n${functionConfig.show}`;
     if (!_.isEmpty(this.triggers)) {
       showDiff += `\ntriggers:\n${triggersConfig.show}`;
@@ -131,27 +149,30 @@ export default class Plan {
   }
 
   private async planTriggers() {
-    const result = [];
-    for (const triggerConfig of this.triggers) {
-      const { triggerName } = triggerConfig;
-      let remote = {};
-      try {
-        remote = await this.fcSdk.getTrigger(
-          this.functionName,
-          triggerName,
-          GetApiType.simpleUnsupported,
-        );
-      } catch (ex) {
-        logger.debug(`Get remote function config error: ${ex.message}`);
-        if (
-          ex.code === FC_API_ERROR_CODE.FunctionNotFound ||
-          ex.code === FC_API_ERROR_CODE.TriggerNotFound
-        ) {
-          remote = {};
+    const result = await runPool(
+      this.triggers,
+      FC_REMOTE_FETCH_CONCURRENCY,
+      async (triggerConfig) => {
+        const { triggerName } = triggerConfig;
+        let remote = {};
+        try {
+          remote = await this.fcSdk.getTrigger(
+            this.functionName,
+            triggerName,
+            GetApiType.simpleUnsupported,
+          );
+        } catch (ex) {
+          logger.debug(`Get remote function config error: ${ex.message}`);
+          if (
+            ex.code === FC_API_ERROR_CODE.FunctionNotFound ||
+            ex.code === FC_API_ERROR_CODE.TriggerNotFound
+          ) {
+            remote = {};
+          }
         }
-      }
-      result.push(remote);
-    }
+        return remote;
+      },
+    );
 
     return diffConvertPlanYaml(result, this.triggers, { deep: 1, complete: true });
   }
@@ -5,7 +5,8 @@ import { IInputs, IRegion, checkRegion } from '../../interface';
 import logger from '../../logger';
 import _ from 'lodash';
 import FC from '../../resources/fc';
-import { getUserAgent, promptForConfirmOrDetails, sleep } from '../../utils';
+import { getUserAgent, promptForConfirmOrDetails } from '../../utils';
+import { getInterruptSignal, waitUntil } from '../../utils/waiter';
 import { IProvision } from '../../interface/cli-config/provision';
 
 const commandsList = Object.keys(commandsHelp.subCommands);
@@ -162,13 +163,24 @@ export default class Provision {
       `${this.region}/${this.functionName}/${this.qualifier}`,
     );
     await this.fcSdk.removeFunctionProvisionConfig(this.functionName, this.qualifier);
-    // eslint-disable-next-line no-constant-condition
-    while (true) {
-      await sleep(1.5);
-      const { current } = (await this.get()) || {};
-      if (current === 0 || !current) {
-        break;
-      }
+    // 等待预留实例释放
+    const { done } = await waitUntil(
+      async () => {
+        const { current } = (await this.get()) || {};
+        return { done: current === 0 || !current };
+      },
+      {
+        name: 'provision-removed',
+        minDelayMs: 1500,
+        maxDelayMs: 10000,
+        timeoutMs: 15 * 60 * 1000,
+        signal: getInterruptSignal(),
+      },
+    );
+    if (!done) {
+      throw new Error(
+        `Timeout waiting for provision of ${this.functionName}/${this.qualifier} to be removed`,
+      );
     }
     logger.spin(
       'removed',
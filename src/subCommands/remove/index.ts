@@ -4,11 +4,10 @@ import { IInputs, IRegion, checkRegion } from '../../interface';
 import chalk from 'chalk';
 import logger from '../../logger';
 import FC, { GetApiType } from '../../resources/fc';
-import { FC_API_ERROR_CODE } from '../../resources/fc/error-code';
+import { FC_API_ERROR_CODE, isThrottling } from '../../resources/fc/error-code';
 import { parseArgv } from '@serverless-devs/utils';
 import {
   promptForConfirmOrDetails,
-  sleep,
   transformCustomDomainProps,
   isProvisionConfigError,
   getUserAgent,
@@ -16,6 +15,21 @@ import {
 import loadComponent from '@serverless-devs/load-component';
 import { IInputs as _IInputs } from '@serverless-devs/component-interface';
 import { FC3_DOMAIN_COMPONENT_NAME } from '../../constant';
+import {
+  FC_FANOUT_CONCURRENCY,
+  FC_THROTTLING_RETRY_COUNT,
+  FC_TRIGGER_CONCURRENCY,
+} from '../../default/config';
+import { runThrottledPool } from '../../utils/scheduler';
+import { getInterruptSignal, waitUntil } from '../../utils/waiter';
+import {
+  IFanoutArgs,
+  RegionClientPool,
+  parseFanoutArgs,
+  renderFanoutResults,
+  resolveFanoutTargets,
+  runFanout,
+} from '../../utils/fanout';
 import { DisableFunctionInvocationRequest } from '@alicloud/fc20230330';
 
 export default class Remove {
@@ -28,8 +42,83 @@ export default class Remove {
   private disable_list_remote_alb_triggers: string;
 
   private fcSdk: FC;
+  // 批量删除时不逐个打印函数的待删除资源，避免混入批量结果的输出
+  quiet = false;
+  // 删除失败的触发器
+  private failedTriggers: string[] = [];
+
+  /**
+   * 解析批量参数：--regions、--prefix、逗号分隔或带通配符的 --function-name
+   */
+  static parseFanout(inputs: IInputs): IFanoutArgs | undefined {
+    const fanout = parseFanoutArgs(inputs);
+    if (!fanout) {
+      return fanout;
+    }
+    // 不带函数名过滤条件时会匹配地域内的所有函数，删除前必须显式指定
+    const { prefix, names } = fanout.selector;
+    if (!_.isNil(prefix) && _.isEmpty(_.trim(prefix))) {
+      throw new Error('--prefix must not be empty when removing functions in batch');
+    }
+    if (_.isNil(prefix) && _.isEmpty(names)) {
+      throw new Error(
+        'Please specify --prefix or --function-name to select the functions to remove in batch',
+      );
+    }
+    return fanout;
+  }
 
-  constructor(readonly inputs: IInputs) {
+  /**
+   * 批量删除多个地域/函数，统一确认一次，逐个函数汇总删除结果
+   */
+  static async runFanout(inputs: IInputs, fanout: IFanoutArgs) {
+    const { selector, outputFormat, opts } = fanout;
+    const pool = new RegionClientPool(inputs.credential, getUserAgent(inputs.userAgent, 'remove'), {
+      region: _.get(inputs, 'props.region'),
+      endpoint: _.get(inputs, 'props.endpoint'),
+    });
+    const targets = await resolveFanoutTargets(pool, selector, FC_FANOUT_CONCURRENCY);
+    if (_.isEmpty(targets)) {
+      logger.info('No function matched, skip remove');
+      return [];
+    }
+    // jsonl 格式的 stdout 只输出结果记录，待删除列表输出到 stderr
+    const write =
+      outputFormat === 'jsonl'
+        ? (msg: string) => process.stderr.write(`${msg}\n`)
+        : (msg: string) => logger.write(msg);
+    write(`Remove ${targets.length} functions:`);
+    targets.forEach(({ region, functionName }) => write(`  ${region}/${functionName}`));
+    if (!opts['assume-yes']) {
+      const y = await promptForConfirmOrDetails(
+        'Are you sure you want to delete the functions listed above',
+      );
+      if (!y) {
+        logger.debug('False is selected. Skip remove');
+        return;
+      }
+    }
+
+    const records = await runFanout(targets, pool, outputFormat, async (target, fcSdk) => {
+      // 批量模式下删除远端函数及其全部触发器，忽略 yaml 中与单个函数绑定的配置
+      const targetInputs = {
+        ...inputs,
+        args: ['-y'],
+        props: { region: target.region, functionName: target.functionName },
+      } as IInputs;
+      const remove = new Remove(targetInputs, fcSdk);
+      remove.quiet = true;
+      await remove.forceRemove();
+      return 'removed';
+    });
+    const failed = records.filter((record) => record.error);
+    if (!_.isEmpty(failed)) {
+      logger.error(`Failed to remove ${failed.length}/${records.length} functions`);
+    }
+    return renderFanoutResults(records, outputFormat, ['result'], (result) => ({ result }));
+  }
+
+  constructor(readonly inputs: IInputs, fcSdk?: FC) {
     const opts = parseArgv(inputs.args, {
       alias: {
         'assume-yes': 'y',
@@ -93,10 +182,12 @@ export default class Remove {
 
     this.yes = !!yes;
     const userAgent = getUserAgent(inputs.userAgent, 'remove');
-    this.fcSdk = new FC(this.region, inputs.credential, {
-      endpoint: inputs.props.endpoint,
-      userAgent,
-    });
+    this.fcSdk =
+      fcSdk ||
+      new FC(this.region, inputs.credential, {
+        endpoint: inputs.props.endpoint,
+        userAgent,
+      });
   }
 
   async run() {
@@ -112,15 +203,44 @@ export default class Remove {
       }
     }
     try {
-      await this.removeAsyncInvokeConfig();
-      await this.removeCustomDomain();
-      await this.removeTrigger();
-      await this.removeFunction();
+      await this.removeResources();
     } catch (ex) {
       logger.error(`remove error: ${ex.message}`);
     }
   }
 
+  /**
+   * 不经确认直接删除，异常直接抛出，供批量删除汇总每个函数的结果
+   */
+  async forceRemove() {
+    await this.computingRemoveResource();
+    await this.removeResources();
+    if (!_.isEmpty(this.failedTriggers)) {
+      throw new Error(`Failed to remove triggers: ${this.failedTriggers.join(', ')}`);
+    }
+  }
+
+  /**
+   * 打印待删除的资源，批量删除时不打印
+   */
+  private showResource(title: string, data?: any) {
+    if (this.quiet) {
+      return;
+    }
+    logger.write(title);
+    if (!_.isUndefined(data)) {
+      logger.output(data, 2);
+    }
+    console.log();
+  }
+
+  private async removeResources() {
+    await this.removeAsyncInvokeConfig();
+    await this.removeCustomDomain();
+    await this.removeTrigger();
+    await this.removeFunction();
+  }
+
   private async computingRemoveResource() {
     if (this.resources.function) {
       logger.spin('getting', 'function resource', `${this.region}/${this.functionName}`);
@@ -144,8 +264,7 @@ export default class Remove {
   private async getFunctionResource() {
     try {
       await this.fcSdk.getFunction(this.functionName);
-      logger.write(`Remove function: ${this.region}/${this.functionName}`);
-      console.log();
+      this.showResource(`Remove function: ${this.region}/${this.functionName}`);
     } catch (ex) {
       logger.debug(
         `Remove function ${this.region}/${this.functionName} check error: ${ex.message}`,
@@ -169,9 +288,10 @@ export default class Remove {
         vpcBindingConfigs.vpcIds.length > 0
       ) {
         this.resources.vpcBindingConfigs = vpcBindingConfigs;
-        logger.write(`Remove function ${this.region}/${this.functionName} vpcBinding:`);
-        logger.output(this.resources.vpcBindingConfigs, 2);
-        console.log();
+        this.showResource(
+          `Remove function ${this.region}/${this.functionName} vpcBinding:`,
+          this.resources.vpcBindingConfigs,
+        );
       }
     } catch (ex) {
       logger.debug(
@@ -196,9 +316,10 @@ export default class Remove {
         };
       });
       if (!_.isEmpty(this.resources.scalingConfigs)) {
-        logger.write(`Remove function ${this.region}/${this.functionName} scalingConfigs:`);
-        logger.output(this.resources.scalingConfigs, 2);
-        console.log();
+        this.showResource(
+          `Remove function ${this.region}/${this.functionName} scalingConfigs:`,
+          this.resources.scalingConfigs,
+        );
       }
     } catch (ex) {
       logger.debug(
@@ -209,10 +330,9 @@ export default class Remove {
     try {
       const concurrency = await this.fcSdk.getFunctionConcurrency(this.functionName);
       this.resources.concurrency = concurrency.reservedConcurrency;
-      logger.write(
+      this.showResource(
         `Remove function ${this.region}/${this.functionName} concurrency: ${this.resources.concurrency}`,
       );
-      console.log();
     } catch (ex) {
       logger.debug(
         `Get function ${this.region}/${this.functionName} concurrency error: ${ex.message}`,
@@ -223,9 +343,10 @@ export default class Remove {
       const aliases = await this.fcSdk.listAlias(this.functionName);
       if (!_.isEmpty(aliases)) {
         this.resources.aliases = aliases.map((item) => item.aliasName);
-        logger.write(`Remove function ${this.region}/${this.functionName} aliases:`);
-        logger.output(this.resources.aliases, 2);
-        console.log();
+        this.showResource(
+          `Remove function ${this.region}/${this.functionName} aliases:`,
+          this.resources.aliases,
+        );
       }
     } catch (ex) {
       logger.debug(
@@ -238,16 +359,17 @@ export default class Remove {
       if (!_.isEmpty(versions)) {
         this.resources.versions = versions.map((item) => item.versionId);
         if (versions.length > 5) {
-          logger.write(
+          this.showResource(
             `${chalk.yellow(versions.length)} versions of function ${
               this.functionName
             } need to be deleted`,
           );
         } else {
-          logger.write(`Remove function ${this.region}/${this.functionName} versions:`);
-          logger.output(this.resources.versions, 2);
+          this.showResource(
+            `Remove function ${this.region}/${this.functionName} versions:`,
+            this.resources.versions,
+          );
         }
-        console.log();
       }
     } catch (ex) {
       logger.debug(
@@ -267,9 +389,10 @@ export default class Remove {
           qualifier: item.functionArn.split('/')[2] || 'LATEST',
           destinationConfig: item.destinationConfig,
         }));
-        logger.write(`Remove function ${this.region}/${this.functionName} asyncInvokeConfigs:`);
-        logger.output(this.resources.asyncInvokeConfigs, 2);
-        console.log();
+        this.showResource(
+          `Remove function ${this.region}/${this.functionName} asyncInvokeConfigs:`,
+          this.resources.asyncInvokeConfigs,
+        );
       }
     } catch (ex) {
       logger.debug(
@@ -301,16 +424,14 @@ export default class Remove {
     if (_.isEmpty(triggers)) {
       this.resources.triggerNames = [];
     } else {
-      logger.write(`Remove function ${this.region}/${this.functionName} triggers:`);
-      logger.output(
+      this.showResource(
+        `Remove function ${this.region}/${this.functionName} triggers:`,
         triggers.map((item) => ({
           triggerName: item.triggerName,
           triggerType: item.triggerType,
           qualifier: item.qualifier,
         })),
-        2,
       );
-      console.log();
 
       this.resources.triggerNames = triggers.map((item) => item.triggerName);
     }
@@ -320,15 +441,45 @@ export default class Remove {
     if (_.isEmpty(this.resources.triggerNames)) {
       return;
     }
-    for (const triggerName of this.resources.triggerNames) {
-      logger.spin('removing', 'trigger', `${this.region}/${this.functionName}/${triggerName}`);
-      try {
-        await this.fcSdk.removeTrigger(this.functionName, triggerName);
-      } catch (ex) {
-        logger.error(`${ex}`);
-      }
-      logger.spin('removed', 'trigger', `${this.region}/${this.functionName}/${triggerName}`);
-    }
+    let deleted = 0;
+    const throttledTimes: Record<string, number> = {};
+    await runThrottledPool(
+      this.resources.triggerNames,
+      FC_TRIGGER_CONCURRENCY,
+      async (triggerName: string) => {
+        const id = `${this.region}/${this.functionName}/${triggerName}`;
+        logger.spin('removing', 'trigger', id);
+        try {
+          await this.fcSdk.removeTrigger(this.functionName, triggerName);
+          deleted++;
+        } catch (ex) {
+          // 限流时交给 runThrottledPool 退避重试；重试用尽后按失败处理，不中断其余触发器的删除
+          const times = throttledTimes[triggerName] || 0;
+          if (isThrottling(ex) && times < FC_THROTTLING_RETRY_COUNT) {
+            throttledTimes[triggerName] = times + 1;
+            throw ex;
+          }
+          logger.error(`${ex}`);
+          this.failedTriggers.push(triggerName);
+          return;
+        }
+        logger.spin('removed', 'trigger', id);
+      },
+      {
+        isThrottled: isThrottling,
+        retries: FC_THROTTLING_RETRY_COUNT,
+        onThrottled: (triggerName, attempt, delayMs) => {
+          logger.debug(
+            `remove trigger ${this.functionName}/${triggerName} throttled, retry ${attempt} times after ${delayMs}ms`,
+          );
+        },
+      },
+    );
+    logger.info(
+      `Triggers of ${this.functionName}: ${deleted} deleted, ${
+        this.resources.triggerNames.length - deleted
+      } failed`,
+    );
   }
 
   private async removeAsyncInvokeConfig() {
@@ -401,20 +552,31 @@ export default class Remove {
           'remove function scalingConfig',
           `${this.region}/${this.functionName}/${qualifier}`,
         );
-        // eslint-disable-next-line no-constant-condition
-        while (true) {
-          await sleep(1);
-          const scalingConfig =
-            (await this.fcSdk.getFunctionScalingConfig(this.functionName, qualifier)) || {};
-          // 检查scaling config是否已完全删除
-          if (_.isEmpty(scalingConfig) || scalingConfig.currentInstances === 0) {
-            logger.spin(
-              'checked',
-              'remove function scalingConfig',
-              `${this.region}/${this.functionName}/${qualifier}`,
-            );
-            break;
-          }
+        const { done } = await waitUntil(
+          async () => {
+            const scalingConfig =
+              (await this.fcSdk.getFunctionScalingConfig(this.functionName, qualifier)) || {};
+            // 检查scaling config是否已完全删除
+            return { done: _.isEmpty(scalingConfig) || scalingConfig.currentInstances === 0 };
+          },
+          {
+            name: 'scaling-removed',
+            minDelayMs: 1000,
+            maxDelayMs: 10000,
+            timeoutMs: 15 * 60 * 1000,
+            signal: getInterruptSignal(),
+          },
+        );
+        if (done) {
+          logger.spin(
+            'checked',
+            'remove function scalingConfig',
+            `${this.region}/${this.functionName}/${qualifier}`,
+          );
+        } else {
+          logger.warn(
+            `Timeout waiting for scalingConfig of ${this.functionName}/${qualifier} to be removed`,
+          );
         }
       }
     }
@@ -569,45 +731,43 @@ export default class Remove {
       }
     };
 
-    // 首次尝试删除
+    // 首次尝试删除，预置配置错误时退避重试，直到预置实例释放
     logger.info(`Attempting to remove function ${this.functionName}`);
-    if (await performDelete()) {
-      return; // 成功删除，直接返回
-    }
-
-    // 如果首次删除失败且是预置配置错误，开始重试逻辑
-    logger.warn(
-      `Remove function ${this.functionName} failed with provision configuration error, starting retry sequence...`,
+    const { done } = await waitUntil(
+      async (attempt) => {
+        if (attempt > 0) {
+          logger.info(
+            `Retry attempt ${attempt}/${RETRY_CONFIG.maxRetries} for function ${this.functionName}`,
+          );
+          // 在指定阈值时尝试禁用函数调用
+          if (attempt === RETRY_CONFIG.disableInvocationThreshold) {
+            await disableFunctionInvocation();
+          }
+        }
+        const deleted = await performDelete();
+        if (!deleted && attempt === 0) {
+          logger.warn(
+            `Remove function ${this.functionName} failed with provision configuration error, starting retry sequence...`,
+          );
+        } else if (deleted && attempt > 0) {
+          logger.info(
+            `Function ${this.functionName} removed successfully on retry attempt ${attempt}`,
+          );
+        }
+        return { done: deleted };
+      },
+      {
+        name: 'function-removed',
+        minDelayMs: RETRY_CONFIG.interval * 1000,
+        maxDelayMs: 5000,
+        maxAttempts: RETRY_CONFIG.maxRetries + 1,
+      },
     );
 
-    // 循环重试删除
-    for (let attempt = 1; attempt <= RETRY_CONFIG.maxRetries; attempt++) {
-      logger.info(
-        `Retry attempt ${attempt}/${RETRY_CONFIG.maxRetries} for function ${this.functionName}`,
-      );
-
-      // 在指定阈值时尝试禁用函数调用
-      if (attempt === RETRY_CONFIG.disableInvocationThreshold) {
-        await disableFunctionInvocation();
-      }
-
-      // 等待一段时间后重试
-      await sleep(RETRY_CONFIG.interval);
-
-      // 尝试删除
-      if (await performDelete()) {
-        logger.info(
-          `Function ${this.functionName} removed successfully on retry attempt ${attempt}`,
-        );
-        return;
-      }
-
-      // 如果是最后一次重试仍然失败
-      if (attempt === RETRY_CONFIG.maxRetries) {
-        const errorMessage = `Failed to remove function ${this.functionName} after ${RETRY_CONFIG.maxRetries} retries`;
-        logger.error(errorMessage);
-        throw new Error(errorMessage);
-      }
+    if (!done) {
+      const errorMessage = `Failed to remove function ${this.functionName} after ${RETRY_CONFIG.maxRetries} retries`;
+      logger.error(errorMessage);
+      throw new Error(errorMessage);
     }
   }
 }
@@ -2,7 +2,6 @@ import fs from 'fs';
 import fs_extra from 'fs-extra';
 import _ from 'lodash';
 import yaml from 'js-yaml';
-import downloads from '@serverless-devs/downloads';
 import { IInputs, IRegion, checkRegion } from '../../interface';
 import FC, { GetApiType } from '../../resources/fc';
 import { parseArgv } from '@serverless-devs/utils';
@@ -10,6 +9,14 @@ import path from 'path';
 import logger from '../../logger';
 import { TriggerType } from '../../interface/base';
 import { getUserAgent } from '../../utils';
+import { FC_DOWNLOAD_CACHE_SIZE, FC_REMOTE_FETCH_CONCURRENCY } from '../../default/config';
+import { fetchAll } from '../../utils/scheduler';
+import {
+  downloadWithCache,
+  evictDownloadCache,
+  extractZip,
+  getDownloadCacheDir,
+} from '../../utils/download';
 
 export default class Sync {
   private region: IRegion;
@@ -96,53 +103,43 @@ export default class Sync {
   }
 
   async run() {
-    const functionInfo = await this.fcSdk.getFunction(
-      this.functionName,
-      GetApiType.simpleUnsupported,
-      this.qualifier,
+    // 函数与触发器是必需的，读取失败直接报错；其它配置不存在时视为空
+    const { values, errors } = await fetchAll(
+      {
+        functionInfo: () =>
+          this.fcSdk.getFunction(this.functionName, GetApiType.simpleUnsupported, this.qualifier),
+        triggers: () => this.getTriggers(),
+        asyncInvokeConfig: () =>
+          this.fcSdk.getAsyncInvokeConfig(
+            this.functionName,
+            'LATEST',
+            GetApiType.simpleUnsupported,
+          ),
+        provisionConfig: () => this.fcSdk.getFunctionProvisionConfig(this.functionName, 'LATEST'),
+        scalingConfig: () => this.fcSdk.getFunctionScalingConfig(this.functionName, 'LATEST'),
+        concurrencyConfig: () => this.fcSdk.getFunctionConcurrency(this.functionName),
+        vpcBindingConfig: () =>
+          this.fcSdk.getVpcBinding(this.functionName, GetApiType.simpleUnsupported),
+      },
+      FC_REMOTE_FETCH_CONCURRENCY,
     );
-    const triggers = await this.getTriggers();
-    let asyncInvokeConfig = {};
-    let vpcBindingConfig = {};
-    let concurrencyConfig = {};
-    let provisionConfig = {};
-    let scalingConfig = {};
-    try {
-      asyncInvokeConfig = await this.fcSdk.getAsyncInvokeConfig(
-        this.functionName,
-        'LATEST',
-        GetApiType.simpleUnsupported,
-      );
-    } catch (ex) {
-      // eslint-disable-next-line no-empty
-    }
-
-    try {
-      provisionConfig = await this.fcSdk.getFunctionProvisionConfig(this.functionName, 'LATEST');
-    } catch (ex) {
-      // eslint-disable-next-line no-empty
-    }
-
-    try {
-      scalingConfig = await this.fcSdk.getFunctionScalingConfig(this.functionName, 'LATEST');
-    } catch (ex) {
-      // eslint-disable-next-line no-empty
-    }
-
-    try {
-      concurrencyConfig = await this.fcSdk.getFunctionConcurrency(this.functionName);
-    } catch (ex) {
-      // eslint-disable-next-line no-empty
+    _.forEach(errors, (ex, name) => {
+      logger.debug(`Sync get remote ${name} of ${this.functionName} error: ${ex?.message}`);
+    });
+    if (errors.functionInfo) {
+      throw errors.functionInfo;
     }
-
-    try {
-      vpcBindingConfig = await this.fcSdk.getVpcBinding(
-        this.functionName,
-        GetApiType.simpleUnsupported,
-      );
-    } catch (ex) {
-      // eslint-disable-next-line no-empty
+    if (errors.triggers) {
+      throw errors.triggers;
     }
+    const { functionInfo, triggers } = values;
+    const {
+      asyncInvokeConfig = {},
+      vpcBindingConfig = {},
+      concurrencyConfig = {},
+      provisionConfig = {},
+      scalingConfig = {},
+    } = values;
     return await this.write(
       functionInfo,
       triggers,
@@ -176,7 +173,7 @@ export default class Sync {
       .replace('$', '_');
     logger.debug(`sync yaml path: ${ymlPath}`);
     if (!FC.isCustomContainerRuntime(functionConfig.runtime)) {
-      const { url } = await this.fcSdk.getFunctionCode(this.functionName, this.qualifier);
+      const { url, checksum } = await this.fcSdk.getFunctionCode(this.functionName, this.qualifier);
 
       await fs_extra.removeSync(codePath);
       logger.debug(`clear sync code path: ${codePath}`);
@@ -186,10 +183,16 @@ export default class Sync {
         codeUrl = url.replace('.aliyuncs.com', '-internal.aliyuncs.com');
       }
 
-      await downloads(codeUrl, {
-        dest: codePath,
-        extract: true,
-      });
+      // 代码包按 codeChecksum 缓存，代码未变化时再次 sync 不会重复下载
+      const zipFile = checksum
+        ? path.join(getDownloadCacheDir(), `${checksum}.zip`)
+        : path.join(getDownloadCacheDir(), `${this.region}_${this.functionName}-${Date.now()}.zip`);
+      await downloadWithCache(codeUrl, zipFile, { checksum });
+      await extractZip(zipFile, codePath);
+      if (!checksum) {
+        fs_extra.removeSync(zipFile);
+      }
+      evictDownloadCache(FC_DOWNLOAD_CACHE_SIZE, zipFile);
 
       // eslint-disable-next-line require-atomic-updates, no-param-reassign
       functionConfig.code = codePath;
@@ -0,0 +1,65 @@
+import * as fs from 'fs';
+import path from 'path';
+import _ from 'lodash';
+import logger from '../logger';
+
+export interface ICacheEntry {
+  // 缓存条目的路径，淘汰时默认删除该路径
+  path: string;
+  // 单位 byte
+  size: number;
+  lastUsed: number;
+  // 自定义的删除逻辑，例如同时删除元数据文件
+  remove?: () => void;
+}
+
+/**
+ * 文件或目录的大小，单位 byte
+ */
+export function getPathSize(target: string): number {
+  const stat = fs.lstatSync(target);
+  if (!stat.isDirectory()) {
+    return stat.isFile() ? stat.size : 0;
+  }
+  let size = 0;
+  for (const name of fs.readdirSync(target)) {
+    size += getPathSize(path.join(target, name));
+  }
+  return size;
+}
+
+/**
+ * 缓存超过上限时，按最近使用时间从旧到新淘汰，返回淘汰后的缓存大小
+ * @param name 缓存名称，用于日志
+ * @param maxCacheSize 单位 MB
+ * @param keep 当前正在使用的路径，不会被淘汰
+ */
+export function evictLeastRecentlyUsed(
+  name: string,
+  entries: ICacheEntry[],
+  maxCacheSize: number,
+  keep: string[] = [],
+): number {
+  let total = _.sumBy(entries, 'size');
+  const limit = maxCacheSize * 1024 * 1024;
+  for (const entry of _.sortBy(entries, 'lastUsed')) {
+    if (total <= limit) {
+      break;
+    }
+    if (keep.includes(entry.path)) {
+      continue;
+    }
+    logger.debug(`evict ${name} cache ${entry.path}`);
+    try {
+      if (entry.remove) {
+        entry.remove();
+      } else {
+        fs.rmSync(entry.path, { recursive: true, force: true });
+      }
+      total -= entry.size;
+    } catch (ex) {
+      logger.debug(`Evict ${name} cache ${entry.path} error: ${ex}`);
+    }
+  }
+  return total;
+}
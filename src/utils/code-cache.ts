@@ -0,0 +1,198 @@
+import crypto from 'crypto';
+import * as fs from 'fs';
+import path from 'path';
+import _ from 'lodash';
+import { getRootHome } from '@serverless-devs/utils';
+import logger from '../logger';
+import { ICacheEntry, evictLeastRecentlyUsed, getPathSize } from './cache-eviction';
+
+const MANIFEST_VERSION = 1;
+
+interface IFileEntry {
+  mtimeMs: number;
+  size: number;
+  mode: number;
+  hash: string;
+}
+
+export interface ICodeManifest {
+  version: number;
+  codeUri: string;
+  fingerprint: string;
+  files: Record<string, IFileEntry>;
+  crc64?: string;
+}
+
+async function hashFile(filePath: string): Promise<string> {
+  return await new Promise((resolve, reject) => {
+    const hash = crypto.createHash('sha1');
+    fs.createReadStream(filePath)
+      .on('error', reject)
+      .on('data', (chunk) => hash.update(chunk))
+      .on('end', () => resolve(hash.digest('hex')));
+  });
+}
+
+export const getCodeCacheBaseDir = () => path.join(getRootHome(), 'fc', 'code-cache');
+
+/**
+ * 代码包缓存超过上限时，按清单的修改时间（最近一次部署使用的时间）从旧到新淘汰
+ * @param maxCacheSize 单位 MB
+ * @param keepDir 当前正在使用的缓存目录，不会被淘汰
+ */
+export function evictCodeCache(maxCacheSize: number, keepDir?: string) {
+  const baseDir = getCodeCacheBaseDir();
+  if (!fs.existsSync(baseDir)) {
+    return;
+  }
+  const entries: ICacheEntry[] = [];
+  for (const name of fs.readdirSync(baseDir)) {
+    const dir = path.join(baseDir, name);
+    try {
+      const manifestFile = path.join(dir, 'manifest.json');
+      const { mtimeMs } = fs.statSync(fs.existsSync(manifestFile) ? manifestFile : dir);
+      entries.push({ path: dir, size: getPathSize(dir), lastUsed: mtimeMs });
+    } catch (ex) {
+      logger.debug(`Stat code cache ${dir} error: ${ex}`);
+    }
+  }
+  evictLeastRecentlyUsed('code', entries, maxCacheSize, keepDir ? [keepDir] : []);
+}
+
+/**
+ * 代码包缓存：基于 path + mtime + size + hash 的文件清单判断代码目录是否变化
+ * 目录未变化时直接复用上次生成的 zip（字节一致，crc64 与 codeChecksum 可直接比较），不再重新压缩
+ */
+export default class CodeCache {
+  readonly cacheDir: string;
+  readonly manifestFile: string;
+  readonly zipFile: string;
+
+  private manifest: ICodeManifest;
+  private previous: ICodeManifest;
+
+  constructor(readonly codeUri: string, key: string) {
+    this.cacheDir = path.join(getCodeCacheBaseDir(), key);
+    this.manifestFile = path.join(this.cacheDir, 'manifest.json');
+    this.zipFile = path.join(this.cacheDir, 'code.zip');
+  }
+
+  /**
+   * 扫描代码目录，只对 mtime/size 发生变化的文件重新计算 hash
+   */
+  async scan(): Promise<string> {
+    this.previous = this.readManifest();
+    const previousFiles = this.previous?.files || {};
+    const files: Record<string, IFileEntry> = {};
+    let rehashed = 0;
+
+    const walk = async (dir: string, visited: Set<string>) => {
+      const realDir = fs.realpathSync(dir);
+      if (visited.has(realDir)) {
+        return;
+      }
+      visited.add(realDir);
+
+      const names = fs.readdirSync(dir).sort();
+      for (const name of names) {
+        const filePath = path.join(dir, name);
+        const stat = fs.statSync(filePath);
+        if (stat.isDirectory()) {
+          await walk(filePath, visited);
+          continue;
+        }
+        const relativePath = path.relative(this.codeUri, filePath).split(path.sep).join('/');
+        const cached = previousFiles[relativePath];
+        if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+          files[relativePath] = { ...cached, mode: stat.mode };
+          continue;
+        }
+        rehashed++;
+        files[relativePath] = {
+          mtimeMs: stat.mtimeMs,
+          size: stat.size,
+          mode: stat.mode,
+          hash: await hashFile(filePath),
+        };
+      }
+    };
+    await walk(this.codeUri, new Set());
+
+    const fingerprint = crypto.createHash('sha1');
+    for (const relativePath of _.keys(files)) {
+      const { size, mode, hash } = files[relativePath];
+      fingerprint.update(`${relativePath}\0${size}\0${mode}\0${hash}\n`);
+    }
+    this.manifest = {
+      version: MANIFEST_VERSION,
+      codeUri: this.codeUri,
+      fingerprint: fingerprint.digest('hex'),
+      files,
+    };
+    logger.debug(
+      `Code cache scan ${this.codeUri}: ${_.size(files)} files, ${rehashed} rehashed, fingerprint=${this.manifest.fingerprint}`,
+    );
+    return this.manifest.fingerprint;
+  }
+
+  /**
+   * 代码目录未变化且缓存 zip 存在时返回缓存的 zip 及其 crc64
+   */
+  lookup(): { zipFile: string; crc64: string } | undefined {
+    if (
+      !this.manifest ||
+      !this.previous?.crc64 ||
+      this.previous.fingerprint !== this.manifest.fingerprint ||
+      !fs.existsSync(this.zipFile)
+    ) {
+      return undefined;
+    }
+    // 刷新清单中的 mtime，下次扫描无需重新计算 hash
+    this.writeManifest(this.previous.crc64);
+    return { zipFile: this.zipFile, crc64: this.previous.crc64 };
+  }
+
+  /**
+   * 将新生成的 zip 移入缓存目录，并写入清单
+   */
+  save(generatedZipFile: string, crc64: string): string {
+    if (!this.manifest) {
+      return generatedZipFile;
+    }
+    fs.mkdirSync(this.cacheDir, { recursive: true });
+    if (path.resolve(generatedZipFile) !== path.resolve(this.zipFile)) {
+      const tmpFile = `${this.zipFile}.${process.pid}.tmp`;
+      fs.copyFileSync(generatedZipFile, tmpFile);
+      fs.renameSync(tmpFile, this.zipFile);
+      fs.rmSync(generatedZipFile, { force: true });
+    }
+    this.writeManifest(crc64);
+    return this.zipFile;
+  }
+
+  /**
+   * 缓存不可用时清理，避免后续误命中
+   */
+  invalidate() {
+    fs.rmSync(this.cacheDir, { recursive: true, force: true });
+  }
+
+  private writeManifest(crc64: string) {
+    fs.mkdirSync(this.cacheDir, { recursive: true });
+    const tmpManifest = `${this.manifestFile}.${process.pid}.tmp`;
+    fs.writeFileSync(tmpManifest, JSON.stringify({ ...this.manifest, crc64 }));
+    fs.renameSync(tmpManifest, this.manifestFile);
+  }
+
+  private readManifest(): ICodeManifest | undefined {
+    try {
+      const manifest = JSON.parse(fs.readFileSync(this.manifestFile, 'utf-8'));
+      if (manifest?.version !== MANIFEST_VERSION || manifest?.codeUri !== this.codeUri) {
+        return undefined;
+      }
+      return manifest;
+    } catch (ex) {
+      return undefined;
+    }
+  }
+}
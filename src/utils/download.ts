@@ -0,0 +1,261 @@
+import axios from 'axios';
+import path from 'path';
+import * as fs from 'fs';
+import { pipeline } from 'stream';
+import { promisify } from 'util';
+import extract from 'extract-zip';
+import { getRootHome } from '@serverless-devs/utils';
+import logger from '../logger';
+import { calculateCRC64, sleep } from './index';
+import { backoffDelay, runPool } from './scheduler';
+import { evictLeastRecentlyUsed, getPathSize } from './cache-eviction';
+import {
+  FC_DOWNLOAD_CONCURRENCY,
+  FC_DOWNLOAD_PART_SIZE,
+  FC_DOWNLOAD_TIMEOUT,
+} from '../default/config';
+
+const streamPipeline = promisify(pipeline);
+
+// 单个分段失败后的最大尝试次数，重试时从已下载的位置继续
+const DOWNLOAD_MAX_ATTEMPTS = 3;
+
+export interface IRangedDownloadOptions {
+  // 期望的 CRC64（FC 返回的 codeChecksum），下载完成后校验
+  checksum?: string;
+  concurrency?: number;
+  // 分段大小，单位 byte
+  partSize?: number;
+  // 建立连接和两次读取数据之间的超时时间，单位毫秒
+  timeout?: number;
+}
+
+/**
+ * 函数代码包的共享缓存目录，文件按 codeChecksum 命名
+ */
+export const getDownloadCacheDir = () => path.join(getRootHome(), 'cache', 'code');
+
+const getFileSizeOrZero = (file: string) => (fs.existsSync(file) ? fs.statSync(file).size : 0);
+
+async function withRetry<T>(name: string, fn: () => Promise<T>): Promise<T> {
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await fn();
+    } catch (ex) {
+      if (attempt + 1 >= DOWNLOAD_MAX_ATTEMPTS) {
+        throw ex;
+      }
+      const delayMs = backoffDelay(attempt, 1000, 10000);
+      logger.debug(`Download ${name} error: ${ex?.message}, retry after ${delayMs}ms`);
+      await sleep(delayMs / 1000);
+    }
+  }
+}
+
+/**
+ * 将响应流写入文件，超过 timeout 没有收到数据时中断，由 withRetry 重试
+ * axios 的 timeout 只覆盖到收到响应头，读取响应体卡住时需要单独处理
+ */
+async function saveStream(stream: any, file: string, timeout: number, flags = 'w') {
+  let timer: NodeJS.Timeout;
+  const resetTimer = () => {
+    clearTimeout(timer);
+    timer = setTimeout(() => {
+      stream.destroy(new Error(`Read ${file} timeout after ${timeout}ms`));
+    }, timeout);
+  };
+  resetTimer();
+  stream.on('data', resetTimer);
+  try {
+    await streamPipeline(stream, fs.createWriteStream(file, { flags }));
+  } finally {
+    clearTimeout(timer);
+  }
+}
+
+/**
+ * 获取文件大小，不支持分段下载时返回 undefined
+ * 签名 URL 通常只允许 GET，因此用 Range: bytes=0-0 探测
+ */
+async function probeSize(url: string, timeout: number): Promise<number | undefined> {
+  const res = await axios({
+    url,
+    method: 'GET',
+    responseType: 'stream',
+    headers: { Range: 'bytes=0-0' },
+    timeout,
+  });
+  res.data.destroy();
+  const match = /\/(\d+)$/.exec(res.headers['content-range'] || '');
+  if (res.status !== 206 || !match) {
+    return undefined;
+  }
+  return parseInt(match[1], 10);
+}
+
+async function fetchWhole(url: string, file: string, timeout: number) {
+  const res = await axios({ url, method: 'GET', responseType: 'stream', timeout });
+  await saveStream(res.data, file, timeout);
+}
+
+/**
+ * 下载 [start, end] 区间到分段文件，分段文件已有内容时从断点继续
+ */
+async function fetchRange(
+  url: string,
+  file: string,
+  start: number,
+  end: number,
+  timeout: number,
+) {
+  const expected = end - start + 1;
+  let existing = getFileSizeOrZero(file);
+  if (existing === expected) {
+    return;
+  }
+  if (existing > expected) {
+    fs.unlinkSync(file);
+    existing = 0;
+  }
+
+  const res = await axios({
+    url,
+    method: 'GET',
+    responseType: 'stream',
+    headers: { Range: `bytes=${start + existing}-${end}` },
+    timeout,
+  });
+  if (res.status !== 206) {
+    res.data.destroy();
+    throw new Error(`Range request of ${file} is not supported, status ${res.status}`);
+  }
+  await saveStream(res.data, file, timeout, 'a');
+
+  const size = getFileSizeOrZero(file);
+  if (size !== expected) {
+    throw new Error(`Incomplete part ${file}, expected ${expected} bytes but got ${size}`);
+  }
+}
+
+async function concatFiles(files: string[], target: string) {
+  const writer = fs.createWriteStream(target);
+  for (const file of files) {
+    await new Promise<void>((resolve, reject) => {
+      const reader = fs.createReadStream(file);
+      reader.on('error', reject);
+      reader.on('end', resolve);
+      reader.pipe(writer, { end: false });
+    });
+  }
+  await new Promise<void>((resolve, reject) => {
+    writer.on('error', reject);
+    writer.end(resolve);
+  });
+}
+
+/**
+ * 多连接分段下载到 dest，dest 已存在时直接复用
+ * 分段保存在 <dest>.parts 中，中断后再次下载同一文件时只补齐缺失的部分
+ * 全部完成并通过 checksum 校验后才重命名为 dest，因此 dest 存在即表示内容完整
+ */
+export async function downloadWithCache(
+  url: string,
+  dest: string,
+  options: IRangedDownloadOptions = {},
+): Promise<string> {
+  const {
+    checksum,
+    concurrency = FC_DOWNLOAD_CONCURRENCY,
+    partSize = FC_DOWNLOAD_PART_SIZE * 1024 * 1024,
+    timeout = FC_DOWNLOAD_TIMEOUT * 1000,
+  } = options;
+  if (fs.existsSync(dest)) {
+    logger.debug(`The file ${dest} already exists locally, skip the download`);
+    // 刷新修改时间，缓存淘汰时按最近使用时间排序
+    const now = new Date();
+    fs.utimesSync(dest, now, now);
+    return dest;
+  }
+
+  fs.mkdirSync(path.dirname(dest), { recursive: true });
+  const partsDir = `${dest}.parts`;
+  const tmpFile = `${dest}.tmp-${process.pid}`;
+  const size = await withRetry(dest, () => probeSize(url, timeout));
+
+  if (!size) {
+    logger.debug(`Range request is not supported, download ${dest} in one stream`);
+    await withRetry(dest, () => fetchWhole(url, tmpFile, timeout));
+  } else {
+    // 分段按文件大小划分，大小变化说明不是同一个文件，丢弃之前的分段
+    const sizeFile = path.join(partsDir, 'size');
+    const partsSize = fs.existsSync(sizeFile) ? fs.readFileSync(sizeFile, 'utf-8') : undefined;
+    if (partsSize !== `${size}`) {
+      fs.rmSync(partsDir, { recursive: true, force: true });
+    }
+    fs.mkdirSync(partsDir, { recursive: true });
+    fs.writeFileSync(sizeFile, `${size}`);
+
+    const count = Math.ceil(size / partSize);
+    const parts = Array.from({ length: count }, (_v, index) => ({
+      file: path.join(partsDir, `${index}`),
+      start: index * partSize,
+      end: Math.min(size, (index + 1) * partSize) - 1,
+    }));
+    logger.debug(`Download ${dest}: ${size} bytes in ${count} parts`);
+    await runPool(parts, concurrency, ({ file, start, end }) =>
+      withRetry(file, () => fetchRange(url, file, start, end, timeout)),
+    );
+    await concatFiles(
+      parts.map(({ file }) => file),
+      tmpFile,
+    );
+  }
+
+  if (checksum) {
+    const crc64Value = await calculateCRC64(tmpFile);
+    if (`${crc64Value}` !== `${checksum}`) {
+      fs.rmSync(tmpFile, { force: true });
+      fs.rmSync(partsDir, { recursive: true, force: true });
+      throw new Error(`Checksum of ${dest} mismatch, expected ${checksum} but got ${crc64Value}`);
+    }
+  }
+  fs.renameSync(tmpFile, dest);
+  fs.rmSync(partsDir, { recursive: true, force: true });
+  return dest;
+}
+
+/**
+ * 代码包缓存超过上限时，按最近使用时间淘汰代码包以及中断下载留下的分段
+ * @param maxCacheSize 单位 MB
+ * @param keepFile 当前正在使用的代码包，不会被淘汰
+ */
+export function evictDownloadCache(maxCacheSize: number, keepFile?: string) {
+  const baseDir = getDownloadCacheDir();
+  if (!fs.existsSync(baseDir)) {
+    return;
+  }
+  const entries = [];
+  for (const name of fs.readdirSync(baseDir)) {
+    // 跳过其它进程正在写入的临时文件
+    if (!name.endsWith('.zip') && !name.endsWith('.zip.parts')) {
+      continue;
+    }
+    const entryPath = path.join(baseDir, name);
+    try {
+      const { mtimeMs } = fs.statSync(entryPath);
+      entries.push({ path: entryPath, size: getPathSize(entryPath), lastUsed: mtimeMs });
+    } catch (ex) {
+      logger.debug(`Stat download cache ${entryPath} error: ${ex}`);
+    }
+  }
+  const keep = keepFile ? [keepFile, `${keepFile}.parts`] : [];
+  evictLeastRecentlyUsed('download', entries, maxCacheSize, keep);
+}
+
+/**
+ * 将 zip 包解压到目标目录
+ */
+export async function extractZip(zipFile: string, dir: string) {
+  fs.mkdirSync(dir, { recursive: true });
+  await extract(zipFile, { dir: path.resolve(dir) });
+}
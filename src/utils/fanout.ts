@@ -0,0 +1,235 @@
+import _ from 'lodash';
+import { parseArgv } from '@serverless-devs/utils';
+import { ICredentials } from '@serverless-devs/component-interface';
+import { IInputs, IRegion, checkRegion } from '../interface';
+import FC from '../resources/fc';
+import { runPool } from './scheduler';
+import { tableShow } from './index';
+import { FC_FANOUT_CONCURRENCY } from '../default/config';
+
+export type FanoutOutputFormat = 'json' | 'jsonl' | 'table';
+export const FANOUT_OUTPUT_FORMATS: FanoutOutputFormat[] = ['json', 'jsonl', 'table'];
+
+export interface IFanoutTarget {
+  region: IRegion;
+  functionName: string;
+}
+
+export interface IFanoutResult<R = any> {
+  region: IRegion;
+  functionName: string;
+  result?: R;
+  // 失败时的错误信息
+  error?: string;
+}
+
+export interface IFanoutArgs {
+  selector: IFanoutSelector;
+  outputFormat: FanoutOutputFormat;
+  opts: any;
+}
+
+export interface IFanoutSelector {
+  regions: IRegion[];
+  // 函数名前缀，服务端过滤
+  prefix?: string;
+  // 函数名列表或通配符（* ?），本地过滤
+  names: string[];
+}
+
+const splitList = (value: any): string[] =>
+  _.compact(
+    _.flatMap(_.castArray(value || []), (item) => String(item).split(',')).map((item) =>
+      item.trim(),
+    ),
+  );
+
+export const isFunctionPattern = (name: string) => /[*?]/.test(name);
+
+/**
+ * 将通配符转换为正则，* 匹配任意字符，? 匹配单个字符
+ */
+export function globToRegExp(glob: string): RegExp {
+  const source = glob
+    .split('')
+    .map((char) => {
+      if (char === '*') {
+        return '.*';
+      }
+      if (char === '?') {
+        return '.';
+      }
+      return _.escapeRegExp(char);
+    })
+    .join('');
+  return new RegExp(`^${source}$`);
+}
+
+/**
+ * 解析批量参数：--regions 多地域、--prefix 前缀、--function-name 逗号分隔的列表或通配符
+ * 只指定了单个地域和单个确定的函数名时返回 undefined，按原有单函数逻辑执行
+ */
+export function parseFanoutSelector(opts: any, defaultRegion: string): IFanoutSelector | undefined {
+  const regions = splitList(opts.regions);
+  const names = splitList(opts['function-name']);
+  const { prefix } = opts;
+  if (
+    _.isEmpty(regions) &&
+    _.isNil(prefix) &&
+    names.length <= 1 &&
+    !names.some(isFunctionPattern)
+  ) {
+    return undefined;
+  }
+  const selectedRegions = (
+    _.isEmpty(regions) ? [opts.region || defaultRegion] : regions
+  ) as IRegion[];
+  selectedRegions.forEach((region) => checkRegion(region));
+  return { regions: _.uniq(selectedRegions), prefix, names };
+}
+
+export function parseFanoutOutputFormat(opts: any): FanoutOutputFormat {
+  const format = opts['output-format'] || (opts.table ? 'table' : 'json');
+  if (!FANOUT_OUTPUT_FORMATS.includes(format)) {
+    throw new Error(
+      `Invalid --output-format ${format}, the allowed values are ${FANOUT_OUTPUT_FORMATS.join(
+        ', ',
+      )}`,
+    );
+  }
+  return format;
+}
+
+/**
+ * 按地域复用 FC 客户端，避免每个函数重复创建
+ */
+export class RegionClientPool {
+  private clients = new Map<string, FC>();
+
+  constructor(
+    private credential: ICredentials,
+    private userAgent: string,
+    // endpoint 通常只对应一个地域，仅对该地域生效
+    private endpoint?: { region: string; endpoint: string },
+  ) {}
+
+  get(region: IRegion): FC {
+    if (!this.clients.has(region)) {
+      const endpoint = this.endpoint?.region === region ? this.endpoint.endpoint : undefined;
+      this.clients.set(
+        region,
+        new FC(region, this.credential, { endpoint, userAgent: this.userAgent }),
+      );
+    }
+    return this.clients.get(region);
+  }
+}
+
+/**
+ * 列出地域内的函数，按前缀（服务端）和函数名/通配符（本地）过滤
+ */
+export async function listMatchedFunctions(
+  fcSdk: FC,
+  prefix: string | undefined,
+  names: string[],
+): Promise<any[]> {
+  const functions = await fcSdk.listFunctions(prefix);
+  if (_.isEmpty(names)) {
+    return functions;
+  }
+  const patterns = names.map((name) => globToRegExp(name));
+  return functions.filter((fn) => patterns.some((pattern) => pattern.test(fn.functionName)));
+}
+
+/**
+ * 各地域并发解析出需要处理的函数，结果按 regions 顺序排列
+ * 只给出确定的函数名时不调用 ListFunctions，直接按名称展开
+ */
+export async function resolveFanoutTargets(
+  pool: RegionClientPool,
+  selector: IFanoutSelector,
+  concurrency: number,
+): Promise<IFanoutTarget[]> {
+  const { regions, prefix, names } = selector;
+  const exactNames = _.isNil(prefix) && !_.isEmpty(names) && !names.some(isFunctionPattern);
+
+  const perRegion = await runPool(regions, concurrency, async (region) =>
+    exactNames
+      ? names.map((functionName) => ({ functionName }))
+      : await listMatchedFunctions(pool.get(region), prefix, names),
+  );
+  return _.flatMap(regions, (region, index) =>
+    perRegion[index].map((fn) => ({ region, functionName: fn.functionName })),
+  );
+}
+
+export const writeJsonLine = (record: any) => {
+  process.stdout.write(`${JSON.stringify(record)}\n`);
+};
+
+/**
+ * 解析 info、remove 的批量参数，不是批量模式时返回 undefined
+ */
+export function parseFanoutArgs(inputs: IInputs): IFanoutArgs | undefined {
+  const opts = parseArgv(inputs.args, {
+    alias: { 'assume-yes': 'y' },
+    boolean: ['table'],
+    string: ['region', 'regions', 'prefix', 'function-name', 'output-format'],
+  });
+  const selector = parseFanoutSelector(opts, _.get(inputs, 'props.region'));
+  if (!selector) {
+    return undefined;
+  }
+  return { selector, outputFormat: parseFanoutOutputFormat(opts), opts };
+}
+
+/**
+ * 按并发上限对每个函数执行 worker，单个函数失败不影响其它函数
+ * jsonl 格式下每个函数完成后立即输出一行
+ */
+export async function runFanout<R>(
+  targets: IFanoutTarget[],
+  pool: RegionClientPool,
+  outputFormat: FanoutOutputFormat,
+  worker: (target: IFanoutTarget, fcSdk: FC) => Promise<R>,
+): Promise<IFanoutResult<R>[]> {
+  return await runPool(targets, FC_FANOUT_CONCURRENCY, async (target) => {
+    let record: IFanoutResult<R>;
+    try {
+      record = { ...target, result: await worker(target, pool.get(target.region)) };
+    } catch (ex) {
+      record = { ...target, error: ex?.message || `${ex}` };
+    }
+    if (outputFormat === 'jsonl') {
+      writeJsonLine(record);
+    }
+    return record;
+  });
+}
+
+/**
+ * 输出批量结果：json 返回结果列表，table 打印表格，jsonl 已逐行输出
+ * @param pick 从单个函数的结果中挑选表格列
+ */
+export function renderFanoutResults<R>(
+  records: IFanoutResult<R>[],
+  outputFormat: FanoutOutputFormat,
+  columns: string[],
+  pick: (result: R) => Record<string, any>,
+): IFanoutResult<R>[] | undefined {
+  if (outputFormat === 'json') {
+    return records;
+  }
+  if (outputFormat === 'table') {
+    tableShow(
+      records.map(({ region, functionName, result, error }) => ({
+        region,
+        functionName,
+        ...(error ? {} : pick(result)),
+        error: error || '',
+      })),
+      ['region', 'functionName', ...columns, 'error'],
+    );
+  }
+  return undefined;
+}
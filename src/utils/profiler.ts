@@ -0,0 +1,237 @@
+import { AsyncLocalStorage } from 'async_hooks';
+import { performance } from 'perf_hooks';
+import _ from 'lodash';
+
+export type ProfileCategory = 'stage' | 'api' | 'file' | 'wait' | 'auto' | 'image';
+
+export interface IProfileSpan {
+  id: number;
+  parentId?: number;
+  name: string;
+  category: ProfileCategory;
+  // 相对 profiler 创建时间的偏移，单位 ms
+  start: number;
+  // 单位 ms
+  duration: number;
+  // retries: 重试次数；bytes: 传输或处理的字节数；error: 失败时的错误信息
+  attrs: Record<string, any>;
+}
+
+export interface IProfileSummaryRow {
+  category: ProfileCategory;
+  name: string;
+  count: number;
+  totalMs: number;
+  maxMs: number;
+  retries: number;
+  bytes: number;
+}
+
+const round = (ms: number) => Math.round(ms * 1000) / 1000;
+
+/**
+ * 记录一次命令内的耗时 span，span 之间按调用关系形成父子结构
+ * 只保存已结束的 span，导出为 JSON 或 Chrome trace（chrome://tracing、Perfetto 可直接打开）
+ */
+export class Profiler {
+  readonly spans: IProfileSpan[] = [];
+  readonly startedAt = Date.now();
+  private readonly origin = performance.now();
+  private nextId = 1;
+
+  begin(name: string, category: ProfileCategory, parent?: IProfileSpan): IProfileSpan {
+    return {
+      id: this.nextId++,
+      parentId: parent?.id,
+      name,
+      category,
+      start: performance.now() - this.origin,
+      duration: 0,
+      attrs: {},
+    };
+  }
+
+  end(span: IProfileSpan, error?: any) {
+    // eslint-disable-next-line no-param-reassign
+    span.duration = performance.now() - this.origin - span.start;
+    if (error) {
+      // eslint-disable-next-line no-param-reassign
+      span.attrs.error = error.code || error.message || `${error}`;
+    }
+    this.spans.push(span);
+  }
+
+  toJSON() {
+    return {
+      startedAt: new Date(this.startedAt).toISOString(),
+      spans: _.sortBy(this.spans, 'start').map((span) => ({
+        ...span,
+        start: round(span.start),
+        duration: round(span.duration),
+      })),
+    };
+  }
+
+  /**
+   * Chrome trace 要求同一个 tid 上的事件严格嵌套，并发的 span 依次放到不重叠的 tid 上
+   */
+  toChromeTrace() {
+    const spans = [...this.spans].sort((a, b) => a.start - b.start || b.duration - a.duration);
+    // 每个 lane 保存当前仍未结束的 span 的结束时间，栈顶为最内层
+    const lanes: number[][] = [];
+    const traceEvents = spans.map((span) => {
+      const end = span.start + span.duration;
+      let tid = lanes.findIndex((stack) => {
+        while (stack.length && stack[stack.length - 1] <= span.start) {
+          stack.pop();
+        }
+        return stack.length === 0 || stack[stack.length - 1] >= end;
+      });
+      if (tid === -1) {
+        tid = lanes.push([]) - 1;
+      }
+      lanes[tid].push(end);
+      return {
+        name: span.name,
+        cat: span.category,
+        ph: 'X',
+        ts: Math.round(span.start * 1000),
+        dur: Math.round(span.duration * 1000),
+        pid: 1,
+        tid: tid + 1,
+        args: span.attrs,
+      };
+    });
+    return { traceEvents, displayTimeUnit: 'ms' };
+  }
+
+  /**
+   * 按 分类 + 名称 汇总，按总耗时从高到低排序
+   */
+  summary(): IProfileSummaryRow[] {
+    const rows: Record<string, IProfileSummaryRow> = {};
+    for (const { category, name, duration, attrs } of this.spans) {
+      const key = `${category}#${name}`;
+      const row = rows[key] || {
+        category,
+        name,
+        count: 0,
+        totalMs: 0,
+        maxMs: 0,
+        retries: 0,
+        bytes: 0,
+      };
+      row.count++;
+      row.totalMs += duration;
+      row.maxMs = Math.max(row.maxMs, duration);
+      row.retries += attrs.retries || 0;
+      row.bytes += attrs.bytes || 0;
+      rows[key] = row;
+    }
+    return _.orderBy(Object.values(rows), 'totalMs', 'desc').map((row) => ({
+      ...row,
+      totalMs: Math.round(row.totalMs),
+      maxMs: Math.round(row.maxMs),
+    }));
+  }
+}
+
+interface IProfileScope {
+  profiler: Profiler;
+  parent?: IProfileSpan;
+}
+
+const storage = new AsyncLocalStorage<IProfileScope>();
+
+/**
+ * 在 profiler 作用域内执行，作用域外的 traceSpan 不做任何记录
+ */
+export async function runWithProfiler<T>(profiler: Profiler, fn: () => Promise<T>): Promise<T> {
+  return await storage.run({ profiler }, fn);
+}
+
+export const getProfiler = (): Profiler | undefined => storage.getStore()?.profiler;
+
+const isPromiseLike = (value: any): value is Promise<any> => typeof value?.then === 'function';
+
+/**
+ * 记录 fn 的耗时，fn 内部产生的 span 作为子 span；fn 可以是同步或异步函数
+ * 通过 span.attrs 补充重试次数、字节数等信息；不在 profiler 作用域内时传入的 span 不会被记录
+ */
+export function traceSpan<T>(
+  name: string,
+  category: ProfileCategory,
+  fn: (span: IProfileSpan) => T,
+): T {
+  const scope = storage.getStore();
+  if (!scope) {
+    return fn({ id: 0, name, category, start: 0, duration: 0, attrs: {} });
+  }
+  const { profiler, parent } = scope;
+  const span = profiler.begin(name, category, parent);
+  let result: T;
+  try {
+    result = storage.run({ profiler, parent: span }, () => fn(span));
+  } catch (ex) {
+    profiler.end(span, ex);
+    throw ex;
+  }
+  if (!isPromiseLike(result)) {
+    profiler.end(span);
+    return result;
+  }
+  return result.then(
+    (value) => {
+      profiler.end(span);
+      return value;
+    },
+    (ex) => {
+      profiler.end(span, ex);
+      throw ex;
+    },
+  ) as any;
+}
+
+/**
+ * 累加当前 span 的数值属性，例如在重试分支中记录 retries
+ */
+export function addSpanAttr(key: 'retries' | 'bytes' | 'attempts', value = 1) {
+  const span = storage.getStore()?.parent;
+  if (span) {
+    span.attrs[key] = (span.attrs[key] || 0) + value;
+  }
+}
+
+/**
+ * 代理 SDK client：profiler 作用域内每个返回 Promise 的方法调用记录为一个 api span
+ * 方法以原对象为 this 调用，SDK 内部的 xxx -> xxxWithOptions 不会重复记录；作用域外原样返回
+ */
+export function traceClient<T extends object>(client: T, prefix: string): T {
+  return new Proxy(client, {
+    get(target, prop, receiver) {
+      const value = Reflect.get(target, prop, receiver);
+      const scope = storage.getStore();
+      if (!scope || typeof value !== 'function' || typeof prop !== 'string') {
+        return value;
+      }
+      return (...args: any[]) => {
+        const { profiler, parent } = scope;
+        const span = profiler.begin(`${prefix}.${prop}`, 'api', parent);
+        const result = storage.run({ profiler, parent: span }, () => value.apply(target, args));
+        if (!isPromiseLike(result)) {
+          return result;
+        }
+        return result.then(
+          (ret) => {
+            profiler.end(span);
+            return ret;
+          },
+          (ex) => {
+            profiler.end(span, ex);
+            throw ex;
+          },
+        );
+      };
+    },
+  });
+}
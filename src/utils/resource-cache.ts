@@ -0,0 +1,129 @@
+import path from 'path';
+import * as fs from 'fs';
+import _ from 'lodash';
+import { getRootHome } from '@serverless-devs/utils';
+import logger from '../logger';
+import { FC_RESOURCE_CACHE_TTL } from '../default/config';
+
+interface IResourceCacheEntry {
+  value: any;
+  expiresAt: number;
+}
+
+export interface IResourceScope {
+  accountID: string;
+  // RAM 角色等全局资源不传
+  region?: string;
+}
+
+/**
+ * 已解析资源的缓存目录，每个账号一个文件
+ */
+export const getResourceCacheDir = () => path.join(getRootHome(), 'cache', 'resources');
+
+const getCacheFile = (accountID: string) => path.join(getResourceCacheDir(), `${accountID}.json`);
+
+const getEntryKey = ({ region }: IResourceScope, key: string) => `${region || 'global'}/${key}`;
+
+// 进程内正在解析或已解析的资源，相同资源只解析一次
+const resolved = new Map<string, Promise<any>>();
+
+function readEntries(accountID: string): Record<string, IResourceCacheEntry> {
+  try {
+    return JSON.parse(fs.readFileSync(getCacheFile(accountID), 'utf-8'));
+  } catch (ex) {
+    return {};
+  }
+}
+
+function updateEntries(
+  accountID: string,
+  update: (entries: Record<string, IResourceCacheEntry>) => Record<string, IResourceCacheEntry>,
+) {
+  let tmpFile: string;
+  try {
+    const file = getCacheFile(accountID);
+    const entries = update(readEntries(accountID));
+    fs.mkdirSync(path.dirname(file), { recursive: true });
+    tmpFile = `${file}.tmp-${process.pid}`;
+    fs.writeFileSync(tmpFile, JSON.stringify(entries, null, 2));
+    fs.renameSync(tmpFile, file);
+  } catch (ex) {
+    if (tmpFile) {
+      fs.rmSync(tmpFile, { force: true });
+    }
+    logger.debug(`Update resource cache of ${accountID} error: ${ex}`);
+  }
+}
+
+async function isValid<T>(value: T, validate?: (value: T) => Promise<boolean>) {
+  if (!validate) {
+    return true;
+  }
+  try {
+    return await validate(value);
+  } catch (ex) {
+    logger.debug(`Validate cached resource error: ${ex}`);
+    return false;
+  }
+}
+
+/**
+ * 获取已解析的资源：进程内只解析一次，跨进程按账号 + 地域缓存到本地，FC_RESOURCE_CACHE_TTL 后过期
+ * 命中本地缓存时先调用 validate 做轻量校验，校验不通过或出错时重新解析；解析失败不缓存
+ * @param key 资源标识，例如 role/oss-trigger、slr/FC
+ */
+export async function cachedResource<T>(
+  scope: IResourceScope,
+  key: string,
+  resolve: () => Promise<T>,
+  validate?: (value: T) => Promise<boolean>,
+): Promise<T> {
+  const entryKey = getEntryKey(scope, key);
+  const processKey = `${scope.accountID}/${entryKey}`;
+  let entry = resolved.get(processKey);
+  if (!entry) {
+    entry = (async () => {
+      if (FC_RESOURCE_CACHE_TTL <= 0) {
+        return await resolve();
+      }
+      const cached = readEntries(scope.accountID)[entryKey];
+      if (cached && cached.expiresAt > Date.now() && (await isValid(cached.value, validate))) {
+        logger.debug(`Resource cache hit: ${entryKey}`);
+        return cached.value;
+      }
+      const value = await resolve();
+      updateEntries(scope.accountID, (entries) => ({
+        ...entries,
+        [entryKey]: { value, expiresAt: Date.now() + FC_RESOURCE_CACHE_TTL * 1000 },
+      }));
+      return value;
+    })();
+    resolved.set(processKey, entry);
+    entry.catch(() => {
+      if (resolved.get(processKey) === entry) {
+        resolved.delete(processKey);
+      }
+    });
+  }
+  return _.cloneDeep(await entry);
+}
+
+/**
+ * 使用缓存的资源失败后清理：清理账号在该地域以及全局（RAM 角色）的缓存，下次重新解析
+ */
+export function invalidateResourceCache(scope: IResourceScope) {
+  const prefixes = [getEntryKey(scope, ''), getEntryKey({ accountID: scope.accountID }, '')];
+  const matched = (key: string) => prefixes.some((prefix) => key.startsWith(prefix));
+  const accountPrefix = `${scope.accountID}/`;
+  for (const key of Array.from(resolved.keys())) {
+    if (key.startsWith(accountPrefix) && matched(key.slice(accountPrefix.length))) {
+      resolved.delete(key);
+    }
+  }
+  if (_.isEmpty(readEntries(scope.accountID))) {
+    return;
+  }
+  updateEntries(scope.accountID, (entries) => _.omitBy(entries, (_v, key) => matched(key)));
+  logger.debug(`Invalidate resource cache of ${scope.accountID} in ${scope.region || 'global'}`);
+}
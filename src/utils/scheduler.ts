@@ -0,0 +1,242 @@
+import _ from 'lodash';
+
+export interface ITask<T = any> {
+  name: string;
+  deps?: string[];
+  run: () => Promise<T>;
+}
+
+export interface ITaskGraphResult {
+  results: Record<string, any>;
+  // 每个任务的耗时，单位 ms
+  timings: Record<string, number>;
+}
+
+/**
+ * 按并发上限执行任务，结果顺序与 items 一致
+ * 任意任务失败后不再启动新任务，等待已启动的任务结束后抛出第一个异常
+ */
+export async function runPool<T, R>(
+  items: T[],
+  concurrency: number,
+  worker: (item: T, index: number) => Promise<R>,
+): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let nextIndex = 0;
+  let firstError: any;
+
+  const runWorker = async () => {
+    while (nextIndex < items.length && !firstError) {
+      const index = nextIndex++;
+      try {
+        // eslint-disable-next-line no-await-in-loop
+        results[index] = await worker(items[index], index);
+      } catch (ex) {
+        firstError = firstError || ex;
+      }
+    }
+  };
+
+  const size = Math.max(1, Math.min(concurrency || 1, items.length));
+  await Promise.all(_.times(size, runWorker));
+  if (firstError) {
+    throw firstError;
+  }
+  return results;
+}
+
+/**
+ * 按依赖关系执行任务：依赖都完成后才会启动，无依赖关系的任务并发执行
+ * deps 中不存在的任务名会被忽略，便于按需裁剪阶段
+ */
+export async function runTaskGraph(
+  tasks: ITask[],
+  concurrency: number,
+): Promise<ITaskGraphResult> {
+  const names = new Set(tasks.map((task) => task.name));
+  const pending = tasks.map((task) => ({
+    ...task,
+    deps: _.filter(task.deps, (dep) => names.has(dep)),
+  }));
+  const done = new Set<string>();
+  const results: Record<string, any> = {};
+  const timings: Record<string, number> = {};
+  const limit = Math.max(1, concurrency || 1);
+  let running = 0;
+  let firstError: any;
+
+  await new Promise<void>((resolve) => {
+    const schedule = () => {
+      if (firstError || pending.length === 0) {
+        if (running === 0) {
+          resolve();
+        }
+        return;
+      }
+      for (let i = 0; i < pending.length && running < limit; ) {
+        const task = pending[i];
+        if (!task.deps.every((dep) => done.has(dep))) {
+          i++;
+          continue;
+        }
+        pending.splice(i, 1);
+        running++;
+        const start = Date.now();
+        Promise.resolve()
+          .then(() => task.run())
+          .then(
+            (result) => {
+              results[task.name] = result;
+              done.add(task.name);
+            },
+            (ex) => {
+              firstError = firstError || ex;
+            },
+          )
+          .then(() => {
+            timings[task.name] = Date.now() - start;
+            running--;
+            schedule();
+          });
+      }
+      if (running === 0 && pending.length > 0 && !firstError) {
+        firstError = new Error(
+          `Unable to schedule tasks because of circular dependencies: ${pending
+            .map((task) => task.name)
+            .join(', ')}`,
+        );
+        resolve();
+      }
+    };
+    schedule();
+  });
+
+  if (firstError) {
+    throw firstError;
+  }
+  return { results, timings };
+}
+
+export interface IThrottledPoolOptions<T> {
+  // 判断异常是否为限流，限流的任务会退避后重试
+  isThrottled: (ex: any) => boolean;
+  // 单个任务因限流重试的次数上限
+  retries?: number;
+  baseDelayMs?: number;
+  maxDelayMs?: number;
+  onThrottled?: (item: T, attempt: number, delayMs: number) => void;
+}
+
+const delay = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * 指数退避，叠加随机抖动避免并发任务同时重试
+ */
+export const backoffDelay = (attempt: number, baseDelayMs: number, maxDelayMs: number): number => {
+  const ceiling = Math.min(maxDelayMs, baseDelayMs * 2 ** attempt);
+  return Math.round(ceiling / 2 + (Math.random() * ceiling) / 2);
+};
+
+/**
+ * 感知限流的并发池，语义与 runPool 一致
+ * 遇到限流时：当前并发减半并暂停所有任务一段退避时间，任务成功后并发逐步恢复；被限流的任务单独重试
+ */
+export async function runThrottledPool<T, R>(
+  items: T[],
+  concurrency: number,
+  worker: (item: T, index: number) => Promise<R>,
+  options: IThrottledPoolOptions<T>,
+): Promise<R[]> {
+  const { isThrottled, retries = 5, baseDelayMs = 1000, maxDelayMs = 20000, onThrottled } = options;
+  const maxLimit = Math.max(1, concurrency || 1);
+  const results: R[] = new Array(items.length);
+  let limit = maxLimit;
+  let pausedUntil = 0;
+  let nextIndex = 0;
+  let firstError: any;
+
+  const runItem = async (item: T, index: number): Promise<R> => {
+    for (let attempt = 0; ; attempt++) {
+      const wait = pausedUntil - Date.now();
+      if (wait > 0) {
+        // eslint-disable-next-line no-await-in-loop
+        await delay(wait);
+      }
+      try {
+        // eslint-disable-next-line no-await-in-loop
+        const result = await worker(item, index);
+        limit = Math.min(maxLimit, limit + 1);
+        return result;
+      } catch (ex) {
+        if (!isThrottled(ex) || attempt >= retries) {
+          throw ex;
+        }
+        limit = Math.max(1, Math.floor(limit / 2));
+        const delayMs = backoffDelay(attempt, baseDelayMs, maxDelayMs);
+        pausedUntil = Math.max(pausedUntil, Date.now() + delayMs);
+        if (onThrottled) {
+          onThrottled(item, attempt + 1, delayMs);
+        }
+      }
+    }
+  };
+
+  const runWorker = async (slot: number) => {
+    while (nextIndex < items.length && !firstError) {
+      // 并发被限流压低时，超出上限的 worker 等待恢复
+      if (slot >= limit) {
+        // eslint-disable-next-line no-await-in-loop
+        await delay(baseDelayMs);
+        continue;
+      }
+      const index = nextIndex++;
+      try {
+        // eslint-disable-next-line no-await-in-loop
+        results[index] = await runItem(items[index], index);
+      } catch (ex) {
+        firstError = firstError || ex;
+      }
+    }
+  };
+
+  const size = Math.max(1, Math.min(maxLimit, items.length));
+  await Promise.all(_.times(size, runWorker));
+  if (firstError) {
+    throw firstError;
+  }
+  return results;
+}
+
+export interface IFetchResult {
+  values: Record<string, any>;
+  // 失败调用的异常，key 与调用名称一致，顺序与调用声明顺序一致
+  errors: Record<string, any>;
+}
+
+/**
+ * 并发执行一组互不依赖的远端读取，单个调用失败不影响其它调用，异常按名称收集
+ */
+export async function fetchAll(
+  calls: Record<string, () => Promise<any>>,
+  concurrency: number,
+): Promise<IFetchResult> {
+  const names = _.keys(calls);
+  const settled = await runPool(names, concurrency, async (name) => {
+    try {
+      return { value: await calls[name]() };
+    } catch (ex) {
+      return { error: ex || new Error(`${name} failed`) };
+    }
+  });
+  const values: Record<string, any> = {};
+  const errors: Record<string, any> = {};
+  names.forEach((name, index) => {
+    const { value, error } = settled[index] as { value?: any; error?: any };
+    if (error) {
+      errors[name] = error;
+    } else {
+      values[name] = value;
+    }
+  });
+  return { values, errors };
+}
@@ -1,29 +1,138 @@
-import Ajv, { ErrorObject } from 'ajv';
+import { ErrorObject, ValidateFunction } from 'ajv';
+import crypto from 'crypto';
+import path from 'path';
+import * as fs from 'fs';
+import { getRootHome } from '@serverless-devs/utils';
 
 import { IProps } from '../interface';
 import logger from '../logger';
 import { SCHEMA_FILE_PATH } from '../constant';
 import { yellow } from 'chalk';
 
+// ajv standalone 代码依赖的运行时模块，使用静态 require 以便 ncc 打包
+const AJV_RUNTIME_MODULES: Record<string, () => any> = {
+  /* eslint-disable @typescript-eslint/no-require-imports */
+  'ajv/dist/runtime/equal': () => require('ajv/dist/runtime/equal'),
+  'ajv/dist/runtime/ucs2length': () => require('ajv/dist/runtime/ucs2length'),
+  'ajv/dist/runtime/uri': () => require('ajv/dist/runtime/uri'),
+  'ajv/dist/runtime/validation_error': () => require('ajv/dist/runtime/validation_error'),
+  /* eslint-enable @typescript-eslint/no-require-imports */
+};
+
+let cachedValidate: ValidateFunction;
+
+export const getValidatorCacheDir = () => path.join(getRootHome(), 'fc', 'schema');
+
+const sha256 = (content: string) => crypto.createHash('sha256').update(content).digest('hex');
+
+function getSchemaHash(schemaContent: string): string {
+  // eslint-disable-next-line @typescript-eslint/no-require-imports
+  const { version } = require('ajv/package.json');
+  return sha256(`${version}\n${schemaContent}`);
+}
+
+function getValidatorCacheFile(schemaHash: string): string {
+  return path.join(getValidatorCacheDir(), `validate-${schemaHash.slice(0, 16)}.js`);
+}
+
+// 元数据放在代码文件旁边，记录生成时的 schema 和代码的 hash
+const getMetaFile = (file: string) => `${file}.json`;
+
+function loadValidator(file: string, schemaHash: string): ValidateFunction | undefined {
+  const metaFile = getMetaFile(file);
+  if (!fs.existsSync(file) || !fs.existsSync(metaFile)) {
+    return undefined;
+  }
+  try {
+    const code = fs.readFileSync(file, 'utf-8');
+    const meta = JSON.parse(fs.readFileSync(metaFile, 'utf-8'));
+    // 缓存的代码会通过 new Function 执行，内容与生成时不一致（损坏或被篡改）时不能加载
+    if (meta.schemaHash !== schemaHash || meta.codeHash !== sha256(code)) {
+      logger.debug(`Cached validator ${file} does not match its hash, regenerate it`);
+      return undefined;
+    }
+    const mod = { exports: {} as any };
+    const requireRuntime = (id: string) => {
+      if (!AJV_RUNTIME_MODULES[id]) {
+        throw new Error(`unsupported module ${id}`);
+      }
+      return AJV_RUNTIME_MODULES[id]();
+    };
+    // eslint-disable-next-line no-new-func
+    new Function('require', 'module', 'exports', code)(requireRuntime, mod, mod.exports);
+    const validate = mod.exports.default || mod.exports;
+    return typeof validate === 'function' ? validate : undefined;
+  } catch (ex) {
+    logger.debug(`Load cached validator ${file} error: ${ex}`);
+    return undefined;
+  }
+}
+
+function compileValidator(schema: any, file: string, schemaHash: string): ValidateFunction {
+  // 只有缓存未命中时才加载 ajv 编译器
+  /* eslint-disable @typescript-eslint/no-require-imports */
+  const Ajv = require('ajv').default;
+  const standaloneCode = require('ajv/dist/standalone').default;
+  /* eslint-enable @typescript-eslint/no-require-imports */
+  const ajv = new Ajv({
+    allErrors: true,
+    strictSchema: true,
+    validateSchema: true,
+    code: { source: true },
+  });
+  const validate = ajv.compile(schema);
+
+  try {
+    fs.mkdirSync(path.dirname(file), { recursive: true });
+    // 先写临时文件再重命名，避免并发执行时读到不完整的文件
+    const code = standaloneCode(ajv, validate);
+    const tmpFile = `${file}.tmp-${process.pid}`;
+    fs.writeFileSync(tmpFile, code);
+    fs.renameSync(tmpFile, file);
+    const tmpMetaFile = `${getMetaFile(file)}.tmp-${process.pid}`;
+    fs.writeFileSync(tmpMetaFile, JSON.stringify({ schemaHash, codeHash: sha256(code) }));
+    fs.renameSync(tmpMetaFile, getMetaFile(file));
+  } catch (ex) {
+    logger.debug(`Save validator cache ${file} error: ${ex}`);
+  }
+  return validate;
+}
+
+/**
+ * 获取 schema 校验函数：进程内复用，跨进程按 schema 内容和 ajv 版本缓存编译后的代码
+ * 加载缓存前校验代码的 hash，不一致时重新编译并覆盖缓存
+ */
+export function getValidator(): ValidateFunction {
+  if (cachedValidate) {
+    return cachedValidate;
+  }
+  const schemaContent = fs.readFileSync(SCHEMA_FILE_PATH, 'utf-8');
+  const schemaHash = getSchemaHash(schemaContent);
+  const file = getValidatorCacheFile(schemaHash);
+  cachedValidate = loadValidator(file, schemaHash);
+  if (cachedValidate) {
+    logger.debug(`Use cached validator: ${file}`);
+  } else {
+    cachedValidate = compileValidator(JSON.parse(schemaContent), file, schemaHash);
+  }
+  return cachedValidate;
+}
+
 export default (props: IProps) => {
   // 注意：ncc 或者 esbuild 之后 __dirname 会变为 dist/
   logger.debug(`Validating file path: ${SCHEMA_FILE_PATH}`);
 
   try {
-    // eslint-disable-next-line @typescript-eslint/no-require-imports
-    const schema = require(SCHEMA_FILE_PATH);
-    const ajv = new Ajv({
-      allErrors: true,
-      strictSchema: true,
-      validateSchema: true,
-    });
-    const valid = ajv.validate(schema, props);
+    const validate = getValidator();
+    const valid = validate(props);
 
     logger.debug(`validate status: ${valid}`);
     if (!valid) {
-      logger.debug(`validate error: ${JSON.stringify(ajv.errors, null, 2)}`);
+      logger.debug(`validate error: ${JSON.stringify(validate.errors, null, 2)}`);
       logger.debug(yellow(`Valid function props error:`));
-      for (const error of ajv.errors as Array<ErrorObject<string, Record<string, any>, unknown>>) {
+      for (const error of validate.errors as Array<
+        ErrorObject<string, Record<string, any>, unknown>
+      >) {
         logger.debug(yellow(`  ${error.instancePath}: ${error.message}`));
       }
       logger.debug(' \n ');
@@ -32,3 +141,10 @@ export default (props: IProps) => {
     logger.debug(`Validate Error: ${ex}`);
   }
 };
+
+/**
+ * 仅用于测试：清除进程内缓存的校验函数
+ */
+export const resetValidator = () => {
+  cachedValidate = undefined;
+};
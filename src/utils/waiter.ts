@@ -0,0 +1,167 @@
+import logger from '../logger';
+import { sleep } from './index';
+import { backoffDelay } from './scheduler';
+import { traceSpan } from './profiler';
+
+export interface IWaitCheckResult<T> {
+  done: boolean;
+  value?: T;
+}
+
+// 取消信号，兼容 AbortSignal
+export interface IWaitSignal {
+  aborted: boolean;
+  addEventListener?(type: 'abort', listener: () => void): void;
+  removeEventListener?(type: 'abort', listener: () => void): void;
+}
+
+export interface IWaiterOptions {
+  // 等待项名称，用于日志和耗时统计
+  name: string;
+  // 轮询间隔上下限，单位 ms
+  minDelayMs?: number;
+  maxDelayMs?: number;
+  // 预计完成耗时，单位 ms；接近预计完成时间时间隔不超过 minDelayMs，避免完成后多等一个间隔
+  expectedMs?: number;
+  // 超时时间，单位 ms
+  timeoutMs?: number;
+  // 最大查询次数
+  maxAttempts?: number;
+  // 取消后不再查询，waitUntil 抛出错误
+  signal?: IWaitSignal;
+}
+
+export interface IWaitResult<T> {
+  // false 表示超时或达到最大查询次数
+  done: boolean;
+  value?: T;
+  attempts: number;
+  // 单位 ms
+  elapsedMs: number;
+}
+
+export interface IWaitStat {
+  count: number;
+  attempts: number;
+  // 单位 ms
+  elapsedMs: number;
+  // 超时、取消或查询出错而未完成的次数
+  unfinished: number;
+}
+
+const waitStats: Record<string, IWaitStat> = {};
+
+/**
+ * 进程内各等待项的累计次数与耗时，key 为等待项名称
+ */
+export const getWaitStats = (): Record<string, IWaitStat> => ({ ...waitStats });
+
+export const resetWaitStats = () => {
+  Object.keys(waitStats).forEach((key) => delete waitStats[key]);
+};
+
+function recordWait(name: string, result: IWaitResult<any>) {
+  const stat = waitStats[name] || { count: 0, attempts: 0, elapsedMs: 0, unfinished: 0 };
+  stat.count++;
+  stat.attempts += result.attempts;
+  stat.elapsedMs += result.elapsedMs;
+  if (!result.done) {
+    stat.unfinished++;
+  }
+  waitStats[name] = stat;
+  logger.debug(
+    `waiter ${name} ${result.done ? 'done' : 'unfinished'} after ${result.attempts} checks, ${
+      result.elapsedMs
+    }ms`,
+  );
+}
+
+let interruptController: AbortController;
+
+/**
+ * 收到 Ctrl-C（DEVS:SIGINT）时取消的信号，进程内共享，用于停止轮询
+ */
+export function getInterruptSignal(): AbortSignal {
+  if (!interruptController) {
+    interruptController = new AbortController();
+    process.once('DEVS:SIGINT', () => interruptController.abort());
+  }
+  return interruptController.signal;
+}
+
+/**
+ * 等待期间收到取消信号时立即结束等待
+ */
+async function sleepUnlessAborted(ms: number, signal?: IWaitSignal) {
+  if (!signal?.addEventListener) {
+    await sleep(ms / 1000);
+    return;
+  }
+  let onAbort: () => void;
+  const aborted = new Promise<void>((resolve) => {
+    onAbort = resolve;
+    signal.addEventListener('abort', onAbort);
+  });
+  try {
+    await Promise.race([sleep(ms / 1000), aborted]);
+  } finally {
+    signal.removeEventListener?.('abort', onAbort);
+  }
+}
+
+/**
+ * 计算下次查询前的等待时间：带抖动的指数退避，且不越过预计完成时间和超时时间
+ */
+export function nextWaitDelay(attempt: number, elapsedMs: number, options: IWaiterOptions) {
+  const { minDelayMs = 1000, maxDelayMs = 10000, expectedMs, timeoutMs } = options;
+  let delayMs = backoffDelay(attempt, minDelayMs, maxDelayMs);
+  if (expectedMs && elapsedMs < expectedMs) {
+    delayMs = Math.min(delayMs, Math.max(minDelayMs, expectedMs - elapsedMs));
+  }
+  if (timeoutMs) {
+    delayMs = Math.min(delayMs, Math.max(0, timeoutMs - elapsedMs));
+  }
+  return Math.max(minDelayMs / 2, delayMs);
+}
+
+/**
+ * 轮询 check 直到 done，首次查询立即执行
+ * 超时或达到最大查询次数时返回 done: false，由调用方决定告警还是抛错；取消或 check 抛错时直接抛出
+ */
+export async function waitUntil<T>(
+  check: (attempt: number) => Promise<IWaitCheckResult<T>>,
+  options: IWaiterOptions,
+): Promise<IWaitResult<T>> {
+  const { name, timeoutMs, maxAttempts, signal } = options;
+  return await traceSpan(`wait ${name}`, 'wait', async (span) => {
+    const start = Date.now();
+    let attempts = 0;
+    let result: IWaitResult<T>;
+
+    try {
+      for (;;) {
+        if (signal?.aborted) {
+          throw new Error(`Waiting for ${name} was cancelled`);
+        }
+        // eslint-disable-next-line no-await-in-loop
+        const { done, value } = await check(attempts);
+        attempts++;
+        const elapsedMs = Date.now() - start;
+        if (done) {
+          result = { done, value, attempts, elapsedMs };
+          return result;
+        }
+        if ((maxAttempts && attempts >= maxAttempts) || (timeoutMs && elapsedMs >= timeoutMs)) {
+          result = { done: false, value, attempts, elapsedMs };
+          return result;
+        }
+        // eslint-disable-next-line no-await-in-loop
+        await sleepUnlessAborted(nextWaitDelay(attempts - 1, elapsedMs, options), signal);
+      }
+    } finally {
+      // eslint-disable-next-line no-param-reassign
+      span.attrs.attempts = attempts;
+      recordWait(name, result || { done: false, attempts, elapsedMs: Date.now() - start });
+    }
+  });
+}